@@ -0,0 +1,287 @@
+"""
+Benchmarks for pygorpho.
+
+Sweeps the morphology functions over volume sizes, dtypes and structuring
+elements, times them next to the scipy.ndimage equivalents and stores the
+results as JSON. Two result files can then be compared to find
+regressions.
+
+Usage::
+
+    python benchmarks/bench.py run -o results.json
+    python benchmarks/bench.py run --quick --backend cpu -o quick.json
+    python benchmarks/bench.py compare old.json new.json --threshold 0.1
+"""
+
+import argparse
+import datetime
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+
+import pygorpho as pg
+
+#: Volume sizes (side length of a cube) for full and quick runs
+SIZES = {'full': [64, 128, 256], 'quick': [32, 64]}
+#: Structuring element sizes (side length) for full and quick runs
+STREL_SIZES = {'full': [3, 7, 15], 'quick': [3, 7]}
+#: Ball radii for full and quick runs
+RADII = {'full': [2, 5, 10, 20], 'quick': [2, 5]}
+
+FLAT_DTYPES = ['uint8', 'uint16', 'float32', 'float64']
+GEN_DTYPES = ['int16', 'float32']
+OPS = {
+    'dilate': pg.DILATE,
+    'erode': pg.ERODE,
+    'open': pg.OPEN,
+    'close': pg.CLOSE,
+    'tophat': pg.TOPHAT,
+    'bothat': pg.BOTHAT,
+}
+
+
+def box(size):
+    return np.ones((size, size, size), dtype=bool)
+
+
+def ball(radius):
+    r = np.arange(-radius, radius + 1)
+    z, y, x = np.meshgrid(r, r, r, indexing='ij')
+    return x**2 + y**2 + z**2 <= radius**2
+
+
+def random_strel(size, seed=0):
+    rng = np.random.default_rng(seed)
+    strel = rng.random((size, size, size)) > 0.5
+    strel[size // 2, size // 2, size // 2] = True
+    return strel
+
+
+def make_volume(size, dtype, seed=0):
+    rng = np.random.default_rng(seed)
+    dtype = np.dtype(dtype)
+    shape = (size, size, size)
+    if dtype.kind == 'f':
+        return rng.random(shape).astype(dtype)
+    info = np.iinfo(dtype)
+    return rng.integers(info.min, info.max, size=shape, dtype=dtype,
+                        endpoint=True)
+
+
+def scipy_morph(vol, op, **kwargs):
+    """scipy.ndimage equivalent of a morphological operation."""
+    import scipy.ndimage as ndi
+    funcs = {
+        'dilate': ndi.grey_dilation,
+        'erode': ndi.grey_erosion,
+        'open': ndi.grey_opening,
+        'close': ndi.grey_closing,
+        'tophat': ndi.white_tophat,
+        'bothat': ndi.black_tophat,
+    }
+    return funcs[op](vol, mode='nearest', **kwargs)
+
+
+def cases(mode, ops):
+    """
+    Yields the benchmark cases.
+
+    Each case is a tuple (id, params, setup) where ``setup()`` returns a
+    function running pygorpho and a function running scipy (or None).
+    """
+    sizes = SIZES[mode]
+    strel_sizes = STREL_SIZES[mode]
+    radii = RADII[mode]
+
+    # Flat structuring elements
+    families = [('box', s, box(s)) for s in strel_sizes]
+    families += [('random', s, random_strel(s)) for s in strel_sizes[:2]]
+    families += [('ball', r, ball(r)) for r in radii[:2]]
+    for size, dtype, (family, param, strel), op in itertools.product(
+            sizes, FLAT_DTYPES, families, ops):
+        params = dict(func='flat.morph', size=size, dtype=dtype,
+                      strel=family, strel_param=param, op=op)
+
+        def setup(size=size, dtype=dtype, strel=strel, op=op):
+            vol = make_volume(size, dtype)
+            return (lambda: pg.flat.morph(vol, strel, OPS[op]),
+                    lambda: scipy_morph(vol, op, footprint=strel))
+
+        yield _case_id(params), params, setup
+
+    # Line segments approximating balls
+    for size, dtype, radius, op in itertools.product(
+            sizes, FLAT_DTYPES, radii, ops):
+        params = dict(func='flat.linear_morph', size=size, dtype=dtype,
+                      strel='ball_approx', strel_param=radius, op=op)
+
+        def setup(size=size, dtype=dtype, radius=radius, op=op):
+            vol = make_volume(size, dtype)
+            steps, lens = pg.strel.flat_ball_approx(radius)
+            return (lambda: pg.flat.linear_morph(vol, steps, lens, OPS[op]),
+                    None)
+
+        yield _case_id(params), params, setup
+
+    # General structuring elements
+    for size, dtype, strel_size, op in itertools.product(
+            sizes, GEN_DTYPES, strel_sizes[:2], ops):
+        params = dict(func='gen.morph', size=size, dtype=dtype,
+                      strel='random', strel_param=strel_size, op=op)
+
+        def setup(size=size, dtype=dtype, strel_size=strel_size, op=op):
+            vol = make_volume(size, dtype)
+            rng = np.random.default_rng(1)
+            strel = rng.integers(-5, 5, size=(strel_size,) * 3).astype(dtype)
+            return (lambda: pg.gen.morph(vol, strel, OPS[op]),
+                    lambda: scipy_morph(vol, op, structure=strel))
+
+        yield _case_id(params), params, setup
+
+
+def _case_id(params):
+    return '{func}/{op}/{dtype}/{size}/{strel}-{strel_param}'.format(
+        **params)
+
+
+def timeit(func, repeat):
+    """Returns the run times of func in seconds after a warm up call."""
+    func()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def metadata(args):
+    try:
+        import scipy
+        scipy_version = scipy.__version__
+    except ImportError:
+        scipy_version = None
+    return {
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'scipy': scipy_version,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'num_threads': os.getenv('PYGORPHO_NUM_THREADS'),
+        'backend': args.backend,
+        'available_backends': pg.backend.available_backends(),
+        'repeat': args.repeat,
+    }
+
+
+def run(args):
+    if args.backend is not None:
+        pg.backend.set_backend(args.backend)
+    mode = 'quick' if args.quick else 'full'
+    ops = args.ops or ['dilate', 'erode', 'open', 'tophat']
+
+    results = []
+    for case_id, params, setup in cases(mode, ops):
+        if args.filter and not all(f in case_id for f in args.filter):
+            continue
+        ours, theirs = setup()
+        times = timeit(ours, args.repeat)
+        result = dict(id=case_id, params=params, time=min(times),
+                      median=statistics.median(times), times=times)
+        if theirs is not None and not args.no_scipy:
+            scipy_times = timeit(theirs, args.repeat)
+            result['scipy_time'] = min(scipy_times)
+            result['speedup'] = result['scipy_time'] / result['time']
+        results.append(result)
+        line = '{:<60} {:10.4f} s'.format(case_id, result['time'])
+        if 'speedup' in result:
+            line += '   {:6.1f}x scipy'.format(result['speedup'])
+        print(line, flush=True)
+
+    data = {'meta': metadata(args), 'results': results}
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(data, f, indent=1)
+    return 0
+
+
+def compare(args):
+    with open(args.old) as f:
+        old = {r['id']: r for r in json.load(f)['results']}
+    with open(args.new) as f:
+        new = {r['id']: r for r in json.load(f)['results']}
+
+    regressions = 0
+    for case_id in sorted(old.keys() & new.keys()):
+        ratio = new[case_id]['time'] / old[case_id]['time']
+        flag = ''
+        if max(old[case_id]['time'], new[case_id]['time']) < args.min_time:
+            pass  # Too short to time reliably
+        elif ratio > 1 + args.threshold:
+            flag = 'REGRESSION'
+            regressions += 1
+        elif ratio < 1 / (1 + args.threshold):
+            flag = 'improved'
+        if flag or args.all:
+            print('{:<60} {:10.4f} s -> {:10.4f} s  {:6.2f}x  {}'.format(
+                case_id, old[case_id]['time'], new[case_id]['time'], ratio,
+                flag))
+    for case_id in sorted(old.keys() - new.keys()):
+        print('{:<60} missing in new run'.format(case_id))
+    for case_id in sorted(new.keys() - old.keys()):
+        print('{:<60} new case'.format(case_id))
+
+    print('{} regressions in {} common cases'.format(
+        regressions, len(old.keys() & new.keys())))
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('run', help='run the benchmarks')
+    p.add_argument('-o', '--output', help='JSON file to write results to')
+    p.add_argument('--backend', help='backend to use (default: auto)')
+    p.add_argument('--quick', action='store_true',
+                   help='only small volumes and structuring elements')
+    p.add_argument('--repeat', type=int, default=5,
+                   help='number of timed runs per case (default: 5)')
+    p.add_argument('--ops', nargs='+', choices=sorted(OPS),
+                   help='operations to run (default: dilate erode open '
+                        'tophat)')
+    p.add_argument('-k', '--filter', nargs='+',
+                   help='only run cases whose id contains all of these')
+    p.add_argument('--no-scipy', action='store_true',
+                   help='do not time scipy.ndimage')
+    p.set_defaults(func=run)
+
+    p = sub.add_parser('compare', help='compare two runs')
+    p.add_argument('old', help='JSON file with the baseline results')
+    p.add_argument('new', help='JSON file with the new results')
+    p.add_argument('--threshold', type=float, default=0.1,
+                   help='relative slowdown flagged as regression '
+                        '(default: 0.1)')
+    p.add_argument('--min-time', type=float, default=1e-3,
+                   help='cases faster than this many seconds in both runs '
+                        'are never flagged (default: 0.001)')
+    p.add_argument('--all', action='store_true',
+                   help='also print cases without changes')
+    p.set_defaults(func=compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -23,6 +23,7 @@ setup(
     packages=["pygorpho"],
     setup_requires=['numpy', 'scikit-build>=0.7.0'],
     install_requires=['numpy', 'scikit-build>=0.7.0'],
+    extras_require={'dask': ['dask[array]']},
     cmake_languages=('CUDA',),
     cmake_minimum_required_version='3.10',
     classifiers=[
@@ -1,9 +1,21 @@
 """Fast 3D mathematical morphology using CUDA."""
 
 from .constants import *
+from . import aio
+from . import binary
+from . import backend
+from . import chunked
 from . import cuda
+from . import distance
 from . import gen
 from . import flat
+from . import instrument
+from . import lazy
+from . import outofcore
+from . import recon
 from . import strel
+from . import tune
 
-__all__ = ['cuda', 'gen', 'flat', 'strel', 'constants']
+__all__ = ['aio', 'backend', 'binary', 'chunked', 'cuda', 'distance', 'gen',
+           'flat', 'instrument', 'lazy', 'outofcore', 'recon', 'strel',
+           'tune', 'constants']
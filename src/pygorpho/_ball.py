@@ -0,0 +1,283 @@
+"""
+Zonohedral approximations of balls. Only meant for internal use.
+
+A ball is approximated by the Minkowski sum of line segments along the 13
+directions in ``_decompose.DIRECTIONS`` [J19]_. By symmetry, all segments of
+the same class (along the axes, face diagonals or body diagonals) have the
+same length. A segment of length ``2 * a + 1`` reaches a steps from the
+center in each direction.
+
+The distance between the zonohedron and the ball is measured with the
+Hausdorff distance, which is the largest difference between their support
+functions. For the zonohedron it is largest at a vertex and smallest at a
+face, so only these need to be checked. Due to the cubic symmetry, it is
+enough to look at the vertices and faces in one of the 48 symmetric parts of
+space, given by ``x >= y >= z >= 0``.
+"""
+import itertools
+import numpy as np
+
+from . import _decompose
+from . import constants
+
+#: Index of the class of each direction: axes, face and body diagonals
+CLASSES = np.array([0] * 3 + [1] * 6 + [2] * 4)
+
+
+def _vertex_generators():
+    # Directions in the fundamental part of space. Each direction picks the
+    # vertex which maximizes its dot product, so sample enough directions to
+    # hit all vertices of the fundamental part.
+    n = 64
+    x, y, z = np.meshgrid(*[np.arange(1, 2 * n, 2) / (2 * n)] * 3,
+                          indexing='ij')
+    keep = (x > y) & (y > z)
+    # Shift off the symmetry planes of the arrangement
+    u = np.stack([x[keep], y[keep] * 0.999, z[keep] * 0.998], axis=1)
+    signs = np.unique(np.sign(u @ _decompose.DIRECTIONS.T), axis=0)
+    signs = signs[np.all(signs != 0, axis=1)]
+    # Vertex = sum over classes of a[c] * (sum of signed directions in c)
+    gens = np.stack([
+        (signs[:, CLASSES == c, None]
+         * _decompose.DIRECTIONS[None, CLASSES == c]).sum(axis=1)
+        for c in range(3)
+    ], axis=1)
+    return gens.astype(float)
+
+
+def _face_weights():
+    # Faces of a zonohedron are spanned by two of its directions, so their
+    # normals are cross products. Map them to the fundamental part.
+    normals = set()
+    for s, t in itertools.combinations(_decompose.DIRECTIONS, 2):
+        n = np.sort(np.abs(np.cross(s, t)))[::-1]
+        if n.any():
+            normals.add(tuple(n))
+    normals = np.array(sorted(normals), dtype=float)
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+    # Support function in direction n = sum over classes of a[c] * weight
+    dots = np.abs(normals @ _decompose.DIRECTIONS.T)
+    return np.stack([dots[:, CLASSES == c].sum(axis=1) for c in range(3)],
+                    axis=1)
+
+
+#: Vertex generators with shape (vertices, classes, 3)
+VERTEX_GENS = _vertex_generators()
+#: Support function weights for each face normal with shape (faces, classes)
+FACE_WEIGHTS = _face_weights()
+
+
+def outer_radius(a):
+    """Returns the largest distance from the center to the zonohedron."""
+    a = np.asarray(a, dtype=float)
+    verts = np.einsum('...c,vcd->...vd', a, VERTEX_GENS)
+    return np.linalg.norm(verts, axis=-1).max(axis=-1)
+
+
+def inner_radius(a):
+    """Returns the smallest distance from the center to the boundary."""
+    a = np.asarray(a, dtype=float)
+    return (a[..., None, :] * FACE_WEIGHTS).sum(axis=-1).min(axis=-1)
+
+
+def ball_lengths(radius, type):
+    """
+    Returns the line lengths for each class which best approximate a ball.
+
+    For ``INSIDE`` the zonohedron must lie inside the ball and for
+    ``OUTSIDE`` it must contain the ball. Subject to this, the Hausdorff
+    distance to the ball is minimized. Ties are broken by the smallest total
+    length of the line segments.
+
+    Parameters
+    ----------
+    radius
+        Non-negative integer radius.
+    type
+        ``INSIDE``, ``BEST`` or ``OUTSIDE`` from ``constants``.
+
+    Returns
+    -------
+    numpy.array
+        Length of the line segments in each class.
+    """
+    if radius <= 0:
+        return np.ones(3, dtype=int)
+    r = float(radius)
+    # For each a[0], a[1], search a[2] with bisection, since the outer radius
+    # grows and the inner radius does not shrink when a[2] grows.
+    a0, a1 = np.meshgrid(np.arange(radius + 1),
+                         np.arange(int(r / np.sqrt(2)) + 2), indexing='ij')
+    a0 = a0.ravel()
+    a1 = a1.ravel()
+    lo = np.zeros_like(a0)
+    hi = np.full_like(a0, int(r / np.sqrt(3)) + 2)
+
+    def radii(a2):
+        a = np.stack([a0, a1, a2], axis=1)
+        return outer_radius(a) - r, r - inner_radius(a)
+
+    # Find the smallest a[2] where the condition holds, or hi if none does
+    if type == constants.INSIDE:
+        cond = lambda over, under: over > 0
+    elif type == constants.OUTSIDE:
+        cond = lambda over, under: under <= 0
+    else:
+        cond = lambda over, under: over >= under
+    while np.any(lo < hi):
+        mid = (lo + hi) // 2
+        ok = cond(*radii(mid))
+        hi = np.where(ok, mid, hi)
+        lo = np.where(ok, lo, np.minimum(mid + 1, hi))
+
+    if type == constants.INSIDE:
+        a2 = lo - 1
+        over, under = radii(np.maximum(a2, 0))
+        err = np.where((a2 >= 0) & (over <= 0), under, np.inf)
+    elif type == constants.OUTSIDE:
+        a2 = lo
+        over, under = radii(a2)
+        err = np.where(under <= 0, over, np.inf)
+    else:
+        # The optimum is where the two distances cross
+        cands = [np.maximum(lo - 1, 0), lo]
+        errs = [np.maximum(*radii(c)) for c in cands]
+        a2 = np.where(errs[0] <= errs[1], cands[0], cands[1])
+        err = np.minimum(errs[0], errs[1])
+
+    total = 3 * a0 + 6 * a1 + 4 * a2
+    best = np.lexsort((total, np.round(err, 9)))[0]
+    return 2 * np.array([a0[best], a1[best], a2[best]]) + 1
+
+
+def _errors(a, radius, type):
+    """
+    Returns the Hausdorff distance between the zonohedra with half lengths
+    a and the ball, or inf where they violate the constraint of type.
+    """
+    over = outer_radius(a) - radius
+    under = radius - inner_radius(a)
+    if type == constants.INSIDE:
+        return np.where(over <= 1e-9, under, np.inf)
+    if type == constants.OUTSIDE:
+        return np.where(under <= 1e-9, over, np.inf)
+    return np.maximum(over, under)
+
+
+def _candidates(radius, type, slack, extra=None):
+    """
+    Returns half lengths whose distance to the ball is at most slack more
+    than the best, and how much more it is. Half lengths in extra are added
+    if they satisfy the constraint of type.
+    """
+    r = float(radius)
+    a0, a1 = np.meshgrid(np.arange(radius + 1),
+                         np.arange(int(r / np.sqrt(2)) + 2), indexing='ij')
+    a0 = a0.ravel()
+    a1 = a1.ravel()
+    # Find where the constraint starts to hold, as in ball_lengths, and
+    # look at a few a[2] on both sides
+    lo = np.zeros_like(a0)
+    hi = np.full_like(a0, int(r / np.sqrt(3)) + 2)
+    while np.any(lo < hi):
+        mid = (lo + hi) // 2
+        a = np.stack([a0, a1, mid], axis=1)
+        over = outer_radius(a) - r
+        under = r - inner_radius(a)
+        if type == constants.INSIDE:
+            ok = over > 0
+        elif type == constants.OUTSIDE:
+            ok = under <= 0
+        else:
+            ok = over >= under
+        hi = np.where(ok, mid, hi)
+        lo = np.where(ok, lo, np.minimum(mid + 1, hi))
+    cands = [np.stack([a0, a1, lo + d], axis=1) for d in range(-3, 4)]
+    cands = np.concatenate(cands)
+    cands = cands[cands[:, 2] >= 0]
+    err = _errors(cands, r, type)
+    best = err.min()
+    keep = err <= best + slack
+    cands = cands[keep]
+    err = err[keep]
+    if extra is not None:
+        extra_err = _errors(extra, r, type)
+        keep = np.isfinite(extra_err)
+        cands = np.concatenate([cands, extra[keep]])
+        err = np.concatenate([err, extra_err[keep]])
+    cands, index = np.unique(cands, axis=0, return_index=True)
+    return cands, err[index] - best
+
+
+def nested_ball_lengths(radii, type, slack=3.0):
+    """
+    Returns line lengths which approximate balls of increasing radii, such
+    that each zonohedron contains the previous one.
+
+    A zonohedron contains the previous one when none of its line segments
+    are shorter. Among such sequences, the one where the Hausdorff distance
+    exceeds that of ``ball_lengths`` the least is found with dynamic
+    programming. The largest excess is minimized first and then the sum of
+    the excesses.
+
+    Parameters
+    ----------
+    radii
+        Increasing sequence of positive integer radii.
+    type
+        ``INSIDE``, ``BEST`` or ``OUTSIDE`` from ``constants``.
+    slack
+        Largest excess of the candidates considered for each radius.
+        Candidates which continue the sequence are added if there are no
+        others.
+
+    Returns
+    -------
+    numpy.array
+        Length of the line segments in each class with shape
+        ``(len(radii), 3)``.
+    """
+    steps = []
+    prev = None
+    for radius in radii:
+        cands, excess = _candidates(radius, type, slack)
+        if prev is not None:
+            worst, total, choice = _extend(prev, cands, excess)
+            if not np.isfinite(worst).any():
+                # Keep the previous zonohedra or grow them to the best one
+                best = cands[np.argmin(excess)]
+                extra = np.concatenate([prev[0], np.maximum(prev[0], best)])
+                cands, excess = _candidates(radius, type, slack, extra)
+                worst, total, choice = _extend(prev, cands, excess)
+        else:
+            worst, total, choice = excess, excess, None
+        steps.append((cands, choice))
+        prev = (cands, worst, total)
+
+    # Trace the best sequence back from the last radius
+    worst, total = prev[1], prev[2]
+    index = np.lexsort((total, worst))[0]
+    res = []
+    for cands, choice in reversed(steps):
+        res.append(cands[index])
+        if choice is not None:
+            index = choice[index]
+    return 2 * np.array(res[::-1]) + 1
+
+
+def _extend(prev, cands, excess):
+    """
+    Returns the largest and summed excess of the best sequence ending at
+    each candidate, and the previous candidate of that sequence.
+    """
+    prev_cands, prev_worst, prev_total = prev
+    fits = np.all(prev_cands[None] <= cands[:, None], axis=2)
+    # Order the previous candidates by largest excess, then summed excess
+    rank = np.empty(len(prev_cands))
+    rank[np.lexsort((prev_total, prev_worst))] = np.arange(len(prev_cands))
+    rank = np.where(np.isfinite(prev_worst), rank, np.inf)
+    choice = np.argmin(np.where(fits, rank[None], np.inf), axis=1)
+    ok = fits[np.arange(len(cands)), choice] & np.isfinite(rank[choice])
+    worst = np.where(ok, np.maximum(prev_worst[choice], excess), np.inf)
+    total = np.where(ok, prev_total[choice] + excess, np.inf)
+    return worst, total, choice
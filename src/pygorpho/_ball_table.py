@@ -0,0 +1,1030 @@
+"""
+Line segments for flat_ball_approx. Only meant for internal use.
+
+These are the line segments of the gorpho library, so the approximations are
+the same as in earlier versions, which called the library. STEPS holds the
+step vectors, with the axes, face diagonals and body diagonals in the order
+of ``_ball.CLASSES``. LENGTHS[radius][type] holds the length of the line
+segments along the axes, face diagonals and body diagonals, with type
+indexed by the INSIDE, BEST and OUTSIDE constants. The lengths may be even.
+"""
+
+STEPS = [
+    [1, 0, 0],
+    [0, -1, 0],
+    [0, 0, 1],
+    [1, 1, 0],
+    [-1, 1, 0],
+    [-1, 0, -1],
+    [1, 0, -1],
+    [0, 1, 1],
+    [0, -1, 1],
+    [-1, -1, -1],
+    [1, 1, -1],
+    [1, -1, 1],
+    [-1, 1, 1],
+]
+
+LENGTHS = [
+    [[0, 0, 0], [0, 0, 0], [0, 0, 0]],  # 0
+    [[2, 0, 0], [2, 0, 0], [3, 0, 0]],  # 1
+    [[3, 0, 0], [4, 0, 0], [2, 0, 2]],  # 2
+    [[2, 2, 0], [3, 0, 2], [3, 2, 0]],  # 3
+    [[3, 2, 0], [4, 0, 2], [2, 2, 2]],  # 4
+    [[2, 2, 2], [3, 2, 2], [3, 3, 0]],  # 5
+    [[3, 3, 0], [4, 2, 2], [2, 3, 2]],  # 6
+    [[2, 3, 2], [3, 2, 3], [4, 2, 3]],  # 7
+    [[3, 3, 2], [4, 3, 2], [5, 3, 2]],  # 8
+    [[2, 3, 3], [3, 3, 3], [4, 3, 3]],  # 9
+    [[3, 4, 2], [4, 4, 2], [5, 4, 2]],  # 10
+    [[5, 3, 3], [6, 3, 3], [4, 4, 3]],  # 11
+    [[6, 3, 3], [4, 4, 3], [5, 4, 3]],  # 12
+    [[5, 3, 4], [6, 4, 3], [7, 4, 3]],  # 13
+    [[6, 4, 3], [8, 3, 4], [6, 4, 4]],  # 14
+    [[8, 3, 4], [6, 4, 4], [7, 5, 3]],  # 15
+    [[6, 4, 4], [7, 5, 3], [6, 5, 4]],  # 16
+    [[7, 5, 3], [6, 5, 4], [7, 6, 3]],  # 17
+    [[6, 5, 4], [7, 6, 3], [9, 5, 4]],  # 18
+    [[8, 4, 5], [9, 5, 4], [7, 6, 4]],  # 19
+    [[9, 4, 5], [7, 6, 4], [9, 6, 4]],  # 20
+    [[7, 6, 4], [9, 5, 5], [8, 6, 5]],  # 21
+    [[9, 5, 5], [7, 7, 4], [9, 7, 4]],  # 22
+    [[7, 6, 5], [9, 6, 5], [11, 6, 5]],  # 23
+    [[8, 7, 4], [11, 5, 6], [9, 7, 5]],  # 24
+    [[7, 7, 5], [9, 7, 5], [11, 7, 5]],  # 25
+    [[8, 8, 4], [11, 6, 6], [10, 7, 6]],  # 26
+    [[10, 6, 6], [12, 7, 5], [11, 8, 5]],  # 27
+    [[8, 8, 5], [10, 8, 5], [13, 7, 6]],  # 28
+    [[10, 7, 6], [9, 8, 6], [11, 9, 5]],  # 29
+    [[11, 8, 5], [10, 9, 5], [13, 8, 6]],  # 30
+    [[9, 9, 5], [12, 8, 6], [11, 9, 6]],  # 31
+    [[11, 8, 6], [14, 7, 7], [13, 9, 6]],  # 32
+    [[13, 7, 7], [12, 9, 6], [15, 8, 7]],  # 33
+    [[11, 9, 6], [14, 8, 7], [13, 10, 6]],  # 34
+    [[12, 9, 6], [12, 9, 7], [15, 9, 7]],  # 35
+    [[11, 9, 7], [14, 9, 7], [13, 10, 7]],  # 36
+    [[12, 10, 6], [12, 10, 7], [15, 10, 7]],  # 37
+    [[14, 9, 7], [11, 10, 8], [13, 11, 7]],  # 38
+    [[12, 10, 7], [12, 11, 7], [15, 11, 7]],  # 39
+    [[14, 9, 8], [13, 11, 7], [17, 10, 8]],  # 40
+    [[12, 11, 7], [16, 9, 9], [15, 11, 8]],  # 41
+    [[13, 11, 7], [13, 12, 7], [17, 11, 8]],  # 42
+    [[12, 11, 8], [15, 11, 8], [15, 12, 8]],  # 43
+    [[13, 12, 7], [14, 11, 9], [17, 12, 8]],  # 44
+    [[15, 11, 8], [15, 12, 8], [15, 13, 8]],  # 45
+    [[13, 12, 8], [17, 11, 9], [17, 13, 8]],  # 46
+    [[14, 13, 7], [15, 13, 8], [19, 12, 9]],  # 47
+    [[16, 12, 8], [17, 12, 9], [17, 13, 9]],  # 48
+    [[15, 12, 9], [15, 13, 9], [19, 13, 9]],  # 49
+    [[16, 12, 9], [16, 14, 8], [17, 14, 9]],  # 50
+    [[17, 13, 8], [18, 13, 9], [19, 14, 9]],  # 51
+    [[16, 13, 9], [17, 13, 10], [21, 13, 10]],  # 52
+    [[18, 12, 10], [18, 14, 9], [19, 14, 10]],  # 53
+    [[19, 12, 10], [20, 13, 10], [21, 14, 10]],  # 54
+    [[17, 14, 9], [18, 14, 10], [19, 15, 10]],  # 55
+    [[16, 14, 10], [20, 14, 10], [21, 15, 10]],  # 56
+    [[18, 13, 11], [18, 15, 10], [19, 16, 10]],  # 57
+    [[18, 15, 9], [20, 14, 11], [21, 16, 10]],  # 58
+    [[17, 15, 10], [18, 16, 10], [23, 15, 11]],  # 59
+    [[18, 16, 9], [20, 15, 11], [21, 16, 11]],  # 60
+    [[21, 13, 12], [18, 17, 10], [23, 16, 11]],  # 61
+    [[18, 16, 10], [23, 15, 11], [21, 17, 11]],  # 62
+    [[20, 15, 11], [21, 16, 11], [23, 17, 11]],  # 63
+    [[18, 17, 10], [23, 15, 12], [21, 18, 11]],  # 64
+    [[19, 17, 10], [21, 17, 11], [23, 17, 12]],  # 65
+    [[21, 16, 11], [23, 16, 12], [25, 17, 12]],  # 66
+    [[23, 15, 12], [21, 18, 11], [23, 18, 12]],  # 67
+    [[21, 17, 11], [23, 17, 12], [25, 18, 12]],  # 68
+    [[22, 17, 11], [21, 18, 12], [23, 19, 12]],  # 69
+    [[21, 17, 12], [23, 18, 12], [25, 18, 13]],  # 70
+    [[22, 18, 11], [21, 19, 12], [23, 20, 12]],  # 71
+    [[24, 17, 12], [23, 18, 13], [25, 19, 13]],  # 72
+    [[22, 18, 12], [24, 19, 12], [27, 19, 13]],  # 73
+    [[24, 17, 13], [23, 19, 13], [25, 20, 13]],  # 74
+    [[22, 19, 12], [24, 20, 12], [27, 20, 13]],  # 75
+    [[24, 18, 13], [26, 19, 13], [25, 21, 13]],  # 76
+    [[22, 19, 13], [24, 20, 13], [27, 20, 14]],  # 77
+    [[23, 20, 12], [26, 19, 14], [29, 20, 14]],  # 78
+    [[25, 19, 13], [24, 21, 13], [27, 21, 14]],  # 79
+    [[27, 18, 14], [26, 20, 14], [29, 21, 14]],  # 80
+    [[25, 19, 14], [24, 22, 13], [27, 22, 14]],  # 81
+    [[26, 20, 13], [26, 21, 14], [29, 21, 15]],  # 82
+    [[25, 20, 14], [28, 20, 15], [27, 23, 14]],  # 83
+    [[30, 18, 15], [29, 21, 14], [29, 22, 15]],  # 84
+    [[24, 22, 13], [27, 22, 14], [31, 22, 15]],  # 85
+    [[26, 21, 14], [26, 22, 15], [29, 23, 15]],  # 86
+    [[28, 20, 15], [27, 23, 14], [31, 23, 15]],  # 87
+    [[29, 20, 15], [29, 22, 15], [29, 24, 15]],  # 88
+    [[27, 22, 14], [27, 23, 15], [31, 23, 16]],  # 89
+    [[26, 22, 15], [29, 23, 15], [29, 25, 15]],  # 90
+    [[31, 20, 16], [31, 22, 16], [31, 24, 16]],  # 91
+    [[28, 23, 14], [29, 23, 16], [33, 24, 16]],  # 92
+    [[27, 23, 15], [30, 24, 15], [31, 25, 16]],  # 93
+    [[26, 23, 16], [29, 24, 16], [33, 24, 17]],  # 94
+    [[30, 23, 15], [31, 23, 17], [31, 26, 16]],  # 95
+    [[28, 24, 15], [32, 24, 16], [33, 25, 17]],  # 96
+    [[30, 23, 16], [30, 25, 16], [35, 25, 17]],  # 97
+    [[28, 25, 15], [36, 22, 18], [33, 26, 17]],  # 98
+    [[29, 25, 15], [30, 26, 16], [35, 26, 17]],  # 99
+    [[31, 24, 16], [32, 25, 17], [33, 27, 17]],  # 100
+    [[33, 23, 17], [34, 24, 18], [35, 26, 18]],  # 101
+    [[31, 25, 16], [32, 26, 17], [33, 28, 17]],  # 102
+    [[29, 26, 16], [34, 25, 18], [35, 27, 18]],  # 103
+    [[31, 25, 17], [32, 27, 17], [37, 27, 18]],  # 104
+    [[32, 26, 16], [34, 26, 18], [35, 28, 18]],  # 105
+    [[31, 26, 17], [32, 27, 18], [37, 27, 19]],  # 106
+    [[32, 26, 17], [33, 28, 17], [35, 29, 18]],  # 107
+    [[34, 25, 18], [32, 28, 18], [37, 28, 19]],  # 108
+    [[32, 27, 17], [34, 27, 19], [35, 30, 18]],  # 109
+    [[34, 26, 18], [35, 28, 18], [37, 29, 19]],  # 110
+    [[32, 27, 18], [37, 27, 19], [39, 28, 20]],  # 111
+    [[33, 28, 17], [35, 28, 19], [37, 30, 19]],  # 112
+    [[32, 28, 18], [37, 28, 19], [39, 29, 20]],  # 113
+    [[37, 26, 19], [35, 29, 19], [37, 31, 19]],  # 114
+    [[32, 28, 19], [34, 29, 20], [39, 30, 20]],  # 115
+    [[33, 29, 18], [35, 30, 19], [37, 32, 19]],  # 116
+    [[35, 28, 19], [37, 29, 20], [39, 31, 20]],  # 117
+    [[36, 28, 19], [38, 30, 19], [41, 30, 21]],  # 118
+    [[34, 30, 18], [36, 31, 19], [39, 32, 20]],  # 119
+    [[36, 29, 19], [38, 30, 20], [41, 31, 21]],  # 120
+    [[38, 28, 20], [37, 30, 21], [39, 33, 20]],  # 121
+    [[36, 29, 20], [38, 31, 20], [41, 32, 21]],  # 122
+    [[37, 30, 19], [40, 30, 21], [43, 31, 22]],  # 123
+    [[36, 30, 20], [38, 32, 20], [41, 33, 21]],  # 124
+    [[37, 31, 19], [40, 31, 21], [43, 32, 22]],  # 125
+    [[39, 29, 21], [38, 32, 21], [41, 34, 21]],  # 126
+    [[37, 31, 20], [39, 33, 20], [43, 33, 22]],  # 127
+    [[36, 31, 21], [38, 33, 21], [41, 35, 21]],  # 128
+    [[40, 31, 20], [40, 32, 22], [43, 34, 22]],  # 129
+    [[38, 32, 20], [41, 33, 21], [45, 33, 23]],  # 130
+    [[37, 32, 21], [43, 32, 22], [43, 35, 22]],  # 131
+    [[38, 33, 20], [45, 31, 23], [45, 34, 23]],  # 132
+    [[39, 33, 20], [43, 33, 22], [43, 36, 22]],  # 133
+    [[38, 33, 21], [41, 34, 22], [45, 35, 23]],  # 134
+    [[40, 32, 22], [40, 34, 23], [43, 36, 23]],  # 135
+    [[41, 33, 21], [41, 35, 22], [45, 36, 23]],  # 136
+    [[39, 34, 21], [43, 34, 23], [47, 35, 24]],  # 137
+    [[41, 33, 22], [41, 36, 22], [45, 37, 23]],  # 138
+    [[43, 32, 23], [43, 35, 23], [47, 36, 24]],  # 139
+    [[41, 34, 22], [48, 33, 24], [45, 37, 24]],  # 140
+    [[46, 32, 23], [46, 35, 23], [47, 37, 24]],  # 141
+    [[41, 34, 23], [44, 36, 23], [45, 38, 24]],  # 142
+    [[42, 35, 22], [46, 35, 24], [47, 38, 24]],  # 143
+    [[44, 34, 23], [44, 37, 23], [49, 37, 25]],  # 144
+    [[42, 35, 23], [46, 36, 24], [47, 39, 24]],  # 145
+    [[43, 36, 22], [44, 37, 24], [49, 38, 25]],  # 146
+    [[42, 36, 23], [46, 37, 24], [47, 39, 25]],  # 147
+    [[44, 35, 24], [44, 38, 24], [49, 39, 25]],  # 148
+    [[45, 35, 24], [46, 37, 25], [51, 38, 26]],  # 149
+    [[43, 37, 23], [47, 38, 24], [49, 40, 25]],  # 150
+    [[45, 36, 24], [46, 38, 25], [51, 39, 26]],  # 151
+    [[47, 35, 25], [47, 39, 24], [49, 40, 26]],  # 152
+    [[44, 38, 23], [49, 38, 25], [51, 40, 26]],  # 153
+    [[46, 37, 24], [47, 39, 25], [49, 41, 26]],  # 154
+    [[48, 36, 25], [50, 37, 27], [51, 41, 26]],  # 155
+    [[50, 35, 26], [47, 40, 25], [53, 40, 27]],  # 156
+    [[47, 38, 24], [49, 39, 26], [51, 42, 26]],  # 157
+    [[46, 38, 25], [47, 41, 25], [53, 41, 27]],  # 158
+    [[47, 39, 24], [49, 40, 26], [51, 42, 27]],  # 159
+    [[49, 37, 26], [51, 39, 27], [53, 42, 27]],  # 160
+    [[47, 39, 25], [49, 41, 26], [51, 43, 27]],  # 161
+    [[49, 38, 26], [50, 41, 26], [53, 43, 27]],  # 162
+    [[50, 39, 25], [49, 41, 27], [55, 42, 28]],  # 163
+    [[48, 40, 25], [50, 42, 26], [53, 43, 28]],  # 164
+    [[47, 40, 26], [52, 41, 27], [55, 43, 28]],  # 165
+    [[48, 41, 25], [50, 42, 27], [53, 44, 28]],  # 166
+    [[50, 40, 26], [52, 42, 27], [55, 44, 28]],  # 167
+    [[48, 41, 26], [54, 41, 28], [53, 45, 28]],  # 168
+    [[47, 41, 27], [52, 42, 28], [55, 45, 28]],  # 169
+    [[48, 42, 26], [54, 42, 28], [57, 44, 29]],  # 170
+    [[53, 40, 27], [52, 43, 28], [55, 45, 29]],  # 171
+    [[51, 41, 27], [54, 42, 29], [57, 45, 29]],  # 172
+    [[53, 40, 28], [52, 44, 28], [55, 46, 29]],  # 173
+    [[51, 42, 27], [54, 43, 29], [57, 46, 29]],  # 174
+    [[52, 42, 27], [55, 44, 28], [59, 45, 30]],  # 175
+    [[51, 42, 28], [53, 45, 28], [57, 46, 30]],  # 176
+    [[52, 43, 27], [55, 44, 29], [59, 46, 30]],  # 177
+    [[51, 43, 28], [53, 46, 28], [57, 47, 30]],  # 178
+    [[52, 43, 28], [55, 45, 29], [59, 47, 30]],  # 179
+    [[54, 42, 29], [57, 44, 30], [57, 48, 30]],  # 180
+    [[52, 44, 28], [55, 46, 29], [59, 47, 31]],  # 181
+    [[54, 43, 29], [57, 45, 30], [61, 47, 31]],  # 182
+    [[55, 43, 29], [55, 46, 30], [59, 48, 31]],  # 183
+    [[53, 45, 28], [56, 47, 29], [61, 48, 31]],  # 184
+    [[55, 44, 29], [55, 47, 30], [59, 49, 31]],  # 185
+    [[57, 43, 30], [56, 48, 29], [61, 49, 31]],  # 186
+    [[54, 46, 28], [58, 47, 30], [59, 50, 31]],  # 187
+    [[56, 45, 29], [60, 46, 31], [61, 49, 32]],  # 188
+    [[55, 45, 30], [62, 45, 32], [63, 49, 32]],  # 189
+    [[56, 45, 30], [60, 47, 31], [61, 50, 32]],  # 190
+    [[54, 47, 29], [58, 48, 31], [63, 50, 32]],  # 191
+    [[56, 46, 30], [60, 47, 32], [61, 51, 32]],  # 192
+    [[58, 45, 31], [58, 49, 31], [63, 50, 33]],  # 193
+    [[56, 46, 31], [60, 48, 32], [65, 50, 33]],  # 194
+    [[57, 47, 30], [58, 50, 31], [63, 51, 33]],  # 195
+    [[56, 47, 31], [59, 50, 31], [65, 51, 33]],  # 196
+    [[57, 48, 30], [61, 49, 32], [63, 52, 33]],  # 197
+    [[58, 48, 30], [63, 49, 32], [65, 52, 33]],  # 198
+    [[57, 48, 31], [61, 50, 32], [63, 53, 33]],  # 199
+    [[58, 49, 30], [60, 50, 33], [65, 52, 34]],  # 200
+    [[60, 48, 31], [61, 51, 32], [67, 52, 34]],  # 201
+    [[58, 49, 31], [63, 50, 33], [65, 53, 34]],  # 202
+    [[57, 49, 32], [61, 51, 33], [67, 53, 34]],  # 203
+    [[58, 50, 31], [63, 51, 33], [65, 54, 34]],  # 204
+    [[63, 48, 32], [61, 52, 33], [67, 53, 35]],  # 205
+    [[61, 49, 32], [60, 52, 34], [65, 55, 34]],  # 206
+    [[60, 49, 33], [64, 52, 33], [67, 54, 35]],  # 207
+    [[61, 50, 32], [63, 52, 34], [69, 54, 35]],  # 208
+    [[59, 51, 32], [64, 53, 33], [67, 55, 35]],  # 209
+    [[61, 50, 33], [66, 52, 34], [69, 54, 36]],  # 210
+    [[62, 51, 32], [64, 53, 34], [67, 56, 35]],  # 211
+    [[61, 51, 33], [70, 50, 36], [69, 55, 36]],  # 212
+    [[62, 51, 33], [64, 54, 34], [67, 57, 35]],  # 213
+    [[64, 50, 34], [66, 53, 35], [69, 56, 36]],  # 214
+    [[62, 52, 33], [64, 55, 34], [71, 56, 36]],  # 215
+    [[64, 51, 34], [66, 54, 35], [69, 57, 36]],  # 216
+    [[69, 49, 35], [68, 53, 36], [71, 56, 37]],  # 217
+    [[63, 53, 33], [69, 54, 35], [69, 58, 36]],  # 218
+    [[62, 53, 34], [67, 55, 35], [71, 57, 37]],  # 219
+    [[63, 53, 34], [66, 55, 36], [73, 57, 37]],  # 220
+    [[65, 52, 35], [67, 56, 35], [71, 58, 37]],  # 221
+    [[63, 54, 34], [69, 55, 36], [73, 57, 38]],  # 222
+    [[65, 53, 35], [68, 55, 37], [71, 59, 37]],  # 223
+    [[63, 54, 35], [69, 56, 36], [73, 58, 38]],  # 224
+    [[64, 55, 34], [67, 57, 36], [71, 60, 37]],  # 225
+    [[66, 54, 35], [69, 56, 37], [73, 59, 38]],  # 226
+    [[68, 53, 36], [67, 58, 36], [75, 59, 38]],  # 227
+    [[70, 52, 37], [69, 57, 37], [73, 60, 38]],  # 228
+    [[67, 55, 35], [70, 58, 36], [75, 59, 39]],  # 229
+    [[66, 55, 36], [69, 58, 37], [73, 61, 38]],  # 230
+    [[67, 56, 35], [70, 58, 37], [75, 60, 39]],  # 231
+    [[68, 56, 35], [72, 58, 37], [73, 62, 38]],  # 232
+    [[67, 56, 36], [70, 59, 37], [75, 61, 39]],  # 233
+    [[69, 55, 37], [72, 58, 38], [77, 60, 40]],  # 234
+    [[70, 56, 36], [70, 60, 37], [75, 62, 39]],  # 235
+    [[68, 57, 36], [72, 59, 38], [77, 61, 40]],  # 236
+    [[67, 57, 37], [74, 58, 39], [75, 63, 39]],  # 237
+    [[68, 58, 36], [72, 60, 38], [77, 62, 40]],  # 238
+    [[69, 58, 36], [74, 59, 39], [75, 63, 40]],  # 239
+    [[68, 58, 37], [72, 60, 39], [77, 63, 40]],  # 240
+    [[69, 59, 36], [73, 61, 38], [79, 62, 41]],  # 241
+    [[71, 58, 37], [72, 61, 39], [77, 64, 40]],  # 242
+    [[73, 57, 38], [73, 62, 38], [79, 63, 41]],  # 243
+    [[71, 58, 38], [75, 61, 39], [77, 65, 40]],  # 244
+    [[72, 59, 37], [77, 60, 40], [79, 64, 41]],  # 245
+    [[71, 59, 38], [79, 59, 41], [81, 63, 42]],  # 246
+    [[76, 57, 39], [77, 61, 40], [79, 65, 41]],  # 247
+    [[71, 59, 39], [75, 62, 40], [81, 64, 42]],  # 248
+    [[72, 60, 38], [77, 61, 41], [79, 66, 41]],  # 249
+    [[74, 59, 39], [75, 63, 40], [81, 65, 42]],  # 250
+    [[72, 60, 39], [77, 62, 41], [79, 66, 42]],  # 251
+    [[73, 61, 38], [78, 63, 40], [81, 66, 42]],  # 252
+    [[72, 61, 39], [76, 64, 40], [83, 65, 43]],  # 253
+    [[73, 61, 39], [78, 63, 41], [81, 67, 42]],  # 254
+    [[75, 60, 40], [76, 65, 40], [83, 66, 43]],  # 255
+    [[73, 62, 39], [78, 64, 41], [81, 68, 42]],  # 256
+    [[75, 61, 40], [77, 64, 42], [83, 67, 43]],  # 257
+    [[80, 59, 41], [78, 65, 41], [81, 68, 43]],  # 258
+    [[74, 63, 39], [80, 64, 42], [83, 68, 43]],  # 259
+    [[76, 62, 40], [78, 65, 42], [85, 67, 44]],  # 260
+    [[75, 62, 41], [80, 65, 42], [83, 69, 43]],  # 261
+    [[76, 62, 41], [78, 66, 42], [85, 68, 44]],  # 262
+    [[77, 63, 40], [80, 65, 43], [83, 69, 44]],  # 263
+    [[76, 63, 41], [78, 67, 42], [85, 69, 44]],  # 264
+    [[77, 64, 40], [83, 65, 43], [83, 70, 44]],  # 265
+    [[76, 63, 42], [81, 67, 42], [85, 70, 44]],  # 266
+    [[77, 64, 41], [83, 66, 43], [87, 69, 45]],  # 267
+    [[76, 64, 42], [81, 67, 43], [85, 71, 44]],  # 268
+    [[80, 64, 41], [87, 64, 45], [87, 70, 45]],  # 269
+    [[78, 65, 41], [81, 68, 43], [85, 71, 45]],  # 270
+    [[77, 65, 42], [83, 67, 44], [87, 71, 45]],  # 271
+    [[78, 66, 41], [81, 69, 43], [89, 70, 46]],  # 272
+    [[80, 65, 42], [83, 68, 44], [87, 72, 45]],  # 273
+    [[78, 66, 42], [81, 69, 44], [89, 71, 46]],  # 274
+    [[80, 65, 43], [86, 68, 44], [87, 72, 46]],  # 275
+    [[78, 67, 42], [84, 69, 44], [89, 72, 46]],  # 276
+    [[83, 65, 43], [86, 68, 45], [87, 73, 46]],  # 277
+    [[81, 66, 43], [84, 70, 44], [89, 73, 46]],  # 278
+    [[79, 68, 42], [86, 69, 45], [91, 72, 47]],  # 279
+    [[81, 67, 43], [84, 70, 45], [89, 73, 47]],  # 280
+    [[82, 67, 43], [86, 70, 45], [91, 73, 47]],  # 281
+    [[84, 66, 44], [84, 71, 45], [89, 74, 47]],  # 282
+    [[82, 68, 43], [86, 70, 46], [91, 74, 47]],  # 283
+    [[81, 68, 44], [84, 72, 45], [89, 75, 47]],  # 284
+    [[86, 66, 45], [86, 71, 46], [91, 75, 47]],  # 285
+    [[83, 69, 43], [87, 72, 45], [93, 74, 48]],  # 286
+    [[82, 69, 44], [89, 71, 46], [91, 75, 48]],  # 287
+    [[84, 68, 45], [87, 72, 46], [93, 75, 48]],  # 288
+    [[89, 66, 46], [89, 72, 46], [91, 76, 48]],  # 289
+    [[83, 70, 44], [87, 73, 46], [93, 76, 48]],  # 290
+    [[85, 69, 45], [86, 73, 47], [95, 75, 49]],  # 291
+    [[87, 68, 46], [87, 74, 46], [93, 76, 49]],  # 292
+    [[84, 71, 44], [89, 73, 47], [95, 76, 49]],  # 293
+    [[86, 70, 45], [91, 72, 48], [93, 77, 49]],  # 294
+    [[88, 69, 46], [89, 74, 47], [95, 77, 49]],  # 295
+    [[87, 69, 47], [94, 72, 48], [93, 78, 49]],  # 296
+    [[84, 72, 45], [89, 74, 48], [95, 78, 49]],  # 297
+    [[86, 71, 46], [90, 75, 47], [97, 77, 50]],  # 298
+    [[87, 72, 45], [89, 75, 48], [95, 78, 50]],  # 299
+    [[85, 73, 45], [90, 76, 47], [97, 78, 50]],  # 300
+    [[87, 72, 46], [92, 75, 48], [95, 79, 50]],  # 301
+    [[86, 72, 47], [90, 76, 48], [97, 79, 50]],  # 302
+    [[87, 73, 46], [96, 73, 50], [95, 80, 50]],  # 303
+    [[88, 73, 46], [90, 77, 48], [97, 79, 51]],  # 304
+    [[87, 73, 47], [92, 76, 49], [99, 79, 51]],  # 305
+    [[88, 74, 46], [94, 75, 50], [97, 80, 51]],  # 306
+    [[90, 73, 47], [92, 77, 49], [99, 80, 51]],  # 307
+    [[88, 74, 47], [94, 76, 50], [97, 81, 51]],  # 308
+    [[90, 73, 48], [95, 77, 49], [99, 80, 52]],  # 309
+    [[88, 75, 47], [93, 78, 49], [97, 82, 51]],  # 310
+    [[89, 75, 47], [92, 78, 50], [99, 81, 52]],  # 311
+    [[91, 74, 48], [93, 79, 49], [101, 81, 52]],  # 312
+    [[89, 76, 47], [95, 78, 50], [99, 82, 52]],  # 313
+    [[91, 75, 48], [97, 77, 51], [101, 82, 52]],  # 314
+    [[93, 74, 49], [95, 79, 50], [99, 83, 52]],  # 315
+    [[91, 75, 49], [97, 78, 51], [101, 82, 53]],  # 316
+    [[92, 76, 48], [95, 79, 51], [103, 82, 53]],  # 317
+    [[91, 76, 49], [96, 80, 50], [101, 83, 53]],  # 318
+    [[96, 74, 50], [95, 80, 51], [103, 83, 53]],  # 319
+    [[94, 75, 50], [96, 81, 50], [101, 84, 53]],  # 320
+    [[92, 77, 49], [98, 80, 51], [103, 83, 54]],  # 321
+    [[94, 76, 50], [100, 79, 52], [101, 85, 53]],  # 322
+    [[99, 74, 51], [98, 81, 51], [103, 84, 54]],  # 323
+    [[93, 78, 49], [100, 80, 52], [105, 84, 54]],  # 324
+    [[92, 78, 50], [98, 81, 52], [103, 85, 54]],  # 325
+    [[93, 78, 50], [100, 80, 53], [105, 85, 54]],  # 326
+    [[94, 79, 49], [98, 82, 52], [103, 86, 54]],  # 327
+    [[93, 79, 50], [100, 81, 53], [105, 85, 55]],  # 328
+    [[95, 78, 51], [98, 83, 52], [103, 87, 54]],  # 329
+    [[97, 77, 52], [100, 82, 53], [105, 86, 55]],  # 330
+    [[94, 80, 50], [98, 83, 53], [107, 86, 55]],  # 331
+    [[96, 79, 51], [99, 84, 52], [105, 87, 55]],  # 332
+    [[98, 78, 52], [101, 83, 53], [107, 86, 56]],  # 333
+    [[95, 81, 50], [100, 83, 54], [105, 88, 55]],  # 334
+    [[97, 80, 51], [101, 84, 53], [107, 87, 56]],  # 335
+    [[96, 80, 52], [103, 83, 54], [105, 89, 55]],  # 336
+    [[97, 81, 51], [105, 82, 55], [107, 88, 56]],  # 337
+    [[98, 81, 51], [103, 84, 54], [109, 88, 56]],  # 338
+    [[97, 81, 52], [101, 85, 54], [107, 89, 56]],  # 339
+    [[98, 82, 51], [103, 84, 55], [109, 88, 57]],  # 340
+    [[100, 81, 52], [101, 86, 54], [107, 90, 56]],  # 341
+    [[98, 82, 52], [103, 85, 55], [109, 89, 57]],  # 342
+    [[97, 82, 53], [104, 86, 54], [111, 89, 57]],  # 343
+    [[98, 83, 52], [106, 85, 55], [109, 90, 57]],  # 344
+    [[100, 82, 53], [104, 86, 55], [111, 89, 58]],  # 345
+    [[98, 83, 53], [107, 84, 57], [109, 91, 57]],  # 346
+    [[99, 84, 52], [104, 87, 55], [111, 90, 58]],  # 347
+    [[101, 83, 53], [106, 86, 56], [109, 92, 57]],  # 348
+    [[103, 82, 54], [104, 88, 55], [111, 91, 58]],  # 349
+    [[101, 83, 54], [106, 87, 56], [113, 90, 59]],  # 350
+    [[102, 84, 53], [104, 88, 56], [111, 92, 58]],  # 351
+    [[101, 84, 54], [109, 87, 56], [113, 91, 59]],  # 352
+    [[106, 82, 55], [107, 88, 56], [111, 93, 58]],  # 353
+    [[104, 83, 55], [106, 88, 57], [113, 92, 59]],  # 354
+    [[102, 85, 54], [107, 89, 56], [111, 94, 58]],  # 355
+    [[101, 85, 55], [109, 88, 57], [113, 93, 59]],  # 356
+    [[109, 82, 56], [107, 90, 56], [115, 92, 60]],  # 357
+    [[103, 86, 54], [109, 89, 57], [113, 94, 59]],  # 358
+    [[102, 86, 55], [107, 90, 57], [115, 93, 60]],  # 359
+    [[103, 86, 55], [109, 89, 58], [113, 95, 59]],  # 360
+    [[105, 85, 56], [107, 91, 57], [115, 94, 60]],  # 361
+    [[103, 87, 55], [109, 90, 58], [117, 93, 61]],  # 362
+    [[102, 87, 56], [110, 91, 57], [115, 95, 60]],  # 363
+    [[106, 87, 55], [109, 91, 58], [117, 94, 61]],  # 364
+    [[104, 88, 55], [114, 89, 59], [115, 96, 60]],  # 365
+    [[106, 87, 56], [112, 91, 58], [117, 95, 61]],  # 366
+    [[108, 86, 57], [110, 92, 58], [115, 97, 60]],  # 367
+    [[105, 89, 55], [109, 92, 59], [117, 96, 61]],  # 368
+    [[107, 88, 56], [110, 93, 58], [119, 95, 62]],  # 369
+    [[106, 88, 57], [112, 92, 59], [117, 97, 61]],  # 370
+    [[107, 89, 56], [114, 91, 60], [119, 96, 62]],  # 371
+    [[108, 89, 56], [112, 93, 59], [117, 98, 61]],  # 372
+    [[107, 89, 57], [114, 92, 60], [119, 97, 62]],  # 373
+    [[109, 88, 58], [112, 93, 60], [117, 98, 62]],  # 374
+    [[107, 90, 57], [113, 94, 59], [119, 98, 62]],  # 375
+    [[108, 90, 57], [112, 94, 60], [121, 97, 63]],  # 376
+    [[107, 90, 58], [113, 95, 59], [119, 99, 62]],  # 377
+    [[108, 91, 57], [115, 94, 60], [121, 98, 63]],  # 378
+    [[110, 90, 58], [113, 95, 60], [119, 99, 63]],  # 379
+    [[108, 91, 58], [119, 92, 62], [121, 99, 63]],  # 380
+    [[109, 92, 57], [113, 96, 60], [119, 100, 63]],  # 381
+    [[108, 92, 58], [115, 95, 61], [121, 100, 63]],  # 382
+    [[113, 90, 59], [117, 94, 62], [123, 99, 64]],  # 383
+    [[108, 92, 59], [115, 96, 61], [121, 101, 63]],  # 384
+    [[109, 93, 58], [117, 95, 62], [123, 100, 64]],  # 385
+    [[111, 92, 59], [118, 96, 61], [121, 101, 64]],  # 386
+    [[113, 91, 60], [116, 97, 61], [123, 101, 64]],  # 387
+    [[111, 92, 60], [115, 97, 62], [125, 100, 65]],  # 388
+    [[112, 93, 59], [116, 98, 61], [123, 102, 64]],  # 389
+    [[111, 93, 60], [118, 97, 62], [125, 101, 65]],  # 390
+    [[112, 93, 60], [117, 97, 63], [123, 102, 65]],  # 391
+    [[113, 94, 59], [118, 98, 62], [125, 102, 65]],  # 392
+    [[112, 94, 60], [120, 97, 63], [123, 103, 65]],  # 393
+    [[113, 95, 59], [118, 98, 63], [125, 103, 65]],  # 394
+    [[119, 91, 62], [120, 98, 63], [127, 102, 66]],  # 395
+    [[113, 95, 60], [118, 99, 63], [125, 104, 65]],  # 396
+    [[115, 94, 61], [120, 98, 64], [127, 103, 66]],  # 397
+    [[116, 95, 60], [118, 100, 63], [125, 104, 66]],  # 398
+    [[114, 96, 60], [120, 99, 64], [127, 104, 66]],  # 399
+    [[116, 95, 61], [121, 100, 63], [125, 105, 66]],  # 400
+    [[114, 97, 60], [123, 99, 64], [127, 105, 66]],  # 401
+    [[115, 97, 60], [121, 100, 64], [129, 104, 67]],  # 402
+    [[114, 97, 61], [127, 97, 66], [127, 105, 67]],  # 403
+    [[116, 96, 62], [121, 101, 64], [126, 106, 67]],  # 404
+    [[117, 97, 61], [123, 100, 65], [127, 106, 67]],  # 405
+    [[115, 98, 61], [121, 102, 64], [129, 106, 67]],  # 406
+    [[117, 97, 62], [123, 101, 65], [127, 107, 67]],  # 407
+    [[116, 97, 63], [121, 102, 65], [129, 106, 68]],  # 408
+    [[117, 98, 62], [122, 103, 64], [131, 106, 68]],  # 409
+    [[118, 98, 62], [124, 102, 65], [129, 107, 68]],  # 410
+    [[117, 98, 63], [123, 102, 66], [131, 107, 68]],  # 411
+    [[118, 99, 62], [124, 103, 65], [129, 108, 68]],  # 412
+    [[120, 98, 63], [126, 102, 66], [131, 108, 68]],  # 413
+    [[118, 99, 63], [124, 103, 66], [133, 107, 69]],  # 414
+    [[120, 98, 64], [126, 103, 66], [131, 108, 69]],  # 415
+    [[118, 100, 63], [124, 104, 66], [133, 108, 69]],  # 416
+    [[120, 99, 64], [123, 104, 67], [131, 109, 69]],  # 417
+    [[118, 100, 64], [124, 105, 66], [130, 110, 69]],  # 418
+    [[119, 101, 63], [126, 104, 67], [131, 110, 69]],  # 419
+    [[121, 100, 64], [127, 105, 66], [133, 109, 70]],  # 420
+    [[123, 99, 65], [129, 104, 67], [135, 109, 70]],  # 421
+    [[120, 102, 63], [127, 105, 67], [133, 110, 70]],  # 422
+    [[122, 101, 64], [129, 105, 67], [135, 110, 70]],  # 423
+    [[124, 100, 65], [127, 106, 67], [133, 111, 70]],  # 424
+    [[122, 101, 65], [129, 105, 68], [135, 111, 70]],  # 425
+    [[123, 102, 64], [127, 107, 67], [133, 112, 70]],  # 426
+    [[122, 102, 65], [129, 106, 68], [135, 111, 71]],  # 427
+    [[124, 101, 66], [127, 107, 68], [137, 111, 71]],  # 428
+    [[129, 99, 67], [129, 107, 68], [135, 112, 71]],  # 429
+    [[123, 103, 65], [131, 106, 69], [134, 113, 71]],  # 430
+    [[122, 103, 66], [129, 107, 69], [135, 113, 71]],  # 431
+    [[123, 103, 66], [130, 108, 68], [137, 112, 72]],  # 432
+    [[124, 104, 65], [129, 108, 69], [135, 114, 71]],  # 433
+    [[123, 104, 66], [130, 109, 68], [137, 113, 72]],  # 434
+    [[124, 105, 65], [132, 108, 69], [139, 113, 72]],  # 435
+    [[126, 103, 67], [130, 109, 69], [137, 114, 72]],  # 436
+    [[124, 105, 66], [129, 109, 70], [136, 115, 72]],  # 437
+    [[126, 104, 67], [130, 110, 69], [137, 115, 72]],  # 438
+    [[127, 105, 66], [132, 109, 70], [139, 114, 73]],  # 439
+    [[129, 104, 67], [128, 110, 71], [141, 114, 73]],  # 440
+    [[127, 105, 67], [132, 110, 70], [139, 115, 73]],  # 441
+    [[129, 104, 68], [134, 109, 71], [138, 116, 73]],  # 442
+    [[127, 106, 67], [135, 110, 70], [139, 116, 73]],  # 443
+    [[128, 106, 67], [133, 111, 70], [141, 115, 74]],  # 444
+    [[127, 106, 68], [132, 111, 71], [139, 117, 73]],  # 445
+    [[128, 107, 67], [133, 112, 70], [141, 116, 74]],  # 446
+    [[130, 106, 68], [135, 111, 71], [143, 116, 74]],  # 447
+    [[128, 107, 68], [133, 112, 71], [141, 117, 74]],  # 448
+    [[130, 106, 69], [135, 112, 71], [143, 116, 75]],  # 449
+    [[128, 108, 68], [137, 111, 72], [141, 118, 74]],  # 450
+    [[130, 107, 69], [135, 112, 72], [143, 117, 75]],  # 451
+    [[135, 105, 70], [136, 113, 71], [141, 119, 74]],  # 452
+    [[129, 109, 68], [135, 113, 72], [143, 118, 75]],  # 453
+    [[131, 108, 69], [136, 114, 71], [145, 118, 75]],  # 454
+    [[133, 107, 70], [138, 113, 72], [143, 119, 75]],  # 455
+    [[130, 110, 68], [136, 114, 72], [145, 118, 76]],  # 456
+    [[132, 109, 69], [138, 114, 72], [143, 120, 75]],  # 457
+    [[131, 109, 70], [136, 115, 72], [145, 119, 76]],  # 458
+    [[132, 109, 70], [138, 114, 73], [147, 119, 76]],  # 459
+    [[130, 111, 69], [144, 111, 75], [145, 120, 76]],  # 460
+    [[132, 110, 70], [138, 115, 73], [147, 119, 77]],  # 461
+    [[131, 110, 71], [140, 114, 74], [145, 121, 76]],  # 462
+    [[136, 108, 72], [138, 116, 73], [144, 121, 77]],  # 463
+    [[133, 111, 70], [140, 115, 74], [145, 122, 76]],  # 464
+    [[135, 110, 71], [138, 116, 74], [147, 121, 77]],  # 465
+    [[134, 110, 72], [139, 117, 73], [149, 121, 77]],  # 466
+    [[134, 112, 70], [138, 117, 74], [147, 122, 77]],  # 467
+    [[133, 112, 71], [140, 116, 75], [149, 121, 78]],  # 468
+    [[132, 112, 72], [141, 117, 74], [147, 123, 77]],  # 469
+    [[136, 112, 71], [143, 116, 75], [149, 122, 78]],  # 470
+    [[134, 113, 71], [142, 116, 76], [147, 124, 77]],  # 471
+    [[136, 112, 72], [143, 117, 75], [149, 123, 78]],  # 472
+    [[134, 114, 71], [141, 118, 75], [151, 122, 79]],  # 473
+    [[139, 112, 72], [140, 118, 76], [149, 124, 78]],  # 474
+    [[137, 113, 72], [141, 119, 75], [151, 123, 79]],  # 475
+    [[139, 112, 73], [143, 118, 76], [149, 125, 78]],  # 476
+    [[137, 114, 72], [144, 119, 75], [151, 124, 79]],  # 477
+    [[142, 112, 73], [146, 118, 76], [149, 125, 79]],  # 478
+    [[137, 114, 73], [144, 119, 76], [151, 125, 79]],  # 479
+    [[138, 115, 72], [146, 119, 76], [153, 124, 80]],  # 480
+    [[137, 115, 73], [144, 120, 76], [151, 126, 79]],  # 481
+    [[138, 115, 73], [143, 120, 77], [153, 125, 80]],  # 482
+    [[137, 115, 74], [144, 121, 76], [151, 127, 79]],  # 483
+    [[138, 116, 73], [146, 120, 77], [153, 126, 80]],  # 484
+    [[140, 115, 74], [144, 121, 77], [155, 125, 81]],  # 485
+    [[138, 116, 74], [145, 122, 76], [153, 127, 80]],  # 486
+    [[139, 117, 73], [144, 122, 77], [155, 126, 81]],  # 487
+    [[138, 117, 74], [146, 121, 78], [153, 128, 80]],  # 488
+    [[143, 115, 75], [147, 122, 77], [155, 127, 81]],  # 489
+    [[141, 116, 75], [149, 121, 78], [153, 128, 81]],  # 490
+    [[139, 118, 74], [147, 123, 77], [155, 128, 81]],  # 491
+    [[141, 117, 75], [149, 122, 78], [157, 127, 82]],  # 492
+    [[143, 116, 76], [147, 123, 78], [155, 129, 81]],  # 493
+    [[140, 119, 74], [153, 120, 80], [157, 128, 82]],  # 494
+    [[142, 118, 75], [147, 124, 78], [155, 130, 81]],  # 495
+    [[141, 118, 76], [149, 123, 79], [157, 129, 82]],  # 496
+    [[142, 118, 76], [147, 125, 78], [155, 130, 82]],  # 497
+    [[143, 119, 75], [149, 124, 79], [157, 130, 82]],  # 498
+    [[142, 119, 76], [154, 122, 80], [159, 129, 83]],  # 499
+    [[143, 120, 75], [152, 124, 79], [157, 131, 82]],  # 500
+    [[148, 118, 76], [150, 125, 79], [159, 130, 83]],  # 501
+    [[143, 120, 76], [152, 124, 80], [157, 131, 83]],  # 502
+    [[142, 120, 77], [150, 126, 79], [159, 131, 83]],  # 503
+    [[146, 120, 76], [152, 125, 80], [157, 132, 83]],  # 504
+    [[144, 121, 76], [150, 126, 80], [159, 132, 83]],  # 505
+    [[143, 121, 77], [152, 126, 80], [161, 131, 84]],  # 506
+    [[144, 122, 76], [150, 127, 80], [159, 133, 83]],  # 507
+    [[145, 122, 76], [152, 126, 81], [161, 132, 84]],  # 508
+    [[144, 122, 77], [153, 127, 80], [159, 133, 84]],  # 509
+    [[146, 121, 78], [152, 127, 81], [161, 133, 84]],  # 510
+    [[147, 122, 77], [153, 128, 80], [163, 132, 85]],  # 511
+    [[149, 121, 78], [155, 127, 81], [161, 134, 84]],  # 512
+    [[147, 122, 78], [153, 128, 81], [163, 133, 85]],  # 513
+    [[149, 121, 79], [155, 128, 81], [161, 134, 85]],  # 514
+    [[147, 123, 78], [153, 129, 81], [163, 134, 85]],  # 515
+    [[148, 123, 78], [155, 128, 82], [161, 135, 85]],  # 516
+    [[150, 122, 79], [153, 130, 81], [163, 135, 85]],  # 517
+    [[148, 124, 78], [155, 129, 82], [165, 134, 86]],  # 518
+    [[150, 123, 79], [157, 128, 83], [163, 135, 86]],  # 519
+    [[148, 124, 79], [155, 130, 82], [165, 135, 86]],  # 520
+    [[149, 125, 78], [156, 130, 82], [163, 136, 86]],  # 521
+    [[148, 125, 79], [155, 130, 83], [165, 136, 86]],  # 522
+    [[150, 124, 80], [156, 131, 82], [163, 137, 86]],  # 523
+    [[151, 124, 80], [158, 130, 83], [165, 137, 86]],  # 524
+    [[149, 126, 79], [156, 132, 82], [167, 136, 87]],  # 525
+    [[151, 125, 80], [158, 131, 83], [165, 137, 87]],  # 526
+    [[153, 124, 81], [160, 130, 84], [167, 137, 87]],  # 527
+    [[150, 127, 79], [162, 129, 85], [165, 138, 87]],  # 528
+    [[152, 126, 80], [160, 131, 84], [167, 138, 87]],  # 529
+    [[154, 125, 81], [158, 132, 84], [165, 139, 87]],  # 530
+    [[152, 126, 81], [159, 133, 83], [167, 138, 88]],  # 531
+    [[153, 127, 80], [158, 133, 84], [169, 138, 88]],  # 532
+    [[152, 127, 81], [160, 132, 85], [167, 139, 88]],  # 533
+    [[153, 128, 80], [161, 133, 84], [166, 140, 88]],  # 534
+    [[155, 126, 82], [159, 134, 84], [167, 140, 88]],  # 535
+    [[153, 128, 81], [161, 133, 85], [169, 140, 88]],  # 536
+    [[155, 127, 82], [159, 135, 84], [171, 139, 89]],  # 537
+    [[156, 128, 81], [161, 134, 85], [169, 140, 89]],  # 538
+    [[154, 129, 81], [160, 134, 86], [171, 140, 89]],  # 539
+    [[153, 129, 82], [161, 135, 85], [169, 141, 89]],  # 540
+    [[154, 130, 81], [163, 134, 86], [168, 142, 89]],  # 541
+    [[156, 129, 82], [161, 135, 86], [169, 142, 89]],  # 542
+    [[154, 130, 82], [162, 136, 85], [171, 141, 90]],  # 543
+    [[153, 130, 83], [161, 136, 86], [173, 141, 90]],  # 544
+    [[157, 130, 82], [162, 137, 85], [171, 142, 90]],  # 545
+    [[159, 129, 83], [164, 136, 86], [170, 143, 90]],  # 546
+    [[157, 130, 83], [166, 135, 87], [171, 143, 90]],  # 547
+    [[159, 129, 84], [164, 137, 86], [173, 142, 91]],  # 548
+    [[157, 131, 83], [166, 136, 87], [171, 144, 90]],  # 549
+    [[158, 131, 83], [164, 137, 87], [173, 143, 91]],  # 550
+    [[157, 131, 84], [163, 137, 88], [175, 143, 91]],  # 551
+    [[158, 132, 83], [164, 138, 87], [173, 144, 91]],  # 552
+    [[157, 132, 84], [166, 137, 88], [175, 144, 91]],  # 553
+    [[158, 132, 84], [164, 139, 87], [173, 145, 91]],  # 554
+    [[159, 133, 83], [169, 137, 88], [175, 144, 92]],  # 555
+    [[158, 133, 84], [167, 138, 88], [177, 144, 92]],  # 556
+    [[160, 132, 85], [169, 138, 88], [175, 145, 92]],  # 557
+    [[165, 130, 86], [167, 139, 88], [177, 145, 92]],  # 558
+    [[159, 134, 84], [166, 139, 89], [175, 146, 92]],  # 559
+    [[161, 133, 85], [167, 140, 88], [177, 145, 93]],  # 560
+    [[163, 132, 86], [169, 139, 89], [175, 147, 92]],  # 561
+    [[160, 135, 84], [167, 140, 89], [177, 146, 93]],  # 562
+    [[162, 134, 85], [169, 140, 89], [179, 146, 93]],  # 563
+    [[161, 134, 86], [167, 141, 89], [177, 147, 93]],  # 564
+    [[163, 133, 87], [169, 140, 90], [179, 147, 93]],  # 565
+    [[160, 136, 85], [170, 141, 89], [177, 148, 93]],  # 566
+    [[162, 135, 86], [169, 141, 90], [179, 147, 94]],  # 567
+    [[164, 134, 87], [170, 142, 89], [177, 149, 93]],  # 568
+    [[165, 134, 87], [172, 141, 90], [179, 148, 94]],  # 569
+    [[163, 136, 86], [170, 142, 90], [181, 148, 94]],  # 570
+    [[162, 136, 87], [172, 142, 90], [179, 149, 94]],  # 571
+    [[163, 137, 86], [170, 143, 90], [181, 148, 95]],  # 572
+    [[164, 137, 86], [172, 142, 91], [179, 150, 94]],  # 573
+    [[163, 137, 87], [170, 144, 90], [181, 149, 95]],  # 574
+    [[164, 138, 86], [172, 143, 91], [179, 151, 94]],  # 575
+    [[166, 137, 87], [174, 142, 92], [181, 150, 95]],  # 576
+    [[164, 138, 87], [175, 143, 91], [183, 150, 95]],  # 577
+    [[166, 137, 88], [173, 144, 91], [181, 151, 95]],  # 578
+    [[164, 139, 87], [172, 144, 92], [183, 150, 96]],  # 579
+    [[165, 139, 87], [173, 145, 91], [181, 152, 95]],  # 580
+    [[167, 138, 88], [175, 144, 92], [183, 151, 96]],  # 581
+    [[169, 137, 89], [173, 146, 91], [185, 151, 96]],  # 582
+    [[167, 139, 88], [175, 145, 92], [183, 152, 96]],  # 583
+    [[169, 138, 89], [173, 146, 92], [185, 151, 97]],  # 584
+    [[167, 139, 89], [179, 143, 94], [183, 153, 96]],  # 585
+    [[168, 140, 88], [176, 146, 92], [185, 152, 97]],  # 586
+    [[167, 140, 89], [175, 146, 93], [183, 154, 96]],  # 587
+    [[172, 138, 90], [176, 147, 92], [185, 153, 97]],  # 588
+    [[170, 139, 90], [175, 147, 93], [187, 152, 98]],  # 589
+    [[168, 141, 89], [176, 147, 93], [185, 154, 97]],  # 590
+    [[170, 140, 90], [178, 147, 93], [187, 153, 98]],  # 591
+    [[175, 138, 91], [176, 148, 93], [185, 155, 97]],  # 592
+    [[169, 142, 89], [178, 147, 94], [187, 154, 98]],  # 593
+    [[171, 141, 90], [176, 149, 93], [185, 156, 97]],  # 594
+    [[169, 142, 90], [178, 148, 94], [187, 155, 98]],  # 595
+    [[170, 143, 89], [180, 147, 95], [189, 154, 99]],  # 596
+    [[169, 143, 90], [178, 149, 94], [187, 156, 98]],  # 597
+    [[171, 142, 91], [180, 148, 95], [189, 155, 99]],  # 598
+    [[172, 142, 91], [178, 149, 95], [187, 157, 98]],  # 599
+    [[170, 144, 90], [179, 150, 94], [189, 156, 99]],  # 600
+    [[172, 143, 91], [178, 150, 95], [187, 157, 99]],  # 601
+    [[171, 143, 92], [179, 151, 94], [189, 157, 99]],  # 602
+    [[172, 143, 92], [181, 150, 95], [191, 156, 100]],  # 603
+    [[173, 144, 91], [183, 149, 96], [189, 158, 99]],  # 604
+    [[172, 144, 92], [181, 151, 95], [191, 157, 100]],  # 605
+    [[173, 145, 91], [183, 150, 96], [189, 159, 99]],  # 606
+    [[174, 145, 91], [181, 151, 96], [191, 158, 100]],  # 607
+    [[173, 145, 92], [183, 150, 97], [193, 157, 101]],  # 608
+    [[174, 146, 91], [181, 152, 96], [191, 159, 100]],  # 609
+    [[176, 145, 92], [183, 151, 97], [193, 158, 101]],  # 610
+    [[174, 146, 92], [184, 152, 96], [191, 160, 100]],  # 611
+    [[173, 146, 93], [182, 153, 96], [193, 159, 101]],  # 612
+    [[174, 147, 92], [184, 152, 97], [191, 160, 101]],  # 613
+    [[176, 146, 93], [182, 154, 96], [193, 160, 101]],  # 614
+    [[174, 147, 93], [184, 153, 97], [195, 159, 102]],  # 615
+    [[175, 148, 92], [183, 153, 98], [193, 161, 101]],  # 616
+    [[177, 147, 93], [184, 154, 97], [195, 160, 102]],  # 617
+    [[179, 146, 94], [186, 153, 98], [193, 161, 102]],  # 618
+    [[177, 147, 94], [188, 152, 99], [195, 161, 102]],  # 619
+    [[178, 148, 93], [186, 154, 98], [193, 162, 102]],  # 620
+    [[177, 148, 94], [184, 155, 98], [195, 162, 102]],  # 621
+    [[178, 148, 94], [185, 156, 97], [197, 161, 103]],  # 622
+    [[180, 147, 95], [187, 155, 98], [195, 163, 102]],  # 623
+    [[178, 149, 94], [189, 154, 99], [197, 162, 103]],  # 624
+    [[180, 148, 95], [187, 156, 98], [195, 163, 103]],  # 625
+    [[178, 149, 95], [189, 155, 99], [197, 163, 103]],  # 626
+    [[179, 150, 94], [187, 156, 99], [195, 164, 103]],  # 627
+    [[178, 150, 95], [193, 153, 101], [197, 164, 103]],  # 628
+    [[179, 150, 95], [187, 157, 99], [199, 163, 104]],  # 629
+    [[185, 147, 97], [189, 156, 100], [197, 164, 104]],  # 630
+    [[179, 151, 95], [187, 158, 99], [199, 164, 104]],  # 631
+    [[181, 150, 96], [189, 157, 100], [197, 165, 104]],  # 632
+    [[183, 149, 97], [191, 156, 101], [199, 165, 104]],  # 633
+    [[180, 152, 95], [192, 157, 100], [201, 164, 105]],  # 634
+    [[182, 151, 96], [190, 158, 100], [199, 166, 104]],  # 635
+    [[184, 150, 97], [189, 158, 101], [201, 165, 105]],  # 636
+    [[185, 151, 96], [190, 159, 100], [199, 166, 105]],  # 637
+    [[183, 152, 96], [192, 158, 101], [201, 166, 105]],  # 638
+    [[182, 152, 97], [190, 160, 100], [199, 167, 105]],  # 639
+    [[183, 153, 96], [192, 159, 101], [201, 167, 105]],  # 640
+    [[184, 153, 96], [190, 160, 101], [203, 166, 106]],  # 641
+    [[183, 153, 97], [192, 159, 102], [201, 167, 106]],  # 642
+    [[185, 152, 98], [190, 161, 101], [203, 167, 106]],  # 643
+    [[186, 153, 97], [192, 160, 102], [201, 168, 106]],  # 644
+    [[184, 154, 97], [193, 161, 101], [203, 168, 106]],  # 645
+    [[183, 154, 98], [195, 160, 102], [201, 169, 106]],  # 646
+    [[184, 155, 97], [193, 161, 102], [203, 168, 107]],  # 647
+    [[186, 154, 98], [195, 161, 102], [205, 168, 107]],  # 648
+    [[184, 155, 98], [193, 162, 102], [203, 169, 107]],  # 649
+    [[185, 156, 97], [192, 162, 103], [205, 169, 107]],  # 650
+    [[187, 155, 98], [193, 163, 102], [203, 170, 107]],  # 651
+    [[189, 154, 99], [195, 162, 103], [205, 170, 107]],  # 652
+    [[187, 155, 99], [197, 161, 104], [207, 169, 108]],  # 653
+    [[185, 157, 98], [195, 163, 103], [205, 170, 108]],  # 654
+    [[187, 156, 99], [196, 163, 103], [207, 170, 108]],  # 655
+    [[192, 154, 100], [195, 163, 104], [205, 171, 108]],  # 656
+    [[187, 156, 100], [196, 164, 103], [207, 171, 108]],  # 657
+    [[188, 157, 99], [195, 164, 104], [205, 172, 108]],  # 658
+    [[190, 156, 100], [196, 165, 103], [207, 171, 109]],  # 659
+    [[192, 155, 101], [198, 164, 104], [209, 171, 109]],  # 660
+    [[189, 158, 99], [196, 165, 104], [207, 172, 109]],  # 661
+    [[188, 158, 100], [198, 164, 105], [209, 172, 109]],  # 662
+    [[189, 158, 100], [200, 164, 105], [207, 173, 109]],  # 663
+    [[188, 158, 101], [198, 165, 105], [209, 173, 109]],  # 664
+    [[189, 159, 100], [199, 166, 104], [207, 174, 109]],  # 665
+    [[191, 158, 101], [198, 166, 105], [209, 173, 110]],  # 666
+    [[193, 157, 102], [200, 165, 106], [211, 173, 110]],  # 667
+    [[190, 160, 100], [201, 166, 105], [209, 174, 110]],  # 668
+    [[192, 159, 101], [199, 167, 105], [211, 174, 110]],  # 669
+    [[194, 158, 102], [198, 167, 106], [209, 175, 110]],  # 670
+    [[192, 159, 102], [199, 168, 105], [211, 174, 111]],  # 671
+    [[190, 161, 101], [201, 167, 106], [209, 176, 110]],  # 672
+    [[192, 160, 102], [200, 167, 107], [211, 175, 111]],  # 673
+    [[193, 161, 101], [201, 168, 106], [213, 175, 111]],  # 674
+    [[191, 162, 101], [203, 167, 107], [211, 176, 111]],  # 675
+    [[193, 161, 102], [201, 168, 107], [213, 176, 111]],  # 676
+    [[192, 161, 103], [202, 169, 106], [211, 177, 111]],  # 677
+    [[193, 162, 102], [201, 169, 107], [213, 176, 112]],  # 678
+    [[194, 162, 102], [202, 170, 106], [215, 176, 112]],  # 679
+    [[193, 162, 103], [204, 169, 107], [213, 177, 112]],  # 680
+    [[194, 163, 102], [206, 168, 108], [215, 177, 112]],  # 681
+    [[196, 162, 103], [204, 170, 107], [213, 178, 112]],  # 682
+    [[194, 163, 103], [206, 169, 108], [215, 177, 113]],  # 683
+    [[193, 163, 104], [204, 170, 108], [213, 179, 112]],  # 684
+    [[194, 164, 103], [203, 170, 109], [215, 178, 113]],  # 685
+    [[195, 164, 103], [204, 171, 108], [217, 178, 113]],  # 686
+    [[197, 163, 104], [206, 170, 109], [215, 179, 113]],  # 687
+    [[195, 165, 103], [204, 172, 108], [217, 178, 114]],  # 688
+    [[197, 164, 104], [206, 171, 109], [215, 180, 113]],  # 689
+    [[199, 163, 105], [204, 172, 109], [217, 179, 114]],  # 690
+    [[197, 164, 105], [205, 173, 108], [215, 181, 113]],  # 691
+    [[198, 165, 104], [207, 172, 109], [217, 180, 114]],  # 692
+    [[197, 165, 105], [209, 171, 110], [219, 180, 114]],  # 693
+    [[202, 163, 106], [207, 173, 109], [217, 181, 114]],  # 694
+    [[199, 166, 104], [209, 172, 110], [219, 180, 115]],  # 695
+    [[198, 166, 105], [211, 171, 111], [217, 182, 114]],  # 696
+    [[200, 165, 106], [209, 173, 110], [219, 181, 115]],  # 697
+    [[205, 163, 107], [207, 174, 110], [217, 183, 114]],  # 698
+    [[199, 167, 105], [209, 173, 111], [219, 182, 115]],  # 699
+    [[198, 167, 106], [207, 175, 110], [221, 181, 116]],  # 700
+    [[199, 167, 106], [209, 174, 111], [219, 183, 115]],  # 701
+    [[200, 168, 105], [210, 175, 110], [221, 182, 116]],  # 702
+    [[199, 168, 106], [212, 174, 111], [219, 184, 115]],  # 703
+    [[201, 167, 107], [210, 175, 111], [221, 183, 116]],  # 704
+    [[203, 166, 108], [212, 175, 111], [223, 183, 116]],  # 705
+    [[200, 169, 106], [210, 176, 111], [221, 184, 116]],  # 706
+    [[202, 168, 107], [212, 175, 112], [223, 183, 117]],  # 707
+    [[204, 167, 108], [210, 177, 111], [221, 185, 116]],  # 708
+    [[205, 168, 107], [212, 176, 112], [223, 184, 117]],  # 709
+    [[203, 169, 107], [214, 175, 113], [221, 186, 116]],  # 710
+    [[205, 168, 108], [215, 176, 112], [223, 185, 117]],  # 711
+    [[203, 170, 107], [213, 177, 112], [225, 184, 118]],  # 712
+    [[208, 168, 108], [212, 177, 113], [223, 186, 117]],  # 713
+    [[203, 170, 108], [213, 178, 112], [225, 185, 118]],  # 714
+    [[204, 171, 107], [215, 177, 113], [223, 187, 117]],  # 715
+    [[206, 170, 108], [213, 179, 112], [225, 186, 118]],  # 716
+    [[204, 171, 108], [215, 178, 113], [223, 187, 118]],  # 717
+    [[203, 171, 109], [213, 179, 113], [225, 187, 118]],  # 718
+    [[204, 172, 108], [219, 176, 115], [227, 186, 119]],  # 719
+    [[206, 171, 109], [213, 180, 113], [225, 188, 118]],  # 720
+    [[204, 172, 109], [215, 179, 114], [227, 187, 119]],  # 721
+    [[205, 173, 108], [216, 180, 113], [225, 189, 118]],  # 722
+    [[207, 172, 109], [215, 180, 114], [227, 188, 119]],  # 723
+    [[209, 171, 110], [220, 178, 115], [229, 187, 120]],  # 724
+    [[207, 172, 110], [218, 180, 114], [227, 189, 119]],  # 725
+    [[208, 173, 109], [216, 181, 114], [229, 188, 120]],  # 726
+    [[207, 173, 110], [215, 181, 115], [227, 190, 119]],  # 727
+    [[212, 171, 111], [216, 182, 114], [229, 189, 120]],  # 728
+    [[210, 172, 111], [218, 181, 115], [227, 190, 120]],  # 729
+    [[208, 174, 110], [220, 180, 116], [229, 190, 120]],  # 730
+    [[210, 173, 111], [218, 182, 115], [231, 189, 121]],  # 731
+    [[212, 172, 112], [220, 181, 116], [229, 191, 120]],  # 732
+    [[209, 175, 110], [218, 182, 116], [231, 190, 121]],  # 733
+    [[208, 175, 111], [219, 183, 115], [229, 192, 120]],  # 734
+    [[209, 175, 111], [218, 183, 116], [231, 191, 121]],  # 735
+    [[210, 176, 110], [219, 184, 115], [229, 192, 121]],  # 736
+    [[209, 176, 111], [221, 183, 116], [231, 192, 121]],  # 737
+    [[211, 175, 112], [219, 184, 116], [233, 191, 122]],  # 738
+    [[212, 176, 111], [221, 184, 116], [231, 193, 121]],  # 739
+    [[210, 177, 111], [223, 183, 117], [233, 192, 122]],  # 740
+    [[212, 176, 112], [221, 184, 117], [231, 193, 122]],  # 741
+    [[211, 176, 113], [220, 184, 118], [233, 193, 122]],  # 742
+    [[215, 176, 112], [221, 185, 117], [231, 194, 122]],  # 743
+    [[213, 177, 112], [223, 184, 118], [233, 194, 122]],  # 744
+    [[212, 177, 113], [224, 185, 117], [235, 193, 123]],  # 745
+    [[213, 178, 112], [222, 186, 117], [233, 195, 122]],  # 746
+    [[218, 176, 113], [221, 186, 118], [235, 194, 123]],  # 747
+    [[213, 178, 113], [222, 187, 117], [233, 195, 123]],  # 748
+    [[214, 179, 112], [224, 186, 118], [235, 195, 123]],  # 749
+    [[213, 179, 113], [223, 186, 119], [237, 194, 124]],  # 750
+    [[214, 179, 113], [224, 187, 118], [235, 196, 123]],  # 751
+    [[213, 179, 114], [226, 186, 119], [237, 195, 124]],  # 752
+    [[214, 180, 113], [224, 187, 119], [235, 196, 124]],  # 753
+    [[216, 179, 114], [226, 187, 119], [237, 196, 124]],  # 754
+    [[214, 180, 114], [224, 188, 119], [235, 197, 124]],  # 755
+    [[215, 181, 113], [225, 189, 118], [237, 197, 124]],  # 756
+    [[217, 180, 114], [224, 189, 119], [239, 196, 125]],  # 757
+    [[219, 179, 115], [226, 188, 120], [237, 197, 125]],  # 758
+    [[214, 181, 115], [227, 189, 119], [239, 197, 125]],  # 759
+    [[215, 182, 114], [229, 188, 120], [237, 198, 125]],  # 760
+    [[217, 181, 115], [227, 189, 120], [239, 198, 125]],  # 761
+    [[219, 180, 116], [229, 189, 120], [237, 199, 125]],  # 762
+    [[220, 180, 116], [227, 190, 120], [239, 199, 125]],  # 763
+    [[218, 182, 115], [226, 190, 121], [241, 198, 126]],  # 764
+    [[217, 182, 116], [227, 191, 120], [239, 199, 126]],  # 765
+    [[222, 180, 117], [229, 190, 121], [241, 199, 126]],  # 766
+    [[219, 183, 115], [227, 191, 121], [239, 200, 126]],  # 767
+    [[218, 183, 116], [228, 192, 120], [241, 200, 126]],  # 768
+    [[219, 184, 115], [230, 191, 121], [239, 201, 126]],  # 769
+    [[221, 182, 117], [229, 191, 122], [241, 200, 127]],  # 770
+    [[219, 184, 116], [230, 192, 121], [243, 200, 127]],  # 771
+    [[218, 184, 117], [232, 191, 122], [241, 201, 127]],  # 772
+    [[222, 184, 116], [230, 193, 121], [243, 201, 127]],  # 773
+    [[220, 185, 116], [232, 192, 122], [241, 202, 127]],  # 774
+    [[222, 184, 117], [230, 193, 122], [243, 202, 127]],  # 775
+    [[220, 186, 116], [232, 192, 123], [245, 201, 128]],  # 776
+    [[221, 186, 116], [230, 194, 122], [243, 202, 128]],  # 777
+    [[220, 186, 117], [232, 193, 123], [245, 202, 128]],  # 778
+    [[222, 185, 118], [233, 194, 122], [243, 203, 128]],  # 779
+    [[223, 186, 117], [235, 193, 123], [245, 203, 128]],  # 780
+    [[225, 185, 118], [233, 194, 123], [243, 204, 128]],  # 781
+    [[223, 186, 118], [235, 194, 123], [245, 203, 129]],  # 782
+    [[225, 185, 119], [233, 195, 123], [247, 203, 129]],  # 783
+    [[223, 187, 118], [235, 194, 124], [245, 204, 129]],  # 784
+    [[224, 187, 118], [233, 196, 123], [247, 204, 129]],  # 785
+    [[223, 187, 119], [235, 195, 124], [245, 205, 129]],  # 786
+    [[224, 188, 118], [237, 194, 125], [247, 204, 130]],  # 787
+    [[226, 187, 119], [235, 196, 124], [245, 206, 129]],  # 788
+    [[224, 188, 119], [237, 195, 125], [247, 205, 130]],  # 789
+    [[225, 189, 118], [235, 196, 125], [249, 205, 130]],  # 790
+    [[224, 189, 119], [236, 197, 124], [247, 206, 130]],  # 791
+    [[226, 188, 120], [235, 197, 125], [249, 206, 130]],  # 792
+    [[224, 189, 120], [236, 198, 124], [247, 207, 130]],  # 793
+    [[225, 190, 119], [238, 197, 125], [249, 206, 131]],  # 794
+    [[227, 189, 120], [236, 198, 125], [247, 208, 130]],  # 795
+    [[229, 188, 121], [238, 198, 125], [249, 207, 131]],  # 796
+    [[226, 191, 119], [236, 199, 125], [251, 207, 131]],  # 797
+    [[228, 190, 120], [238, 198, 126], [249, 208, 131]],  # 798
+    [[230, 189, 121], [239, 199, 125], [251, 207, 132]],  # 799
+    [[228, 190, 121], [238, 199, 126], [249, 209, 131]],  # 800
+    [[229, 191, 120], [240, 198, 127], [251, 208, 132]],  # 801
+    [[228, 191, 121], [241, 199, 126], [253, 208, 132]],  # 802
+    [[229, 192, 120], [239, 200, 126], [251, 209, 132]],  # 803
+    [[231, 190, 122], [241, 199, 127], [253, 209, 132]],  # 804
+    [[229, 192, 121], [239, 201, 126], [251, 210, 132]],  # 805
+    [[228, 192, 122], [241, 200, 127], [253, 209, 133]],  # 806
+    [[233, 190, 123], [239, 202, 126], [251, 211, 132]],  # 807
+    [[230, 193, 121], [241, 201, 127], [253, 210, 133]],  # 808
+    [[229, 193, 122], [243, 200, 128], [255, 210, 133]],  # 809
+    [[230, 194, 121], [241, 201, 128], [253, 211, 133]],  # 810
+    [[232, 193, 122], [242, 202, 127], [255, 210, 134]],  # 811
+    [[230, 194, 122], [241, 202, 128], [253, 212, 133]],  # 812
+    [[232, 193, 123], [242, 203, 127], [255, 211, 134]],  # 813
+    [[233, 194, 122], [244, 202, 128], [253, 213, 133]],  # 814
+    [[235, 193, 123], [242, 203, 128], [255, 212, 134]],  # 815
+    [[233, 194, 123], [244, 203, 128], [257, 211, 135]],  # 816
+    [[232, 194, 124], [242, 204, 128], [255, 213, 134]],  # 817
+    [[233, 195, 123], [244, 203, 129], [257, 212, 135]],  # 818
+    [[234, 195, 123], [246, 203, 129], [255, 214, 134]],  # 819
+    [[233, 195, 124], [244, 204, 129], [257, 213, 135]],  # 820
+    [[234, 196, 123], [246, 203, 130], [259, 213, 135]],  # 821
+    [[233, 196, 124], [244, 205, 129], [257, 214, 135]],  # 822
+    [[234, 196, 124], [246, 204, 130], [259, 213, 136]],  # 823
+    [[236, 195, 125], [244, 205, 130], [257, 215, 135]],  # 824
+    [[234, 197, 124], [245, 206, 129], [256, 215, 136]],  # 825
+    [[236, 196, 125], [247, 205, 130], [257, 216, 135]],  # 826
+    [[241, 194, 126], [246, 205, 131], [259, 215, 136]],  # 827
+    [[235, 198, 124], [247, 206, 130], [261, 214, 137]],  # 828
+    [[237, 197, 125], [249, 205, 131], [259, 216, 136]],  # 829
+    [[239, 196, 126], [247, 207, 130], [261, 215, 137]],  # 830
+    [[236, 199, 124], [249, 206, 131], [259, 217, 136]],  # 831
+    [[238, 198, 125], [247, 207, 131], [258, 217, 137]],  # 832
+    [[237, 198, 126], [248, 208, 130], [259, 218, 136]],  # 833
+    [[242, 196, 127], [247, 208, 131], [261, 217, 137]],  # 834
+    [[239, 199, 125], [249, 207, 132], [263, 216, 138]],  # 835
+    [[238, 199, 126], [250, 208, 131], [261, 218, 137]],  # 836
+    [[240, 198, 127], [252, 207, 132], [260, 218, 138]],  # 837
+    [[241, 198, 127], [250, 208, 132], [261, 219, 137]],  # 838
+    [[239, 200, 126], [252, 208, 132], [263, 218, 138]],  # 839
+    [[238, 200, 127], [250, 209, 132], [261, 219, 138]],  # 840
+    [[243, 198, 128], [249, 209, 133], [263, 219, 138]],  # 841
+    [[240, 201, 126], [250, 210, 132], [265, 218, 139]],  # 842
+    [[239, 201, 127], [252, 209, 133], [263, 220, 138]],  # 843
+    [[240, 202, 126], [250, 210, 133], [265, 219, 139]],  # 844
+    [[242, 201, 127], [251, 211, 132], [263, 221, 138]],  # 845
+    [[240, 202, 127], [250, 211, 133], [265, 220, 139]],  # 846
+    [[242, 201, 128], [259, 207, 135], [267, 219, 140]],  # 847
+    [[240, 203, 127], [253, 211, 133], [265, 221, 139]],  # 848
+    [[245, 201, 128], [255, 210, 134], [264, 221, 140]],  # 849
+    [[243, 202, 128], [253, 212, 133], [265, 222, 139]],  # 850
+    [[245, 201, 129], [255, 211, 134], [267, 221, 140]],  # 851
+    [[243, 203, 128], [253, 212, 134], [265, 222, 140]],  # 852
+    [[244, 203, 128], [255, 212, 134], [267, 222, 140]],  # 853
+    [[243, 203, 129], [253, 213, 134], [269, 221, 141]],  # 854
+    [[244, 204, 128], [255, 212, 135], [267, 223, 140]],  # 855
+    [[243, 204, 129], [253, 214, 134], [269, 222, 141]],  # 856
+    [[244, 204, 129], [255, 213, 135], [267, 223, 141]],  # 857
+    [[246, 203, 130], [257, 212, 136], [269, 223, 141]],  # 858
+    [[244, 205, 129], [258, 213, 135], [267, 224, 141]],  # 859
+    [[246, 204, 130], [256, 214, 135], [269, 224, 141]],  # 860
+    [[244, 205, 130], [255, 214, 136], [271, 223, 142]],  # 861
+    [[245, 206, 129], [256, 215, 135], [269, 225, 141]],  # 862
+    [[247, 205, 130], [258, 214, 136], [268, 225, 142]],  # 863
+    [[249, 204, 131], [256, 216, 135], [269, 225, 142]],  # 864
+    [[247, 205, 131], [258, 215, 136], [271, 225, 142]],  # 865
+    [[245, 207, 130], [260, 214, 137], [269, 226, 142]],  # 866
+    [[247, 206, 131], [258, 215, 137], [271, 226, 142]],  # 867
+    [[249, 205, 132], [259, 216, 136], [273, 225, 143]],  # 868
+    [[246, 208, 130], [261, 215, 137], [271, 226, 143]],  # 869
+    [[248, 207, 131], [259, 217, 136], [273, 226, 143]],  # 870
+    [[250, 206, 132], [261, 216, 137], [271, 227, 143]],  # 871
+    [[248, 207, 132], [259, 217, 137], [273, 227, 143]],  # 872
+    [[249, 208, 131], [261, 217, 137], [275, 226, 144]],  # 873
+    [[248, 208, 132], [259, 218, 137], [273, 228, 143]],  # 874
+    [[249, 209, 131], [261, 217, 138], [275, 227, 144]],  # 875
+    [[250, 209, 131], [259, 219, 137], [273, 228, 144]],  # 876
+    [[249, 209, 132], [261, 218, 138], [275, 228, 144]],  # 877
+    [[248, 209, 133], [263, 217, 139], [273, 229, 144]],  # 878
+    [[252, 209, 132], [261, 219, 138], [275, 229, 144]],  # 879
+    [[250, 210, 132], [262, 219, 138], [277, 228, 145]],  # 880
+    [[249, 210, 133], [264, 218, 139], [275, 229, 145]],  # 881
+    [[250, 211, 132], [262, 220, 138], [277, 229, 145]],  # 882
+    [[251, 211, 132], [264, 219, 139], [275, 230, 145]],  # 883
+    [[250, 211, 133], [262, 221, 138], [277, 230, 145]],  # 884
+    [[252, 210, 134], [264, 220, 139], [275, 231, 145]],  # 885
+    [[253, 211, 133], [266, 219, 140], [277, 230, 146]],  # 886
+    [[255, 210, 134], [264, 221, 139], [279, 230, 146]],  # 887
+    [[253, 211, 134], [266, 220, 140], [277, 231, 146]],  # 888
+    [[254, 212, 133], [264, 221, 140], [279, 231, 146]],  # 889
+    [[253, 212, 134], [265, 222, 139], [277, 232, 146]],  # 890
+    [[254, 212, 134], [264, 222, 140], [279, 232, 146]],  # 891
+    [[253, 212, 135], [266, 221, 141], [277, 233, 146]],  # 892
+    [[254, 213, 134], [267, 222, 140], [279, 232, 147]],  # 893
+    [[256, 212, 135], [265, 223, 140], [281, 232, 147]],  # 894
+    [[254, 213, 135], [267, 222, 141], [279, 233, 147]],  # 895
+    [[255, 214, 134], [269, 222, 141], [281, 233, 147]],  # 896
+    [[254, 214, 135], [267, 223, 141], [279, 234, 147]],  # 897
+    [[255, 214, 135], [269, 222, 142], [281, 233, 148]],  # 898
+    [[261, 211, 137], [267, 224, 141], [283, 233, 148]],  # 899
+    [[255, 215, 135], [269, 223, 142], [281, 234, 148]],  # 900
+    [[257, 214, 136], [271, 222, 143], [283, 234, 148]],  # 901
+    [[259, 213, 137], [268, 225, 141], [281, 235, 148]],  # 902
+    [[256, 216, 135], [267, 225, 142], [283, 235, 148]],  # 903
+    [[258, 215, 136], [268, 226, 141], [281, 236, 148]],  # 904
+    [[257, 215, 137], [270, 225, 142], [283, 235, 149]],  # 905
+    [[258, 215, 137], [272, 224, 143], [285, 235, 149]],  # 906
+    [[259, 216, 136], [270, 226, 142], [283, 236, 149]],  # 907
+    [[258, 216, 137], [272, 225, 143], [285, 236, 149]],  # 908
+    [[259, 217, 136], [270, 226, 143], [283, 237, 149]],  # 909
+    [[261, 215, 138], [272, 225, 144], [285, 236, 150]],  # 910
+    [[259, 217, 137], [270, 227, 143], [283, 238, 149]],  # 911
+    [[258, 217, 138], [272, 226, 144], [285, 237, 150]],  # 912
+    [[262, 217, 137], [270, 228, 143], [287, 237, 150]],  # 913
+    [[260, 218, 137], [275, 226, 144], [285, 238, 150]],  # 914
+    [[259, 218, 138], [273, 227, 144], [287, 238, 150]],  # 915
+    [[260, 219, 137], [275, 227, 144], [285, 239, 150]],  # 916
+    [[262, 218, 138], [273, 228, 144], [287, 238, 151]],  # 917
+    [[260, 219, 138], [275, 227, 145], [289, 238, 151]],  # 918
+    [[262, 218, 139], [273, 229, 144], [287, 239, 151]],  # 919
+    [[263, 219, 138], [275, 228, 145], [289, 239, 151]],  # 920
+    [[265, 218, 139], [273, 230, 144], [287, 240, 151]],  # 921
+    [[263, 219, 139], [275, 229, 145], [286, 240, 152]],  # 922
+    [[265, 218, 140], [273, 230, 145], [287, 241, 151]],  # 923
+    [[263, 220, 139], [274, 231, 144], [289, 240, 152]],  # 924
+    [[264, 220, 139], [276, 230, 145], [291, 240, 152]],  # 925
+    [[263, 220, 140], [275, 230, 146], [289, 241, 152]],  # 926
+    [[264, 221, 139], [276, 231, 145], [291, 240, 153]],  # 927
+    [[263, 221, 140], [278, 230, 146], [289, 242, 152]],  # 928
+    [[264, 221, 140], [276, 231, 146], [288, 242, 153]],  # 929
+    [[265, 222, 139], [278, 231, 146], [289, 243, 152]],  # 930
+    [[264, 222, 140], [276, 232, 146], [291, 242, 153]],  # 931
+    [[266, 221, 141], [278, 231, 147], [293, 242, 153]],  # 932
+    [[267, 221, 141], [276, 233, 146], [291, 243, 153]],  # 933
+    [[265, 223, 140], [278, 232, 147], [293, 242, 154]],  # 934
+    [[267, 222, 141], [280, 231, 148], [291, 244, 153]],  # 935
+    [[265, 223, 141], [278, 233, 147], [293, 243, 154]],  # 936
+    [[266, 224, 140], [279, 233, 147], [291, 245, 153]],  # 937
+    [[268, 223, 141], [278, 233, 148], [293, 244, 154]],  # 938
+    [[270, 222, 142], [279, 234, 147], [295, 243, 155]],  # 939
+    [[269, 222, 143], [281, 233, 148], [293, 245, 154]],  # 940
+    [[269, 224, 141], [279, 235, 147], [292, 245, 155]],  # 941
+    [[268, 224, 142], [281, 234, 148], [293, 246, 154]],  # 942
+    [[269, 225, 141], [283, 233, 149], [295, 245, 155]],  # 943
+    [[275, 221, 144], [285, 232, 150], [297, 245, 155]],  # 944
+    [[269, 225, 142], [282, 235, 148], [295, 246, 155]],  # 945
+    [[268, 225, 143], [281, 235, 149], [297, 245, 156]],  # 946
+    [[269, 226, 142], [282, 236, 148], [295, 247, 155]],  # 947
+    [[270, 226, 142], [281, 236, 149], [294, 247, 156]],  # 948
+    [[269, 226, 143], [282, 236, 149], [295, 248, 155]],  # 949
+    [[270, 227, 142], [284, 236, 149], [297, 247, 156]],  # 950
+    [[272, 226, 143], [282, 237, 149], [299, 246, 157]],  # 951
+    [[270, 227, 143], [284, 236, 150], [297, 248, 156]],  # 952
+    [[269, 227, 144], [282, 238, 149], [299, 247, 157]],  # 953
+    [[270, 228, 143], [284, 237, 150], [297, 249, 156]],  # 954
+    [[275, 226, 144], [286, 236, 151], [299, 248, 157]],  # 955
+    [[273, 227, 144], [284, 238, 150], [297, 249, 157]],  # 956
+    [[275, 226, 145], [286, 237, 151], [299, 249, 157]],  # 957
+    [[273, 228, 144], [287, 237, 151], [301, 248, 158]],  # 958
+    [[275, 227, 145], [285, 239, 150], [299, 250, 157]],  # 959
+    [[273, 228, 145], [284, 239, 151], [301, 249, 158]],  # 960
+    [[274, 229, 144], [285, 240, 150], [299, 251, 157]],  # 961
+    [[273, 229, 145], [287, 239, 151], [301, 250, 158]],  # 962
+    [[278, 227, 146], [289, 238, 152], [299, 251, 158]],  # 963
+    [[276, 228, 146], [287, 240, 151], [301, 251, 158]],  # 964
+    [[274, 230, 145], [289, 239, 152], [303, 250, 159]],  # 965
+    [[276, 229, 146], [287, 240, 152], [301, 252, 158]],  # 966
+    [[274, 230, 146], [288, 241, 151], [300, 252, 159]],  # 967
+    [[275, 231, 145], [287, 241, 152], [301, 252, 159]],  # 968
+    [[277, 230, 146], [289, 240, 153], [303, 252, 159]],  # 969
+    [[275, 231, 146], [290, 241, 152], [305, 251, 160]],  # 970
+    [[276, 232, 145], [288, 242, 152], [303, 253, 159]],  # 971
+    [[275, 232, 146], [290, 241, 153], [305, 252, 160]],  # 972
+    [[277, 231, 147], [292, 241, 153], [303, 254, 159]],  # 973
+    [[282, 229, 148], [290, 242, 153], [305, 253, 160]],  # 974
+    [[276, 233, 146], [292, 241, 154], [303, 254, 160]],  # 975
+    [[278, 232, 147], [290, 243, 153], [305, 254, 160]],  # 976
+    [[280, 231, 148], [292, 242, 154], [307, 253, 161]],  # 977
+    [[281, 232, 147], [291, 242, 155], [305, 255, 160]],  # 978
+    [[279, 233, 147], [291, 244, 153], [304, 255, 161]],  # 979
+    [[278, 233, 148], [290, 244, 154], [305, 255, 161]],  # 980
+    [[279, 234, 147], [291, 245, 153], [307, 255, 161]],  # 981
+    [[280, 234, 147], [293, 244, 154], [305, 256, 161]],  # 982
+    [[279, 234, 148], [295, 243, 155], [307, 256, 161]],  # 983
+    [[280, 235, 147], [293, 245, 154], [309, 255, 162]],  # 984
+    [[282, 234, 148], [295, 244, 155], [307, 257, 161]],  # 985
+    [[280, 235, 148], [293, 245, 155], [306, 257, 162]],  # 986
+    [[279, 235, 149], [295, 245, 155], [307, 257, 162]],  # 987
+    [[280, 236, 148], [293, 246, 155], [309, 257, 162]],  # 988
+    [[282, 235, 149], [292, 246, 156], [307, 258, 162]],  # 989
+    [[283, 235, 149], [293, 247, 155], [309, 258, 162]],  # 990
+    [[281, 237, 148], [295, 246, 156], [311, 257, 163]],  # 991
+    [[283, 236, 149], [297, 245, 157], [309, 258, 163]],  # 992
+    [[285, 235, 150], [298, 246, 156], [311, 258, 163]],  # 993
+    [[283, 236, 150], [296, 247, 156], [309, 259, 163]],  # 994
+    [[284, 237, 149], [298, 246, 157], [311, 259, 163]],  # 995
+    [[283, 237, 150], [296, 248, 156], [313, 258, 164]],  # 996
+    [[288, 235, 151], [298, 247, 157], [311, 259, 164]],  # 997
+    [[283, 237, 151], [296, 249, 156], [313, 259, 164]],  # 998
+    [[284, 238, 150], [298, 248, 157], [311, 260, 164]],  # 999
+    [[283, 238, 151], [296, 249, 157], [313, 260, 164]],  # 1000
+]
@@ -0,0 +1,822 @@
+"""
+NumPy implementations of the gorpho operations. Only meant for internal use.
+
+The functions mirror the C bindings in _thin.py: they write the result into a
+preallocated output volume and follow the same conventions as the CUDA code.
+A structuring element of size n along an axis covers the offsets
+``-(n // 2), ..., n - 1 - n // 2`` and is not reflected for dilations.
+Voxels outside the volume are ignored.
+"""
+import concurrent.futures
+import itertools
+import os
+import threading
+import numpy as np
+
+from . import _instrument
+from . import _thin
+
+# Must match the types handled by typeDispatch in pygorpho.cuh, plus float16,
+# which CudaBackend maps to the other types
+SUPPORTED_TYPES = frozenset(np.dtype(c).num for c in '?bBhHiIlLqQefd')
+
+
+def check_type(dtype):
+    """
+    Raise ValueError if dtype is not supported.
+
+    Parameters
+    ----------
+    dtype
+        numpy.dtype to check.
+
+    Raises
+    ------
+    ValueError
+        If dtype is not one of the types supported by the C bindings.
+    """
+    if dtype.num not in SUPPORTED_TYPES:
+        raise ValueError('invalid type')
+
+
+def identity(dtype, op):
+    """
+    Returns the identity element for dilation or erosion.
+
+    Parameters
+    ----------
+    dtype
+        numpy.dtype of the volume.
+    op
+        Either _thin.DILATE or _thin.ERODE.
+
+    Returns
+    -------
+    numpy scalar
+        Smallest value of dtype for dilation and largest value for erosion.
+        For floating point types these are -inf and inf, respectively.
+    """
+    if dtype == np.bool_:
+        val = op != _thin.DILATE
+    elif np.issubdtype(dtype, np.floating):
+        val = -np.inf if op == _thin.DILATE else np.inf
+    else:
+        info = np.iinfo(dtype)
+        val = info.min if op == _thin.DILATE else info.max
+    return dtype.type(val)
+
+
+def shifted_slices(shape, offset):
+    """
+    Returns slices pairing voxels with their neighbor at a given offset.
+
+    Parameters
+    ----------
+    shape
+        Shape of the volume.
+    offset
+        Integer offset for each axis.
+
+    Returns
+    -------
+    (tuple, tuple)
+        Slices (dst, src) such that ``vol[src]`` holds the neighbors of the
+        voxels in ``vol[dst]``. Voxels with a neighbor outside the volume are
+        left out.
+    """
+    dst = tuple(slice(max(0, -o), max(0, n - max(0, o)))
+                for n, o in zip(shape, offset))
+    src = tuple(slice(max(0, o), max(0, n - max(0, -o)))
+                for n, o in zip(shape, offset))
+    return dst, src
+
+
+def strel_offsets(strel_shape):
+    """
+    Returns the offsets covered by each entry of a structuring element.
+
+    Parameters
+    ----------
+    strel_shape
+        Shape of the structuring element.
+
+    Returns
+    -------
+    numpy.array
+        Array of shape ``strel_shape + (ndim,)`` with the offset of each entry.
+    """
+    idx = np.indices(strel_shape)
+    center = np.array(strel_shape) // 2
+    return np.moveaxis(idx, 0, -1) - center
+
+
+def offsets_halo(offsets):
+    """
+    Returns the border needed around a block to apply a set of offsets.
+
+    Parameters
+    ----------
+    offsets
+        Array with one integer offset per row.
+
+    Returns
+    -------
+    (numpy.array, numpy.array)
+        Number of voxels needed before and after the block along each axis.
+    """
+    if len(offsets) == 0:
+        zeros = np.zeros(offsets.shape[1], dtype=int)
+        return zeros, zeros
+    before = np.maximum(0, -offsets.min(axis=0))
+    after = np.maximum(0, offsets.max(axis=0))
+    return before, after
+
+
+def within(offsets, shape):
+    """
+    Returns which offsets connect two voxels of a volume.
+
+    Passes which ignore voxels outside the volume give the same result
+    without the other offsets.
+
+    Parameters
+    ----------
+    offsets
+        Array with one integer offset per row.
+    shape
+        Shape of the volume.
+
+    Returns
+    -------
+    numpy.array
+        Boolean array which is True for offsets smaller than shape along
+        every axis.
+    """
+    return np.all(np.abs(offsets) < np.asarray(shape), axis=-1)
+
+
+def clip_line(step, length, shape):
+    """
+    Returns the length of the part of a line segment which connects voxels
+    of a volume.
+
+    The line segment covers the offsets ``k * step`` for
+    ``k = -(length // 2), ..., length - 1 - length // 2``. Only the offsets
+    with ``|k| <= K`` fit in the volume, where K is the largest value with
+    ``K * |step| < shape`` along every axis. These are again a line segment
+    of the same form.
+    """
+    step = np.abs(np.asarray(step))
+    nonzero = step > 0
+    if length <= 1 or not nonzero.any():
+        return length
+    k = int(np.min((np.asarray(shape)[nonzero] - 1) // step[nonzero]))
+    return min(length, 2 * k + 1)
+
+
+def offsets_pass(offsets, op, weights=None):
+    """
+    Returns a pass which dilates or erodes with a set of offsets.
+
+    One vectorized pass is made over the block for each offset. With
+    weights, only voxels inside the volume are combined, since the weight
+    added to the identity outside the volume could otherwise give any value.
+    Without weights, voxels outside the volume take part, which lets
+    consecutive passes act as one with the Minkowski sum of their offsets.
+
+    Parameters
+    ----------
+    offsets
+        Array with one integer offset per row.
+    op
+        Either _thin.DILATE or _thin.ERODE.
+    weights
+        Values of a general structuring element for each offset. If None,
+        the structuring element is flat.
+
+    Returns
+    -------
+    tuple
+        Pass for run_passes.
+    """
+    reduce = np.maximum if op == _thin.DILATE else np.minimum
+    combine = add if op == _thin.DILATE else subtract
+
+    def func(out, f, inner):
+        out[...] = identity(f.dtype, op)
+        tmp = None
+        if weights is not None:
+            out = out[inner]
+            f = f[inner]
+            tmp = np.empty_like(f)
+        for i, offset in enumerate(offsets):
+            dst, src = shifted_slices(f.shape, offset)
+            if weights is None:
+                reduce(out[dst], f[src], out=out[dst])
+            else:
+                combine(f[src], weights[i], out=tmp[dst])
+                reduce(out[dst], tmp[dst], out=out[dst])
+
+    before, after = offsets_halo(offsets)
+    return (op, func, before, after)
+
+
+def morph_ops(op):
+    """
+    Returns the dilations and erosions an operation is made of.
+
+    Raises
+    ------
+    ValueError
+        If op is not one of the operation codes in _thin.
+    """
+    if op == _thin.DILATE or op == _thin.ERODE:
+        return [op]
+    elif op == _thin.OPEN or op == _thin.TOPHAT:
+        return [_thin.ERODE, _thin.DILATE]
+    elif op == _thin.CLOSE or op == _thin.BOTHAT:
+        return [_thin.DILATE, _thin.ERODE]
+    else:
+        raise ValueError('invalid morhology operation code')
+
+
+def run_passes(res, vol, op, passes, block_size, reset=True):
+    """
+    Compute an operation as a sequence of dilations and erosions.
+
+    The passes are applied one after the other, and voxels outside the volume
+    are ignored by each of them. For the top-hat and bot-hat operations the
+    difference to the input is taken at the end. The volume is processed in
+    blocks.
+
+    Parameters
+    ----------
+    res
+        Output volume. Must have same shape and dtype as vol. May be vol.
+    vol
+        Input volume.
+    op
+        Operation code from _thin.
+    passes
+        List of (pass_op, func, before, after) tuples. ``func(out, f, inner)``
+        must write the dilation (if pass_op is _thin.DILATE) or erosion of f
+        into out and may overwrite f. inner is a tuple of slices giving the
+        part of f inside the volume. before and after give the number of
+        voxels needed before and after each voxel along each axis.
+    block_size
+        Maximum size of the blocks.
+    reset
+        If False, voxels outside the volume are only ignored when switching
+        between dilation and erosion. Consecutive dilations (erosions) then
+        act as one dilation (erosion) with the Minkowski sum of their
+        structuring elements.
+    """
+    ndim = vol.ndim
+    halo_before = np.zeros(ndim, dtype=int)
+    halo_after = np.zeros(ndim, dtype=int)
+    reach_before = np.zeros(ndim, dtype=int)
+    reach_after = np.zeros(ndim, dtype=int)
+    for _, _, before, after in passes:
+        halo_before += np.broadcast_to(before, ndim)
+        halo_after += np.broadcast_to(after, ndim)
+        reach_before = np.maximum(reach_before, before)
+        reach_after = np.maximum(reach_after, after)
+
+    limit = None
+    if reset:
+        # Voxels outside the volume hold the identity before each pass, so
+        # the buffers only need to cover the volume and what one pass reaches
+        # beyond it
+        shape = np.array(vol.shape)
+        halo_before = np.minimum(halo_before, shape - 1 + reach_before)
+        halo_after = np.minimum(halo_after, shape - 1 + reach_after)
+        limit = (reach_before, reach_after)
+
+    if not passes:
+        res[...] = 0 if op == _thin.TOPHAT or op == _thin.BOTHAT else vol
+        return
+    keep_input = op == _thin.TOPHAT or op == _thin.BOTHAT
+
+    def func(buf, inner, center):
+        cur = buf
+        spare = None
+        for i, (pass_op, pass_func, _, _) in enumerate(passes):
+            if i > 0 and (reset or pass_op != passes[i - 1][0]):
+                reset_outside(cur, inner, identity(vol.dtype, pass_op))
+            out = spare if spare is not None else np.empty_like(cur)
+            if keep_input and cur is buf:
+                pass_func(out, cur.copy(), inner)
+                spare = None
+            else:
+                pass_func(out, cur, inner)
+                spare = cur
+            cur = out
+        if op == _thin.TOPHAT:
+            subtract(buf[center], cur[center], out=cur[center])
+        elif op == _thin.BOTHAT:
+            subtract(cur[center], buf[center], out=cur[center])
+        return cur
+
+    fill = identity(vol.dtype, passes[0][0])
+    process_blocks(res, vol, halo_before, halo_after, block_size, fill, func,
+                   limit)
+
+
+def flat_morph_op(res, vol, strel, op, block_size):
+    """
+    Morphological operation with flat structuring element.
+
+    Parameters
+    ----------
+    res
+        Output volume. Must have same shape and dtype as vol. May be vol.
+    vol
+        Input volume.
+    strel
+        Boolean structuring element with same number of dimensions as vol.
+    op
+        Operation to perform. Must be one of the operation codes in _thin.
+    block_size
+        Maximum size of the blocks the volume is processed in.
+
+    Raises
+    ------
+    ValueError
+        If vol has an unsupported type or op is invalid.
+    """
+    check_type(vol.dtype)
+    offsets = strel_offsets(strel.shape)[strel]
+    offsets = offsets[within(offsets, vol.shape)]
+    passes = [offsets_pass(offsets, o) for o in morph_ops(op)]
+    run_passes(res, vol, op, passes, block_size)
+
+
+def gen_morph_op(res, vol, strel, op, block_size):
+    """
+    Morphological operation with general (grayscale) structuring element.
+
+    Parameters
+    ----------
+    res
+        Output volume. Must have same shape and dtype as vol. May be vol.
+    vol
+        Input volume.
+    strel
+        Structuring element with same number of dimensions and dtype as vol.
+    op
+        Operation to perform. Must be one of the operation codes in _thin.
+    block_size
+        Maximum size of the blocks the volume is processed in.
+
+    Raises
+    ------
+    ValueError
+        If vol has an unsupported type or op is invalid.
+    """
+    offsets = strel_offsets(strel.shape).reshape(-1, strel.ndim)
+    gen_offsets_morph_op(res, vol, offsets, strel.ravel(), op, block_size)
+
+
+def gen_offsets_morph_op(res, vol, offsets, weights, op, block_size):
+    """
+    Morphological operation with general structuring element given as a list
+    of offsets and weights.
+
+    Parameters
+    ----------
+    res
+        Output volume. Must have same shape and dtype as vol. May be vol.
+    vol
+        Input volume.
+    offsets
+        Array with one integer offset per row.
+    weights
+        Array with the weight of each offset, with same dtype as vol.
+    op
+        Operation to perform. Must be one of the operation codes in _thin.
+    block_size
+        Maximum size of the blocks the volume is processed in.
+
+    Raises
+    ------
+    ValueError
+        If vol has an unsupported type or op is invalid.
+    """
+    check_type(vol.dtype)
+    keep = within(offsets, vol.shape)
+    offsets, weights = offsets[keep], weights[keep]
+    passes = [offsets_pass(offsets, o, weights) for o in morph_ops(op)]
+    run_passes(res, vol, op, passes, block_size)
+
+
+def gen_separable_morph_op(res, vol, profiles, op, block_size):
+    """
+    Morphological operation with general structuring element which is the
+    sum of a 1D profile along each axis.
+
+    Each dilation and erosion is done as one pass for each profile, which
+    gives the same result as with the full structuring element, since each
+    profile covers offset 0.
+
+    Parameters
+    ----------
+    res
+        Output volume. Must have same shape and dtype as vol. May be vol.
+    vol
+        Input volume.
+    profiles
+        Sequence of 1D arrays with same dtype as vol, one for each of the
+        last axes of vol.
+    op
+        Operation to perform. Must be one of the operation codes in _thin.
+    block_size
+        Maximum size of the blocks the volume is processed in.
+
+    Raises
+    ------
+    ValueError
+        If vol has an unsupported type or op is invalid.
+    """
+    check_type(vol.dtype)
+    first = vol.ndim - len(profiles)
+    parts = []
+    for axis, profile in enumerate(profiles, first):
+        if len(profile) == 1 and profile[0] == 0:
+            continue
+        offsets = np.zeros((len(profile), vol.ndim), dtype=int)
+        offsets[:, axis] = np.arange(len(profile)) - len(profile) // 2
+        keep = within(offsets, vol.shape)
+        parts.append((offsets[keep], profile[keep]))
+    passes = [offsets_pass(offsets, o, profile) for o in morph_ops(op)
+              for offsets, profile in parts]
+    run_passes(res, vol, op, passes, block_size)
+
+
+def flat_sum_morph_op(res, vol, line_steps, line_lens, strels, op,
+                      block_size):
+    """
+    Morphological operation with the Minkowski sum of flat line segments and
+    small flat structuring elements.
+
+    Gives the same result as flat_morph_op with the summed structuring
+    element, since voxels outside the volume are only ignored once for each
+    dilation and erosion.
+
+    Parameters
+    ----------
+    res
+        Output volume. Must have same shape and dtype as vol. May be vol.
+    vol
+        Input volume.
+    line_steps
+        Array with one integer step vector per row.
+    line_lens
+        Array with the length of each line segment.
+    strels
+        Sequence of boolean structuring elements.
+    op
+        Operation to perform. Must be one of the operation codes in _thin.
+    block_size
+        Maximum size of the blocks the volume is processed in.
+
+    Raises
+    ------
+    ValueError
+        If vol has an unsupported type or op is invalid.
+    """
+    check_type(vol.dtype)
+    passes = []
+    for o in morph_ops(op):
+        passes += [line_pass(step, length, o)
+                   for step, length in zip(line_steps, line_lens)
+                   if length > 1]
+        passes += [offsets_pass(strel_offsets(s.shape)[s], o) for s in strels]
+    run_passes(res, vol, op, passes, block_size, reset=False)
+
+
+def add(a, b, out):
+    """Computes a + b in the type of out, wrapping around like C++ does."""
+    return np.add(a, b, out=out)
+
+
+def subtract(a, b, out):
+    """Computes a - b in the type of out, wrapping around like C++ does."""
+    if out.dtype == np.bool_:
+        # Matches the conversion of (int)a - (int)b back to bool
+        return np.not_equal(a, b, out=out)
+    return np.subtract(a, b, out=out)
+
+
+def num_threads():
+    """
+    Returns the number of worker threads used for block processing.
+
+    Uses the PYGORPHO_NUM_THREADS environment variable if it is set and
+    otherwise the number of CPUs.
+    """
+    env = os.getenv('PYGORPHO_NUM_THREADS')
+    if env is not None:
+        return max(1, int(env))
+    return os.cpu_count() or 1
+
+
+def line_offsets(step, length):
+    """
+    Returns the range of offsets covered by a line segment.
+
+    Parameters
+    ----------
+    step
+        Integer step vector.
+    length
+        Number of steps.
+
+    Returns
+    -------
+    (numpy.array, numpy.array)
+        Smallest and largest offset along each axis. The line segment covers
+        the offsets ``(k - length // 2) * step`` for ``k = 0, ..., length-1``.
+    """
+    step = np.asarray(step)
+    first = -(length // 2) * step
+    last = (length - 1 - length // 2) * step
+    return np.minimum(first, last), np.maximum(first, last)
+
+
+def split_blocks(shape, block_size, halo_before, halo_after, min_blocks):
+    """
+    Returns the blocks a volume is processed in.
+
+    Starts from block_size and halves the block along its longest axis until
+    there are at least min_blocks blocks, or blocks would become thinner than
+    their halo.
+
+    Returns
+    -------
+    list
+        List of tuples of slices, one for each block. The blocks are ordered
+        with the first axis varying slowest.
+    """
+    block = [max(1, min(int(b), n)) for b, n in zip(block_size, shape)]
+    count = lambda: np.prod([-(-n // b) for n, b in zip(shape, block)])
+    while count() < min_blocks:
+        axis = int(np.argmax(block))
+        if block[axis] // 2 < max(8, halo_before[axis] + halo_after[axis]):
+            break
+        block[axis] = -(-block[axis] // 2)
+    starts = itertools.product(*[range(0, n, b) for n, b in zip(shape, block)])
+    return [tuple(slice(s, min(s + b, n)) for s, b, n in zip(st, block, shape))
+            for st in starts]
+
+
+def process_blocks(res, vol, halo_before, halo_after, block_size, fill, func,
+                   limit=None):
+    """
+    Apply a function to overlapping blocks of a volume on a thread pool.
+
+    Each block is copied into a buffer extended by the halo, where voxels
+    outside the volume are set to fill. The function is called as
+    ``func(buf, inner, center)``, where inner and center are tuples of slices
+    giving the part of buf inside the volume and the block itself. It must
+    return an array of the same shape as buf, whose center is written to
+    res. The blocks run on the pool from ``block_pool``, and NumPy releases
+    the GIL while processing, so they run in parallel.
+
+    If limit is given as a pair (before, after), the buffers are not
+    extended further than this many voxels beyond the volume along each
+    axis.
+
+    If res shares memory with vol, the blocks are processed in slabs along
+    the first axis which are at least as thick as the halo. A slab is only
+    written once the input for the next slab has been read, so the operation
+    is done in place with memory for two slabs.
+    """
+    threads = num_threads()
+    inplace = np.may_share_memory(res, vol)
+    if inplace:
+        block_size = list(block_size)
+        block_size[0] = max(block_size[0], halo_before[0], halo_after[0], 1)
+    blocks = split_blocks(vol.shape, block_size, halo_before, halo_after,
+                          2 * threads if threads > 1 else 1)
+
+    def extent(block):
+        lo = [b.start - h for b, h in zip(block, halo_before)]
+        hi = [b.stop + h for b, h in zip(block, halo_after)]
+        if limit is not None:
+            lo = [max(l, -r) for l, r in zip(lo, limit[0])]
+            hi = [min(h, n + r) for h, n, r in zip(hi, vol.shape, limit[1])]
+        return lo, hi
+
+    # Each block has a buffer and an output for the passes
+    buf_bytes = sum(np.prod([h - l for l, h in zip(*extent(block))])
+                    for block in blocks) * vol.itemsize
+    _instrument.count(2 * buf_bytes, buf_bytes + res.nbytes, len(blocks))
+
+    def load(block):
+        lo, hi = extent(block)
+        buf = np.empty([h - l for l, h in zip(lo, hi)], dtype=vol.dtype)
+        inner = tuple(slice(max(0, -l), min(h, n) - l)
+                      for l, h, n in zip(lo, hi, vol.shape))
+        src = tuple(slice(max(0, l), min(h, n))
+                    for l, h, n in zip(lo, hi, vol.shape))
+        center = tuple(slice(b.start - l, b.stop - l)
+                       for l, b in zip(lo, block))
+        reset_outside(buf, inner, fill)
+        buf[inner] = vol[src]
+        return buf, inner, center
+
+    def compute(buf, inner, center):
+        return func(buf, inner, center)[center]
+
+    def run(block):
+        res[block] = compute(*load(block))
+
+    # Blocks of a call made from a block worker run serially, as waiting for
+    # the shared pool from one of its own threads could deadlock
+    executor = None
+    if threads > 1 and len(blocks) > 1 and not getattr(_worker, 'active',
+                                                       False):
+        executor = block_pool()
+    if not inplace:
+        if executor is not None:
+            # Consume the iterator so exceptions are raised here
+            list(executor.map(run, blocks))
+        else:
+            for block in blocks:
+                run(block)
+        return
+
+    slabs = itertools.groupby(blocks, key=lambda b: b[0].start)
+    pending = []
+    for _, slab in slabs:
+        slab = list(slab)
+        loaded = [load(block) for block in slab]
+        for block, val in pending:
+            res[block] = val
+        if executor is not None:
+            results = list(executor.map(lambda a: compute(*a), loaded))
+        else:
+            results = [compute(*l) for l in loaded]
+        pending = list(zip(slab, results))
+    for block, val in pending:
+        res[block] = val
+
+
+_block_pool = None
+_block_pool_lock = threading.Lock()
+_worker = threading.local()
+
+
+def _init_worker():
+    _worker.active = True
+
+
+def block_pool():
+    """
+    Returns the thread pool shared by all calls to ``process_blocks``.
+
+    The pool is created with ``num_threads()`` threads when it is first
+    needed, so concurrent calls, e.g. from the ``aio`` workers, do not use
+    more threads for blocks than there are CPUs.
+    """
+    global _block_pool
+    with _block_pool_lock:
+        if _block_pool is None:
+            _block_pool = concurrent.futures.ThreadPoolExecutor(
+                num_threads(), thread_name_prefix='pygorpho-blocks',
+                initializer=_init_worker)
+        return _block_pool
+
+
+def reset_outside(buf, inner, fill):
+    """Set all voxels of buf outside the slices in inner to fill."""
+    for axis, s in enumerate(inner):
+        before = (slice(None),) * axis + (slice(0, s.start),)
+        after = (slice(None),) * axis + (slice(s.stop, None),)
+        buf[before] = fill
+        buf[after] = fill
+
+
+def linear_pass(out, f, step, length, op):
+    """
+    Dilation or erosion with one flat line segment.
+
+    Uses the van Herk/Gil-Werman algorithm for long line segments. Each line
+    through the volume is split into runs of length voxels. The prefix
+    max/min of each run is stored in a scratch array and the suffix max/min
+    is computed in place in f, so the result for a window is given by
+    combining one voxel from each. The runs are aligned to planes along an
+    axis where the step is nonzero, so each scan is a loop over planes. Short
+    line segments are done directly with one pass per offset.
+
+    Parameters
+    ----------
+    out
+        Output array.
+    f
+        Input array. Overwritten.
+    step
+        Integer step vector.
+    length
+        Number of steps. Must be at least 1.
+    op
+        Either _thin.DILATE or _thin.ERODE.
+
+    Notes
+    -----
+    Voxels where the line segment reaches outside of f are left with
+    unspecified values in out.
+    """
+    reduce = np.maximum if op == _thin.DILATE else np.minimum
+    step = np.asarray(step)
+    first = -(length // 2)
+    if length <= 4 or not step.any():
+        out[...] = f
+        for k in range(first, first + length):
+            if k != 0:
+                dst, src = shifted_slices(f.shape, k * step)
+                reduce(out[dst], f[src], out=out[dst])
+        return
+
+    # Drive the scans along the nonzero axis with fewest planes
+    nonzero = np.flatnonzero(step)
+    axis = nonzero[np.argmin([f.shape[i] for i in nonzero])]
+    if step[axis] < 0:
+        step = -step
+        first = -(length - 1 + first)
+    m = step[axis]
+    n = f.shape[axis]
+    in_plane = np.delete(step, axis)
+    plane = lambda arr, i: arr[(slice(None),) * axis + (i,)]
+    plane_shape = plane(f, 0).shape
+    prev_dst, prev_src = shifted_slices(plane_shape, -in_plane)
+    next_dst, next_src = shifted_slices(plane_shape, in_plane)
+
+    # Prefix max/min from the start of each run
+    g = f.copy()
+    for i in range(m, n):
+        if (i // m) % length != 0:
+            cur = plane(g, i)
+            reduce(cur[prev_dst], plane(g, i - m)[prev_src],
+                   out=cur[prev_dst])
+    # Suffix max/min to the end of each run
+    for i in range(n - 1 - m, -1, -1):
+        if ((i + m) // m) % length != 0:
+            cur = plane(f, i)
+            reduce(cur[next_dst], plane(f, i + m)[next_src],
+                   out=cur[next_dst])
+
+    # Every window covers the end of one run and the start of the next
+    out[...] = identity(f.dtype, op)
+    dst, src = shifted_slices(f.shape, first * step)
+    out[dst] = f[src]
+    dst, src = shifted_slices(f.shape, (first + length - 1) * step)
+    reduce(out[dst], g[src], out=out[dst])
+
+
+def line_pass(step, length, op):
+    """Returns a pass which dilates or erodes with a line segment."""
+    def func(out, f, inner):
+        linear_pass(out, f, step, length, op)
+
+    before, after = line_offsets(step, length)
+    return (op, func, -before, after)
+
+
+def flat_linear_morph_op(res, vol, line_steps, line_lens, op, block_size):
+    """
+    Morphological operation with a sequence of flat line segments.
+
+    The line segments are applied one after the other, like separate calls
+    to the CUDA implementation. For operations made of a dilation and an
+    erosion, all line segments are applied for the first before the second.
+    The volume is split into blocks, which are processed in parallel, and
+    the intermediate results never leave the blocks.
+
+    Parameters
+    ----------
+    res
+        Output volume. Must have same shape and dtype as vol. May be vol.
+    vol
+        Input volume.
+    line_steps
+        Array with one integer step vector per row. The step vectors must have
+        one coordinate for each axis of vol.
+    line_lens
+        Array with the length of each line segment.
+    op
+        Operation to perform. Must be one of the operation codes in _thin.
+    block_size
+        Maximum size of the blocks.
+
+    Raises
+    ------
+    ValueError
+        If vol has an unsupported type or op is invalid.
+    """
+    check_type(vol.dtype)
+    line_lens = [clip_line(step, length, vol.shape)
+                 for step, length in zip(line_steps, line_lens)]
+    passes = [line_pass(step, length, o) for o in morph_ops(op)
+              for step, length in zip(line_steps, line_lens) if length > 0]
+    run_passes(res, vol, op, passes, block_size)
@@ -0,0 +1,291 @@
+"""
+Decomposition of flat structuring elements. Only meant for internal use.
+
+A structuring element is decomposed into a Minkowski sum of line segments
+and small crosses. Dilating (eroding) with each part in turn then gives the
+same result as dilating (eroding) with the whole structuring element, if
+voxels outside the volume are only ignored at the end.
+
+Structuring elements are handled as boolean arrays of offsets, where the
+offset of an entry is its index minus ``shape // 2``, as for the CUDA code.
+"""
+import functools
+import itertools
+import numpy as np
+
+from . import _cpu
+
+#: Directions of the line segments that are tried
+DIRECTIONS = np.array([
+    [1, 0, 0], [0, 1, 0], [0, 0, 1],
+    [1, 1, 0], [1, -1, 0], [1, 0, 1], [1, 0, -1], [0, 1, 1], [0, 1, -1],
+    [1, 1, 1], [1, 1, -1], [1, -1, 1], [1, -1, -1],
+])
+
+#: Crosses in each plane and in 3D. Needed for diamonds and octahedra.
+CROSSES = [
+    np.array([[0, 0, 0], [-1, 0, 0], [1, 0, 0], [0, -1, 0], [0, 1, 0]]),
+    np.array([[0, 0, 0], [-1, 0, 0], [1, 0, 0], [0, 0, -1], [0, 0, 1]]),
+    np.array([[0, 0, 0], [0, -1, 0], [0, 1, 0], [0, 0, -1], [0, 0, 1]]),
+    np.array([[0, 0, 0], [-1, 0, 0], [1, 0, 0], [0, -1, 0], [0, 1, 0],
+              [0, 0, -1], [0, 0, 1]]),
+]
+
+
+def line_offsets(step, length):
+    """Returns the offsets covered by a line segment, one per row."""
+    return np.outer(np.arange(length) - length // 2, step)
+
+
+def offsets_strel(offsets):
+    """Returns the smallest structuring element covering a set of offsets."""
+    radius = np.abs(offsets).max(axis=0)
+    strel = np.zeros(2 * radius + 1, dtype=bool)
+    strel[tuple((offsets + radius).T)] = True
+    return strel
+
+
+def dilate(points, offsets):
+    """Minkowski sum of a set of points and a set of offsets."""
+    res = np.zeros_like(points)
+    for offset in offsets:
+        dst, src = _cpu.shifted_slices(points.shape, -offset)
+        res[dst] |= points[src]
+    return res
+
+
+def erode(points, offsets):
+    """Minkowski difference of a set of points and a set of offsets."""
+    res = points.copy()
+    for offset in offsets:
+        dst, src = _cpu.shifted_slices(points.shape, offset)
+        shifted = np.zeros_like(points)
+        shifted[dst] = points[src]
+        res &= shifted
+    return res
+
+
+def split(points, offsets):
+    """
+    Returns points with the offsets factored out, or None if the offsets are
+    not a Minkowski summand of points.
+    """
+    rest = erode(points, offsets)
+    if rest.any() and np.array_equal(dilate(rest, offsets), points):
+        return rest
+    return None
+
+
+def zonohedron(shape, lines):
+    """Returns the Minkowski sum of line segments on a grid centered at 0."""
+    points = np.zeros(shape, dtype=bool)
+    points[tuple(np.array(shape) // 2)] = True
+    for step, length in lines:
+        points = dilate(points, line_offsets(step, length))
+    return points
+
+
+def cost(line_lens, strels):
+    """
+    Returns the rough number of passes over the volume needed to apply the
+    parts of a decomposition.
+
+    Long line segments take a constant number of passes with the van
+    Herk/Gil-Werman algorithm, while the other parts take one per offset.
+    """
+    lines = sum(length - 1 if length <= 4 else 4 for length in line_lens)
+    return lines + sum(int(strel.sum()) - 1 for strel in strels)
+
+
+def shortest_run(points, step):
+    """
+    Returns the number of points in the shortest run of points along step.
+
+    Each run of a Minkowski sum with a line segment is at least as long as
+    the line segment, so this bounds the length of line segments which can
+    be factored out. Takes one pass per point in the shortest run.
+    """
+    ends = points.copy()
+    dst, src = _cpu.shifted_slices(points.shape, step)
+    ends[dst] &= ~points[src]
+    runs = ends
+    length = 0
+    while np.array_equal(runs, ends) and runs.any():
+        length += 1
+        # Keep the ends whose run has another point
+        dst, src = _cpu.shifted_slices(points.shape, -length * step)
+        shifted = np.zeros_like(points)
+        shifted[dst] = points[src]
+        runs = runs & shifted
+    return length
+
+
+def symmetric(points):
+    """
+    Returns whether points are symmetric about the center of their bounding
+    box.
+
+    Line segments and crosses are symmetric about their center, and so is
+    any Minkowski sum of them.
+    """
+    idx = np.nonzero(points)
+    box = points[tuple(slice(i.min(), i.max() + 1) for i in idx)]
+    return np.array_equal(box, box[::-1, ::-1, ::-1])
+
+
+def split_line(points, step):
+    """
+    Factors the longest possible line segment along step out of points.
+
+    Returns the rest of points, the step vector and the length, or None if
+    no line segment is a Minkowski summand of points.
+    """
+    max_len = shortest_run(points, step)
+    for length in range(max_len, 1, -1):
+        # Even segments are not symmetric, so try both ways
+        for sign in [1, -1] if length % 2 == 0 else [1]:
+            rest = split(points, line_offsets(sign * step, length))
+            if rest is not None:
+                return rest, sign * step, length
+    return None
+
+
+def exact(points, crosses_first):
+    """
+    Greedily factors line segments and crosses out of points.
+
+    Returns the line segments and crosses, or None if points does not end up
+    as the origin. The order matters: diamonds are only found by taking the
+    crosses first, and boxes by taking the line segments first.
+    """
+    lines = []
+    strels = []
+    found = True
+    while found:
+        found = False
+        for take_crosses in [crosses_first, not crosses_first]:
+            if take_crosses:
+                for cross in CROSSES:
+                    rest = split(points, cross)
+                    if rest is not None:
+                        points = rest
+                        strels.append(offsets_strel(cross))
+                        found = True
+            else:
+                for step in DIRECTIONS:
+                    res = split_line(points, step)
+                    if res is not None:
+                        points = res[0]
+                        lines.append(res[1:])
+                        found = True
+
+    origin = np.zeros_like(points)
+    origin[tuple(np.array(points.shape) // 2)] = True
+    if not np.array_equal(points, origin):
+        return None
+    return lines, strels
+
+
+def approximate(points, tolerance):
+    """
+    Fits a Minkowski sum of line segments to points.
+
+    The line lengths are grown and shrunk one step at a time, as long as it
+    reduces the number of voxels where the two differ. Returns the lines,
+    or None if the difference ends up larger than tolerance times the
+    number of voxels in points.
+    """
+    count = points.sum()
+    # Room for a fit which sticks out of points
+    shape = 2 * np.array(points.shape) + 1
+    target = np.zeros(shape, dtype=bool)
+    corner = shape // 2 - np.array(points.shape) // 2
+    target[tuple(slice(c, c + n) for c, n in zip(corner, points.shape))] \
+        = points
+
+    def error(lens):
+        lines = [(s, n) for s, n in zip(DIRECTIONS, lens) if n > 1]
+        return np.count_nonzero(zonohedron(shape, lines) != target)
+
+    # Grow the axis, face diagonal and body diagonal lines together first,
+    # so symmetric shapes get symmetric fits, and then adjust each line.
+    classes = [[0, 1, 2], [3, 4, 5, 6, 7, 8], [9, 10, 11, 12]]
+    singles = [[i] for i in range(len(DIRECTIONS))]
+    lens = np.ones(len(DIRECTIONS), dtype=int)
+    best = error(lens)
+    for groups, deltas in [(classes, [2, -2]), (singles, [2, 1, -1, -2])]:
+        while True:
+            # Take the move which reduces the difference the most
+            moves = []
+            for group, delta in itertools.product(groups, deltas):
+                if lens[group].min() + delta >= 1:
+                    lens[group] += delta
+                    moves.append((error(lens), group, delta))
+                    lens[group] -= delta
+            err, group, delta = min(moves, key=lambda m: m[0])
+            if err >= best:
+                break
+            best = err
+            lens[group] += delta
+    if best > tolerance * count:
+        return None
+    return [(s, int(n)) for s, n in zip(DIRECTIONS, lens) if n > 1], []
+
+
+@functools.lru_cache(maxsize=64)
+def _decompose(shape, data, tolerance):
+    points = np.frombuffer(data, dtype=bool).reshape(shape)
+    if not points.any():
+        return None
+    candidates = []
+    if symmetric(points):
+        candidates = [exact(points, False), exact(points, True)]
+        candidates = [c for c in candidates if c is not None]
+    parts = None
+    if candidates:
+        parts = min(candidates, key=lambda c: cost([n for _, n in c[0]], c[1]))
+    if parts is None and tolerance > 0:
+        parts = approximate(points, tolerance)
+    if parts is None:
+        return None
+    lines, strels = parts
+    line_steps = np.array([s for s, _ in lines], dtype=np.int32)
+    line_steps = line_steps.reshape(-1, 3)
+    line_lens = np.array([n for _, n in lines], dtype=np.int32)
+    for a in [line_steps, line_lens] + strels:
+        a.flags.writeable = False
+    return line_steps, line_lens, tuple(strels)
+
+
+def decompose(strel, tolerance=0.0):
+    """
+    Decompose a flat 3D structuring element into line segments and crosses.
+
+    Parameters
+    ----------
+    strel
+        Boolean 3D structuring element.
+    tolerance
+        Largest allowed number of differing voxels, as a fraction of the
+        number of voxels in strel. If 0, the decomposition must be exact.
+
+    Returns
+    -------
+    tuple or None
+        Tuple (line_steps, line_lens, strels) with the line segments and the
+        remaining small structuring elements, or None if no decomposition
+        was found. The arrays are read-only, since they are cached.
+    """
+    strel = np.ascontiguousarray(strel, dtype=bool)
+    return _decompose(strel.shape, strel.tobytes(), float(tolerance))
+
+
+def plan(strel, tolerance):
+    """
+    Returns the decomposition of strel if it is cheaper to apply than strel
+    itself, or else None.
+    """
+    parts = decompose(strel, tolerance)
+    if parts is None or cost(parts[1], parts[2]) >= np.count_nonzero(strel):
+        return None
+    return parts
@@ -0,0 +1,92 @@
+"""
+Lower envelopes of parabolas. Only meant for internal use.
+
+Computes ``d[q] = min_p f[p] + c * (q - p)**2`` along an axis in linear time
+with the algorithm of [FH12]_. The parabolas rooted at each p are added to
+the envelope from left to right, removing those they hide, and the envelope
+is then read off from left to right. All lines along the axis are processed
+together, so the Python loops only run over the positions along the axis.
+
+References
+----------
+.. [FH12] P. F. Felzenszwalb and D. P. Huttenlocher, "Distance Transforms
+   of Sampled Functions," Theory of Computing 8. (pp. 415-428). 2012.
+"""
+import numpy as np
+
+
+def parabola_min(f, axis, c):
+    """
+    Returns the lower envelope of parabolas along an axis.
+
+    Parameters
+    ----------
+    f
+        Floating point array with the height of the parabola rooted at each
+        position. Positions with infinite height have no parabola.
+    axis
+        Axis to compute along.
+    c
+        Positive curvature of the parabolas.
+
+    Returns
+    -------
+    numpy.array
+        Array of same shape as f with ``min_p f[p] + c * (q - p)**2`` along
+        axis, which is inf for lines without parabolas.
+    """
+    f = np.moveaxis(np.asarray(f, dtype=np.float64), axis, 0)
+    shape = f.shape
+    if shape[0] <= 1:
+        return np.moveaxis(f.copy(), 0, axis)
+    res = _envelope(np.ascontiguousarray(f.reshape(shape[0], -1)), float(c))
+    return np.moveaxis(res.reshape(shape), 0, axis)
+
+
+def _envelope(f, c):
+    n, m = f.shape
+    cols = np.arange(m)
+    # Stack of parabolas on the envelope for each line. v holds their roots
+    # and z the position where each starts to be the lowest.
+    v = np.zeros((n, m), dtype=np.intp)
+    z = np.empty((n + 1, m))
+    top = np.full(m, -1)
+    height = f + c * np.arange(n, dtype=np.float64)[:, None] ** 2
+
+    def intersect(q, idx):
+        p = v[top[idx], idx]
+        return (height[q, idx] - height[p, idx]) / (2 * c * (q - p))
+
+    for q in range(n):
+        idx = cols[np.isfinite(f[q])]
+        if not idx.size:
+            continue
+        # Remove the parabolas which the new one hides
+        pending = idx[top[idx] >= 0]
+        while pending.size:
+            hidden = intersect(q, pending) <= z[top[pending], pending]
+            pending = pending[hidden]
+            top[pending] -= 1
+            pending = pending[top[pending] >= 0]
+        start = np.full(idx.size, -np.inf)
+        nonempty = top[idx] >= 0
+        start[nonempty] = intersect(q, idx[nonempty])
+        top[idx] += 1
+        v[top[idx], idx] = q
+        z[top[idx], idx] = start
+
+    res = np.full((n, m), np.inf)
+    idx = cols[top >= 0]
+    k = np.zeros(idx.size, dtype=np.intp)
+    last = top[idx]
+    for q in range(n):
+        # Move on to the parabolas which are lowest at q
+        pending = np.flatnonzero(k < last)
+        while pending.size:
+            ahead = z[k[pending] + 1, idx[pending]] <= q
+            pending = pending[ahead]
+            k[pending] += 1
+            pending = pending[k[pending] < last[pending]]
+        p = v[k, idx]
+        res[q, idx] = f[p, idx] + c * (q - p) ** 2
+    return res
@@ -0,0 +1,142 @@
+"""
+Recording of per-call statistics. Only meant for internal use.
+
+The public interface is in ``instrument``. The morphology functions mark
+the end of each phase with ``checkpoint`` and report memory traffic and
+blocks with ``count``. Both do nothing unless a hook is registered, so the
+cost of the instrumentation is a context variable lookup.
+"""
+import contextvars
+import functools
+import time
+
+_hooks = []
+_current = contextvars.ContextVar('pygorpho_call', default=None)
+
+
+class CallRecord:
+    """
+    Statistics for one call of a morphology function.
+
+    Attributes
+    ----------
+    function
+        Name of the function, such as ``'flat.morph'``.
+    op
+        Operation code from ``constants``.
+    backend
+        Name of the backend which did the computations.
+    dtype
+        Type of the voxels.
+    shape
+        Shape of the volume as passed to the backend.
+    time
+        Wall time of the whole call in seconds.
+    phases
+        Dictionary with the wall time of each phase in seconds. The phases
+        are ``prepare`` (input conversion, output allocation and backend
+        selection), ``decompose`` (structuring element decomposition),
+        ``copy`` (copies for the memory layout the backend needs),
+        ``compute`` (the backend itself) and ``finish`` (reshaping the
+        result).
+    bytes_allocated
+        Number of bytes in arrays allocated for the output, temporary
+        volumes and block buffers.
+    bytes_copied
+        Number of bytes copied between arrays, including to and from block
+        buffers.
+    blocks
+        Number of blocks the volume was processed in. For the CUDA backend
+        this is estimated from the block size.
+    """
+
+    def __init__(self, function, op):
+        self.function = function
+        self.op = op
+        self.backend = None
+        self.dtype = None
+        self.shape = None
+        self.time = 0.0
+        self.phases = {}
+        self.bytes_allocated = 0
+        self.bytes_copied = 0
+        self.blocks = 0
+        self._last = time.perf_counter()
+
+    def as_dict(self):
+        """Returns the statistics as a dictionary for JSON export."""
+        return {
+            'function': self.function,
+            'op': self.op,
+            'backend': self.backend,
+            'dtype': self.dtype,
+            'shape': None if self.shape is None else list(self.shape),
+            'time': self.time,
+            'phases': dict(self.phases),
+            'bytes_allocated': self.bytes_allocated,
+            'bytes_copied': self.bytes_copied,
+            'blocks': self.blocks,
+        }
+
+    def __repr__(self):
+        return 'CallRecord({})'.format(
+            ', '.join('{}={!r}'.format(k, v)
+                      for k, v in self.as_dict().items()))
+
+
+def instrumented(function, op_index):
+    """
+    Decorator which records the calls of a morphology function. The
+    operation is the positional argument at op_index or keyword ``op``.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _hooks:
+                return func(*args, **kwargs)
+            op = args[op_index] if len(args) > op_index else kwargs.get('op')
+            record = CallRecord(function, op)
+            start = record._last
+            token = _current.set(record)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                checkpoint('finish')
+                _current.reset(token)
+                record.time = time.perf_counter() - start
+                for hook in list(_hooks):
+                    hook(record)
+
+        return wrapper
+
+    return decorator
+
+
+def checkpoint(phase):
+    """Add the time since the last checkpoint to a phase of the call."""
+    record = _current.get()
+    if record is None:
+        return
+    now = time.perf_counter()
+    record.phases[phase] = record.phases.get(phase, 0.0) + now - record._last
+    record._last = now
+
+
+def describe(backend, vol):
+    """Record the backend and volume of the call."""
+    record = _current.get()
+    if record is None:
+        return
+    record.backend = backend.name
+    record.dtype = str(vol.dtype)
+    record.shape = tuple(int(n) for n in vol.shape)
+
+
+def count(bytes_allocated=0, bytes_copied=0, blocks=0):
+    """Add memory traffic and blocks to the call."""
+    record = _current.get()
+    if record is None:
+        return
+    record.bytes_allocated += int(bytes_allocated)
+    record.bytes_copied += int(bytes_copied)
+    record.blocks += int(blocks)
@@ -0,0 +1,194 @@
+"""
+Rank filters with flat structuring elements. Only meant for internal use.
+
+The volume is first mapped to integer codes which sort like its values.
+With few distinct codes, each line along the last axis keeps a histogram of
+the window around the current voxel, as in [HYT79]_. Moving one voxel
+along the line adds the voxels entering the window and removes those
+leaving it, so the cost grows with the surface of the structuring element.
+The wanted rank is tracked by moving the current code up or down until the
+number of voxels below it fits. With many distinct codes, the windows are
+sorted instead. Voxels outside the volume get a code above all others, so
+they sort last and are never selected.
+
+References
+----------
+.. [HYT79] T. Huang, G. Yang and G. Tang, "A fast two-dimensional median
+   filtering algorithm," IEEE Transactions on Acoustics, Speech, and Signal
+   Processing 27. (pp. 13-18). 1979.
+"""
+import numpy as np
+from . import _cpu
+from . import _thin
+
+#: Largest number of codes for which histograms are used
+MAX_BINS = 2 ** 16
+
+#: Number of bytes in the histograms of a block
+HIST_BYTES = 2 ** 25
+
+
+def encode(vol):
+    """
+    Returns the distinct values of vol in increasing order and the code of
+    each voxel, which is its index into them.
+    """
+    if vol.dtype == np.bool_ or vol.dtype.itemsize == 1:
+        low = int(vol.min()) if vol.size else 0
+        values = np.arange(low, int(vol.max()) + 1 if vol.size else low)
+        return values.astype(vol.dtype), (vol.astype(np.int32) - low)
+    if np.issubdtype(vol.dtype, np.integer) and vol.size:
+        low = int(vol.min())
+        if int(vol.max()) - low < MAX_BINS:
+            values = np.arange(low, int(vol.max()) + 1).astype(vol.dtype)
+            return values, (vol.astype(np.int64) - low).astype(np.int32)
+    values, codes = np.unique(vol, return_inverse=True)
+    return values, codes.reshape(vol.shape).astype(np.int32)
+
+
+def rank_filter(res, vol, strel, fraction, block_size):
+    """
+    Rank filter with flat structuring element.
+
+    Parameters
+    ----------
+    res
+        Output volume. Must have same shape and dtype as vol. May be vol.
+    vol
+        3D input volume.
+    strel
+        3D boolean structuring element.
+    fraction
+        Position in the sorted window, where 0 is the smallest value and 1
+        the largest. For a window of n voxels inside the volume, the value
+        at index ``floor(fraction * (n - 1) + 0.5)`` is selected.
+    block_size
+        Maximum size of the blocks the volume is processed in. Blocks are
+        made smaller if their histograms would use too much memory.
+    """
+    values, codes = encode(vol)
+    bins = len(values)
+    # Voxels without any voxels of strel inside the volume get the identity
+    # of the nearest of dilation and erosion
+    op = _thin.DILATE if fraction > 0.5 else _thin.ERODE
+    values = np.append(values, _cpu.identity(vol.dtype, op))
+
+    before = np.array([n // 2 for n in strel.shape])
+    after = np.array([n - 1 - n // 2 for n in strel.shape])
+    if bins < MAX_BINS:
+        rows = _strel_rows(strel)
+        side = max(1, int(np.sqrt(HIST_BYTES / (4 * (bins + 1)))))
+        block_size = [min(block_size[0], side), min(block_size[1], side),
+                      block_size[2]]
+        func = lambda buf, inner, center: _histogram_block(
+            buf, center, rows, fraction, bins)
+    else:
+        offsets = _cpu.strel_offsets(strel.shape)[strel]
+        func = lambda buf, inner, center: _sort_block(
+            buf, center, offsets, fraction, bins)
+    out = np.empty(vol.shape, dtype=np.int32)
+    _cpu.process_blocks(out, codes, before, after, block_size, bins, func)
+    np.take(values, out, out=res)
+
+
+def _strel_rows(strel):
+    """Returns (dz, dy, first, last) for each run of strel along x."""
+    center = [n // 2 for n in strel.shape]
+    runs = []
+    for iz, iy in zip(*np.nonzero(strel.any(axis=2))):
+        row = np.concatenate([[False], strel[iz, iy], [False]])
+        edges = np.flatnonzero(row[1:] != row[:-1])
+        for a, b in zip(edges[::2], edges[1::2]):
+            runs.append((iz - center[0], iy - center[1],
+                         a - center[2], b - 1 - center[2]))
+    return np.array(runs, dtype=np.int64).reshape(-1, 4)
+
+
+def _targets(fraction, count):
+    target = np.floor(fraction * (count - 1) + 0.5).astype(np.int64)
+    return np.maximum(target, 0)
+
+
+def _histogram_block(buf, center, rows, fraction, bins):
+    res = np.empty(buf.shape, dtype=np.int32)
+    flat = buf.ravel()
+    zs, ys, xs = center
+    sz, sy = buf.shape[1] * buf.shape[2], buf.shape[2]
+    z, y = np.meshgrid(np.arange(zs.start, zs.stop),
+                       np.arange(ys.start, ys.stop), indexing='ij')
+    base = (z * sz + y * sy).ravel()
+    nrows = base.size
+    # Index of the first and last voxel of each run for each line
+    row_base = base[None] + (rows[:, 0] * sz + rows[:, 1] * sy)[:, None]
+    first = row_base + rows[:, 2, None]
+    last = row_base + rows[:, 3, None]
+    hist_base = np.arange(nrows, dtype=np.int64) * (bins + 1)
+
+    hist = np.zeros(nrows * (bins + 1), dtype=np.int32)
+    x = xs.start
+    for k in range(int(rows[:, 2].min()), int(rows[:, 3].max()) + 1):
+        inside = (rows[:, 2] <= k) & (k <= rows[:, 3])
+        for vals in flat[row_base[inside] + x + k]:
+            hist[hist_base + vals] += 1
+    hist2d = hist.reshape(nrows, bins + 1)
+    outside = hist2d[:, bins].astype(np.int64)
+    total = int(hist2d[0].sum())
+
+    # Start at the smallest code reaching the target
+    target = _targets(fraction, total - outside)
+    cum = np.cumsum(hist2d, axis=1)
+    cur = np.argmax(cum > target[:, None], axis=1)
+    below = cum[np.arange(nrows), cur] - hist2d[np.arange(nrows), cur]
+    res[zs, ys, x] = cur.reshape(z.shape)
+
+    for x in range(xs.start + 1, xs.stop):
+        enter = flat[last + x]
+        leave = flat[first + x - 1]
+        # Each run adds or removes one voxel per line, so the indices of a
+        # run are distinct
+        for run in range(len(rows)):
+            hist[hist_base + enter[run]] += 1
+            hist[hist_base + leave[run]] -= 1
+        below += (np.count_nonzero(enter < cur, axis=0)
+                  - np.count_nonzero(leave < cur, axis=0))
+        outside += (np.count_nonzero(enter == bins, axis=0)
+                    - np.count_nonzero(leave == bins, axis=0))
+        target = _targets(fraction, total - outside)
+
+        # Move the current code until the target is among its voxels
+        pending = np.flatnonzero(below > target)
+        while pending.size:
+            cur[pending] -= 1
+            below[pending] -= hist[hist_base[pending] + cur[pending]]
+            pending = pending[below[pending] > target[pending]]
+        pending = np.flatnonzero(
+            below + hist[hist_base + cur] <= target)
+        while pending.size:
+            below[pending] += hist[hist_base[pending] + cur[pending]]
+            cur[pending] += 1
+            pending = pending[below[pending]
+                              + hist[hist_base[pending] + cur[pending]]
+                              <= target[pending]]
+        res[zs, ys, x] = cur.reshape(z.shape)
+    return res
+
+
+def _sort_block(buf, center, offsets, fraction, bins):
+    res = np.empty(buf.shape, dtype=np.int32)
+    flat = buf.ravel()
+    strides = np.array([buf.shape[1] * buf.shape[2], buf.shape[2], 1])
+    index = np.stack(np.meshgrid(*[np.arange(s.start, s.stop)
+                                   for s in center], indexing='ij'), axis=-1)
+    index = (index @ strides).ravel()
+    shifts = offsets @ strides
+    out = np.empty(index.size, dtype=np.int32)
+    # Sort the windows of a chunk of voxels at a time
+    chunk = max(1, 2 ** 22 // max(1, len(shifts)))
+    for start in range(0, index.size, chunk):
+        window = np.sort(flat[index[None, start:start + chunk]
+                              + shifts[:, None]], axis=0)
+        count = np.count_nonzero(window < bins, axis=0)
+        target = np.minimum(_targets(fraction, count), len(shifts) - 1)
+        out[start:start + chunk] = window[target, np.arange(window.shape[1])]
+    res[center] = out.reshape(res[center].shape)
+    return res
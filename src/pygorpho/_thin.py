@@ -17,6 +17,27 @@ class _DummyLib:
         return _DummyFunc()
 
 
+class _MissingFunc:
+    def __init__(self, ret):
+        self.ret = ret
+
+    def __call__(self, *args):
+        return self.ret
+
+
+class _MissingLib:
+    """
+    Stand-in for the C bindings if the dynamic library could not be found.
+
+    All functions report that no CUDA device is available, so callers fall
+    back to the NumPy implementations.
+    """
+    def __getattr__(self, name):
+        if name == 'pyGetDeviceCount':
+            return _MissingFunc(0)
+        return _MissingFunc(4)  # ERR_NO_AVAILABLE_CUDA_DEVICE
+
+
 # Load the shared library
 def try_lib_load():
     """
@@ -71,7 +92,11 @@ def try_lib_load():
                           '(try setting PYGORPHO_PATH environment variable)')
 
 
-PYGORPHO_LIB, PYGORPHO_PATH = try_lib_load()
+try:
+    PYGORPHO_LIB, PYGORPHO_PATH = try_lib_load()
+except ImportError:
+    # Without the library we can still run on the CPU
+    PYGORPHO_LIB, PYGORPHO_PATH = _MissingLib(), None
 
 DILATE = 0  # Must match MOP_DILATE in pygorpho.cuh
 ERODE = 1  # Must match MOP_ERODE in pygorpho.cuh
@@ -0,0 +1,150 @@
+"""
+Block sizes for ``block_size='auto'``. Only meant for internal use.
+
+Block sizes measured by ``tune.tune`` are kept in a JSON file, keyed by the
+backend, device, function, volume shape, dtype, operation and reach of the
+structuring element. Calls without a measurement get a block size from a
+simple memory model. The public interface is in ``tune``.
+"""
+import contextvars
+import json
+import os
+import threading
+import numpy as np
+from . import _util
+
+#: Value of block_size which selects the block size automatically
+AUTO = 'auto'
+
+_lock = threading.Lock()
+_cache = None
+#: Keys and block sizes of the calls made while tuning
+_capture = contextvars.ContextVar('pygorpho_tune_capture', default=None)
+
+
+def cache_path():
+    """
+    Returns the path of the file with the tuned block sizes.
+
+    This is ``block_sizes.json`` in ``PYGORPHO_CACHE_DIR`` if it is set, or
+    else in ``pygorpho`` in the user's cache directory.
+    """
+    folder = os.getenv('PYGORPHO_CACHE_DIR')
+    if folder is None:
+        base = os.getenv('XDG_CACHE_HOME') or os.path.join(
+            os.path.expanduser('~'), '.cache')
+        folder = os.path.join(base, 'pygorpho')
+    return os.path.join(folder, 'block_sizes.json')
+
+
+def load_cache():
+    """Returns the tuned block sizes, reading them from disk the first time."""
+    global _cache
+    with _lock:
+        if _cache is None:
+            try:
+                with open(cache_path()) as f:
+                    _cache = json.load(f)
+            except (OSError, ValueError):
+                _cache = {}
+        return _cache
+
+
+def store(key, block_size):
+    """Save a tuned block size to the cache file."""
+    cache = load_cache()
+    with _lock:
+        cache[key] = [int(b) for b in block_size]
+        path = cache_path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write a new file and swap it in, so readers never see half a file
+        tmp = '{}.{}.tmp'.format(path, os.getpid())
+        with open(tmp, 'w') as f:
+            json.dump(cache, f, indent=1, sort_keys=True)
+        os.replace(tmp, path)
+
+
+def reset():
+    """Forget the tuned block sizes read from disk."""
+    global _cache
+    with _lock:
+        _cache = None
+
+
+def make_key(impl, function, vol, op, halo):
+    """Returns the cache key for a call."""
+    reach = np.asarray(halo[0]) + np.asarray(halo[1])
+    return '|'.join([
+        impl.name, impl.device_name(), function,
+        'x'.join(str(n) for n in vol.shape), vol.dtype.str, str(op),
+        'x'.join(str(int(r)) for r in reach),
+    ])
+
+
+def resolve(block_size, impl, function, vol, op, halo):
+    """
+    Returns the block size to use for a call.
+
+    Parameters
+    ----------
+    block_size
+        Block size given by the caller. Returned as is unless it is
+        ``AUTO``.
+    impl
+        Backend used for the call.
+    function
+        Name of the function, such as ``'flat.morph'``.
+    vol
+        Input volume as a 3D array, or batch of volumes as a 4D array.
+    op
+        Operation code from constants.
+    halo
+        Number of voxels needed before and after each voxel along each axis
+        of a volume, as returned by ``_util.strel_halo``.
+    """
+    capture = _capture.get()
+    if not isinstance(block_size, str):
+        if capture is not None:
+            key = make_key(impl, function, vol, op, halo)
+            capture.append((key, list(block_size)))
+        return block_size
+    if block_size != AUTO:
+        raise ValueError('block_size must be a sequence or ' + repr(AUTO))
+
+    key = make_key(impl, function, vol, op, halo)
+    res = load_cache().get(key)
+    if res is None:
+        shape = vol.shape[-3:]
+        perm = _util.axes_order(vol[0] if vol.ndim == 4 else vol)
+        block = heuristic([shape[i] for i in perm], vol.itemsize,
+                          [halo[0][i] + halo[1][i] for i in perm],
+                          impl.block_bytes)
+        res = [0] * 3
+        for i, b in zip(perm, block):
+            res[i] = b
+    if capture is not None:
+        capture.append((key, res))
+    return res
+
+
+def heuristic(shape, itemsize, reach, block_bytes):
+    """
+    Returns a block size from a memory model.
+
+    Starts with the whole volume and halves the longest axis until a block
+    with its halo takes at most block_bytes. Blocks are not made thinner
+    than twice their halo, since most of the work would then be spent on
+    the halo. Ties are broken in favor of keeping the last axis long, which
+    is the contiguous one when shape is in memory order.
+    """
+    block = [max(1, int(n)) for n in shape]
+    reach = [int(r) for r in reach]
+    while np.prod([b + r for b, r in zip(block, reach)]) * itemsize \
+            > block_bytes:
+        candidates = [i for i in range(len(block))
+                      if block[i] // 2 >= max(8, 2 * reach[i])]
+        if not candidates:
+            break
+        axis = max(candidates, key=lambda i: (block[i], -i))
+        block[axis] = -(-block[axis] // 2)
+    return block
@@ -0,0 +1,226 @@
+"""
+Helpers shared by the morphology functions. Only meant for internal use.
+"""
+import numpy as np
+from . import _instrument
+from . import constants
+
+
+def atleast_3d_batch(vols):
+    """
+    Returns a 4D view of a batch of volumes.
+
+    The first axis indexes the volumes. Volumes with fewer than 3 dimensions
+    get extra axes like with numpy.atleast_3d.
+
+    Raises
+    ------
+    ValueError
+        If vols does not have between 1 and 4 dimensions.
+    """
+    if vols.ndim < 1 or vols.ndim > 4:
+        raise ValueError('batch of volumes must have 1 to 4 dimensions')
+    expand = [
+        (slice(None), None, None, None),
+        (slice(None), None, slice(None), None),
+        (Ellipsis, None),
+        (Ellipsis,),
+    ]
+    return vols[expand[vols.ndim - 1]]
+
+
+def prepare_output(vol, out, batch=False):
+    """
+    Returns the array to write the result of an operation on vol into.
+
+    Parameters
+    ----------
+    vol
+        Input volume as a 3D numpy array, or batch of volumes as a 4D array.
+    out
+        Output array given by the caller, or None.
+    batch
+        Whether vol is a batch of volumes.
+
+    Returns
+    -------
+    numpy.array
+        3D (4D for batches) view of out, or a new array like vol if out is
+        None.
+
+    Raises
+    ------
+    ValueError
+        If out does not have the same size and dtype as vol.
+    """
+    if out is None:
+        _instrument.count(bytes_allocated=vol.nbytes)
+        return np.empty_like(vol)
+    if not isinstance(out, np.ndarray):
+        raise ValueError('out must be a numpy array')
+    if batch:
+        res = atleast_3d_batch(out)
+    else:
+        res = np.atleast_3d(out)
+    if res.shape != vol.shape or res.dtype != vol.dtype:
+        raise ValueError('out must have same shape and dtype as vol')
+    return res
+
+
+def axes_order(vol):
+    """
+    Returns the axis permutation which makes vol as close to C order as
+    possible.
+
+    Axes are sorted by decreasing absolute stride, so ``vol.transpose(perm)``
+    is C-contiguous for both C- and Fortran-ordered volumes.
+    """
+    strides = [abs(s) if n > 1 else 0 for s, n in zip(vol.strides, vol.shape)]
+    return [int(i) for i in np.argsort(strides, kind='stable')[::-1]]
+
+
+def same_layout(a, b):
+    """Returns whether a and b are views of the same memory locations."""
+    return (a.shape == b.shape and a.strides == b.strides
+            and a.ctypes.data == b.ctypes.data)
+
+
+def run_backend(func, impl, res, vol, kernel, block_size, batch=False):
+    """
+    Call a backend on arrays with arbitrary memory layout.
+
+    The axes are permuted so that the slowest varying axis comes first,
+    which means Fortran-ordered volumes are processed without copying. The
+    structuring element and block size are permuted to match. Backends with
+    ``strided`` set get the remaining views as they are. Otherwise, vol is
+    copied if it is not C-contiguous and the result is computed in a
+    temporary array if res is not. If res overlaps vol and the backend cannot
+    work in place, vol is copied first.
+
+    For a batch of volumes, the first axis stays in place. Backends with
+    ``batched`` set get the whole batch, while others are called once for
+    each volume.
+
+    Parameters
+    ----------
+    func
+        Function called as ``func(res, vol, kernel, block_size)`` with the
+        prepared arrays.
+    impl
+        Backend which will perform the operation.
+    res
+        Output volume as a 3D array with same shape and dtype as vol.
+    vol
+        Input volume as a 3D array, or batch of volumes as a 4D array.
+    kernel
+        Structuring element as a 3D array, line steps as a 2D array with
+        one step vector per row, or a tuple with one 1D array per axis.
+    block_size
+        Block size in numpy axis order.
+    batch
+        Whether vol is a batch of volumes.
+    """
+    _instrument.describe(impl, vol)
+    _instrument.checkpoint('prepare')
+    if vol.size == 0:
+        return
+    perm = axes_order(vol[0] if batch else vol)
+    full = [0] + [i + 1 for i in perm] if batch else perm
+    vol = vol.transpose(full)
+    target = res.transpose(full)
+    if isinstance(kernel, tuple):
+        kernel = tuple(kernel[i] for i in perm)
+    elif kernel.ndim == 3:
+        kernel = kernel.transpose(perm)
+    else:
+        kernel = kernel[:, perm]
+    block_size = [block_size[i] for i in perm]
+
+    if batch and not impl.batched:
+        for r, v in zip(target, vol):
+            _run_backend(func, impl, r, v, kernel, block_size)
+    else:
+        _run_backend(func, impl, target, vol, kernel, block_size)
+
+
+def _run_backend(func, impl, target, vol, kernel, block_size):
+    if not impl.strided:
+        if not vol.flags.c_contiguous:
+            _instrument.count(vol.nbytes, vol.nbytes)
+        vol = np.ascontiguousarray(vol)
+        if isinstance(kernel, tuple):
+            kernel = tuple(np.ascontiguousarray(k) for k in kernel)
+        else:
+            kernel = np.ascontiguousarray(kernel)
+    res = target
+    if not impl.strided and not target.flags.c_contiguous:
+        _instrument.count(bytes_allocated=vol.nbytes)
+        res = np.empty(vol.shape, dtype=vol.dtype)
+    if np.may_share_memory(vol, res):
+        if not impl.inplace or not same_layout(vol, res):
+            _instrument.count(vol.nbytes, vol.nbytes)
+            vol = vol.copy()
+    _instrument.checkpoint('copy')
+
+    func(res, vol, kernel, block_size)
+    _instrument.checkpoint('compute')
+    if res is not target:
+        _instrument.count(bytes_copied=res.nbytes)
+        target[...] = res
+        _instrument.checkpoint('copy')
+
+
+def strel_halo(strel_shape, op):
+    """
+    Returns the number of voxels an operation reads around each voxel.
+
+    Parameters
+    ----------
+    strel_shape
+        Shape of the structuring element.
+    op
+        Operation code from constants.
+
+    Returns
+    -------
+    (numpy.array, numpy.array)
+        Number of voxels needed before and after each voxel along each axis.
+        Operations made of two passes need twice as many.
+    """
+    size = np.array(strel_shape)
+    before = size // 2
+    after = size - 1 - before
+    passes = 1 if op == constants.DILATE or op == constants.ERODE else 2
+    return passes * before, passes * after
+
+
+def lines_halo(line_steps, line_lens, op):
+    """
+    Returns the number of voxels an operation with line segments reads
+    around each voxel.
+
+    Parameters
+    ----------
+    line_steps
+        Array with one integer step vector per row.
+    line_lens
+        Array with the length of each line segment.
+    op
+        Operation code from constants.
+
+    Returns
+    -------
+    (numpy.array, numpy.array)
+        Number of voxels needed before and after each voxel along each axis.
+        Operations made of two passes need twice as many.
+    """
+    before = np.zeros(line_steps.shape[1], dtype=int)
+    after = np.zeros(line_steps.shape[1], dtype=int)
+    for step, length in zip(line_steps, line_lens):
+        if length > 0:
+            first = -(length // 2) * step
+            last = (length - 1 - length // 2) * step
+            before += np.maximum(0, -np.minimum(first, last))
+            after += np.maximum(0, np.maximum(first, last))
+    passes = 1 if op == constants.DILATE or op == constants.ERODE else 2
+    return passes * before, passes * after
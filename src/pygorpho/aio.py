@@ -0,0 +1,239 @@
+"""
+Asynchronous mathematical morphology.
+
+The functions in ``aio.flat`` and ``aio.gen`` take the same arguments as
+their counterparts in ``flat`` and ``gen``, but run on a pool of worker
+threads and return a ``MorphFuture`` right away. A future can be waited on
+with ``result()``, awaited in a coroutine, or passed as an argument to
+another call, which then starts as soon as the future is done.
+
+The CUDA library and most of the NumPy operations run with the GIL
+released, so other Python threads keep running while the operations are
+computed.
+"""
+
+import asyncio
+import concurrent.futures
+import contextlib
+import contextvars
+import functools
+import threading
+import types
+from . import _cpu
+from . import flat as _flat
+from . import gen as _gen
+
+
+class MorphFuture(concurrent.futures.Future):
+    """
+    Future with the result of an asynchronous operation.
+
+    Can be awaited in a coroutine, in which case the event loop keeps
+    running while the operation is computed.
+    """
+
+    def __await__(self):
+        return asyncio.wrap_future(self).__await__()
+
+    def then(self, func, *args, **kwargs):
+        """
+        Schedule ``func(result, *args, **kwargs)`` to run when this future
+        is done.
+
+        Parameters
+        ----------
+        func
+            Function to call with the result, such as ``flat.erode``.
+        args, kwargs
+            Additional arguments to func. May contain futures.
+
+        Returns
+        -------
+        MorphFuture
+            Future with the result of func.
+
+        Example
+        -------
+        .. code-block:: python
+            :dedent: 4
+
+            >>> import numpy as np
+            >>> import pygorpho as pg
+            >>> vol = np.random.rand(100, 100, 100)
+            >>> strel = np.ones((5, 5, 5))
+            >>> fut = pg.aio.flat.dilate(vol, strel).then(pg.flat.erode, strel)
+            >>> res = fut.result()
+        """
+        return submit(func, self, *args, **kwargs)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_current = contextvars.ContextVar('pygorpho_executor', default=None)
+
+
+def set_executor(executor):
+    """
+    Set the default worker pool.
+
+    Parameters
+    ----------
+    executor
+        A ``concurrent.futures.Executor`` or the number of worker threads in
+        a new thread pool. If None, a thread pool with
+        ``PYGORPHO_NUM_THREADS`` threads (default: the number of CPUs) is
+        created when it is first needed.
+    """
+    global _executor
+    if isinstance(executor, int):
+        executor = concurrent.futures.ThreadPoolExecutor(
+            executor, thread_name_prefix='pygorpho')
+    with _executor_lock:
+        _executor = executor
+
+
+@contextlib.contextmanager
+def use_executor(executor):
+    """
+    Context manager which selects the worker pool inside a with block.
+
+    Parameters
+    ----------
+    executor
+        A ``concurrent.futures.Executor``.
+    """
+    token = _current.set(executor)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def get_executor():
+    """
+    Returns the worker pool used for asynchronous operations.
+
+    Returns
+    -------
+    concurrent.futures.Executor
+        The pool from the innermost ``use_executor`` block, or else the one
+        given to ``set_executor``.
+    """
+    global _executor
+    executor = _current.get()
+    if executor is not None:
+        return executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = concurrent.futures.ThreadPoolExecutor(
+                _cpu.num_threads(), thread_name_prefix='pygorpho')
+        return _executor
+
+
+def submit(func, *args, **kwargs):
+    """
+    Run ``func(*args, **kwargs)`` on the worker pool.
+
+    Arguments which are futures are replaced by their results. The call is
+    only submitted once they are all done, so no worker waits for another.
+    If one of them fails, the returned future fails with the same exception.
+    func runs in a copy of the caller's context, so settings such as
+    ``backend.use_backend`` and ``instrument.record`` blocks apply to it.
+
+    Parameters
+    ----------
+    func
+        Function to call, such as ``flat.dilate``.
+    args, kwargs
+        Arguments to func. May contain futures.
+
+    Returns
+    -------
+    MorphFuture
+        Future with the result of func.
+    """
+    executor = get_executor()
+    ctx = contextvars.copy_context()
+    fut = MorphFuture()
+    deps = [a for a in list(args) + list(kwargs.values())
+            if isinstance(a, concurrent.futures.Future)]
+    remaining = [len(deps)]
+    lock = threading.Lock()
+
+    def run():
+        if not fut.set_running_or_notify_cancel():
+            return
+        try:
+            res = ctx.run(func, *[_result(a) for a in args],
+                          **{k: _result(v) for k, v in kwargs.items()})
+        except BaseException as e:
+            fut.set_exception(e)
+        else:
+            fut.set_result(res)
+
+    def start():
+        try:
+            executor.submit(run)
+        except BaseException as e:
+            if fut.set_running_or_notify_cancel():
+                fut.set_exception(e)
+
+    def dep_done(dep):
+        with lock:
+            remaining[0] -= 1
+            if fut.done():
+                return
+            if dep.cancelled():
+                fut.cancel()
+                return
+            if dep.exception() is not None:
+                if fut.set_running_or_notify_cancel():
+                    fut.set_exception(dep.exception())
+                return
+            if remaining[0] > 0:
+                return
+        start()
+
+    if not deps:
+        start()
+    for dep in deps:
+        dep.add_done_callback(dep_done)
+    return fut
+
+
+def _result(arg):
+    if isinstance(arg, concurrent.futures.Future):
+        return arg.result()
+    return arg
+
+
+def _make_async(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return submit(func, *args, **kwargs)
+
+    wrapper.__doc__ = (
+        'Asynchronous version of ``{}.{}``. Arguments may be futures and '
+        'a ``MorphFuture`` with the result is returned.'.format(
+            func.__module__.rsplit('.', 1)[-1], func.__name__))
+    return wrapper
+
+
+def _make_namespace(module, names):
+    return types.SimpleNamespace(
+        **{n: _make_async(getattr(module, n)) for n in names})
+
+
+#: Asynchronous versions of the functions in ``flat``
+flat = _make_namespace(_flat, [
+    'morph', 'dilate', 'erode', 'open', 'close', 'tophat', 'bothat',
+    'morph_batch', 'linear_morph', 'linear_dilate', 'linear_erode',
+    'linear_open', 'linear_close', 'linear_tophat', 'linear_bothat',
+    'linear_morph_batch',
+])
+
+#: Asynchronous versions of the functions in ``gen``
+gen = _make_namespace(_gen, [
+    'morph', 'dilate', 'erode', 'open', 'close', 'tophat', 'bothat',
+    'morph_batch',
+])
@@ -0,0 +1,559 @@
+"""Selection of the backend which performs the computations."""
+import contextlib
+import contextvars
+import platform
+import numpy as np
+from . import _cpu
+from . import _instrument
+from . import _thin
+from . import _util
+from . import cuda
+
+#: Policy which picks a backend for each call
+AUTO = 'auto'
+
+
+class Backend:
+    """
+    Base class for backends.
+
+    A backend performs the computations for the functions in ``flat`` and
+    ``gen``. Subclasses override the operations they support.
+    Volumes are passed as 3D numpy arrays and results are written into a
+    preallocated array ``res`` of the same shape and type. The arrays are
+    C-contiguous unless ``strided`` is set. Block sizes and step vectors are
+    given in numpy axis order.
+
+    When the backend is ``AUTO``, the available backends are tried in order
+    of decreasing ``priority``. The first which supports the volume type and
+    has ``min_bytes`` at most the size of the volume is used.
+    """
+    #: Name used to register the backend
+    name = None
+    #: Priority for the automatic selection
+    priority = 0
+    #: Smallest volume (in bytes) the backend is automatically used for
+    min_bytes = 0
+    #: Whether res may share memory with vol. Otherwise vol is copied first.
+    inplace = False
+    #: Whether the arrays may have arbitrary strides. Otherwise they are
+    #: copied to C-contiguous arrays first.
+    strided = False
+    #: Whether vol may be a 4D batch of volumes, with the structuring element
+    #: applied to the last three axes. Otherwise the backend is called once
+    #: for each volume.
+    batched = False
+    #: Bytes in a block with its halo for ``block_size='auto'``, when no
+    #: tuned block size is cached
+    block_bytes = 2**26
+
+    def is_available(self):
+        """Returns whether the backend can be used on this machine."""
+        return True
+
+    def device_name(self):
+        """
+        Returns the name of the device the backend computes on. Tuned block
+        sizes are only reused on devices with the same name.
+        """
+        return platform.machine()
+
+    def supports(self, dtype):
+        """Returns whether the backend can process volumes of type dtype."""
+        return dtype.num in _cpu.SUPPORTED_TYPES
+
+    def flat_morph(self, res, vol, strel, op, block_size):
+        """Morphological operation with flat structuring element."""
+        raise NotImplementedError()
+
+    def gen_morph(self, res, vol, strel, op, block_size):
+        """Morphological operation with general structuring element."""
+        raise NotImplementedError()
+
+    def gen_offsets_morph(self, res, vol, offsets, weights, op, block_size):
+        """
+        Morphological operation with general structuring element given as a
+        list of offsets and weights.
+
+        The default implementation places the weights in the smallest
+        centered structuring element covering the offsets and calls
+        ``gen_morph``. The other entries are set to -inf, so they never
+        contribute. Integer types have no -inf, so unless the offsets fill
+        the structuring element the operation is done by the ``'cpu'``
+        backend instead.
+        """
+        reach = np.max(np.abs(offsets), axis=0, initial=0)
+        index = tuple((offsets + reach).T)
+        strel = np.zeros(2 * reach + 1, dtype=vol.dtype)
+        if np.issubdtype(vol.dtype, np.floating):
+            strel[...] = -np.inf
+        elif len(offsets) < strel.size:
+            get_backend('cpu').gen_offsets_morph(res, vol, offsets, weights,
+                                                 op, block_size)
+            return
+        strel[index] = weights
+        self.gen_morph(res, vol, strel, op, block_size)
+
+    def gen_separable_morph(self, res, vol, profiles, op, block_size):
+        """
+        Morphological operation with general structuring element which is
+        the sum of a 1D profile along each axis.
+
+        The default implementation calls ``gen_morph`` with each profile in
+        turn, so each dilation and erosion only needs one intermediate
+        volume.
+        """
+        strels = []
+        for axis, profile in enumerate(profiles):
+            if len(profile) > 1 or profile[0] != 0:
+                shape = [1] * len(profiles)
+                shape[axis] = len(profile)
+                strels.append(profile.reshape(shape))
+
+        def dilate_erode(res, vol, op):
+            if not strels:
+                res[...] = vol
+                return
+            tmp = None
+            if len(strels) > 1:
+                tmp = np.empty_like(vol)
+                _instrument.count(bytes_allocated=tmp.nbytes)
+            # Alternate so the last pass writes to res
+            cur = vol
+            for i, strel in enumerate(strels):
+                dst = res if (len(strels) - i) % 2 == 1 else tmp
+                self.gen_morph(dst, cur, strel, op, block_size)
+                cur = dst
+
+        _compose(dilate_erode, res, vol, op)
+
+    def flat_linear_morph(self, res, vol, line_steps, line_lens, op,
+                          block_size):
+        """Morphological operation with flat line segments."""
+        raise NotImplementedError()
+
+    def flat_sum_morph(self, res, vol, line_steps, line_lens, strels, op,
+                       block_size):
+        """
+        Morphological operation with flat structuring element given as the
+        Minkowski sum of line segments and small structuring elements.
+
+        The default implementation pads the volume, so the parts can be
+        applied one after the other with ``flat_linear_morph`` and
+        ``flat_morph`` without losing the voxels near the border.
+        """
+        cur = vol
+        for o in _cpu.morph_ops(op):
+            before, after = _util.lines_halo(line_steps, line_lens, o)
+            for strel in strels:
+                b, a = _util.strel_halo(strel.shape, o)
+                before, after = before + b, after + a
+            buf = np.pad(cur, list(zip(before, after)),
+                         constant_values=_cpu.identity(vol.dtype, o))
+            tmp = np.empty_like(buf)
+            _instrument.count(2 * buf.nbytes, cur.nbytes)
+            if len(line_lens) > 0:
+                self.flat_linear_morph(tmp, buf, line_steps, line_lens, o,
+                                       block_size)
+                buf, tmp = tmp, buf
+            for strel in strels:
+                self.flat_morph(tmp, buf, strel, o, block_size)
+                buf, tmp = tmp, buf
+            center = zip(before, vol.shape)
+            cur = buf[tuple(slice(b, b + n) for b, n in center)]
+        if op == _thin.TOPHAT:
+            _cpu.subtract(vol, cur, out=res)
+        elif op == _thin.BOTHAT:
+            _cpu.subtract(cur, vol, out=res)
+        else:
+            res[...] = cur
+
+
+class CudaBackend(Backend):
+    """
+    Backend which uses the gorpho CUDA library.
+
+    The library has no float16 type. Flat operations on float16 volumes are
+    computed on int16 keys which sort like the values, so they are exact and
+    need no wider copies. General operations add values, so they are
+    computed on float32 copies of one slab of the volume at a time.
+
+    The library takes one volume per call, so batches are computed one
+    volume at a time, each with its own transfers to and from the GPU.
+    """
+    name = 'cuda'
+    priority = 100
+    #: Smaller volumes are not worth the transfer to the GPU
+    min_bytes = 2**20
+
+    def __init__(self):
+        self._available = None
+        self._device_name = None
+
+    def is_available(self):
+        if self._available is None:
+            self._available = cuda.get_device_count() > 0
+        return self._available
+
+    def device_name(self):
+        # The library computes on the first device
+        if self._device_name is None:
+            self._device_name = cuda.get_device_name(0)
+        return self._device_name
+
+    def flat_morph(self, res, vol, strel, op, block_size):
+        if vol.dtype == np.float16:
+            _on_half_keys(lambda r, v, o: self.flat_morph(
+                r, v, strel, o, block_size), res, vol, op)
+            return
+        _count_blocks(vol, block_size, len(_cpu.morph_ops(op)))
+        ret = _thin.flat_morph_op_impl(
+            res.ctypes.data, vol.ctypes.data, strel,
+            vol.shape[2], vol.shape[1], vol.shape[0],
+            strel.shape[2], strel.shape[1], strel.shape[0],
+            vol.dtype.num, op,
+            block_size[2], block_size[1], block_size[0])
+        _thin.raise_on_error(ret)
+
+    def gen_morph(self, res, vol, strel, op, block_size):
+        if vol.dtype == np.float16:
+            # float32 has more than twice the precision of float16, so sums
+            # rounded to float32 and then to float16 are rounded correctly
+            wide = strel.astype(np.float32)
+
+            def dilate_erode(res, vol, op):
+                halo = _util.strel_halo(strel.shape, op)
+                _on_float32_slabs(lambda r, v: self.gen_morph(
+                    r, v, wide, op, block_size), res, vol, halo,
+                    block_size[0])
+
+            _compose(dilate_erode, res, vol, op)
+            return
+
+        def dilate_erode(res, vol, op):
+            _count_blocks(vol, block_size)
+            ret = _thin.gen_dilate_erode_impl(
+                res.ctypes.data, vol.ctypes.data, strel.ctypes.data,
+                vol.shape[2], vol.shape[1], vol.shape[0],
+                strel.shape[2], strel.shape[1], strel.shape[0],
+                vol.dtype.num, op,
+                block_size[2], block_size[1], block_size[0])
+            _thin.raise_on_error(ret)
+
+        _compose(dilate_erode, res, vol, op)
+
+    def flat_linear_morph(self, res, vol, line_steps, line_lens, op,
+                          block_size):
+        if vol.dtype == np.float16:
+            _on_half_keys(lambda r, v, o: self.flat_linear_morph(
+                r, v, line_steps, line_lens, o, block_size), res, vol, op)
+            return
+        line_steps = np.array(np.flip(line_steps, axis=1))
+
+        def dilate_erode(res, vol, op):
+            _count_blocks(vol, block_size)
+            ret = _thin.flat_linear_dilate_erode_impl(
+                res.ctypes.data, vol.ctypes.data, line_steps, line_lens,
+                vol.shape[2], vol.shape[1], vol.shape[0],
+                line_lens.shape[0],
+                vol.dtype.num, op,
+                block_size[2], block_size[1], block_size[0])
+            _thin.raise_on_error(ret)
+
+        _compose(dilate_erode, res, vol, op)
+
+
+class CpuBackend(Backend):
+    """Backend which computes on the CPU with NumPy."""
+    name = 'cpu'
+    inplace = True
+    strided = True
+    batched = True
+    #: Blocks which fit in the CPU caches are processed fastest
+    block_bytes = 2**22
+
+    def device_name(self):
+        return '{}-{}-threads'.format(platform.machine(), _cpu.num_threads())
+
+    def flat_morph(self, res, vol, strel, op, block_size):
+        if vol.ndim == 4:
+            strel = strel[None]
+            block_size = _batch_block_size(vol, block_size)
+        _cpu.flat_morph_op(res, vol, strel, op, block_size)
+
+    def gen_morph(self, res, vol, strel, op, block_size):
+        if vol.ndim == 4:
+            strel = strel[None]
+            block_size = _batch_block_size(vol, block_size)
+        _cpu.gen_morph_op(res, vol, strel, op, block_size)
+
+    def gen_offsets_morph(self, res, vol, offsets, weights, op, block_size):
+        if vol.ndim == 4:
+            offsets = np.pad(offsets, [(0, 0), (1, 0)])
+            block_size = _batch_block_size(vol, block_size)
+        _cpu.gen_offsets_morph_op(res, vol, offsets, weights, op, block_size)
+
+    def gen_separable_morph(self, res, vol, profiles, op, block_size):
+        if vol.ndim == 4:
+            block_size = _batch_block_size(vol, block_size)
+        _cpu.gen_separable_morph_op(res, vol, profiles, op, block_size)
+
+    def flat_linear_morph(self, res, vol, line_steps, line_lens, op,
+                          block_size):
+        if vol.ndim == 4:
+            line_steps = np.pad(line_steps, [(0, 0), (1, 0)])
+            block_size = _batch_block_size(vol, block_size)
+        _cpu.flat_linear_morph_op(res, vol, line_steps, line_lens, op,
+                                  block_size)
+
+    def flat_sum_morph(self, res, vol, line_steps, line_lens, strels, op,
+                       block_size):
+        if vol.ndim == 4:
+            line_steps = np.pad(line_steps, [(0, 0), (1, 0)])
+            strels = [strel[None] for strel in strels]
+            block_size = _batch_block_size(vol, block_size)
+        _cpu.flat_sum_morph_op(res, vol, line_steps, line_lens, strels, op,
+                               block_size)
+
+
+def _batch_block_size(vol, block_size):
+    # Put as many whole volumes in a block as the block size allows, so small
+    # volumes are processed together instead of one block each
+    size = [min(b, n) for b, n in zip(block_size, vol.shape[1:])]
+    count = max(1, int(np.prod(block_size)) // int(np.prod(size)))
+    return [count] + list(block_size)
+
+
+def _compose(dilate_erode, res, vol, op):
+    # The library only has dilation and erosion for these structuring
+    # elements, so the other operations need an intermediate volume
+    ops = _cpu.morph_ops(op)
+    if len(ops) == 1:
+        dilate_erode(res, vol, op)
+        return
+    tmp = np.empty_like(vol)
+    _instrument.count(bytes_allocated=tmp.nbytes)
+    dilate_erode(tmp, vol, ops[0])
+    dilate_erode(res, tmp, ops[1])
+    if op == _thin.TOPHAT:
+        _cpu.subtract(vol, res, out=res)
+    elif op == _thin.BOTHAT:
+        _cpu.subtract(res, vol, out=res)
+
+
+def _half_keys(vol, out=None):
+    # Flipping all bits but the sign of negative float16 values reverses
+    # their order, so the keys sort like the values as int16. Applying it to
+    # the keys gives back the values.
+    bits = vol.view(np.int16)
+    mask = bits >> 15
+    mask &= 0x7FFF
+    return np.bitwise_xor(bits, mask, out=out)
+
+
+def _on_half_keys(morph, res, vol, op):
+    # The maximum and minimum of keys are the keys of the maximum and minimum
+    # of the values, so flat operations are exact on keys. The subtraction
+    # for the hats is done on the values.
+    keys = _half_keys(vol)
+    _instrument.count(bytes_allocated=keys.nbytes)
+    base = {_thin.TOPHAT: _thin.OPEN, _thin.BOTHAT: _thin.CLOSE}.get(op, op)
+    res_keys = res.view(np.int16)
+    morph(res_keys, keys, base)
+    # Voxels without any offset inside the volume hold the int16 identity,
+    # which is not the key of an infinity but of a NaN
+    info = np.iinfo(np.int16)
+    lowest = res_keys == info.min
+    highest = res_keys == info.max
+    _half_keys(res, out=res_keys)
+    np.putmask(res, lowest, -np.inf)
+    np.putmask(res, highest, np.inf)
+    if op == _thin.TOPHAT:
+        _cpu.subtract(vol, res, out=res)
+    elif op == _thin.BOTHAT:
+        _cpu.subtract(res, vol, out=res)
+
+
+def _on_float32_slabs(morph, res, vol, halo, size):
+    # Only one slab along the first axis is converted at a time, with enough
+    # voxels around it that the result inside it is exact
+    before, after = halo[0][0], halo[1][0]
+    for start in range(0, vol.shape[0], size):
+        stop = min(start + size, vol.shape[0])
+        low, high = max(start - before, 0), min(stop + after, vol.shape[0])
+        slab = vol[low:high].astype(np.float32)
+        out = np.empty_like(slab)
+        _instrument.count(bytes_allocated=2 * slab.nbytes)
+        morph(out, slab)
+        res[start:stop] = out[start - low:stop - low]
+
+
+def _count_blocks(vol, block_size, passes=1):
+    # The library picks the blocks itself, so this is only an estimate
+    blocks = np.prod([-(-n // b) for n, b in zip(vol.shape, block_size)])
+    _instrument.count(blocks=passes * blocks)
+
+
+_registry = {}
+_default = AUTO
+_current = contextvars.ContextVar('pygorpho_backend', default=None)
+
+
+def register_backend(backend):
+    """
+    Register a backend so it can be selected by name.
+
+    Parameters
+    ----------
+    backend
+        Instance of a ``Backend`` subclass. It is registered under
+        ``backend.name`` and replaces any backend with the same name.
+
+    Example
+    -------
+    .. code-block:: python
+        :dedent: 4
+
+        >>> import pygorpho as pg
+        >>> class MyBackend(pg.backend.CpuBackend):
+        ...     name = 'mine'
+        >>> pg.backend.register_backend(MyBackend())
+        >>> res = pg.flat.dilate([0, 1, 0], [1, 1, 1], backend='mine')
+    """
+    if not isinstance(backend, Backend) or not backend.name:
+        raise ValueError('backend must be a named Backend instance')
+    _registry[backend.name] = backend
+
+
+def get_backend(name):
+    """
+    Returns the registered backend with the given name.
+
+    Parameters
+    ----------
+    name
+        Name of backend.
+
+    Returns
+    -------
+    Backend
+        The registered backend.
+
+    Raises
+    ------
+    ValueError
+        If no backend is registered with the given name.
+    """
+    try:
+        return _registry[name]
+    except KeyError:
+        raise ValueError('unknown backend: {}'.format(name)) from None
+
+
+def available_backends():
+    """
+    Returns the names of the backends which can be used on this machine.
+
+    Returns
+    -------
+    list
+        Names of available backends, ordered by decreasing priority.
+    """
+    backends = sorted(_registry.values(), key=lambda b: -b.priority)
+    return [b.name for b in backends if b.is_available()]
+
+
+def set_backend(backend):
+    """
+    Set the default backend.
+
+    Parameters
+    ----------
+    backend
+        Name of a registered backend, a ``Backend`` instance, or ``AUTO``.
+    """
+    global _default
+    if isinstance(backend, str) and backend != AUTO:
+        get_backend(backend)  # Fail early for unknown names
+    _default = backend
+
+
+@contextlib.contextmanager
+def use_backend(backend):
+    """
+    Context manager which selects the backend inside a with block.
+
+    Parameters
+    ----------
+    backend
+        Name of a registered backend, a ``Backend`` instance, or ``AUTO``.
+
+    Example
+    -------
+    .. code-block:: python
+        :dedent: 4
+
+        >>> import numpy as np
+        >>> import pygorpho as pg
+        >>> vol = np.zeros((100, 100, 100))
+        >>> with pg.backend.use_backend('cpu'):
+        ...     res = pg.flat.dilate(vol, np.ones((3, 3, 3)))
+    """
+    if isinstance(backend, str) and backend != AUTO:
+        get_backend(backend)  # Fail early for unknown names
+    token = _current.set(backend)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def select_backend(backend=None, vol=None):
+    """
+    Returns the backend to use for an operation.
+
+    Parameters
+    ----------
+    backend
+        Backend requested for the call. If None, the backend from the
+        innermost ``use_backend`` block is used, or else the one given to
+        ``set_backend``.
+    vol
+        Volume to process. Used by the ``AUTO`` policy.
+
+    Returns
+    -------
+    Backend
+        The selected backend.
+
+    Raises
+    ------
+    RuntimeError
+        If the ``AUTO`` policy finds no available backend.
+    """
+    if backend is None:
+        backend = _current.get()
+    if backend is None:
+        backend = _default
+    if isinstance(backend, Backend):
+        return backend
+    if backend != AUTO:
+        return get_backend(backend)
+
+    candidates = sorted(_registry.values(), key=lambda b: -b.priority)
+    for b in candidates:
+        if not b.is_available():
+            continue
+        if vol is not None and (not b.supports(vol.dtype)
+                                or vol.nbytes < b.min_bytes):
+            continue
+        return b
+    for b in candidates:
+        # Let the backend report why it cannot process the volume
+        if b.is_available():
+            return b
+    raise RuntimeError('no backend available')
+
+
+register_backend(CudaBackend())
+register_backend(CpuBackend())
@@ -0,0 +1,188 @@
+"""
+Mathematical morphology on chunked arrays with dask.
+
+The functions take a dask array (or anything ``dask.array.asarray`` accepts,
+such as a zarr array) and return a lazy dask array. Each chunk is processed
+with its neighbors' voxels out to the exact reach of the structuring element
+along each axis, so the result is identical to processing the whole volume
+at once. Requires dask to be installed.
+"""
+
+import numpy as np
+from . import _util
+from . import constants
+from . import flat
+from . import gen
+
+_OPS = [constants.DILATE, constants.ERODE, constants.OPEN, constants.CLOSE,
+        constants.TOPHAT, constants.BOTHAT]
+
+
+def morph(arr, strel, op, chunks='auto', block_size=[256, 256, 256],
+          backend=None):
+    """
+    Morphological operation with flat structuring element on a chunked
+    array.
+
+    Parameters
+    ----------
+    arr
+        Volume to apply operation to. Must be a dask array or convertible to
+        one with ``dask.array.asarray``, and have at most 3 dimensions.
+    strel
+        Structuring element. Must be convertible to numpy array of at most 3
+        dimensions.
+    op
+        Operation to perform. Must be either ``DILATE``, ``ERODE``, ``OPEN``,
+        ``CLOSE``, ``TOPHAT``, ``BOTHAT`` from ``constants``.
+    chunks
+        Chunks to use if arr is not already a dask array.
+    block_size
+        Block size for processing each chunk. See ``flat.morph``.
+    backend
+        Backend to use. See ``flat.morph``.
+
+    Returns
+    -------
+    dask.array.Array
+        Lazy array of same size as arr with the result of the operation.
+
+    Example
+    -------
+    .. code-block:: python
+        :dedent: 4
+
+        >>> import dask.array as da
+        >>> import numpy as np
+        >>> import pygorpho as pg
+        >>> arr = da.from_zarr('ct.zarr')
+        >>> strel = np.ones((11, 11, 11))
+        >>> res = pg.chunked.morph(arr, strel, pg.OPEN)
+        >>> res.to_zarr('opened.zarr')
+    """
+    assert(op in _OPS)
+    strel = np.atleast_3d(np.asarray(strel, dtype=np.bool_))
+
+    def func(block):
+        return flat.morph(block, strel, op, block_size, backend)
+
+    return _map_overlap(func, arr, _util.strel_halo(strel.shape, op), chunks)
+
+
+def linear_morph(arr, line_steps, line_lens, op, chunks='auto',
+                 block_size=[256, 256, 512], backend=None):
+    """
+    Morphological operation with flat line segment structuring elements on
+    a chunked array.
+
+    Parameters
+    ----------
+    arr
+        Volume to apply operation to. Must be a dask array or convertible to
+        one with ``dask.array.asarray``, and have at most 3 dimensions.
+    line_steps
+        Step vector for each line segment. See ``flat.linear_morph``.
+    line_lens
+        Length of each line segment. See ``flat.linear_morph``.
+    op
+        Operation to perform. Must be either ``DILATE``, ``ERODE``, ``OPEN``,
+        ``CLOSE``, ``TOPHAT``, ``BOTHAT`` from ``constants``.
+    chunks
+        Chunks to use if arr is not already a dask array.
+    block_size
+        Block size for processing each chunk. See ``flat.linear_morph``.
+    backend
+        Backend to use. See ``flat.linear_morph``.
+
+    Returns
+    -------
+    dask.array.Array
+        Lazy array of same size as arr with the result of the operation.
+
+    Example
+    -------
+    .. code-block:: python
+        :dedent: 4
+
+        >>> import dask.array as da
+        >>> import pygorpho as pg
+        >>> arr = da.from_zarr('ct.zarr')
+        >>> lineSteps, lineLens = pg.strel.flat_ball_approx(15)
+        >>> res = pg.chunked.linear_morph(arr, lineSteps, lineLens,
+        ...                               pg.CLOSE)
+    """
+    assert(op in _OPS)
+    line_steps = np.atleast_2d(np.asarray(line_steps, dtype=np.int32))
+    line_lens = np.atleast_1d(np.asarray(line_lens, dtype=np.int32))
+    assert line_steps.ndim == 2
+    assert line_steps.shape[1] == 3
+    assert line_steps.shape[0] == line_lens.shape[0]
+
+    def func(block):
+        return flat.linear_morph(block, line_steps, line_lens, op,
+                                 block_size, backend)
+
+    halo = _util.lines_halo(line_steps, line_lens, op)
+    return _map_overlap(func, arr, halo, chunks)
+
+
+def gen_morph(arr, strel, op, chunks='auto', block_size=[256, 256, 256],
+              backend=None):
+    """
+    Morphological operation with general (grayscale) structuring element on
+    a chunked array.
+
+    Parameters
+    ----------
+    arr
+        Volume to apply operation to. Must be a dask array or convertible to
+        one with ``dask.array.asarray``, and have at most 3 dimensions.
+    strel
+        Structuring element. Must be convertible to numpy array of at most 3
+        dimensions.
+    op
+        Operation to perform. Must be either ``DILATE``, ``ERODE``, ``OPEN``,
+        ``CLOSE``, ``TOPHAT``, ``BOTHAT`` from ``constants``.
+    chunks
+        Chunks to use if arr is not already a dask array.
+    block_size
+        Block size for processing each chunk. See ``gen.morph``.
+    backend
+        Backend to use. See ``gen.morph``.
+
+    Returns
+    -------
+    dask.array.Array
+        Lazy array of same size as arr with the result of the operation.
+    """
+    assert(op in _OPS)
+    strel = np.atleast_3d(np.asarray(strel))
+
+    def func(block):
+        return gen.morph(block, strel, op, block_size, backend)
+
+    return _map_overlap(func, arr, _util.strel_halo(strel.shape, op), chunks)
+
+
+def _map_overlap(func, arr, halo, chunks):
+    """
+    Apply func to each chunk of arr extended by the halo.
+
+    The halo is given as 3D (before, after) arrays and mapped to the axes of
+    arr the same way numpy.atleast_3d adds axes. Voxels beyond the edge of
+    arr are not added, since the operations ignore them anyway.
+    """
+    try:
+        import dask.array as da
+    except ImportError:
+        raise ImportError('pygorpho.chunked requires dask') from None
+
+    arr = da.asarray(arr, chunks=chunks)
+    if arr.ndim > 3:
+        raise ValueError('arr must have at most 3 dimensions')
+    # Axes of the 3D volume which the axes of arr end up as
+    axes = [[], [1], [0, 1], [0, 1, 2]][arr.ndim]
+    before, after = halo
+    depth = {i: int(max(before[a], after[a])) for i, a in enumerate(axes)}
+    return da.map_overlap(func, arr, depth=depth, boundary='none',
+                          dtype=arr.dtype)
@@ -0,0 +1,227 @@
+"""
+Exact Euclidean ball morphology on binary volumes with distance transforms.
+
+A voxel is in the dilation of a binary volume with a ball of radius r if
+it is at most r from a True voxel, and in the erosion if it is more than r
+from a False voxel. Both are computed from a separable Euclidean distance
+transform [FH12]_, so the cost does not depend on the radius. The ball is
+the set of offsets which are at most r from the center, measured with the
+voxel spacing, which may differ between axes. As for ``flat.morph``,
+voxels outside the volume are ignored.
+
+A distance map can be returned and passed back in, so dilations or
+erosions with many radii only need one distance transform. All
+computations are done on the CPU with NumPy.
+
+Example
+-------
+.. code-block:: python
+    :dedent: 4
+
+    >>> import numpy as np
+    >>> import pygorpho as pg
+    >>> vol = np.random.rand(100, 100, 100) < 0.001
+    >>> res, dist = pg.distance.ball_dilate(vol, 20, return_distance=True)
+    >>> # Reuse the distance map for other radii
+    >>> res30 = pg.distance.ball_dilate(vol, 30, distance=dist)
+"""
+
+import numpy as np
+from . import _envelope
+from . import constants
+
+# Relative tolerance on the radius, so offsets exactly at the radius are in
+# the ball however the squared distances are rounded
+_TOLERANCE = 1e-12
+
+
+def edt(vol, spacing=None):
+    """
+    Euclidean distance transform.
+
+    Parameters
+    ----------
+    vol
+        Volume to transform. Must be convertible to numpy array of at most 3
+        dimensions. Nonzero values are True.
+    spacing
+        Distance between voxels along each axis, either a number or a
+        sequence with one number per dimension of vol. Default is 1.
+
+    Returns
+    -------
+    numpy.array
+        Volume of same size as vol with the distance from each voxel to the
+        nearest False voxel, which is 0 for False voxels and inf everywhere
+        if vol has no False voxels.
+
+    Example
+    -------
+    .. code-block:: python
+        :dedent: 4
+
+        >>> import numpy as np
+        >>> import pygorpho as pg
+        >>> vol = np.ones((5, 5, 5), dtype=bool)
+        >>> vol[2, 2, 2] = False
+        >>> dist = pg.distance.edt(vol, spacing=(2.0, 1.0, 1.0))
+        >>> float(dist[0, 2, 2])
+        4.0
+    """
+    vol = np.asarray(vol)
+    return np.sqrt(_squared_edt(vol, spacing))
+
+
+def ball_morph(vol, radius, op, spacing=None, distance=None,
+               return_distance=False):
+    """
+    Morphological operation on a binary volume with an exact Euclidean ball.
+
+    Parameters
+    ----------
+    vol
+        Volume to apply operation to. Must be convertible to numpy array of
+        at most 3 dimensions. Nonzero values are True.
+    radius
+        Non-negative radius of the ball, in the units of spacing.
+    op
+        Operation to perform. Must be either ``DILATE``, ``ERODE``, ``OPEN``
+        or ``CLOSE`` from ``constants``.
+    spacing
+        Distance between voxels along each axis. See ``edt``.
+    distance
+        Distance map returned by an earlier call with the same vol, spacing
+        and op, or None. Saves the first distance transform.
+    return_distance
+        Whether to also return the distance map from the first distance
+        transform. For ``DILATE`` and ``CLOSE`` it holds the distance to the
+        nearest True voxel, and for ``ERODE`` and ``OPEN`` the distance to
+        the nearest False voxel.
+
+    Returns
+    -------
+    numpy.array or (numpy.array, numpy.array)
+        Boolean volume of same size as vol with the result of the operation,
+        and the distance map if return_distance is True.
+
+    Example
+    -------
+    .. code-block:: python
+        :dedent: 4
+
+        >>> import numpy as np
+        >>> import pygorpho as pg
+        >>> vol = np.zeros((200, 200, 200), dtype=bool)
+        >>> vol[50:150, 50:150, 50:150] = True
+        >>> # Round the corners of the cube
+        >>> res = pg.distance.ball_morph(vol, 40, pg.OPEN)
+    """
+    assert(op in [constants.DILATE, constants.ERODE, constants.OPEN,
+                  constants.CLOSE])
+    if radius < 0:
+        raise ValueError('radius must be non-negative')
+    vol = np.asarray(vol).astype(np.bool_, copy=False)
+    limit = _limit(radius)
+    first_dilates = op == constants.DILATE or op == constants.CLOSE
+
+    if distance is None:
+        squared = _squared_edt(~vol if first_dilates else vol, spacing)
+    else:
+        distance = np.asarray(distance)
+        if distance.shape != vol.shape:
+            raise ValueError('distance must have same shape as vol')
+        squared = distance ** 2
+    if first_dilates:
+        res = squared <= limit
+    else:
+        res = squared > limit
+
+    if op == constants.OPEN:
+        res = _squared_edt(~res, spacing) <= limit
+    elif op == constants.CLOSE:
+        res = _squared_edt(res, spacing) > limit
+    if return_distance:
+        return res, (np.sqrt(squared) if distance is None else distance)
+    return res
+
+
+def ball_dilate(vol, radius, spacing=None, distance=None,
+                return_distance=False):
+    """Dilation with an exact Euclidean ball. See ``ball_morph``."""
+    return ball_morph(vol, radius, constants.DILATE, spacing, distance,
+                      return_distance)
+
+
+def ball_erode(vol, radius, spacing=None, distance=None,
+               return_distance=False):
+    """Erosion with an exact Euclidean ball. See ``ball_morph``."""
+    return ball_morph(vol, radius, constants.ERODE, spacing, distance,
+                      return_distance)
+
+
+def ball_open(vol, radius, spacing=None, distance=None,
+              return_distance=False):
+    """Opening with an exact Euclidean ball. See ``ball_morph``."""
+    return ball_morph(vol, radius, constants.OPEN, spacing, distance,
+                      return_distance)
+
+
+def ball_close(vol, radius, spacing=None, distance=None,
+               return_distance=False):
+    """Closing with an exact Euclidean ball. See ``ball_morph``."""
+    return ball_morph(vol, radius, constants.CLOSE, spacing, distance,
+                      return_distance)
+
+
+def ball(radius, spacing=None, ndim=3):
+    """
+    Returns the ball used by ``ball_morph`` as a structuring element.
+
+    Parameters
+    ----------
+    radius
+        Non-negative radius of the ball, in the units of spacing.
+    spacing
+        Distance between voxels along each axis. See ``edt``.
+    ndim
+        Number of dimensions.
+
+    Returns
+    -------
+    numpy.array
+        Boolean array with odd size along each axis, which is True at the
+        offsets at most radius from the center, up to a relative tolerance
+        of 1e-12 so offsets exactly at the radius are included.
+    """
+    spacing = _spacing(spacing, ndim)
+    reach = [int(np.floor(radius / s * (1 + _TOLERANCE))) for s in spacing]
+    grids = np.meshgrid(*[np.arange(-r, r + 1) * s
+                          for r, s in zip(reach, spacing)], indexing='ij')
+    return sum(g ** 2 for g in grids) <= _limit(radius)
+
+
+def _limit(radius):
+    """Returns the largest squared distance which is in the ball."""
+    return float(radius) ** 2 * (1 + _TOLERANCE) ** 2
+
+
+def _spacing(spacing, ndim):
+    if spacing is None:
+        return [1.0] * ndim
+    spacing = np.atleast_1d(np.asarray(spacing, dtype=np.float64))
+    if spacing.size == 1:
+        spacing = np.repeat(spacing, ndim)
+    if spacing.shape != (ndim,) or np.any(spacing <= 0):
+        raise ValueError('spacing must be positive with one value per axis')
+    return [float(s) for s in spacing]
+
+
+def _squared_edt(vol, spacing):
+    """Returns the squared distance from each voxel to the nearest False."""
+    if vol.ndim > 3:
+        raise ValueError('vol must have at most 3 dimensions')
+    spacing = _spacing(spacing, vol.ndim)
+    res = np.where(vol, np.inf, 0.0)
+    for axis, s in enumerate(spacing):
+        res = _envelope.parabola_min(res, axis, s ** 2)
+    return res
@@ -1,11 +1,19 @@
 """Mathematical morphology with flat (binary) structuring elements."""
 
 import numpy as np
-from . import _thin
+from . import _decompose
+from . import _instrument
+from . import _rank
+from . import _tune
+from . import _util
 from . import constants
+from .backend import select_backend
+from .strel import nested_ball_approx
 
 
-def morph(vol, strel, op, block_size=[256, 256, 256]):
+@_instrument.instrumented('flat.morph', 2)
+def morph(vol, strel, op, block_size=[256, 256, 256], backend=None, out=None,
+          decompose=True, tolerance=0.0):
     """
     Morphological operation with flat structuring element.
 
@@ -22,13 +30,45 @@ def morph(vol, strel, op, block_size=[256, 256, 256]):
         ``CLOSE``, ``TOPHAT``, ``CLOSE`` from ``constants``.
     block_size
         Block size for GPU processing. Volume is sent to the GPU in blocks of
-        this size.
+        this size. If ``'auto'``, the size is chosen automatically. See
+        ``pygorpho.tune``.
+    backend
+        Backend to use. Must be the name of a registered backend, a
+        ``Backend`` instance or ``AUTO``. If None, the current default is
+        used. See ``pygorpho.backend``.
+    out
+        Array to write the result into, which is then returned. Must have the
+        same shape and dtype as vol. May be vol itself.
+    decompose
+        Whether to decompose strel into line segments if possible. See
+        ``strel.decompose``. The search is done on the first call with each
+        structuring element and cached. It returns right away for most
+        structuring elements without a decomposition, such as digital balls,
+        but takes a fraction of a second for large decomposable ones, such as
+        an octahedron of radius 30. Pass False to skip it.
+    tolerance
+        Largest allowed difference between strel and its decomposition, as a
+        fraction of the number of voxels in strel. If 0, only exact
+        decompositions are used.
 
     Returns
     -------
     numpy.array
         Volume of same size as vol with the result of the operation.
 
+    Notes
+    -----
+    With the ``AUTO`` backend, the operation is computed on the CPU with
+    NumPy if no CUDA device is available or the volume is small. The results
+    are identical.
+
+    Structuring elements which are Minkowski sums of line segments and small
+    crosses, such as boxes and octahedra, are applied one part at a time when
+    this needs fewer passes over the volume. Long line segments are done with
+    the van Herk/Gil-Werman algorithm, so the cost for a box does not grow
+    with its size. The result is the same as for the whole structuring
+    element.
+
     Example
     -------
     .. code-block:: python
@@ -52,21 +92,114 @@ def morph(vol, strel, op, block_size=[256, 256, 256]):
     strel = np.atleast_3d(np.asarray(strel, dtype=np.bool_))
 
     # Prepare output volume
-    vol_size = vol.shape
-    res = np.empty_like(vol)
+    res = _util.prepare_output(vol, out)
 
-    ret = _thin.flat_morph_op_impl(
-        res.ctypes.data, vol.ctypes.data, strel,
-        vol_size[2], vol_size[1], vol_size[0],
-        strel.shape[2], strel.shape[1], strel.shape[0],
-        vol.dtype.num, op,
-        block_size[2], block_size[1], block_size[0])
-    _thin.raise_on_error(ret)
+    impl = select_backend(backend, vol)
+    halo = _util.strel_halo(strel.shape, op)
+    block_size = _tune.resolve(block_size, impl, 'flat.morph', vol, op, halo)
+    func = _morph_func(impl, op, decompose, tolerance)
+    _util.run_backend(func, impl, res, vol, strel, block_size)
 
-    return np.resize(res, old_shape)
+    return res.reshape(old_shape) if out is None else out
 
 
-def dilate(vol, strel, block_size=[256, 256, 256]):
+@_instrument.instrumented('flat.morph_batch', 2)
+def morph_batch(vols, strel, op, block_size=[256, 256, 256], backend=None,
+                out=None, decompose=True, tolerance=0.0):
+    """
+    Morphological operation with flat structuring element on a batch of
+    volumes.
+
+    Gives the same result as calling ``morph`` on each volume, but the
+    arguments are only checked and prepared once for the whole batch.
+
+    Parameters
+    ----------
+    vols
+        Volumes to apply operation to. Must be convertible to numpy array
+        where the first axis indexes the volumes, such as an (N, Z, Y, X)
+        array or a list of volumes with the same shape. Each volume may have
+        at most 3 dimensions.
+    strel
+        Structuring element. Must be convertible to numpy array of at most 3
+        dimensions.
+    op
+        Operation to perform. Must be either ``DILATE``, ``ERODE``, ``OPEN``,
+        ``CLOSE``, ``TOPHAT``, ``BOTHAT`` from ``constants``.
+    block_size
+        Block size for processing each volume. See ``morph``.
+    backend
+        Backend to use. See ``morph``.
+    out
+        Array to write the results into, which is then returned. Must have
+        the same shape and dtype as vols. May be vols itself.
+    decompose
+        Whether to decompose strel into line segments if possible. See
+        ``morph``.
+    tolerance
+        Largest allowed difference between strel and its decomposition. See
+        ``morph``.
+
+    Returns
+    -------
+    numpy.array
+        Volumes of same size as vols with the results of the operation.
+
+    Notes
+    -----
+    The CPU backend processes the whole batch at once, with several small
+    volumes in each block. Other backends are called once for each volume.
+    In particular, the CUDA backend makes one library call, with its own
+    transfers to and from the GPU, for each volume, so it gains nothing over
+    calling ``morph`` in a loop. For many small volumes the CPU backend is
+    usually faster.
+
+    Example
+    -------
+    .. code-block:: python
+        :dedent: 4
+
+        >>> import numpy as np
+        >>> import pygorpho as pg
+        >>> patches = np.random.rand(10000, 64, 64, 64)
+        >>> res = pg.flat.morph_batch(patches, np.ones((5, 5, 5)), pg.OPEN)
+    """
+    assert(op in [constants.DILATE, constants.ERODE, constants.OPEN,
+                  constants.CLOSE, constants.TOPHAT, constants.BOTHAT])
+
+    # Recast inputs to correct datatype
+    vols = np.asarray(vols)
+    old_shape = vols.shape
+    vols = _util.atleast_3d_batch(vols)
+    strel = np.atleast_3d(np.asarray(strel, dtype=np.bool_))
+
+    # Prepare output volumes
+    res = _util.prepare_output(vols, out, batch=True)
+
+    impl = select_backend(backend, vols)
+    halo = _util.strel_halo(strel.shape, op)
+    block_size = _tune.resolve(block_size, impl, 'flat.morph_batch', vols, op,
+                               halo)
+    func = _morph_func(impl, op, decompose, tolerance)
+    _util.run_backend(func, impl, res, vols, strel, block_size, batch=True)
+
+    return res.reshape(old_shape) if out is None else out
+
+
+def _morph_func(impl, op, decompose, tolerance):
+    """Returns a function which calls impl for morph and morph_batch."""
+    def func(res, vol, strel, block_size):
+        parts = _decompose.plan(strel, tolerance) if decompose else None
+        _instrument.checkpoint('decompose')
+        if parts is None:
+            impl.flat_morph(res, vol, strel, op, block_size)
+        else:
+            impl.flat_sum_morph(res, vol, *parts, op, block_size)
+
+    return func
+
+
+def dilate(vol, strel, block_size=[256, 256, 256], backend=None, out=None):
     """
     Dilation with flat structuring element.
 
@@ -80,7 +213,15 @@ def dilate(vol, strel, block_size=[256, 256, 256]):
         dimensions.
     block_size
         Block size for GPU processing. Volume is sent to the GPU in blocks of
-        this size.
+        this size. If ``'auto'``, the size is chosen automatically. See
+        ``pygorpho.tune``.
+    backend
+        Backend to use. Must be the name of a registered backend, a
+        ``Backend`` instance or ``AUTO``. If None, the current default is
+        used. See ``pygorpho.backend``.
+    out
+        Array to write the result into, which is then returned. Must have the
+        same shape and dtype as vol. May be vol itself.
 
     Returns
     -------
@@ -100,10 +241,10 @@ def dilate(vol, strel, block_size=[256, 256, 256]):
         >>> strel = np.ones((11, 11, 11))
         >>> res = pg.flat.dilate(vol, strel)
     """
-    return morph(vol, strel, constants.DILATE, block_size)
+    return morph(vol, strel, constants.DILATE, block_size, backend, out)
 
 
-def erode(vol, strel, block_size=[256, 256, 256]):
+def erode(vol, strel, block_size=[256, 256, 256], backend=None, out=None):
     """
     Erosion with flat structuring element.
 
@@ -117,7 +258,15 @@ def erode(vol, strel, block_size=[256, 256, 256]):
         dimensions.
     block_size
         Block size for GPU processing. Volume is sent to the GPU in blocks of
-        this size.
+        this size. If ``'auto'``, the size is chosen automatically. See
+        ``pygorpho.tune``.
+    backend
+        Backend to use. Must be the name of a registered backend, a
+        ``Backend`` instance or ``AUTO``. If None, the current default is
+        used. See ``pygorpho.backend``.
+    out
+        Array to write the result into, which is then returned. Must have the
+        same shape and dtype as vol. May be vol itself.
 
     Returns
     -------
@@ -137,10 +286,10 @@ def erode(vol, strel, block_size=[256, 256, 256]):
         >>> strel = np.ones((11, 11, 11))
         >>> res = pg.flat.erode(vol, strel)
     """
-    return morph(vol, strel, constants.ERODE, block_size)
+    return morph(vol, strel, constants.ERODE, block_size, backend, out)
 
 
-def open(vol, strel, block_size=[256, 256, 256]):
+def open(vol, strel, block_size=[256, 256, 256], backend=None, out=None):
     """
     Opening with flat structuring element.
 
@@ -154,7 +303,15 @@ def open(vol, strel, block_size=[256, 256, 256]):
         dimensions.
     block_size
         Block size for GPU processing. Volume is sent to the GPU in blocks of
-        this size.
+        this size. If ``'auto'``, the size is chosen automatically. See
+        ``pygorpho.tune``.
+    backend
+        Backend to use. Must be the name of a registered backend, a
+        ``Backend`` instance or ``AUTO``. If None, the current default is
+        used. See ``pygorpho.backend``.
+    out
+        Array to write the result into, which is then returned. Must have the
+        same shape and dtype as vol. May be vol itself.
 
     Returns
     -------
@@ -175,10 +332,10 @@ def open(vol, strel, block_size=[256, 256, 256]):
         >>> strel = np.ones((11, 11, 11))
         >>> res = pg.flat.open(vol, strel)
     """
-    return morph(vol, strel, constants.OPEN, block_size)
+    return morph(vol, strel, constants.OPEN, block_size, backend, out)
 
 
-def close(vol, strel, block_size=[256, 256, 256]):
+def close(vol, strel, block_size=[256, 256, 256], backend=None, out=None):
     """
     Closing with flat structuring element.
 
@@ -192,7 +349,15 @@ def close(vol, strel, block_size=[256, 256, 256]):
         dimensions.
     block_size
         Block size for GPU processing. Volume is sent to the GPU in blocks of
-        this size.
+        this size. If ``'auto'``, the size is chosen automatically. See
+        ``pygorpho.tune``.
+    backend
+        Backend to use. Must be the name of a registered backend, a
+        ``Backend`` instance or ``AUTO``. If None, the current default is
+        used. See ``pygorpho.backend``.
+    out
+        Array to write the result into, which is then returned. Must have the
+        same shape and dtype as vol. May be vol itself.
 
     Returns
     -------
@@ -213,10 +378,10 @@ def close(vol, strel, block_size=[256, 256, 256]):
         >>> strel = np.ones((11, 11, 11))
         >>> res = pg.flat.close(vol, strel)
     """
-    return morph(vol, strel, constants.CLOSE, block_size)
+    return morph(vol, strel, constants.CLOSE, block_size, backend, out)
 
 
-def tophat(vol, strel, block_size=[256, 256, 256]):
+def tophat(vol, strel, block_size=[256, 256, 256], backend=None, out=None):
     """
     Top-hat transform with flat structuring element.
 
@@ -233,7 +398,15 @@ def tophat(vol, strel, block_size=[256, 256, 256]):
         dimensions.
     block_size
         Block size for GPU processing. Volume is sent to the GPU in blocks of
-        this size.
+        this size. If ``'auto'``, the size is chosen automatically. See
+        ``pygorpho.tune``.
+    backend
+        Backend to use. Must be the name of a registered backend, a
+        ``Backend`` instance or ``AUTO``. If None, the current default is
+        used. See ``pygorpho.backend``.
+    out
+        Array to write the result into, which is then returned. Must have the
+        same shape and dtype as vol. May be vol itself.
 
     Returns
     -------
@@ -254,10 +427,10 @@ def tophat(vol, strel, block_size=[256, 256, 256]):
         >>> strel = np.ones((11, 11, 11))
         >>> res = pg.flat.tophat(vol, strel)
     """
-    return morph(vol, strel, constants.TOPHAT, block_size)
+    return morph(vol, strel, constants.TOPHAT, block_size, backend, out)
 
 
-def bothat(vol, strel, block_size=[256, 256, 256]):
+def bothat(vol, strel, block_size=[256, 256, 256], backend=None, out=None):
     """
     Bot-hat transform with flat structuring element.
 
@@ -274,7 +447,15 @@ def bothat(vol, strel, block_size=[256, 256, 256]):
         dimensions.
     block_size
         Block size for GPU processing. Volume is sent to the GPU in blocks of
-        this size.
+        this size. If ``'auto'``, the size is chosen automatically. See
+        ``pygorpho.tune``.
+    backend
+        Backend to use. Must be the name of a registered backend, a
+        ``Backend`` instance or ``AUTO``. If None, the current default is
+        used. See ``pygorpho.backend``.
+    out
+        Array to write the result into, which is then returned. Must have the
+        same shape and dtype as vol. May be vol itself.
 
     Returns
     -------
@@ -295,10 +476,12 @@ def bothat(vol, strel, block_size=[256, 256, 256]):
         >>> strel = np.ones((11, 11, 11))
         >>> res = pg.flat.bothat(vol, strel)
     """
-    return morph(vol, strel, constants.BOTHAT, block_size)
+    return morph(vol, strel, constants.BOTHAT, block_size, backend, out)
 
 
-def linear_morph(vol, line_steps, line_lens, op, block_size=[256, 256, 512]):
+@_instrument.instrumented('flat.linear_morph', 3)
+def linear_morph(vol, line_steps, line_lens, op, block_size=[256, 256, 512],
+                 backend=None, out=None):
     """
     Morphological operation with flat line segment structuring elements.
 
@@ -322,17 +505,34 @@ def linear_morph(vol, line_steps, line_lens, op, block_size=[256, 256, 512]):
         Length or sequence of lengths. Controls the length of the line
         segments. A length of 0 leaves the volume unchanged.
     op
-        Operation to perform for all line segments. Must be either ``DILATE``
-        or ``ERODE`` from ``constants``.
+        Operation to perform. Must be either ``DILATE``, ``ERODE``, ``OPEN``,
+        ``CLOSE``, ``TOPHAT``, ``BOTHAT`` from ``constants``. For ``OPEN``,
+        ``CLOSE``, ``TOPHAT`` and ``BOTHAT``, all line segments are applied
+        for the first of the two operations before the second.
     block_size
         Block size for GPU processing. Volume is sent to the GPU in blocks of
-        this size.
+        this size. If ``'auto'``, the size is chosen automatically. See
+        ``pygorpho.tune``.
+    backend
+        Backend to use. Must be the name of a registered backend, a
+        ``Backend`` instance or ``AUTO``. If None, the current default is
+        used. See ``pygorpho.backend``.
+    out
+        Array to write the result into, which is then returned. Must have the
+        same shape and dtype as vol. May be vol itself.
 
     Returns
     -------
     numpy.array
         Volume of same size as vol with the result of the operation.
 
+    Notes
+    -----
+    With the ``AUTO`` backend, the operation is computed on the CPU if no CUDA
+    device is available or the volume is small. The volume is then split into
+    blocks of at most block_size, which are processed in parallel by
+    ``PYGORPHO_NUM_THREADS`` threads (default: the number of CPUs).
+
     Example
     -------
     .. code-block:: python
@@ -357,7 +557,8 @@ def linear_morph(vol, line_steps, line_lens, op, block_size=[256, 256, 512]):
        filters," IEEE Transactions on Pattern Analysis and Machine
        Intelligence 24. (pp. 504-507). 1993.
     """
-    assert (op == constants.DILATE or op == constants.ERODE)
+    assert(op in [constants.DILATE, constants.ERODE, constants.OPEN,
+                  constants.CLOSE, constants.TOPHAT, constants.BOTHAT])
 
     # Recast inputs to correct datatype
     vol = np.asarray(vol)
@@ -370,24 +571,107 @@ def linear_morph(vol, line_steps, line_lens, op, block_size=[256, 256, 512]):
     assert line_steps.shape[1] == 3
     assert line_steps.shape[0] == line_lens.shape[0]
 
-    line_steps = np.array(np.flip(line_steps, axis=1))
-
     # Prepare output volume
-    vol_size = vol.shape
-    res = np.empty_like(vol)
+    res = _util.prepare_output(vol, out)
+
+    impl = select_backend(backend, vol)
+    halo = _util.lines_halo(line_steps, line_lens, op)
+    block_size = _tune.resolve(block_size, impl, 'flat.linear_morph', vol, op,
+                               halo)
+    func = lambda r, v, s, b: impl.flat_linear_morph(r, v, s, line_lens, op, b)
+    _util.run_backend(func, impl, res, vol, line_steps, block_size)
+
+    return res.reshape(old_shape) if out is None else out
+
+
+@_instrument.instrumented('flat.linear_morph_batch', 3)
+def linear_morph_batch(vols, line_steps, line_lens, op,
+                       block_size=[256, 256, 512], backend=None, out=None):
+    """
+    Morphological operation with flat line segment structuring elements on a
+    batch of volumes.
 
-    ret = _thin.flat_linear_dilate_erode_impl(
-        res.ctypes.data, vol.ctypes.data, line_steps, line_lens,
-        vol_size[2], vol_size[1], vol_size[0],
-        line_lens.shape[0],
-        vol.dtype.num, op,
-        block_size[2], block_size[1], block_size[0])
-    _thin.raise_on_error(ret)
+    Gives the same result as calling ``linear_morph`` on each volume, but the
+    arguments are only checked and prepared once for the whole batch.
 
-    return np.resize(res, old_shape)
+    Parameters
+    ----------
+    vols
+        Volumes to apply operation to. Must be convertible to numpy array
+        where the first axis indexes the volumes, such as an (N, Z, Y, X)
+        array or a list of volumes with the same shape. Each volume may have
+        at most 3 dimensions.
+    line_steps
+        Step vector or sequence of step vectors. See ``linear_morph``.
+    line_lens
+        Length or sequence of lengths. See ``linear_morph``.
+    op
+        Operation to perform. Must be either ``DILATE``, ``ERODE``, ``OPEN``,
+        ``CLOSE``, ``TOPHAT``, ``BOTHAT`` from ``constants``.
+    block_size
+        Block size for processing each volume. See ``linear_morph``.
+    backend
+        Backend to use. See ``linear_morph``.
+    out
+        Array to write the results into, which is then returned. Must have
+        the same shape and dtype as vols. May be vols itself.
+
+    Returns
+    -------
+    numpy.array
+        Volumes of same size as vols with the results of the operation.
 
+    Notes
+    -----
+    The CPU backend processes the whole batch at once, with several small
+    volumes in each block. Other backends are called once for each volume.
+    In particular, the CUDA backend makes one library call, with its own
+    transfers to and from the GPU, for each volume, so it gains nothing over
+    calling ``linear_morph`` in a loop. For many small volumes the CPU
+    backend is usually faster.
 
-def linear_dilate(vol, line_steps, line_lens, block_size=[256, 256, 512]):
+    Example
+    -------
+    .. code-block:: python
+        :dedent: 4
+
+        >>> import numpy as np
+        >>> import pygorpho as pg
+        >>> patches = [np.random.rand(64, 64, 64) for _ in range(100)]
+        >>> lineSteps, lineLens = pg.strel.flat_ball_approx(7)
+        >>> res = pg.flat.linear_morph_batch(patches, lineSteps, lineLens,
+        ...                                  pg.CLOSE)
+    """
+    assert(op in [constants.DILATE, constants.ERODE, constants.OPEN,
+                  constants.CLOSE, constants.TOPHAT, constants.BOTHAT])
+
+    # Recast inputs to correct datatype
+    vols = np.asarray(vols)
+    old_shape = vols.shape
+    vols = _util.atleast_3d_batch(vols)
+    line_steps = np.atleast_2d(
+        np.asarray(line_steps, dtype=np.int32, order='C'))
+    line_lens = np.atleast_1d(np.asarray(line_lens, dtype=np.int32))
+    assert line_steps.ndim == 2
+    assert line_steps.shape[1] == 3
+    assert line_steps.shape[0] == line_lens.shape[0]
+
+    # Prepare output volumes
+    res = _util.prepare_output(vols, out, batch=True)
+
+    impl = select_backend(backend, vols)
+    halo = _util.lines_halo(line_steps, line_lens, op)
+    block_size = _tune.resolve(block_size, impl, 'flat.linear_morph_batch',
+                               vols, op, halo)
+    func = lambda r, v, s, b: impl.flat_linear_morph(r, v, s, line_lens, op, b)
+    _util.run_backend(func, impl, res, vols, line_steps, block_size,
+                      batch=True)
+
+    return res.reshape(old_shape) if out is None else out
+
+
+def linear_dilate(vol, line_steps, line_lens, block_size=[256, 256, 512],
+                  backend=None, out=None):
     """
     Dilation with flat line segment structuring elements.
 
@@ -411,7 +695,15 @@ def linear_dilate(vol, line_steps, line_lens, block_size=[256, 256, 512]):
         segments. A length of 0 leaves the volume unchanged.
     block_size
         Block size for GPU processing. Volume is sent to the GPU in blocks of
-        this size.
+        this size. If ``'auto'``, the size is chosen automatically. See
+        ``pygorpho.tune``.
+    backend
+        Backend to use. Must be the name of a registered backend, a
+        ``Backend`` instance or ``AUTO``. If None, the current default is
+        used. See ``pygorpho.backend``.
+    out
+        Array to write the result into, which is then returned. Must have the
+        same shape and dtype as vol. May be vol itself.
 
     Returns
     -------
@@ -433,10 +725,11 @@ def linear_dilate(vol, line_steps, line_lens, block_size=[256, 256, 512]):
         >>> res = pg.flat.linear_dilate(vol, lineSteps, lineLens)
     """
     return linear_morph(vol, line_steps, line_lens, constants.DILATE,
-                        block_size)
+                        block_size, backend, out)
 
 
-def linear_erode(vol, line_steps, line_lens, block_size=[256, 256, 512]):
+def linear_erode(vol, line_steps, line_lens, block_size=[256, 256, 512],
+                 backend=None, out=None):
     """
     Erosion with flat line segment structuring elements.
 
@@ -460,7 +753,15 @@ def linear_erode(vol, line_steps, line_lens, block_size=[256, 256, 512]):
         segments. A length of 0 leaves the volume unchanged.
     block_size
         Block size for GPU processing. Volume is sent to the GPU in blocks of
-        this size.
+        this size. If ``'auto'``, the size is chosen automatically. See
+        ``pygorpho.tune``.
+    backend
+        Backend to use. Must be the name of a registered backend, a
+        ``Backend`` instance or ``AUTO``. If None, the current default is
+        used. See ``pygorpho.backend``.
+    out
+        Array to write the result into, which is then returned. Must have the
+        same shape and dtype as vol. May be vol itself.
 
     Returns
     -------
@@ -482,10 +783,11 @@ def linear_erode(vol, line_steps, line_lens, block_size=[256, 256, 512]):
         >>> res = pg.flat.linear_erode(vol, lineSteps, lineLens)
     """
     return linear_morph(vol, line_steps, line_lens, constants.ERODE,
-                        block_size)
+                        block_size, backend, out)
 
 
-def linear_open(vol, line_steps, line_lens, block_size=[256, 256, 512]):
+def linear_open(vol, line_steps, line_lens, block_size=[256, 256, 512],
+                backend=None, out=None):
     """
     Opening with flat line segment structuring elements.
 
@@ -509,7 +811,15 @@ def linear_open(vol, line_steps, line_lens, block_size=[256, 256, 512]):
         segments. A length of 0 leaves the volume unchanged.
     block_size
         Block size for GPU processing. Volume is sent to the GPU in blocks of
-        this size.
+        this size. If ``'auto'``, the size is chosen automatically. See
+        ``pygorpho.tune``.
+    backend
+        Backend to use. Must be the name of a registered backend, a
+        ``Backend`` instance or ``AUTO``. If None, the current default is
+        used. See ``pygorpho.backend``.
+    out
+        Array to write the result into, which is then returned. Must have the
+        same shape and dtype as vol. May be vol itself.
 
     Returns
     -------
@@ -531,11 +841,12 @@ def linear_open(vol, line_steps, line_lens, block_size=[256, 256, 512]):
         >>> lineLens = [11, 11, 11]
         >>> res = pg.flat.linear_open(vol, lineSteps, lineLens)
     """
-    res = linear_erode(vol, line_steps, line_lens, block_size)
-    return linear_dilate(res, line_steps, line_lens, block_size)
+    return linear_morph(vol, line_steps, line_lens, constants.OPEN,
+                        block_size, backend, out)
 
 
-def linear_close(vol, line_steps, line_lens, block_size=[256, 256, 512]):
+def linear_close(vol, line_steps, line_lens, block_size=[256, 256, 512],
+                 backend=None, out=None):
     """
     Closing with flat line segment structuring elements.
 
@@ -559,7 +870,15 @@ def linear_close(vol, line_steps, line_lens, block_size=[256, 256, 512]):
         segments. A length of 0 leaves the volume unchanged.
     block_size
         Block size for GPU processing. Volume is sent to the GPU in blocks of
-        this size.
+        this size. If ``'auto'``, the size is chosen automatically. See
+        ``pygorpho.tune``.
+    backend
+        Backend to use. Must be the name of a registered backend, a
+        ``Backend`` instance or ``AUTO``. If None, the current default is
+        used. See ``pygorpho.backend``.
+    out
+        Array to write the result into, which is then returned. Must have the
+        same shape and dtype as vol. May be vol itself.
 
     Returns
     -------
@@ -581,11 +900,12 @@ def linear_close(vol, line_steps, line_lens, block_size=[256, 256, 512]):
         >>> lineLens = [11, 11, 11]
         >>> res = pg.flat.linear_close(vol, lineSteps, lineLens)
     """
-    res = linear_dilate(vol, line_steps, line_lens, block_size)
-    return linear_erode(res, line_steps, line_lens, block_size)
+    return linear_morph(vol, line_steps, line_lens, constants.CLOSE,
+                        block_size, backend, out)
 
 
-def linear_tophat(vol, line_steps, line_lens, block_size=[256, 256, 512]):
+def linear_tophat(vol, line_steps, line_lens, block_size=[256, 256, 512],
+                  backend=None, out=None):
     """
     Top-hat transform with flat line segment structuring elements.
 
@@ -609,7 +929,15 @@ def linear_tophat(vol, line_steps, line_lens, block_size=[256, 256, 512]):
         segments. A length of 0 leaves the volume unchanged.
     block_size
         Block size for GPU processing. Volume is sent to the GPU in blocks of
-        this size.
+        this size. If ``'auto'``, the size is chosen automatically. See
+        ``pygorpho.tune``.
+    backend
+        Backend to use. Must be the name of a registered backend, a
+        ``Backend`` instance or ``AUTO``. If None, the current default is
+        used. See ``pygorpho.backend``.
+    out
+        Array to write the result into, which is then returned. Must have the
+        same shape and dtype as vol. May be vol itself.
 
     Returns
     -------
@@ -631,10 +959,12 @@ def linear_tophat(vol, line_steps, line_lens, block_size=[256, 256, 512]):
         >>> lineLens = [11, 11, 11]
         >>> res = pg.flat.linear_tophat(vol, lineSteps, lineLens)
     """
-    return vol - linear_open(vol, line_steps, line_lens, block_size)
+    return linear_morph(vol, line_steps, line_lens, constants.TOPHAT,
+                        block_size, backend, out)
 
 
-def linear_bothat(vol, line_steps, line_lens, block_size=[256, 256, 512]):
+def linear_bothat(vol, line_steps, line_lens, block_size=[256, 256, 512],
+                  backend=None, out=None):
     """
     Bot-hat transform with flat line segment structuring elements.
 
@@ -658,7 +988,15 @@ def linear_bothat(vol, line_steps, line_lens, block_size=[256, 256, 512]):
         segments. A length of 0 leaves the volume unchanged.
     block_size
         Block size for GPU processing. Volume is sent to the GPU in blocks of
-        this size.
+        this size. If ``'auto'``, the size is chosen automatically. See
+        ``pygorpho.tune``.
+    backend
+        Backend to use. Must be the name of a registered backend, a
+        ``Backend`` instance or ``AUTO``. If None, the current default is
+        used. See ``pygorpho.backend``.
+    out
+        Array to write the result into, which is then returned. Must have the
+        same shape and dtype as vol. May be vol itself.
 
     Returns
     -------
@@ -680,4 +1018,284 @@ def linear_bothat(vol, line_steps, line_lens, block_size=[256, 256, 512]):
         >>> lineLens = [11, 11, 11]
         >>> res = pg.flat.linear_tophat(vol, lineSteps, lineLens)
     """
-    return linear_close(vol, line_steps, line_lens, block_size) - vol
+    return linear_morph(vol, line_steps, line_lens, constants.BOTHAT,
+                        block_size, backend, out)
+
+
+def granulometry(vol, radii, type=constants.BEST, radius_map=False,
+                 block_size=[256, 256, 512], backend=None):
+    """
+    Granulometry with approximations to flat balls.
+
+    Opens the volume with balls of increasing radii and measures how much
+    each opening removes. The balls are approximated with line segments by
+    ``strel.nested_ball_approx``, so each ball is the previous one dilated
+    with line segments. The erosions are therefore computed incrementally,
+    by eroding the previous erosion with the extra length of the segments
+    which grow. Only the dilation of each opening needs all segments.
+
+    Parameters
+    ----------
+    vol
+        Volume to analyze. Must be convertible to numpy array of at most 3
+        dimensions.
+    radii
+        Increasing sequence of positive integer radii.
+    type
+        Whether to constrain the ball approximations inside or outside the
+        spheres. See ``strel.nested_ball_approx``.
+    radius_map
+        Whether to also return a volume with the largest radius each voxel
+        survives.
+    block_size
+        Block size for GPU processing. Volume is sent to the GPU in blocks of
+        this size. If ``'auto'``, the size is chosen automatically. See
+        ``pygorpho.tune``.
+    backend
+        Backend to use. Must be the name of a registered backend, a
+        ``Backend`` instance or ``AUTO``. If None, the current default is
+        used. See ``pygorpho.backend``.
+
+    Returns
+    -------
+    numpy.array or (numpy.array, numpy.array)
+        Pattern spectrum with an entry for each radius. Entry i is the sum
+        of the voxel values removed by the opening with ``radii[i]`` which
+        were not removed by the opening with ``radii[i - 1]`` (or kept by
+        the volume itself for i = 0). If radius_map is True, also a volume
+        of same size as vol with the largest radius whose opening leaves the
+        voxel unchanged, or 0 if there is none. Voxels with the smallest
+        value in vol are 0.
+
+    Notes
+    -----
+    Away from the border of the volume, the openings are the same as with
+    ``linear_open`` and the lengths from ``strel.nested_ball_approx``. Near
+    the border, they can differ slightly, since voxels outside the volume
+    are ignored for one line segment at a time. Once an erosion contains
+    only the smallest value of vol, the remaining openings are not
+    computed.
+
+    Example
+    -------
+    .. code-block:: python
+        :dedent: 4
+
+        >>> import numpy as np
+        >>> import pygorpho as pg
+        >>> vol = np.random.rand(100, 100, 100) < 0.01
+        >>> vol = pg.flat.linear_dilate(vol, *pg.strel.flat_ball_approx(4))
+        >>> spectrum, sizes = pg.flat.granulometry(vol, range(1, 11),
+        ...                                        radius_map=True)
+    """
+    vol = np.asarray(vol)
+    old_shape = vol.shape
+    vol = np.atleast_3d(vol)
+    line_steps, all_lens = nested_ball_approx(radii, type)
+    impl = select_backend(backend, vol)
+    kwargs = {'block_size': block_size, 'backend': impl}
+
+    spectrum = np.zeros(len(all_lens))
+    sizes = np.zeros(vol.shape, dtype=np.int32) if radius_map else None
+    if vol.size == 0:
+        return (spectrum, sizes.reshape(old_shape)) if radius_map \
+            else spectrum
+
+    lowest = vol.min()
+    total = vol.sum(dtype=np.float64)
+    eroded = None
+    opened = np.empty_like(vol)
+    prev_lens = np.ones(len(line_steps), dtype=np.int32)
+    for i, (radius, line_lens) in enumerate(zip(np.atleast_1d(radii),
+                                                all_lens)):
+        # Segments of length n and m add up to one of length n + m - 1
+        extra = line_lens - prev_lens + 1
+        grow = extra > 1
+        prev_lens = line_lens
+        if not grow.any():
+            eroded = vol.copy() if eroded is None else eroded
+        else:
+            eroded = linear_erode(vol if eroded is None else eroded,
+                                  line_steps[grow], extra[grow], out=eroded,
+                                  **kwargs)
+
+        if eroded.max() == lowest:
+            # All remaining openings are constant
+            spectrum[i] = total - float(lowest) * vol.size
+            break
+        keep = line_lens > 1
+        linear_dilate(eroded, line_steps[keep], line_lens[keep], out=opened,
+                      **kwargs)
+        opened_total = opened.sum(dtype=np.float64)
+        spectrum[i] = total - opened_total
+        total = opened_total
+        if radius_map:
+            sizes[opened == vol] = radius
+
+    if radius_map:
+        sizes[vol == lowest] = 0
+        return spectrum, sizes.reshape(old_shape)
+    return spectrum
+
+
+def rank(vol, strel, rank, block_size=[64, 64, 512], out=None):
+    """
+    Rank filter with flat structuring element.
+
+    Each voxel is set to the value at a given position in the sorted window
+    of voxels covered by the structuring element. Rank 0 gives the erosion
+    and rank -1 the dilation.
+
+    For volumes with at most 65536 distinct values, such as all 8 and 16 bit
+    integer volumes, each line of the volume keeps a histogram of the
+    window, which is updated with the voxels entering and leaving it as the
+    window slides [HYT79]_. The cost then grows with the surface of the
+    structuring element rather than its volume. Other volumes, such as most
+    floating point volumes, sort the window of each voxel. The volume is
+    processed in blocks by ``PYGORPHO_NUM_THREADS`` threads on the CPU.
+
+    Parameters
+    ----------
+    vol
+        Volume to filter. Must be convertible to numpy array of at most 3
+        dimensions.
+    strel
+        Structuring element. Must be convertible to numpy array of at most 3
+        dimensions.
+    rank
+        Index into the sorted window of ``n = count_nonzero(strel)`` values.
+        Negative indices count from the end.
+    block_size
+        Maximum size of the blocks. Blocks are made smaller if their
+        histograms would use too much memory.
+    out
+        Array to write the result into, which is then returned. Must have the
+        same shape and dtype as vol. May be vol itself.
+
+    Returns
+    -------
+    numpy.array
+        Volume of same size as vol with the result of the filter.
+
+    Notes
+    -----
+    As for the other operations, voxels outside the volume are ignored, so
+    windows near the border have fewer voxels. The rank is then scaled to
+    the same relative position in the smaller window, rounding halves up.
+    See ``percentile``.
+
+    Example
+    -------
+    .. code-block:: python
+        :dedent: 4
+
+        >>> import numpy as np
+        >>> import pygorpho as pg
+        >>> vol = np.random.randint(0, 256, (100, 100, 100), dtype=np.uint8)
+        >>> # Second smallest value in each 3 x 3 x 3 window
+        >>> res = pg.flat.rank(vol, np.ones((3, 3, 3)), 1)
+
+    References
+    ----------
+    .. [HYT79] T. Huang, G. Yang and G. Tang, "A fast two-dimensional median
+       filtering algorithm," IEEE Transactions on Acoustics, Speech, and
+       Signal Processing 27. (pp. 13-18). 1979.
+    """
+    count = int(np.count_nonzero(strel))
+    if not -count <= rank < count:
+        raise ValueError('rank must be in the range of the window')
+    rank = rank % count
+    return percentile(vol, strel, 100.0 * rank / max(count - 1, 1),
+                      block_size, out)
+
+
+def median(vol, strel, block_size=[64, 64, 512], out=None):
+    """
+    Median filter with flat structuring element.
+
+    Same as ``percentile`` with q = 50. For windows with an even number of
+    voxels, the larger of the two middle values is used.
+
+    Parameters
+    ----------
+    vol
+        Volume to filter. Must be convertible to numpy array of at most 3
+        dimensions.
+    strel
+        Structuring element. Must be convertible to numpy array of at most 3
+        dimensions.
+    block_size
+        Maximum size of the blocks. See ``rank``.
+    out
+        Array to write the result into, which is then returned. Must have the
+        same shape and dtype as vol. May be vol itself.
+
+    Returns
+    -------
+    numpy.array
+        Volume of same size as vol with the result of the filter.
+
+    Example
+    -------
+    .. code-block:: python
+        :dedent: 4
+
+        >>> import numpy as np
+        >>> import pygorpho as pg
+        >>> vol = np.random.randint(0, 256, (100, 100, 100), dtype=np.uint8)
+        >>> res = pg.flat.median(vol, np.ones((15, 15, 15)))
+    """
+    return percentile(vol, strel, 50.0, block_size, out)
+
+
+def percentile(vol, strel, q, block_size=[64, 64, 512], out=None):
+    """
+    Percentile filter with flat structuring element.
+
+    For a window of n voxels inside the volume, the value at index
+    ``floor(q / 100 * (n - 1) + 0.5)`` of the sorted window is used. See
+    ``rank`` for how it is computed.
+
+    Parameters
+    ----------
+    vol
+        Volume to filter. Must be convertible to numpy array of at most 3
+        dimensions.
+    strel
+        Structuring element. Must be convertible to numpy array of at most 3
+        dimensions.
+    q
+        Percentile between 0 and 100.
+    block_size
+        Maximum size of the blocks. See ``rank``.
+    out
+        Array to write the result into, which is then returned. Must have the
+        same shape and dtype as vol. May be vol itself.
+
+    Returns
+    -------
+    numpy.array
+        Volume of same size as vol with the result of the filter.
+
+    Example
+    -------
+    .. code-block:: python
+        :dedent: 4
+
+        >>> import numpy as np
+        >>> import pygorpho as pg
+        >>> vol = np.random.rand(100, 100, 100).astype(np.float32)
+        >>> res = pg.flat.percentile(vol, np.ones((5, 5, 5)), 90)
+    """
+    if not 0 <= q <= 100:
+        raise ValueError('q must be between 0 and 100')
+    vol = np.asarray(vol)
+    old_shape = vol.shape
+    vol = np.atleast_3d(vol)
+    strel = np.atleast_3d(np.asarray(strel, dtype=np.bool_))
+    if not strel.any():
+        raise ValueError('strel must have at least one nonzero voxel')
+    res = _util.prepare_output(vol, out)
+    if vol.size:
+        _rank.rank_filter(res, vol, strel, q / 100.0, block_size)
+    return res.reshape(old_shape) if out is None else out
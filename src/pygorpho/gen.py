@@ -1,14 +1,28 @@
 """Mathematical morphology with general (grayscale) structuring elements."""
 
 import numpy as np
-from . import _thin
+from . import _cpu
+from . import _envelope
+from . import _instrument
+from . import _tune
+from . import _util
 from . import constants
+from .backend import select_backend
 
 
-def morph(vol, strel, op, block_size=[256, 256, 256]):
+@_instrument.instrumented('gen.morph', 2)
+def morph(vol, strel, op, block_size=[256, 256, 256], backend=None, out=None,
+          mask=None, decompose=None):
     """
     Morphological operation with general structuring element.
 
+    Entries of strel which are -inf or False in mask are not part of the
+    structuring element. Only the other entries are computed with, so the
+    work is proportional to their number. Structuring elements which are
+    the sum of a 1D profile along each axis can be computed as one pass for
+    each axis, so the work is proportional to the sum of their sizes. See
+    ``cost`` and decompose.
+
     Parameters
     ----------
     vol
@@ -16,19 +30,44 @@ def morph(vol, strel, op, block_size=[256, 256, 256]):
         most 3 dimensions.
     strel
         Structuring element.  Must be convertible to numpy array of at most 3
-        dimensions.
+        dimensions. Entries which are -inf are not used.
     op
-        Operation to perform. Must be either ``DILATE`` or ``ERODE`` from
-        ``constants``.
+        Operation to perform. Must be either ``DILATE``, ``ERODE``, ``OPEN``,
+        ``CLOSE``, ``TOPHAT``, ``BOTHAT`` from ``constants``.
     block_size
         Block size for GPU processing. Volume is sent to the GPU in blocks of
-        this size.
+        this size. If ``'auto'``, the size is chosen automatically. See
+        ``pygorpho.tune``.
+    backend
+        Backend to use. Must be the name of a registered backend, a
+        ``Backend`` instance or ``AUTO``. If None, the current default is
+        used. See ``pygorpho.backend``.
+    out
+        Array to write the result into, which is then returned. Must have the
+        same shape and dtype as vol. May be vol itself.
+    mask
+        Boolean array of same shape as strel, which is False for the entries
+        that are not used, or None to use all entries which are not -inf.
+        Needed to leave out entries for integer types.
+    decompose
+        Whether to compute strel as one pass for each axis if it is the sum
+        of 1D profiles. See ``separable_morph``. If None, this is only done
+        when the result is the same, which is for integer types where no
+        sum of a voxel and the weights can overflow. If True, it is also
+        done for floating point types, where the weights are then added one
+        axis at a time, which may round differently.
 
     Returns
     -------
     numpy.array
         Volume of same size as vol with the result of the operation.
 
+    Notes
+    -----
+    With the ``AUTO`` backend, the operation is computed on the CPU with
+    NumPy if no CUDA device is available or the volume is small. Arithmetic
+    is done in the type of vol for both.
+
     Example
     -------
     .. code-block:: python
@@ -41,32 +80,120 @@ def morph(vol, strel, op, block_size=[256, 256, 256]):
         >>> vol[50, 50, 50] = 1
         >>> strel = np.ones((11, 11, 11))
         >>> res = pg.gen.morph(vol, strel, pg.DILATE)
+        >>> # Grayscale ball which only computes with the entries in the ball
+        >>> x, y, z = np.mgrid[-15:16, -15:16, -15:16]
+        >>> strel = 1 - (x**2 + y**2 + z**2) / 15**2
+        >>> strel[strel < 0] = -np.inf
+        >>> res = pg.gen.morph(vol, strel, pg.DILATE)
     """
-    assert (op == constants.DILATE or op == constants.ERODE)
+    assert(op in [constants.DILATE, constants.ERODE, constants.OPEN,
+                  constants.CLOSE, constants.TOPHAT, constants.BOTHAT])
 
     # Recast inputs to correct datatype
     vol = np.asarray(vol)
     old_shape = vol.shape
     vol = np.atleast_3d(vol)
-    strel = np.atleast_3d(np.asarray(strel, dtype=vol.dtype))
+    strel, used = _used_entries(strel, mask)
+    strel = strel.astype(vol.dtype, copy=False)
     assert vol.dtype == strel.dtype
 
     # Prepare output volume
-    vol_size = vol.shape
-    res = np.empty_like(vol)
+    res = _util.prepare_output(vol, out)
+
+    impl = select_backend(backend, vol)
+    halo = _util.strel_halo(strel.shape, op)
+    block_size = _tune.resolve(block_size, impl, 'gen.morph', vol, op, halo)
+    _run_backend(impl, res, vol, strel, used, op, block_size, decompose)
+
+    return res.reshape(old_shape) if out is None else out
+
+
+@_instrument.instrumented('gen.morph_batch', 2)
+def morph_batch(vols, strel, op, block_size=[256, 256, 256], backend=None,
+                out=None, mask=None, decompose=None):
+    """
+    Morphological operation with general structuring element on a batch of
+    volumes.
+
+    Gives the same result as calling ``morph`` on each volume, but the
+    arguments are only checked and prepared once for the whole batch.
+
+    Parameters
+    ----------
+    vols
+        Volumes to apply operation to. Must be convertible to numpy array
+        where the first axis indexes the volumes, such as an (N, Z, Y, X)
+        array or a list of volumes with the same shape. Each volume may have
+        at most 3 dimensions.
+    strel
+        Structuring element. Must be convertible to numpy array of at most 3
+        dimensions. Entries which are -inf are not used.
+    op
+        Operation to perform. Must be either ``DILATE``, ``ERODE``, ``OPEN``,
+        ``CLOSE``, ``TOPHAT``, ``BOTHAT`` from ``constants``.
+    block_size
+        Block size for processing each volume. See ``morph``.
+    backend
+        Backend to use. See ``morph``.
+    out
+        Array to write the results into, which is then returned. Must have
+        the same shape and dtype as vols. May be vols itself.
+    mask
+        Entries of strel to use. See ``morph``.
+    decompose
+        Whether to compute strel as one pass for each axis if possible, or
+        None to only do so when the result is the same. See ``morph``.
 
-    ret = _thin.gen_dilate_erode_impl(
-        res.ctypes.data, vol.ctypes.data, strel.ctypes.data,
-        vol_size[2], vol_size[1], vol_size[0],
-        strel.shape[2], strel.shape[1], strel.shape[0],
-        vol.dtype.num, op,
-        block_size[2], block_size[1], block_size[0])
-    _thin.raise_on_error(ret)
+    Returns
+    -------
+    numpy.array
+        Volumes of same size as vols with the results of the operation.
 
-    return np.resize(res, old_shape)
+    Notes
+    -----
+    The CPU backend processes the whole batch at once, with several small
+    volumes in each block. Other backends are called once for each volume.
+    In particular, the CUDA backend makes one library call, with its own
+    transfers to and from the GPU, for each volume, so it gains nothing over
+    calling ``morph`` in a loop. For many small volumes the CPU backend is
+    usually faster.
 
+    Example
+    -------
+    .. code-block:: python
+        :dedent: 4
 
-def dilate(vol, strel, block_size=[256, 256, 256]):
+        >>> import numpy as np
+        >>> import pygorpho as pg
+        >>> patches = np.random.rand(10000, 64, 64, 64)
+        >>> strel = np.zeros((5, 5, 5))
+        >>> res = pg.gen.morph_batch(patches, strel, pg.DILATE)
+    """
+    assert(op in [constants.DILATE, constants.ERODE, constants.OPEN,
+                  constants.CLOSE, constants.TOPHAT, constants.BOTHAT])
+
+    # Recast inputs to correct datatype
+    vols = np.asarray(vols)
+    old_shape = vols.shape
+    vols = _util.atleast_3d_batch(vols)
+    strel, used = _used_entries(strel, mask)
+    strel = strel.astype(vols.dtype, copy=False)
+    assert vols.dtype == strel.dtype
+
+    # Prepare output volumes
+    res = _util.prepare_output(vols, out, batch=True)
+
+    impl = select_backend(backend, vols)
+    halo = _util.strel_halo(strel.shape, op)
+    block_size = _tune.resolve(block_size, impl, 'gen.morph_batch', vols, op,
+                               halo)
+    _run_backend(impl, res, vols, strel, used, op, block_size, decompose,
+                 batch=True)
+
+    return res.reshape(old_shape) if out is None else out
+
+
+def dilate(vol, strel, block_size=[256, 256, 256], backend=None, out=None):
     """
     Dilation with general structuring element.
 
@@ -80,7 +207,15 @@ def dilate(vol, strel, block_size=[256, 256, 256]):
         dimensions.
     block_size
         Block size for GPU processing. Volume is sent to the GPU in blocks of
-        this size.
+        this size. If ``'auto'``, the size is chosen automatically. See
+        ``pygorpho.tune``.
+    backend
+        Backend to use. Must be the name of a registered backend, a
+        ``Backend`` instance or ``AUTO``. If None, the current default is
+        used. See ``pygorpho.backend``.
+    out
+        Array to write the result into, which is then returned. Must have the
+        same shape and dtype as vol. May be vol itself.
 
     Returns
     -------
@@ -100,10 +235,10 @@ def dilate(vol, strel, block_size=[256, 256, 256]):
         >>> strel = np.ones((11, 11, 11))
         >>> res = pg.gen.dilate(vol, strel)
     """
-    return morph(vol, strel, constants.DILATE, block_size)
+    return morph(vol, strel, constants.DILATE, block_size, backend, out)
 
 
-def erode(vol, strel, block_size=[256, 256, 256]):
+def erode(vol, strel, block_size=[256, 256, 256], backend=None, out=None):
     """
     Erosion with general structuring element.
 
@@ -117,7 +252,15 @@ def erode(vol, strel, block_size=[256, 256, 256]):
         dimensions.
     block_size
         Block size for GPU processing. Volume is sent to the GPU in blocks of
-        this size.
+        this size. If ``'auto'``, the size is chosen automatically. See
+        ``pygorpho.tune``.
+    backend
+        Backend to use. Must be the name of a registered backend, a
+        ``Backend`` instance or ``AUTO``. If None, the current default is
+        used. See ``pygorpho.backend``.
+    out
+        Array to write the result into, which is then returned. Must have the
+        same shape and dtype as vol. May be vol itself.
 
     Returns
     -------
@@ -137,10 +280,10 @@ def erode(vol, strel, block_size=[256, 256, 256]):
         >>> strel = np.ones((11, 11, 11))
         >>> res = pg.gen.erode(vol, strel)
     """
-    return morph(vol, strel, constants.ERODE, block_size)
+    return morph(vol, strel, constants.ERODE, block_size, backend, out)
 
 
-def open(vol, strel, block_size=[256, 256, 256]):
+def open(vol, strel, block_size=[256, 256, 256], backend=None, out=None):
     """
     Opening with general structuring element.
 
@@ -154,7 +297,15 @@ def open(vol, strel, block_size=[256, 256, 256]):
         dimensions.
     block_size
         Block size for GPU processing. Volume is sent to the GPU in blocks of
-        this size.
+        this size. If ``'auto'``, the size is chosen automatically. See
+        ``pygorpho.tune``.
+    backend
+        Backend to use. Must be the name of a registered backend, a
+        ``Backend`` instance or ``AUTO``. If None, the current default is
+        used. See ``pygorpho.backend``.
+    out
+        Array to write the result into, which is then returned. Must have the
+        same shape and dtype as vol. May be vol itself.
 
     Returns
     -------
@@ -175,11 +326,10 @@ def open(vol, strel, block_size=[256, 256, 256]):
         >>> strel = np.ones((11, 11, 11))
         >>> res = pg.gen.open(vol, strel)
     """
-    res = erode(vol, strel, block_size)
-    return dilate(res, strel, block_size)
+    return morph(vol, strel, constants.OPEN, block_size, backend, out)
 
 
-def close(vol, strel, block_size=[256, 256, 256]):
+def close(vol, strel, block_size=[256, 256, 256], backend=None, out=None):
     """
     Closing with general structuring element.
 
@@ -193,7 +343,15 @@ def close(vol, strel, block_size=[256, 256, 256]):
         dimensions.
     block_size
         Block size for GPU processing. Volume is sent to the GPU in blocks of
-        this size.
+        this size. If ``'auto'``, the size is chosen automatically. See
+        ``pygorpho.tune``.
+    backend
+        Backend to use. Must be the name of a registered backend, a
+        ``Backend`` instance or ``AUTO``. If None, the current default is
+        used. See ``pygorpho.backend``.
+    out
+        Array to write the result into, which is then returned. Must have the
+        same shape and dtype as vol. May be vol itself.
 
     Returns
     -------
@@ -214,11 +372,10 @@ def close(vol, strel, block_size=[256, 256, 256]):
         >>> strel = np.ones((11, 11, 11))
         >>> res = pg.gen.close(vol, strel)
     """
-    res = dilate(vol, strel, block_size)
-    return erode(res, strel, block_size)
+    return morph(vol, strel, constants.CLOSE, block_size, backend, out)
 
 
-def tophat(vol, strel, block_size=[256, 256, 256]):
+def tophat(vol, strel, block_size=[256, 256, 256], backend=None, out=None):
     """
     Top-hat transform with general structuring element.
 
@@ -235,7 +392,15 @@ def tophat(vol, strel, block_size=[256, 256, 256]):
         dimensions.
     block_size
         Block size for GPU processing. Volume is sent to the GPU in blocks of
-        this size.
+        this size. If ``'auto'``, the size is chosen automatically. See
+        ``pygorpho.tune``.
+    backend
+        Backend to use. Must be the name of a registered backend, a
+        ``Backend`` instance or ``AUTO``. If None, the current default is
+        used. See ``pygorpho.backend``.
+    out
+        Array to write the result into, which is then returned. Must have the
+        same shape and dtype as vol. May be vol itself.
 
     Returns
     -------
@@ -256,10 +421,10 @@ def tophat(vol, strel, block_size=[256, 256, 256]):
         >>> strel = np.ones((11, 11, 11))
         >>> res = pg.gen.tophat(vol, strel)
     """
-    return vol - open(vol, strel, block_size)
+    return morph(vol, strel, constants.TOPHAT, block_size, backend, out)
 
 
-def bothat(vol, strel, block_size=[256, 256, 256]):
+def bothat(vol, strel, block_size=[256, 256, 256], backend=None, out=None):
     """
     Bot-hat transform with general structuring element.
 
@@ -276,7 +441,15 @@ def bothat(vol, strel, block_size=[256, 256, 256]):
         dimensions.
     block_size
         Block size for GPU processing. Volume is sent to the GPU in blocks of
-        this size.
+        this size. If ``'auto'``, the size is chosen automatically. See
+        ``pygorpho.tune``.
+    backend
+        Backend to use. Must be the name of a registered backend, a
+        ``Backend`` instance or ``AUTO``. If None, the current default is
+        used. See ``pygorpho.backend``.
+    out
+        Array to write the result into, which is then returned. Must have the
+        same shape and dtype as vol. May be vol itself.
 
     Returns
     -------
@@ -297,4 +470,302 @@ def bothat(vol, strel, block_size=[256, 256, 256]):
         >>> strel = np.ones((11, 11, 11))
         >>> res = pg.gen.bothat(vol, strel)
     """
-    return close(vol, strel, block_size) - vol
+    return morph(vol, strel, constants.BOTHAT, block_size, backend, out)
+
+
+@_instrument.instrumented('gen.separable_morph', 2)
+def separable_morph(vol, profiles, op, block_size=[256, 256, 256],
+                    backend=None, out=None):
+    """
+    Morphological operation with general structuring element which is the
+    sum of a 1D profile along each axis.
+
+    The structuring element has the weight ``sum(profiles[i][o[i]])`` at
+    offset o, with the offsets of each profile following the same
+    convention as for ``morph``. Each dilation and erosion is computed as
+    one pass for each profile, so the work for each voxel is the sum of the
+    profile sizes instead of their product.
+
+    Parameters
+    ----------
+    vol
+        Volume to apply operation to. Must be convertible to numpy array of at
+        most 3 dimensions.
+    profiles
+        Sequence with one 1D profile for each dimension of vol. Each must be
+        convertible to numpy array.
+    op
+        Operation to perform. Must be either ``DILATE``, ``ERODE``, ``OPEN``,
+        ``CLOSE``, ``TOPHAT``, ``BOTHAT`` from ``constants``.
+    block_size
+        Block size for processing. See ``morph``.
+    backend
+        Backend to use. See ``morph``.
+    out
+        Array to write the result into, which is then returned. Must have the
+        same shape and dtype as vol. May be vol itself.
+
+    Returns
+    -------
+    numpy.array
+        Volume of same size as vol with the result of the operation.
+
+    Example
+    -------
+    .. code-block:: python
+        :dedent: 4
+
+        >>> import numpy as np
+        >>> import pygorpho as pg
+        >>> vol = np.random.rand(100, 100, 100)
+        >>> # Same as a 31 x 31 x 31 strel with weights -|x| - |y| - |z|
+        >>> profile = -np.abs(np.arange(-15, 16)).astype(float)
+        >>> res = pg.gen.separable_morph(vol, [profile] * 3, pg.DILATE)
+    """
+    assert(op in [constants.DILATE, constants.ERODE, constants.OPEN,
+                  constants.CLOSE, constants.TOPHAT, constants.BOTHAT])
+    vol = np.asarray(vol)
+    old_shape = vol.shape
+    profiles = [np.asarray(p, dtype=vol.dtype) for p in profiles]
+    if len(profiles) != vol.ndim or vol.ndim > 3 \
+            or any(p.ndim != 1 or p.size == 0 for p in profiles):
+        raise ValueError('profiles must have one 1D array per axis of vol')
+    # Profiles for the axes np.atleast_3d adds
+    zero = np.zeros(1, dtype=vol.dtype)
+    profiles = {0: [zero] * 3, 1: [zero, profiles[0], zero],
+                2: profiles + [zero], 3: profiles}[vol.ndim]
+    vol = np.atleast_3d(vol)
+    res = _util.prepare_output(vol, out)
+
+    impl = select_backend(backend, vol)
+    halo = _util.strel_halo([len(p) for p in profiles], op)
+    block_size = _tune.resolve(block_size, impl, 'gen.separable_morph', vol,
+                               op, halo)
+    func = lambda r, v, p, b: impl.gen_separable_morph(r, v, p, op, b)
+    _util.run_backend(func, impl, res, vol, tuple(profiles), block_size)
+
+    return res.reshape(old_shape) if out is None else out
+
+
+def parabolic_morph(vol, scale, op, out=None):
+    """
+    Morphological operation with parabolic structuring element.
+
+    The structuring element has the weight ``-sum((o / scale)**2)`` at
+    offset o and covers the whole volume. See ``strel.paraboloid``.
+    Dilations and erosions with it are separable, and along each axis they
+    are computed with the lower envelope of parabolas in linear time, as
+    for ``distance.edt``. The cost therefore does not depend on scale. As
+    for ``morph``, voxels outside the volume are ignored.
+
+    Parameters
+    ----------
+    vol
+        Volume to apply operation to. Must be convertible to numpy array of at
+        most 3 dimensions.
+    scale
+        Positive scale of the parabola, either a number or a sequence with one
+        number per dimension of vol.
+    op
+        Operation to perform. Must be either ``DILATE``, ``ERODE``, ``OPEN``,
+        ``CLOSE``, ``TOPHAT``, ``BOTHAT`` from ``constants``.
+    out
+        Array to write the result into, which is then returned. Must have the
+        same shape and dtype as vol. May be vol itself.
+
+    Returns
+    -------
+    numpy.array
+        Volume of same size as vol with the result of the operation.
+
+    Notes
+    -----
+    The operation is computed on the CPU with NumPy in float64. The result
+    of each dilation and erosion is rounded to the type of vol.
+
+    Example
+    -------
+    .. code-block:: python
+        :dedent: 4
+
+        >>> import numpy as np
+        >>> import pygorpho as pg
+        >>> vol = np.random.rand(100, 100, 100)
+        >>> # Smooth with a paraboloid which is wider along the last axis
+        >>> res = pg.gen.parabolic_morph(vol, [2, 2, 5], pg.OPEN)
+    """
+    assert(op in [constants.DILATE, constants.ERODE, constants.OPEN,
+                  constants.CLOSE, constants.TOPHAT, constants.BOTHAT])
+    vol = np.asarray(vol)
+    if vol.ndim > 3:
+        raise ValueError('vol must have at most 3 dimensions')
+    _cpu.check_type(vol.dtype)
+    scale = np.atleast_1d(np.asarray(scale, dtype=np.float64))
+    if scale.size == 1:
+        scale = np.repeat(scale, vol.ndim)
+    if scale.shape != (vol.ndim,) or np.any(scale <= 0):
+        raise ValueError('scale must be positive with one value per axis')
+    res = _util.prepare_output(np.atleast_3d(vol), out)
+
+    cur = vol
+    for o in _cpu.morph_ops(op):
+        cur = _parabolic_dilate_erode(cur, 1 / scale ** 2, o)
+    if op == constants.TOPHAT:
+        _cpu.subtract(vol, cur, out=cur)
+    elif op == constants.BOTHAT:
+        _cpu.subtract(cur, vol, out=cur)
+    res[...] = np.atleast_3d(cur)
+    return res.reshape(vol.shape) if out is None else out
+
+
+def parabolic_dilate(vol, scale, out=None):
+    """Dilation with parabolic structuring element. See parabolic_morph."""
+    return parabolic_morph(vol, scale, constants.DILATE, out)
+
+
+def parabolic_erode(vol, scale, out=None):
+    """Erosion with parabolic structuring element. See parabolic_morph."""
+    return parabolic_morph(vol, scale, constants.ERODE, out)
+
+
+def cost(strel, mask=None):
+    """
+    Returns the number of entries of a structuring element ``morph`` computes
+    with.
+
+    Parameters
+    ----------
+    strel
+        Structuring element. Must be convertible to numpy array of at most 3
+        dimensions. Entries which are -inf are not used.
+    mask
+        Entries of strel to use. See ``morph``.
+
+    Returns
+    -------
+    dict
+        ``'entries'`` is the number of entries in strel and ``'offsets'`` the
+        number of them which are used. Each dilation and erosion does one
+        operation per voxel for each used entry on backends which take a
+        list of offsets, such as ``'cpu'``. Other backends, such as
+        ``'cuda'``, compute with all entries of the smallest centered
+        structuring element covering the used entries, whose size is given
+        by ``'dense'``. If strel is the sum of 1D profiles along the axes,
+        ``'separable'`` is the sum of their sizes, which is the number of
+        operations per voxel for all backends, and otherwise None.
+
+    Example
+    -------
+    .. code-block:: python
+        :dedent: 4
+
+        >>> import numpy as np
+        >>> import pygorpho as pg
+        >>> strel = np.full((5, 5, 5), -np.inf)
+        >>> strel[2, 2, :] = 0
+        >>> pg.gen.cost(strel)
+        {'entries': 125, 'offsets': 5, 'dense': 5, 'separable': None}
+    """
+    strel, used = _used_entries(strel, mask)
+    offsets = _cpu.strel_offsets(strel.shape)[used]
+    reach = np.max(np.abs(offsets), axis=0, initial=0)
+    profiles = _profiles(strel) if used.all() else None
+    return {'entries': int(strel.size), 'offsets': len(offsets),
+            'dense': int(np.prod(2 * reach + 1)),
+            'separable': (sum(len(p) for p in profiles)
+                          if profiles is not None else None)}
+
+
+def _used_entries(strel, mask):
+    # Returns strel as a 3D array and which of its entries are used
+    strel = np.atleast_3d(np.asarray(strel))
+    if np.issubdtype(strel.dtype, np.floating):
+        used = ~np.isneginf(strel)
+    else:
+        used = np.ones(strel.shape, dtype=bool)
+    if mask is not None:
+        mask = np.atleast_3d(np.asarray(mask, dtype=np.bool_))
+        if mask.shape != strel.shape:
+            raise ValueError('mask must have same shape as strel')
+        used &= mask
+    if not used.all():
+        strel = np.where(used, strel, 0)
+    return strel, used
+
+
+def _parabolic_dilate_erode(vol, curvature, op):
+    # Erosion is min_p f[p] + c * (q - p)**2 along each axis in turn, and
+    # dilation is the same for -f
+    f = vol.astype(np.float64)
+    if op == constants.DILATE:
+        np.subtract(0.0, f, out=f)
+    if np.isneginf(f).any():
+        # Every voxel is covered, and the envelope ignores infinite values
+        f[...] = -np.inf
+    else:
+        for axis, c in enumerate(curvature):
+            f = _envelope.parabola_min(f, axis, c)
+    if op == constants.DILATE:
+        np.subtract(0.0, f, out=f)
+    if not np.issubdtype(vol.dtype, np.floating):
+        np.rint(f, out=f)
+    return f.astype(vol.dtype)
+
+
+def _profiles(strel):
+    # Returns 1D profiles whose sum along the axes is strel, or None if there
+    # are none or they would not save any work
+    if strel.dtype == np.bool_ or sum(n > 1 for n in strel.shape) < 2:
+        return None
+    floating = np.issubdtype(strel.dtype, np.floating)
+    wide = strel.astype(np.float64 if floating else np.int64)
+    center = tuple(n // 2 for n in strel.shape)
+    profiles = []
+    for axis in range(strel.ndim):
+        line = list(center)
+        line[axis] = slice(None)
+        profile = wide[tuple(line)]
+        profiles.append(profile - wide[center] if axis > 0 else profile)
+    total = sum(np.expand_dims(p, [a for a in range(strel.ndim) if a != i])
+                for i, p in enumerate(profiles))
+    if not np.array_equal(total, wide):
+        return None
+    narrow = tuple(p.astype(strel.dtype) for p in profiles)
+    if not all(np.array_equal(n, p) for n, p in zip(narrow, profiles)):
+        return None
+    return narrow
+
+
+def _separable_exact(vol, profiles, op):
+    # Whether the passes for profiles give the same result as the dense
+    # structuring element. Without overflow, the sums are the same in any
+    # order, so this holds for integer types if every partial sum of a voxel
+    # and the weights of each dilation and erosion fits in the type.
+    if not np.issubdtype(vol.dtype, np.integer) or vol.size == 0:
+        return False
+    info = np.iinfo(vol.dtype)
+    weights = sum(int(np.abs(p.astype(np.int64)).max()) for p in profiles)
+    reach = len(_cpu.morph_ops(op)) * weights
+    return (int(vol.min()) - reach >= info.min
+            and int(vol.max()) + reach <= info.max)
+
+
+def _run_backend(impl, res, vol, strel, used, op, block_size, decompose,
+                 batch=False):
+    # Passes the used entries of strel on in the form with the least work
+    if not used.all():
+        weights = strel[used]
+        func = lambda r, v, o, b: impl.gen_offsets_morph(r, v, o, weights,
+                                                         op, b)
+        kernel = _cpu.strel_offsets(strel.shape)[used]
+    else:
+        kernel = _profiles(strel) if decompose is not False else None
+        if kernel is not None and decompose is None \
+                and not _separable_exact(vol, kernel, op):
+            kernel = None
+        if kernel is not None:
+            func = lambda r, v, p, b: impl.gen_separable_morph(r, v, p, op, b)
+        else:
+            func = lambda r, v, s, b: impl.gen_morph(r, v, s, op, b)
+            kernel = strel
+    _util.run_backend(func, impl, res, vol, kernel, block_size, batch=batch)
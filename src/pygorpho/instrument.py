@@ -0,0 +1,148 @@
+"""
+Profiling of the morphology functions.
+
+Registered hooks are called with a ``CallRecord`` after each call of
+``flat.morph``, ``flat.linear_morph``, ``gen.morph`` and the functions
+built on them. A record has the wall time of the call broken down by
+phase, the number of bytes allocated and copied, the number of blocks, the
+backend and the dtype and shape of the volume. Nothing is recorded while no
+hooks are registered.
+"""
+
+import contextlib
+import json
+from . import _instrument
+from ._instrument import CallRecord
+
+
+def add_hook(hook):
+    """
+    Register a function to call with the ``CallRecord`` of each call.
+
+    Parameters
+    ----------
+    hook
+        Function taking a ``CallRecord``. It is called in the thread which
+        made the call, after the call has finished.
+    """
+    _instrument._hooks.append(hook)
+
+
+def remove_hook(hook):
+    """
+    Unregister a function registered with ``add_hook``.
+
+    Parameters
+    ----------
+    hook
+        Function to unregister.
+
+    Raises
+    ------
+    ValueError
+        If hook is not registered.
+    """
+    _instrument._hooks.remove(hook)
+
+
+class Recorder:
+    """
+    Collects the ``CallRecord`` of each call. Created by ``record``.
+
+    Attributes
+    ----------
+    calls
+        List of recorded calls in the order they finished.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, call):
+        self.calls.append(call)
+
+    def to_json(self, **kwargs):
+        """
+        Returns the recorded calls as a JSON string.
+
+        Parameters
+        ----------
+        kwargs
+            Keyword arguments passed on to ``json.dumps``.
+        """
+        return json.dumps([c.as_dict() for c in self.calls], **kwargs)
+
+    def summary(self):
+        """
+        Returns a table with the totals for each function, backend and dtype.
+
+        Returns
+        -------
+        str
+            Table with one row per function, backend and dtype, giving the
+            number of calls, the total time and the time in each phase in
+            seconds, the number of megabytes allocated and copied, and the
+            number of blocks.
+        """
+        phases = ['prepare', 'decompose', 'copy', 'compute', 'finish']
+        groups = {}
+        for c in self.calls:
+            groups.setdefault((c.function, c.backend, c.dtype), []).append(c)
+
+        header = (['function', 'backend', 'dtype', 'calls', 'time'] + phases
+                  + ['MB alloc', 'MB copied', 'blocks'])
+        rows = []
+        for (function, backend, dtype), calls in groups.items():
+            rows.append(
+                [function, str(backend), str(dtype), str(len(calls)),
+                 '{:.4f}'.format(sum(c.time for c in calls))]
+                + ['{:.4f}'.format(sum(c.phases.get(p, 0.0) for c in calls))
+                   for p in phases]
+                + ['{:.1f}'.format(sum(c.bytes_allocated for c in calls)
+                                   / 2**20),
+                   '{:.1f}'.format(sum(c.bytes_copied for c in calls)
+                                   / 2**20),
+                   str(sum(c.blocks for c in calls))])
+
+        widths = [max(len(r[i]) for r in [header] + rows)
+                  for i in range(len(header))]
+        lines = []
+        for r in [header] + rows:
+            cells = [r[0].ljust(widths[0])]
+            cells += [s.rjust(w) for s, w in zip(r[1:], widths[1:])]
+            lines.append('  '.join(cells))
+        return '\n'.join(lines)
+
+
+@contextlib.contextmanager
+def record():
+    """
+    Context manager which records the calls made inside a with block.
+
+    Calls made by other threads during the block are recorded as well.
+
+    Yields
+    ------
+    Recorder
+        Collects the calls.
+
+    Example
+    -------
+    .. code-block:: python
+        :dedent: 4
+
+        >>> import numpy as np
+        >>> import pygorpho as pg
+        >>> vol = np.random.rand(100, 100, 100)
+        >>> with pg.instrument.record() as rec:
+        ...     res = pg.flat.open(vol, np.ones((5, 5, 5)))
+        >>> print(rec.summary())
+        >>> with open('profile.json', 'w') as f:
+        ...     f.write(rec.to_json())
+    """
+    recorder = Recorder()
+    add_hook(recorder)
+    try:
+        yield recorder
+    finally:
+        remove_hook(recorder)
@@ -0,0 +1,508 @@
+"""
+Lazy evaluation of morphology pipelines.
+
+Operations on an ``Expr`` are recorded in a graph instead of being computed
+right away. When the result is needed, the graph is simplified with
+morphological identities and computed with as few intermediate volumes as
+possible:
+
+- Identical subexpressions are only computed once.
+- An erosion followed by a dilation with the same structuring element is
+  computed as one opening, and likewise for closings.
+- Consecutive dilations (erosions) with line segments are computed as one
+  dilation (erosion) with all the line segments.
+- Repeated openings (closings) with the same symmetric structuring element
+  are only computed once, since openings and closings are idempotent.
+- ``x - open(x)`` and ``close(x) - x`` are computed as top-hat and bot-hat
+  transforms. Other differences are computed in place.
+- Intermediate volumes are overwritten once they are no longer needed.
+
+The results are the same as when calling the functions in ``flat`` and
+``gen`` one at a time.
+
+Example
+-------
+.. code-block:: python
+    :dedent: 4
+
+    >>> import numpy as np
+    >>> import pygorpho as pg
+    >>> vol = np.random.rand(100, 100, 100)
+    >>> lineSteps, lineLens = pg.strel.flat_ball_approx(5)
+    >>> x = pg.lazy.volume(vol)
+    >>> y = x.linear_dilate([1, 0, 0], 5).linear_dilate(lineSteps, lineLens)
+    >>> z = y.erode(np.ones((3, 3, 3))).tophat(np.ones((5, 5, 5)))
+    >>> print(z.explain())
+    >>> res = z.compute()
+"""
+
+import numpy as np
+from . import _cpu
+from . import constants
+from . import flat
+from . import gen
+
+_OP_NAMES = {
+    constants.DILATE: 'DILATE', constants.ERODE: 'ERODE',
+    constants.OPEN: 'OPEN', constants.CLOSE: 'CLOSE',
+    constants.TOPHAT: 'TOPHAT', constants.BOTHAT: 'BOTHAT',
+}
+
+
+class _Struct:
+    """Structuring element of a recorded operation."""
+
+    def __init__(self, family, key, symmetric, description, **arrays):
+        #: Either 'flat', 'linear' or 'gen'
+        self.family = family
+        #: Hashable value which identifies the structuring element
+        self.key = key
+        #: Whether the structuring element is point symmetric around its
+        #: center, so openings and closings with it are idempotent
+        self.symmetric = symmetric
+        self.description = description
+        self.arrays = arrays
+
+    def is_identity(self):
+        return self.family == 'linear' and not self.arrays['line_lens'].size
+
+
+def _flat_struct(strel):
+    strel = np.atleast_3d(np.asarray(strel, dtype=np.bool_))
+    key = ('flat', strel.shape, strel.tobytes())
+    symmetric = (all(n % 2 == 1 for n in strel.shape)
+                 and np.array_equal(strel, strel[::-1, ::-1, ::-1]))
+    description = 'flat {}'.format('x'.join(str(n) for n in strel.shape))
+    return _Struct('flat', key, symmetric, description, strel=strel)
+
+
+def _linear_struct(line_steps, line_lens):
+    line_steps = np.atleast_2d(np.asarray(line_steps, dtype=np.int32))
+    line_lens = np.atleast_1d(np.asarray(line_lens, dtype=np.int32))
+    assert line_steps.ndim == 2
+    assert line_steps.shape[1] == 3
+    assert line_steps.shape[0] == line_lens.shape[0]
+    # Segments with at most one voxel do not change the volume
+    keep = line_lens > 1
+    return _lines_struct(line_steps[keep], line_lens[keep])
+
+
+def _lines_struct(line_steps, line_lens):
+    key = ('linear', line_steps.tobytes(), line_lens.tobytes())
+    # A sequence of segments is only known to be symmetric if it is a
+    # single segment with a center voxel
+    symmetric = len(line_lens) == 1 and line_lens[0] % 2 == 1
+    description = '{} line segments'.format(len(line_lens))
+    return _Struct('linear', key, symmetric, description,
+                   line_steps=line_steps, line_lens=line_lens)
+
+
+def _gen_struct(strel):
+    strel = np.atleast_3d(np.asarray(strel))
+    key = ('gen', strel.shape, strel.dtype.str, strel.tobytes())
+    symmetric = (all(n % 2 == 1 for n in strel.shape)
+                 and np.array_equal(strel, strel[::-1, ::-1, ::-1]))
+    description = 'gen {}'.format('x'.join(str(n) for n in strel.shape))
+    return _Struct('gen', key, symmetric, description, strel=strel)
+
+
+class Expr:
+    """
+    Recorded morphology pipeline. Created with ``volume``.
+
+    The methods record an operation and return a new expression. Nothing
+    is computed before ``compute`` is called. Expressions with the same
+    shape and dtype can be subtracted with ``-``.
+
+    Attributes
+    ----------
+    shape
+        Shape of the result.
+    dtype
+        Type of the result.
+    """
+
+    def __init__(self, kind, inputs=(), op=None, struct=None, value=None):
+        self._kind = kind
+        self._inputs = tuple(inputs)
+        self._op = op
+        self._struct = struct
+        self._value = value
+        source = value if kind == 'input' else inputs[0]
+        self.shape = source.shape
+        self.dtype = source.dtype
+
+    def morph(self, strel, op):
+        """Record ``flat.morph``."""
+        return self._morph(_flat_struct(strel), op)
+
+    def dilate(self, strel):
+        """Record ``flat.dilate``."""
+        return self.morph(strel, constants.DILATE)
+
+    def erode(self, strel):
+        """Record ``flat.erode``."""
+        return self.morph(strel, constants.ERODE)
+
+    def open(self, strel):
+        """Record ``flat.open``."""
+        return self.morph(strel, constants.OPEN)
+
+    def close(self, strel):
+        """Record ``flat.close``."""
+        return self.morph(strel, constants.CLOSE)
+
+    def tophat(self, strel):
+        """Record ``flat.tophat``."""
+        return self.morph(strel, constants.TOPHAT)
+
+    def bothat(self, strel):
+        """Record ``flat.bothat``."""
+        return self.morph(strel, constants.BOTHAT)
+
+    def linear_morph(self, line_steps, line_lens, op):
+        """Record ``flat.linear_morph``."""
+        return self._morph(_linear_struct(line_steps, line_lens), op)
+
+    def linear_dilate(self, line_steps, line_lens):
+        """Record ``flat.linear_dilate``."""
+        return self.linear_morph(line_steps, line_lens, constants.DILATE)
+
+    def linear_erode(self, line_steps, line_lens):
+        """Record ``flat.linear_erode``."""
+        return self.linear_morph(line_steps, line_lens, constants.ERODE)
+
+    def linear_open(self, line_steps, line_lens):
+        """Record ``flat.linear_open``."""
+        return self.linear_morph(line_steps, line_lens, constants.OPEN)
+
+    def linear_close(self, line_steps, line_lens):
+        """Record ``flat.linear_close``."""
+        return self.linear_morph(line_steps, line_lens, constants.CLOSE)
+
+    def linear_tophat(self, line_steps, line_lens):
+        """Record ``flat.linear_tophat``."""
+        return self.linear_morph(line_steps, line_lens, constants.TOPHAT)
+
+    def linear_bothat(self, line_steps, line_lens):
+        """Record ``flat.linear_bothat``."""
+        return self.linear_morph(line_steps, line_lens, constants.BOTHAT)
+
+    def gen_morph(self, strel, op):
+        """Record ``gen.morph``."""
+        return self._morph(_gen_struct(strel), op)
+
+    def gen_dilate(self, strel):
+        """Record ``gen.dilate``."""
+        return self.gen_morph(strel, constants.DILATE)
+
+    def gen_erode(self, strel):
+        """Record ``gen.erode``."""
+        return self.gen_morph(strel, constants.ERODE)
+
+    def gen_open(self, strel):
+        """Record ``gen.open``."""
+        return self.gen_morph(strel, constants.OPEN)
+
+    def gen_close(self, strel):
+        """Record ``gen.close``."""
+        return self.gen_morph(strel, constants.CLOSE)
+
+    def gen_tophat(self, strel):
+        """Record ``gen.tophat``."""
+        return self.gen_morph(strel, constants.TOPHAT)
+
+    def gen_bothat(self, strel):
+        """Record ``gen.bothat``."""
+        return self.gen_morph(strel, constants.BOTHAT)
+
+    def __sub__(self, other):
+        if not isinstance(other, Expr):
+            return NotImplemented
+        if other.shape != self.shape or other.dtype != self.dtype:
+            raise ValueError('expressions must have same shape and dtype')
+        return Expr('subtract', (self, other))
+
+    def _morph(self, struct, op):
+        # Operations are recorded as dilations, erosions and differences,
+        # so the optimizer only has to recognize those
+        assert(op in _OP_NAMES)
+        if op == constants.DILATE or op == constants.ERODE:
+            return Expr('morph', (self,), op, struct)
+        if op == constants.OPEN or op == constants.TOPHAT:
+            first, second = constants.ERODE, constants.DILATE
+        else:
+            first, second = constants.DILATE, constants.ERODE
+        res = self._morph(struct, first)._morph(struct, second)
+        if op == constants.TOPHAT:
+            return self - res
+        if op == constants.BOTHAT:
+            return res - self
+        return res
+
+    def compute(self, block_size=None, backend=None, out=None):
+        """
+        Compute the expression.
+
+        Parameters
+        ----------
+        block_size
+            Block size passed on to the functions in ``flat`` and ``gen``.
+            If None, their default is used.
+        backend
+            Backend to use. See ``flat.morph``.
+        out
+            Array to write the result into, which is then returned. Must
+            have the same shape and dtype as the result. May be the input
+            volume.
+
+        Returns
+        -------
+        numpy.array
+            The result.
+        """
+        return _execute(_optimize([self]), block_size, backend, out)[0]
+
+    def explain(self):
+        """
+        Returns the optimized plan for computing the expression.
+
+        Returns
+        -------
+        str
+            One line per step, naming the function called and its
+            arguments.
+        """
+        return _explain(_optimize([self]))
+
+    def __repr__(self):
+        return 'Expr(shape={}, dtype={})'.format(self.shape, self.dtype)
+
+
+def volume(vol):
+    """
+    Start recording a pipeline on a volume.
+
+    Parameters
+    ----------
+    vol
+        Volume to apply operations to. Must be convertible to numpy array of
+        at most 3 dimensions. It is not copied, so it should not be changed
+        before the pipeline is computed.
+
+    Returns
+    -------
+    Expr
+        Expression for the volume itself.
+    """
+    return Expr('input', value=np.asarray(vol))
+
+
+def compute(*exprs, block_size=None, backend=None):
+    """
+    Compute several expressions together.
+
+    Subexpressions which the expressions have in common are only computed
+    once.
+
+    Parameters
+    ----------
+    exprs
+        Expressions to compute.
+    block_size
+        Block size. See ``Expr.compute``.
+    backend
+        Backend to use. See ``Expr.compute``.
+
+    Returns
+    -------
+    list
+        Results in the same order as exprs.
+    """
+    return _execute(_optimize(exprs), block_size, backend, None)
+
+
+def _postorder(outputs):
+    """Returns the nodes reachable from outputs with inputs first."""
+    order = []
+    seen = set()
+    stack = [(node, False) for node in reversed(outputs)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            order.append(node)
+        elif id(node) not in seen:
+            seen.add(id(node))
+            stack.append((node, True))
+            stack += [(i, False) for i in reversed(node._inputs)]
+    return order
+
+
+def _consumers(outputs):
+    """Returns the number of uses of each node, counting outputs as uses."""
+    counts = {}
+    for node in _postorder(outputs):
+        counts.setdefault(id(node), 0)
+        for i in node._inputs:
+            counts[id(i)] += 1
+    for node in outputs:
+        counts[id(node)] += 1
+    return counts
+
+
+def _optimize(outputs):
+    """Returns the output nodes of the simplified graph."""
+    order = _postorder(outputs)
+
+    # Share identical subexpressions
+    canonical = {}
+    nodes = {}
+    for node in order:
+        inputs = tuple(canonical[id(i)] for i in node._inputs)
+        if node._kind == 'input':
+            key = ('input', id(node._value))
+        else:
+            key = (node._kind, node._op,
+                   None if node._struct is None else node._struct.key,
+                   tuple(id(i) for i in inputs))
+        if key not in nodes:
+            nodes[key] = (node if inputs == node._inputs else
+                          Expr(node._kind, inputs, node._op, node._struct,
+                               node._value))
+        canonical[id(node)] = nodes[key]
+    outputs = [canonical[id(node)] for node in outputs]
+
+    # Rewrite into the operations the backends compute in one call. Steps
+    # are only merged into a later step if nothing else uses their result.
+    uses = _consumers(outputs)
+    steps = {}
+    step_uses = {}
+    for node in _postorder(outputs):
+        inputs = [steps[id(i)] for i in node._inputs]
+        if node._kind == 'input':
+            step = node
+        elif node._kind == 'subtract':
+            step = _fuse_subtract(*inputs, step_uses)
+        else:
+            step = _fuse_morph(node, inputs[0], uses[id(node)], step_uses)
+        steps[id(node)] = step
+        step_uses.setdefault(id(step), 0)
+        step_uses[id(step)] += uses[id(node)]
+    return [steps[id(node)] for node in outputs]
+
+
+def _fuse_subtract(a, b, step_uses):
+    # x - open(x) is a top-hat and close(x) - x a bot-hat
+    if (b._kind == 'morph' and b._op == constants.OPEN
+            and b._inputs[0] is a and step_uses[id(b)] == 1):
+        step_uses[id(a)] -= 1
+        return Expr('morph', (a,), constants.TOPHAT, b._struct)
+    if (a._kind == 'morph' and a._op == constants.CLOSE
+            and a._inputs[0] is b and step_uses[id(a)] == 1):
+        step_uses[id(b)] -= 1
+        return Expr('morph', (b,), constants.BOTHAT, a._struct)
+    return Expr('subtract', (a, b))
+
+
+def _fuse_morph(node, child, uses, step_uses):
+    struct = node._struct
+    op = node._op
+    if struct.is_identity():
+        step_uses[id(child)] -= 1
+        return child
+    if (child._kind != 'morph' or step_uses[id(child)] != 1
+            or child._struct.family != struct.family):
+        return Expr('morph', (child,), op, struct)
+
+    inner = child._inputs[0]
+    dual = constants.ERODE if op == constants.DILATE else constants.DILATE
+    if child._op == dual and child._struct.key == struct.key:
+        fused = constants.OPEN if op == constants.DILATE else constants.CLOSE
+        if (struct.symmetric and inner._kind == 'morph'
+                and inner._op == fused and inner._struct.key == struct.key):
+            # Openings and closings are idempotent
+            step_uses[id(inner)] -= 1
+            return inner
+        return Expr('morph', (inner,), fused, struct)
+    if child._op == op and struct.family == 'linear':
+        a = child._struct.arrays
+        b = struct.arrays
+        merged = _lines_struct(
+            np.concatenate([a['line_steps'], b['line_steps']]),
+            np.concatenate([a['line_lens'], b['line_lens']]))
+        return Expr('morph', (inner,), op, merged)
+    return Expr('morph', (child,), op, struct)
+
+
+def _execute(outputs, block_size, backend, out):
+    kwargs = {'backend': backend}
+    if block_size is not None:
+        kwargs['block_size'] = block_size
+    remaining = _consumers(outputs)
+    keep = set(id(node) for node in outputs)
+    values = {}
+    for node in _postorder(outputs):
+        if node._kind == 'input':
+            values[id(node)] = node._value
+            continue
+        args = [values[id(i)] for i in node._inputs]
+        # Overwrite an intermediate volume which is not needed afterwards
+        dst = None
+        for i in node._inputs:
+            if (i._kind != 'input' and remaining[id(i)] == 1
+                    and id(i) not in keep):
+                dst = values[id(i)]
+                break
+        if out is not None and node is outputs[0]:
+            dst = out
+        values[id(node)] = _compute_step(node, args, dst, kwargs)
+        for i in node._inputs:
+            remaining[id(i)] -= 1
+            if remaining[id(i)] == 0:
+                del values[id(i)]
+
+    results = [values[id(node)] for node in outputs]
+    if out is not None and outputs[0]._kind == 'input':
+        out[...] = results[0]
+        results[0] = out
+    return results
+
+
+def _compute_step(node, args, out, kwargs):
+    if node._kind == 'subtract':
+        if out is None:
+            out = np.empty_like(args[0])
+        _cpu.subtract(args[0], args[1], out=out)
+        return out
+    struct = node._struct
+    if struct.family == 'flat':
+        return flat.morph(args[0], struct.arrays['strel'], node._op,
+                          out=out, **kwargs)
+    if struct.family == 'linear':
+        return flat.linear_morph(args[0], struct.arrays['line_steps'],
+                                 struct.arrays['line_lens'], node._op,
+                                 out=out, **kwargs)
+    return gen.morph(args[0], struct.arrays['strel'], node._op, out=out,
+                     **kwargs)
+
+
+def _explain(outputs):
+    names = {}
+    lines = []
+    for node in _postorder(outputs):
+        name = 't{}'.format(len(names))
+        names[id(node)] = name
+        args = ', '.join(names[id(i)] for i in node._inputs)
+        if node._kind == 'input':
+            desc = 'input {} {}'.format(
+                'x'.join(str(n) for n in node.shape), node.dtype)
+        elif node._kind == 'subtract':
+            desc = 'subtract({})'.format(args)
+        else:
+            func = {'flat': 'flat.morph', 'linear': 'flat.linear_morph',
+                    'gen': 'gen.morph'}[node._struct.family]
+            desc = '{}({}, {}, {})'.format(func, args,
+                                           node._struct.description,
+                                           _OP_NAMES[node._op])
+        lines.append('{} = {}'.format(name, desc))
+    return '\n'.join(lines)
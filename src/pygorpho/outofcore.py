@@ -0,0 +1,277 @@
+"""Mathematical morphology on volumes which do not fit in memory."""
+
+import os
+import numpy as np
+from . import _util
+from . import constants
+from . import flat
+
+
+def morph(src, strel, op, dst=None, memory_limit=2**30,
+          block_size=[256, 256, 256], backend=None, shape=None, dtype=None,
+          offset=0):
+    """
+    Morphological operation with flat structuring element on a volume stored
+    on disk.
+
+    The volume is processed in slabs along its slowest varying axis. Each slab
+    is read with a halo given by the size of the structuring element, so the
+    result is identical to ``flat.morph``.
+
+    Parameters
+    ----------
+    src
+        Volume to apply operation to. Must be a numpy array (such as a
+        ``numpy.memmap``) of at most 3 dimensions, or the path of a ``.npy``
+        file or a raw file. For raw files, shape and dtype must be given.
+    strel
+        Structuring element. Must be convertible to numpy array of at most 3
+        dimensions.
+    op
+        Operation to perform. Must be either ``DILATE``, ``ERODE``, ``OPEN``,
+        ``CLOSE``, ``TOPHAT``, ``BOTHAT`` from ``constants``.
+    dst
+        Where to write the result. Must be a numpy array with same shape and
+        dtype as src, or the path of a ``.npy`` file or raw file which is
+        created. May be src itself or the path of the file src is read from,
+        in which case the file is overwritten in place. If None, the result
+        is returned in a new array in memory.
+    memory_limit
+        Maximum number of bytes used for slabs of the volume. Block buffers
+        used by the backend come in addition to this.
+    block_size
+        Block size for processing each slab. See ``flat.morph``.
+    backend
+        Backend to use. See ``flat.morph``.
+    shape
+        Shape of the volume in a raw file.
+    dtype
+        Type of the voxels in a raw file.
+    offset
+        Number of bytes before the volume in a raw file.
+
+    Returns
+    -------
+    numpy.array
+        Volume of same size as src with the result of the operation. This is
+        a ``numpy.memmap`` if dst is a path.
+
+    Raises
+    ------
+    ValueError
+        If the memory limit is too small to hold a slab with its halo, or if
+        dst names the file of a read-only src array.
+
+    Example
+    -------
+    .. code-block:: python
+        :dedent: 4
+
+        >>> import numpy as np
+        >>> import pygorpho as pg
+        >>> vol = np.lib.format.open_memmap('vol.npy', mode='w+',
+        ...                                 dtype=np.uint8,
+        ...                                 shape=(1000, 1000, 1000))
+        >>> vol[500, 500, 500] = 1
+        >>> strel = np.ones((11, 11, 11))
+        >>> res = pg.outofcore.morph('vol.npy', strel, pg.DILATE,
+        ...                          dst='res.npy', memory_limit=2**28)
+    """
+    assert(op in [constants.DILATE, constants.ERODE, constants.OPEN,
+                  constants.CLOSE, constants.TOPHAT, constants.BOTHAT])
+
+    strel = np.atleast_3d(np.asarray(strel, dtype=np.bool_))
+    before, after = _util.strel_halo(strel.shape, op)
+
+    def func(slab, perm):
+        return flat.morph(slab, strel.transpose(perm), op, block_size,
+                          backend)
+
+    return _process(src, dst, before, after, func, memory_limit, shape,
+                    dtype, offset)
+
+
+def linear_morph(src, line_steps, line_lens, op, dst=None,
+                 memory_limit=2**30, block_size=[256, 256, 512],
+                 backend=None, shape=None, dtype=None, offset=0):
+    """
+    Morphological operation with flat line segment structuring elements on a
+    volume stored on disk.
+
+    The volume is processed in slabs along its slowest varying axis. Each slab
+    is read with a halo given by the combined extent of the line segments, so
+    the result is identical to ``flat.linear_morph``.
+
+    Parameters
+    ----------
+    src
+        Volume to apply operation to. Must be a numpy array (such as a
+        ``numpy.memmap``) of at most 3 dimensions, or the path of a ``.npy``
+        file or a raw file. For raw files, shape and dtype must be given.
+    line_steps
+        Step vector for each line segment. See ``flat.linear_morph``.
+    line_lens
+        Length of each line segment. See ``flat.linear_morph``.
+    op
+        Operation to perform. Must be either ``DILATE``, ``ERODE``, ``OPEN``,
+        ``CLOSE``, ``TOPHAT``, ``BOTHAT`` from ``constants``.
+    dst
+        Where to write the result. Must be a numpy array with same shape and
+        dtype as src, or the path of a ``.npy`` file or raw file which is
+        created. May be src itself or the path of the file src is read from,
+        in which case the file is overwritten in place. If None, the result
+        is returned in a new array in memory.
+    memory_limit
+        Maximum number of bytes used for slabs of the volume. Block buffers
+        used by the backend come in addition to this.
+    block_size
+        Block size for processing each slab. See ``flat.linear_morph``.
+    backend
+        Backend to use. See ``flat.linear_morph``.
+    shape
+        Shape of the volume in a raw file.
+    dtype
+        Type of the voxels in a raw file.
+    offset
+        Number of bytes before the volume in a raw file.
+
+    Returns
+    -------
+    numpy.array
+        Volume of same size as src with the result of the operation. This is
+        a ``numpy.memmap`` if dst is a path.
+
+    Raises
+    ------
+    ValueError
+        If the memory limit is too small to hold a slab with its halo, or if
+        dst names the file of a read-only src array.
+
+    Example
+    -------
+    .. code-block:: python
+        :dedent: 4
+
+        >>> import numpy as np
+        >>> import pygorpho as pg
+        >>> lineSteps, lineLens = pg.strel.flat_ball_approx(15)
+        >>> res = pg.outofcore.linear_morph('ct.raw', lineSteps, lineLens,
+        ...                                 pg.DILATE, dst='res.raw',
+        ...                                 shape=(2048, 2048, 2048),
+        ...                                 dtype=np.uint16)
+    """
+    assert(op in [constants.DILATE, constants.ERODE, constants.OPEN,
+                  constants.CLOSE, constants.TOPHAT, constants.BOTHAT])
+
+    line_steps = np.atleast_2d(np.asarray(line_steps, dtype=np.int32))
+    line_lens = np.atleast_1d(np.asarray(line_lens, dtype=np.int32))
+    assert line_steps.ndim == 2
+    assert line_steps.shape[1] == 3
+    assert line_steps.shape[0] == line_lens.shape[0]
+
+    before, after = _util.lines_halo(line_steps, line_lens, op)
+
+    def func(slab, perm):
+        return flat.linear_morph(slab, line_steps[:, perm], line_lens, op,
+                                 block_size, backend)
+
+    return _process(src, dst, before, after, func, memory_limit, shape,
+                    dtype, offset)
+
+
+def _open_input(src, shape, dtype, offset, mode='r'):
+    if isinstance(src, np.ndarray):
+        return src
+    if str(src).endswith('.npy'):
+        return np.load(src, mmap_mode=mode)
+    if shape is None or dtype is None:
+        raise ValueError('shape and dtype must be given for raw files')
+    return np.memmap(src, dtype=dtype, mode=mode, shape=tuple(shape),
+                     offset=offset)
+
+
+def _same_file(src, dst):
+    """Return True if the path dst names the file backing src."""
+    if dst is None or isinstance(dst, np.ndarray):
+        return False
+    if isinstance(src, np.ndarray):
+        src = getattr(src, 'filename', None)
+        if src is None:
+            return False
+    try:
+        return os.path.samefile(src, dst)
+    except OSError:
+        return False
+
+
+def _open_output(dst, src):
+    if dst is None:
+        return np.empty(src.shape, dtype=src.dtype,
+                        order='F' if np.isfortran(src) else 'C')
+    if isinstance(dst, np.ndarray):
+        if dst.shape != src.shape or dst.dtype != src.dtype:
+            raise ValueError('dst must have same shape and dtype as src')
+        return dst
+    if str(dst).endswith('.npy'):
+        return np.lib.format.open_memmap(
+            os.fspath(dst), mode='w+', dtype=src.dtype, shape=src.shape,
+            fortran_order=np.isfortran(src))
+    order = 'F' if np.isfortran(src) else 'C'
+    return np.memmap(dst, dtype=src.dtype, mode='w+', shape=src.shape,
+                     order=order)
+
+
+def _process(src, dst, halo_before, halo_after, func, memory_limit, shape,
+             dtype, offset):
+    """
+    Apply func to slabs of src with a halo and write the results to dst.
+
+    Slabs are taken along the slowest varying axis of src. A slab is only
+    written once the next slab has been read, so dst may be src. At most
+    three slabs are kept in memory at a time.
+    """
+    if _same_file(src, dst):
+        # Opening dst with mode='w+' would truncate the input, so write to
+        # the input file itself instead
+        src = _open_input(src, shape, dtype, offset, mode='r+')
+        if not src.flags.writeable:
+            raise ValueError('dst names the file of src, but src is not '
+                             'writeable')
+        dst = src
+    else:
+        src = _open_input(src, shape, dtype, offset)
+    if src.ndim > 3:
+        raise ValueError('src must have at most 3 dimensions')
+    dst = _open_output(dst, src)
+
+    vol = np.atleast_3d(src)
+    res = np.atleast_3d(dst)
+    perm = _util.axes_order(vol)
+    vol = vol.transpose(perm)
+    res = res.transpose(perm)
+    before = int(halo_before[perm[0]])
+    after = int(halo_after[perm[0]])
+
+    n = vol.shape[0]
+    plane_bytes = max(1, vol[0].nbytes)
+    # Slabs must be at least as thick as the halo for the read ahead
+    thickness = memory_limit // (3 * plane_bytes) - before - after
+    if thickness < max(1, before, after):
+        raise ValueError('memory_limit is too small for structuring element')
+
+    pending = None
+    for start in range(0, n, thickness):
+        stop = min(start + thickness, n)
+        lo = max(0, start - before)
+        hi = min(n, stop + after)
+        slab = np.array(vol[lo:hi])
+        if pending is not None:
+            res[pending[0]] = pending[1]
+        out = func(slab, perm)
+        pending = (slice(start, stop), out[start - lo:stop - lo])
+    if pending is not None:
+        res[pending[0]] = pending[1]
+
+    if isinstance(dst, np.memmap):
+        dst.flush()
+    return dst
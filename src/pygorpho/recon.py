@@ -0,0 +1,456 @@
+"""
+Morphological reconstruction and operations built on it.
+
+Reconstruction by dilation repeats geodesic dilations of a marker volume
+under a mask volume until nothing changes. It is computed with the hybrid
+algorithm of [V93]_: the volume is first swept plane by plane along each
+axis in both directions, which propagates values along straight paths, and
+the remaining changes are then propagated from a queue of voxels. The cost
+is close to linear in the number of voxels. Reconstruction is computed on
+the CPU with NumPy for all backends.
+
+References
+----------
+.. [V93] L. Vincent, "Morphological grayscale reconstruction in image
+   analysis: applications and efficient algorithms," IEEE Transactions on
+   Image Processing 2. (pp. 176-201). 1993.
+"""
+
+import numpy as np
+from . import _cpu
+from . import constants
+from . import flat
+
+#: Neighborhoods for each connectivity as offsets, one per row
+_OFFSETS = {
+    conn: np.array([d for d in np.ndindex(3, 3, 3)
+                    if 0 < np.abs(np.subtract(d, 1)).sum() <= limit]) - 1
+    for conn, limit in [(6, 1), (18, 2), (26, 3)]
+}
+
+
+def reconstruct(marker, mask, method='dilation', connectivity=26, out=None):
+    """
+    Morphological reconstruction of marker under (or over) mask.
+
+    Parameters
+    ----------
+    marker
+        Volume to start from. Must be convertible to numpy array of at most
+        3 dimensions. For reconstruction by dilation, values above mask are
+        lowered to mask first. For reconstruction by erosion, values below
+        mask are raised to mask first.
+    mask
+        Volume which limits the reconstruction. Must have same shape and
+        dtype as marker.
+    method
+        Either ``'dilation'`` or ``'erosion'``.
+    connectivity
+        Voxels are neighbors if they share a face (6), an edge (18) or a
+        corner (26).
+    out
+        Array to write the result into, which is then returned. Must have
+        the same shape and dtype as marker. May be marker or mask.
+
+    Returns
+    -------
+    numpy.array
+        Volume of same size as marker with the reconstruction.
+
+    Example
+    -------
+    .. code-block:: python
+        :dedent: 4
+
+        >>> import numpy as np
+        >>> import pygorpho as pg
+        >>> mask = np.zeros((100, 100, 100), dtype=np.uint8)
+        >>> mask[10:30, 10:30, 10:30] = 1
+        >>> mask[50:90, 50:90, 50:90] = 1
+        >>> marker = np.zeros_like(mask)
+        >>> marker[60, 60, 60] = 1
+        >>> # Keep only the component containing the marker
+        >>> res = pg.recon.reconstruct(marker, mask)
+    """
+    assert(method in ['dilation', 'erosion'])
+    if connectivity not in _OFFSETS:
+        raise ValueError('connectivity must be 6, 18 or 26')
+
+    marker = np.asarray(marker)
+    mask = np.asarray(mask)
+    if marker.shape != mask.shape or marker.dtype != mask.dtype:
+        raise ValueError('marker and mask must have same shape and dtype')
+    if marker.ndim > 3:
+        raise ValueError('marker must have at most 3 dimensions')
+    _cpu.check_type(marker.dtype)
+    if out is not None and (not isinstance(out, np.ndarray)
+                            or out.shape != marker.shape
+                            or out.dtype != marker.dtype):
+        raise ValueError('out must have same shape and dtype as marker')
+
+    op = constants.DILATE if method == 'dilation' else constants.ERODE
+    res = _reconstruct(np.atleast_3d(marker), np.atleast_3d(mask), op,
+                       connectivity)
+    if out is None:
+        return res.reshape(marker.shape)
+    out[...] = res.reshape(marker.shape)
+    return out
+
+
+def open_by_reconstruction(vol, strel, connectivity=26,
+                           block_size=[256, 256, 256], backend=None):
+    """
+    Opening by reconstruction with flat structuring element.
+
+    The volume is eroded and then reconstructed by dilation under itself.
+    Unlike an opening, this keeps the exact shape of all structures which
+    the structuring element fits into.
+
+    Parameters
+    ----------
+    vol
+        Volume to open. Must be convertible to numpy array of at most 3
+        dimensions.
+    strel
+        Structuring element for the erosion. Must be convertible to numpy
+        array of at most 3 dimensions.
+    connectivity
+        Connectivity for the reconstruction. See ``reconstruct``.
+    block_size
+        Block size for the erosion. See ``flat.morph``.
+    backend
+        Backend for the erosion. See ``flat.morph``.
+
+    Returns
+    -------
+    numpy.array
+        Volume of same size as vol with the result of the opening.
+    """
+    vol = np.asarray(vol)
+    marker = flat.erode(vol, strel, block_size, backend)
+    return reconstruct(marker, vol, 'dilation', connectivity, out=marker)
+
+
+def close_by_reconstruction(vol, strel, connectivity=26,
+                            block_size=[256, 256, 256], backend=None):
+    """
+    Closing by reconstruction with flat structuring element.
+
+    The volume is dilated and then reconstructed by erosion over itself.
+
+    Parameters
+    ----------
+    vol
+        Volume to close. Must be convertible to numpy array of at most 3
+        dimensions.
+    strel
+        Structuring element for the dilation. Must be convertible to numpy
+        array of at most 3 dimensions.
+    connectivity
+        Connectivity for the reconstruction. See ``reconstruct``.
+    block_size
+        Block size for the dilation. See ``flat.morph``.
+    backend
+        Backend for the dilation. See ``flat.morph``.
+
+    Returns
+    -------
+    numpy.array
+        Volume of same size as vol with the result of the closing.
+    """
+    vol = np.asarray(vol)
+    marker = flat.dilate(vol, strel, block_size, backend)
+    return reconstruct(marker, vol, 'erosion', connectivity, out=marker)
+
+
+def fill_holes(vol, connectivity=6):
+    """
+    Fill holes in a volume.
+
+    A hole is a region of low values which cannot be reached from the
+    border of the volume without passing higher values. It is raised to the
+    lowest value it is surrounded by. For binary volumes, this fills all
+    background regions which are not connected to the border.
+
+    Parameters
+    ----------
+    vol
+        Volume to fill. Must be convertible to numpy array of at most 3
+        dimensions.
+    connectivity
+        Connectivity of the holes. See ``reconstruct``.
+
+    Returns
+    -------
+    numpy.array
+        Volume of same size as vol with the holes filled.
+
+    Example
+    -------
+    .. code-block:: python
+        :dedent: 4
+
+        >>> import numpy as np
+        >>> import pygorpho as pg
+        >>> vol = np.zeros((10, 10, 10), dtype=bool)
+        >>> vol[2:8, 2:8, 2:8] = True
+        >>> vol[4:6, 4:6, 4:6] = False
+        >>> res = pg.recon.fill_holes(vol)  # Same as vol[2:8, 2:8, 2:8] = 1
+    """
+    vol = np.asarray(vol)
+    vol3 = np.atleast_3d(vol)
+    marker = np.full_like(vol3, _cpu.identity(vol.dtype, constants.ERODE))
+    # Only the axes of vol have a border; those added by atleast_3d do not
+    axes = {1: [1], 2: [0, 1]}.get(vol.ndim, [0, 1, 2])
+    for axis in axes:
+        for index in [0, -1]:
+            border = [slice(None)] * 3
+            border[axis] = index
+            marker[tuple(border)] = vol3[tuple(border)]
+    return reconstruct(marker, vol3, 'erosion', connectivity,
+                       out=marker).reshape(vol.shape)
+
+
+def hmax(vol, h, connectivity=26):
+    """
+    H-maximum transform.
+
+    Removes all regional maxima whose height above their surroundings is at
+    most h, and lowers the other maxima by h. It is given by reconstruction
+    by dilation of ``vol - h`` under vol.
+
+    Parameters
+    ----------
+    vol
+        Volume to transform. Must be convertible to numpy array of at most 3
+        dimensions.
+    h
+        Non-negative height.
+    connectivity
+        Connectivity of the maxima. See ``reconstruct``.
+
+    Returns
+    -------
+    numpy.array
+        Volume of same size as vol with the result of the transform.
+    """
+    vol = np.asarray(vol)
+    marker = _shift(vol, h, constants.ERODE)
+    return reconstruct(marker, vol, 'dilation', connectivity, out=marker)
+
+
+def hmin(vol, h, connectivity=26):
+    """
+    H-minimum transform.
+
+    Removes all regional minima whose depth below their surroundings is at
+    most h, and raises the other minima by h. It is given by reconstruction
+    by erosion of ``vol + h`` over vol.
+
+    Parameters
+    ----------
+    vol
+        Volume to transform. Must be convertible to numpy array of at most 3
+        dimensions.
+    h
+        Non-negative depth.
+    connectivity
+        Connectivity of the minima. See ``reconstruct``.
+
+    Returns
+    -------
+    numpy.array
+        Volume of same size as vol with the result of the transform.
+    """
+    vol = np.asarray(vol)
+    marker = _shift(vol, h, constants.DILATE)
+    return reconstruct(marker, vol, 'erosion', connectivity, out=marker)
+
+
+def h_maxima(vol, h, connectivity=26):
+    """
+    Regional maxima with a height of at least h.
+
+    Parameters
+    ----------
+    vol
+        Volume to find maxima in. Must be convertible to numpy array of at
+        most 3 dimensions.
+    h
+        Positive height.
+    connectivity
+        Connectivity of the maxima. See ``reconstruct``.
+
+    Returns
+    -------
+    numpy.array
+        Boolean volume of same size as vol which is True in the maxima.
+
+    Example
+    -------
+    .. code-block:: python
+        :dedent: 4
+
+        >>> import numpy as np
+        >>> import pygorpho as pg
+        >>> vol = np.random.rand(100, 100, 100)
+        >>> smooth = pg.flat.open(vol, np.ones((5, 5, 5)))
+        >>> peaks = pg.recon.h_maxima(smooth, 0.1)
+    """
+    vol = np.asarray(vol)
+    marker = _shift(vol, h, constants.ERODE)
+    rec = reconstruct(marker, vol, 'dilation', connectivity)
+    return _depth_reached(vol, rec, marker, h)
+
+
+def h_minima(vol, h, connectivity=26):
+    """
+    Regional minima with a depth of at least h.
+
+    Parameters
+    ----------
+    vol
+        Volume to find minima in. Must be convertible to numpy array of at
+        most 3 dimensions.
+    h
+        Positive depth.
+    connectivity
+        Connectivity of the minima. See ``reconstruct``.
+
+    Returns
+    -------
+    numpy.array
+        Boolean volume of same size as vol which is True in the minima.
+    """
+    vol = np.asarray(vol)
+    marker = _shift(vol, h, constants.DILATE)
+    rec = reconstruct(marker, vol, 'erosion', connectivity)
+    return _depth_reached(vol, rec, marker, h)
+
+
+def _shift(vol, h, op):
+    """
+    Returns vol lowered (for ERODE) or raised (for DILATE) by h, saturating
+    at the limits of the dtype.
+    """
+    if vol.dtype == np.bool_:
+        if h > 0:
+            return np.full_like(vol, op == constants.DILATE)
+        return vol.copy()
+    if np.issubdtype(vol.dtype, np.floating):
+        h = vol.dtype.type(h)
+        return vol - h if op == constants.ERODE else vol + h
+    info = np.iinfo(vol.dtype)
+    wide = vol.astype(np.int64) + (-h if op == constants.ERODE else h)
+    return np.clip(wide, info.min, info.max).astype(vol.dtype)
+
+
+def _depth_reached(vol, rec, marker, h):
+    """
+    Returns where rec differs from vol by at least h, given the marker
+    vol shifted by h which rec was reconstructed from.
+    """
+    if vol.dtype == np.bool_:
+        return (vol != rec) if h > 0 else np.zeros_like(vol)
+    if np.issubdtype(vol.dtype, np.floating):
+        # Rounding makes vol - rec inexact, but rec only equals the marker
+        # where the difference is h
+        return rec == marker
+    return np.abs(vol.astype(np.int64) - rec) >= h
+
+
+def _reconstruct(marker, mask, op, connectivity):
+    """
+    Reconstruction of 3D marker under mask (for DILATE) or over mask (for
+    ERODE). Returns a new array.
+    """
+    if op == constants.DILATE:
+        up, down, better = np.maximum, np.minimum, np.greater
+    else:
+        up, down, better = np.minimum, np.maximum, np.less
+    # A border of identity values saves bounds checks, since nothing can
+    # propagate into it
+    fill = _cpu.identity(marker.dtype, op)
+    res = np.pad(down(marker, mask), 1, constant_values=fill)
+    mask = np.pad(mask, 1, constant_values=fill)
+
+    # Sweep along the axes until few voxels change
+    changed = res.size
+    while changed > res.size // 100:
+        changed = 0
+        for axis in range(3):
+            for reverse in [False, True]:
+                changed += _sweep(res, mask, axis, reverse, connectivity,
+                                  up, down, better)
+    if changed == 0:
+        return res[1:-1, 1:-1, 1:-1].copy()
+
+    # Voxels which can still raise (lower) a neighbor start the queue
+    offsets = _OFFSETS[connectivity]
+    queue = np.zeros(res.shape, dtype=bool)
+    for offset in offsets:
+        dst, src = _cpu.shifted_slices(res.shape, offset)
+        queue[dst] |= better(down(res[dst], mask[src]), res[src])
+    queue = np.flatnonzero(queue)
+
+    # Process the queue one wave of neighbors at a time
+    flat_res = res.reshape(-1)
+    flat_mask = mask.reshape(-1)
+    deltas = np.ravel_multi_index((offsets + 1).T, res.shape) \
+        - np.ravel_multi_index((1, 1, 1), res.shape)
+    while queue.size:
+        vals = flat_res[queue]
+        updated = []
+        for delta in deltas:
+            nb = queue + delta
+            cand = down(vals, flat_mask[nb])
+            keep = better(cand, flat_res[nb])
+            if keep.any():
+                up.at(flat_res, nb[keep], cand[keep])
+                updated.append(nb[keep])
+        queue = (np.unique(np.concatenate(updated)) if updated
+                 else np.empty(0, dtype=np.intp))
+    return res[1:-1, 1:-1, 1:-1].copy()
+
+
+def _sweep(res, mask, axis, reverse, connectivity, up, down, better):
+    """
+    Propagate values plane by plane along an axis. Returns the number of
+    voxels which changed.
+    """
+    res = np.moveaxis(res, axis, 0)
+    mask = np.moveaxis(mask, axis, 0)
+    order = range(res.shape[0] - 2, 0, -1) if reverse \
+        else range(1, res.shape[0] - 1)
+    step = 1 if reverse else -1
+    changed = 0
+    for i in order:
+        prev = _plane_neighbors(res[i + step], connectivity, up)
+        down(prev, mask[i], out=prev)
+        grow = better(prev, res[i])
+        count = np.count_nonzero(grow)
+        if count:
+            changed += count
+            up(res[i], prev, out=res[i])
+    return changed
+
+
+def _plane_neighbors(plane, connectivity, up):
+    """
+    Returns the best value among the neighbors in the previous plane for
+    each voxel.
+    """
+    if connectivity == 6:
+        return plane.copy()
+    res = plane.copy()
+    up(res[1:], plane[:-1], out=res[1:])
+    up(res[:-1], plane[1:], out=res[:-1])
+    if connectivity == 26:
+        # Square neighborhood, done separably
+        tmp = res.copy()
+        up(res[:, 1:], tmp[:, :-1], out=res[:, 1:])
+        up(res[:, :-1], tmp[:, 1:], out=res[:, :-1])
+    else:
+        up(res[:, 1:], plane[:, :-1], out=res[:, 1:])
+        up(res[:, :-1], plane[:, 1:], out=res[:, :-1])
+    return res
@@ -1,7 +1,9 @@
 """Structuring elements for mathematical morhology"""
-import ctypes
+import functools
 import numpy as np
-from . import _thin
+from . import _ball
+from . import _ball_table
+from . import _decompose
 from . import constants
 
 
@@ -10,7 +12,12 @@ def flat_ball_approx(radius, type=constants.BEST):
     Returns approximation to flat ball using line segments.
 
     The approximation is constructed according to [J19]_ and allows for
-    constant time morphology operations.
+    constant time morphology operations. For radii up to 1000 the line
+    segments are the same as those of the gorpho library, which are
+    shipped as a table, so no CUDA device is needed. The library does not
+    support larger radii. For these, the lengths are computed in Python to
+    minimize the Hausdorff distance to the ball and are always odd. Results
+    are cached.
 
     Parameters
     ----------
@@ -25,7 +32,7 @@ def flat_ball_approx(radius, type=constants.BEST):
     -------
     (numpy.array, numpy.array)
         Tuple with step vectors and line lengths which parameterizes the line
-        segments.
+        segments. The arrays are shared between calls and are read-only.
 
     Example
     -------
@@ -46,17 +53,174 @@ def flat_ball_approx(radius, type=constants.BEST):
        Structuring Element for Volumetric Morphology," Scandinavian
        Conference on Image Analysis (pp. 128-139). Springer. 2019.
     """
-    LINE_COUNT = 13
     assert (type == constants.INSIDE or type == constants.BEST or
             type == constants.OUTSIDE)
 
-    radius = ctypes.c_int(radius)
-    type = ctypes.c_int(type)
+    return _flat_ball_approx(int(radius), type)
 
-    line_steps = np.empty((LINE_COUNT, 3), dtype=np.int32, order='C')
-    line_lens = np.empty(LINE_COUNT, dtype=np.int32)
 
-    ret = _thin.flat_ball_approx_impl(line_steps, line_lens, radius, type)
-    _thin.raise_on_error(ret)
+@functools.lru_cache(maxsize=1024)
+def _flat_ball_approx(radius, type):
+    if radius < len(_ball_table.LENGTHS):
+        lens = np.array(_ball_table.LENGTHS[max(radius, 0)][type])
+    else:
+        lens = _ball.ball_lengths(radius, type)
+    line_steps = np.array(_ball_table.STEPS, dtype=np.int32)
+    line_lens = lens[_ball.CLASSES].astype(np.int32)
+    line_steps.flags.writeable = False
+    line_lens.flags.writeable = False
+    return line_steps, line_lens
 
-    return (line_steps, line_lens)
+
+def nested_ball_approx(radii, type=constants.BEST):
+    """
+    Returns approximations to flat balls of increasing radii, each of which
+    contains the previous one.
+
+    The approximations of ``flat_ball_approx`` for consecutive radii do not
+    always contain each other, since the lengths are chosen for each radius
+    on its own. Here, no line segment is shorter than for the previous
+    radius, so each approximation is the previous one dilated with line
+    segments. Subject to this, the lengths are chosen to stay as close to
+    the best approximation for each radius as possible. This is what
+    ``flat.granulometry`` uses. Results are cached.
+
+    Parameters
+    ----------
+    radii
+        Increasing sequence of positive integer radii.
+    type
+        Whether to constrain the zonohedral approximations inside or outside
+        the spheres. Must either ``INSIDE``, ``BEST``, or ``OUTSIDE`` from
+        constants.
+
+    Returns
+    -------
+    (numpy.array, numpy.array)
+        Tuple with step vectors and line lengths which parameterizes the line
+        segments. The lengths have a row for each radius. The arrays are
+        shared between calls and are read-only.
+
+    Example
+    -------
+    .. code-block:: python
+        :dedent: 4
+
+        >>> import pygorpho as pg
+        >>> lineSteps, lineLens = pg.strel.nested_ball_approx(range(1, 11))
+        >>> bool((lineLens[1:] >= lineLens[:-1]).all())
+        True
+    """
+    assert (type == constants.INSIDE or type == constants.BEST or
+            type == constants.OUTSIDE)
+    radii = tuple(int(r) for r in np.atleast_1d(radii))
+    if not radii or radii[0] < 1 or any(a >= b for a, b in
+                                        zip(radii, radii[1:])):
+        raise ValueError('radii must be increasing positive integers')
+    return _nested_ball_approx(radii, type)
+
+
+@functools.lru_cache(maxsize=64)
+def _nested_ball_approx(radii, type):
+    lens = _ball.nested_ball_lengths(radii, type)
+    line_steps = _decompose.DIRECTIONS.astype(np.int32)
+    line_lens = lens[:, _ball.CLASSES].astype(np.int32)
+    line_steps.flags.writeable = False
+    line_lens.flags.writeable = False
+    return line_steps, line_lens
+
+
+def decompose(strel, tolerance=0.0):
+    """
+    Returns decomposition of flat structuring element into line segments.
+
+    Finds line segments along the 13 directions used by ``flat_ball_approx``
+    and small crosses whose Minkowski sum is the structuring element. This
+    is the decomposition ``flat.morph`` uses. Boxes, octahedra and
+    zonohedra are decomposed exactly. Other structuring elements, such as
+    digital balls, can be approximated by line segments if tolerance is
+    larger than 0. The exact search is skipped for structuring elements
+    which are not symmetric about their center.
+
+    Parameters
+    ----------
+    strel
+        Structuring element. Must be convertible to numpy array of at most 3
+        dimensions.
+    tolerance
+        Largest allowed number of voxels where the decomposition differs
+        from strel, as a fraction of the number of voxels in strel.
+
+    Returns
+    -------
+    (numpy.array, numpy.array, tuple) or None
+        Tuple with step vectors and line lengths which parameterizes the line
+        segments, and a tuple of small structuring elements which must also
+        be applied. None if no decomposition was found.
+
+    Example
+    -------
+    .. code-block:: python
+        :dedent: 4
+
+        >>> import numpy as np
+        >>> import pygorpho as pg
+        >>> box = np.ones((5, 7, 9))
+        >>> lineSteps, lineLens, strels = pg.strel.decompose(box)
+        >>> lineLens
+        array([5, 7, 9], dtype=int32)
+    """
+    strel = np.atleast_3d(np.asarray(strel, dtype=np.bool_))
+    return _decompose.decompose(strel, tolerance)
+
+
+def paraboloid(scale, radius, ndim=3):
+    """
+    Returns a parabolic general structuring element.
+
+    The weight at offset o is ``-sum((o / scale)**2)``, so it is 0 at the
+    center and decreases by 1 at a distance of scale along each axis. This
+    is the structuring element ``gen.parabolic_morph`` uses without
+    building it, with radius large enough to cover the volume.
+
+    Parameters
+    ----------
+    scale
+        Positive scale, either a number or a sequence with one number per
+        axis.
+    radius
+        Non-negative integer number of offsets on each side of the center,
+        either a number or a sequence with one number per axis.
+    ndim
+        Number of dimensions.
+
+    Returns
+    -------
+    numpy.array
+        float64 array of size ``2 * radius + 1`` along each axis.
+
+    Example
+    -------
+    .. code-block:: python
+        :dedent: 4
+
+        >>> import pygorpho as pg
+        >>> pg.strel.paraboloid(2.0, 2, ndim=1)
+        array([-1.  , -0.25,  0.  , -0.25, -1.  ])
+    """
+    scale = _per_axis(scale, ndim, 'scale', np.float64)
+    radius = _per_axis(radius, ndim, 'radius', np.int64)
+    if np.any(scale <= 0) or np.any(radius < 0):
+        raise ValueError('scale must be positive and radius non-negative')
+    grids = np.meshgrid(*[np.arange(-r, r + 1) / s
+                          for r, s in zip(radius, scale)], indexing='ij')
+    return 0.0 - sum(g ** 2 for g in grids)
+
+
+def _per_axis(values, ndim, name, dtype):
+    values = np.atleast_1d(np.asarray(values, dtype=dtype))
+    if values.size == 1:
+        values = np.repeat(values, ndim)
+    if values.shape != (ndim,):
+        raise ValueError('{} must have one value per axis'.format(name))
+    return values
@@ -0,0 +1,116 @@
+"""
+Tuning of block sizes.
+
+All morphology functions accept ``block_size='auto'``. The block size is
+then looked up in a cache of block sizes measured by ``tune`` for calls
+with the same backend, device, function, volume shape, dtype, operation and
+structuring element reach. If there is no measurement, the block size is
+estimated from the size of the volume and the structuring element, such
+that a block with its halo uses about ``Backend.block_bytes`` bytes.
+
+The cache is stored in ``block_sizes.json`` in ``PYGORPHO_CACHE_DIR``, or
+else in ``~/.cache/pygorpho``.
+"""
+
+import os
+import time
+from . import _tune
+from ._tune import AUTO, cache_path
+
+
+def tune(func, *args, candidates=None, repeat=3, store=True, **kwargs):
+    """
+    Find the fastest block size for a call and cache it.
+
+    Calls ``func(*args, block_size=b, **kwargs)`` for each candidate block
+    size b and picks the one with the shortest run time. Later calls with
+    ``block_size='auto'`` and the same kind of arguments then use it.
+
+    Parameters
+    ----------
+    func
+        Morphology function, such as ``flat.morph`` or ``flat.linear_dilate``.
+    args, kwargs
+        Arguments for func, except block_size.
+    candidates
+        Sequence of block sizes to try. If None, cubes with sides of powers
+        of two, the default block sizes, the whole volume and the estimated
+        block size are tried.
+    repeat
+        Number of times each candidate is timed. The shortest time counts.
+    store
+        Whether to save the result in the cache.
+
+    Returns
+    -------
+    list
+        The fastest block size.
+
+    Example
+    -------
+    .. code-block:: python
+        :dedent: 4
+
+        >>> import numpy as np
+        >>> import pygorpho as pg
+        >>> vol = np.random.rand(300, 300, 300).astype(np.float32)
+        >>> strel = np.ones((7, 7, 7))
+        >>> pg.tune.tune(pg.flat.morph, vol, strel, pg.DILATE)
+        >>> res = pg.flat.dilate(vol, strel, block_size='auto')
+    """
+    if 'block_size' in kwargs:
+        raise TypeError('block_size is chosen by tune')
+    if candidates is None:
+        candidates = [AUTO]
+    else:
+        candidates = [[int(b) for b in c] for c in candidates]
+
+    calls = []
+    token = _tune._capture.set(calls)
+    try:
+        func(*args, block_size=candidates[0], **kwargs)  # Warm up
+    finally:
+        _tune._capture.reset(token)
+    if not calls:
+        raise ValueError('func does not take block_size')
+    key, estimate = calls[-1]
+    if candidates == [AUTO]:
+        candidates = default_candidates(key, estimate)
+
+    best = None
+    for block_size in candidates:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(*args, block_size=block_size, **kwargs)
+            times.append(time.perf_counter() - start)
+        if best is None or min(times) < best[0]:
+            best = (min(times), block_size)
+    if store:
+        _tune.store(key, best[1])
+    return best[1]
+
+
+def default_candidates(key, estimate):
+    """
+    Returns the block sizes tune tries by default for a cache key and the
+    block size used for ``'auto'``.
+    """
+    shape = [int(n) for n in key.split('|')[3].split('x')][-3:]
+    sizes = [list(estimate), [32] * 3, [64] * 3, [128] * 3, [256] * 3,
+             [512] * 3, [256, 256, 512], shape]
+    candidates = []
+    for block in sizes:
+        block = [min(b, n) for b, n in zip(block, shape)]
+        if block not in candidates:
+            candidates.append(block)
+    return candidates
+
+
+def clear_cache():
+    """Delete all tuned block sizes."""
+    _tune.reset()
+    try:
+        os.remove(cache_path())
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,92 @@
+import asyncio
+import concurrent.futures
+import threading
+
+import pytest
+
+import pygorpho as pg
+import numpy as np
+
+
+def test_result():
+    rng = np.random.default_rng(0)
+    vol = rng.random((10, 11, 12))
+    strel = np.ones((3, 3, 3))
+    fut = pg.aio.flat.dilate(vol, strel)
+    assert isinstance(fut, pg.aio.MorphFuture)
+    np.testing.assert_equal(fut.result(), pg.flat.dilate(vol, strel))
+
+    line_steps = [[1, 0, 0], [0, 1, 1]]
+    fut = pg.aio.flat.linear_close(vol, line_steps, [3, 5])
+    np.testing.assert_equal(fut.result(),
+                            pg.flat.linear_close(vol, line_steps, [3, 5]))
+
+    fut = pg.aio.gen.erode(vol, np.zeros((3, 3, 3)))
+    np.testing.assert_equal(fut.result(), pg.flat.erode(vol, strel))
+
+
+def test_chaining():
+    rng = np.random.default_rng(1)
+    vol = rng.random((10, 11, 12))
+    strel = np.ones((3, 3, 3))
+    expected = pg.flat.close(vol, strel)
+
+    fut = pg.aio.flat.dilate(vol, strel).then(pg.flat.erode, strel)
+    np.testing.assert_equal(fut.result(), expected)
+
+    # Futures as arguments
+    gate = threading.Event()
+    with pg.aio.use_executor(concurrent.futures.ThreadPoolExecutor(1)):
+        first = pg.aio.submit(lambda: gate.wait() and vol)
+        fut = pg.aio.flat.close(first, strel=pg.aio.submit(lambda: strel))
+        assert not fut.done()
+        gate.set()
+        np.testing.assert_equal(fut.result(), expected)
+
+
+def test_use_backend():
+    class SpyBackend(pg.backend.CpuBackend):
+        name = 'spy'
+        priority = -1
+
+        def __init__(self):
+            self.calls = []
+
+        def flat_morph(self, res, vol, strel, op, block_size):
+            self.calls.append(op)
+            super().flat_morph(res, vol, strel, op, block_size)
+
+    spy = SpyBackend()
+    pg.backend.register_backend(spy)
+    try:
+        vol = np.zeros((5, 6, 7))
+        # Not decomposable into line segments, so flat_morph is used
+        strel = np.indices((3, 3, 3)).sum(axis=0) % 2 == 0
+        with pg.backend.use_backend('spy'):
+            fut = pg.aio.flat.dilate(vol, strel).then(pg.flat.erode, strel)
+        fut.result()
+        assert spy.calls == [pg.DILATE, pg.ERODE]
+    finally:
+        del pg.backend._registry[spy.name]
+
+
+def test_exception():
+    fut = pg.aio.flat.morph(np.zeros((3, 3, 3)), np.ones((3, 3, 3)), -1)
+    with pytest.raises(AssertionError):
+        fut.result()
+    # Errors are passed on to chained calls
+    with pytest.raises(AssertionError):
+        fut.then(pg.flat.erode, np.ones((3, 3, 3))).result()
+
+
+def test_await():
+    vol = np.zeros((5, 6, 7))
+    vol[2, 3, 4] = 1
+    strel = np.ones((3, 3, 3))
+
+    async def main():
+        first = pg.aio.flat.dilate(vol, strel)
+        return await pg.aio.flat.erode(first, strel)
+
+    res = asyncio.run(main())
+    np.testing.assert_equal(res, pg.flat.close(vol, strel))
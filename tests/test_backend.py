@@ -0,0 +1,164 @@
+import pytest
+
+import pygorpho as pg
+import numpy as np
+
+
+class RecordingBackend(pg.backend.CpuBackend):
+    name = 'recording'
+    priority = 50
+    min_bytes = 1000
+
+    def __init__(self):
+        self.calls = []
+
+    def supports(self, dtype):
+        return dtype != np.float64
+
+    def flat_morph(self, res, vol, strel, op, block_size):
+        self.calls.append(op)
+        super().flat_morph(res, vol, strel, op, block_size)
+
+    def flat_sum_morph(self, res, vol, line_steps, line_lens, strels, op,
+                       block_size):
+        self.calls.append(op)
+        super().flat_sum_morph(res, vol, line_steps, line_lens, strels, op,
+                               block_size)
+
+
+@pytest.fixture
+def recording():
+    backend = RecordingBackend()
+    pg.backend.register_backend(backend)
+    yield backend
+    del pg.backend._registry[backend.name]
+
+
+def test_cpu_available():
+    assert 'cpu' in pg.backend.available_backends()
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        pg.flat.dilate([0, 1, 0], [1, 1, 1], backend='nonexistent')
+    with pytest.raises(ValueError):
+        with pg.backend.use_backend('nonexistent'):
+            pass
+
+
+def test_per_call_backend(recording):
+    res = pg.flat.dilate([0, 1, 0], [1, 1, 1], backend='recording')
+    np.testing.assert_equal(res, [1, 1, 1])
+    assert recording.calls == [pg.DILATE]
+
+
+def test_use_backend(recording):
+    with pg.backend.use_backend('recording'):
+        pg.flat.erode([0, 1, 0], [1, 1, 1])
+        # Per call argument takes precedence
+        pg.flat.erode([0, 1, 0], [1, 1, 1], backend='cpu')
+    pg.flat.erode([0, 1, 0], [1, 1, 1])
+    assert recording.calls == [pg.ERODE]
+
+
+def test_auto_policy(recording):
+    select = pg.backend.select_backend
+    big = np.zeros((10, 10, 10), dtype=np.float32)
+    small = np.zeros((2, 2, 2), dtype=np.float32)
+    unsupported = np.zeros((10, 10, 10), dtype=np.float64)
+    assert select(pg.backend.AUTO, big) is recording
+    assert select(pg.backend.AUTO, small).name != 'recording'
+    assert select(pg.backend.AUTO, unsupported).name != 'recording'
+
+
+class ContiguousBackend(pg.backend.CpuBackend):
+    name = 'contiguous'
+    strided = False
+    inplace = False
+
+    def flat_morph(self, res, vol, strel, op, block_size):
+        assert res.flags.c_contiguous and vol.flags.c_contiguous
+        self.vol = vol
+        super().flat_morph(res, vol, strel, op, block_size)
+
+
+def test_strided_inputs():
+    impl = ContiguousBackend()
+    rng = np.random.default_rng(0)
+    vol = rng.random((10, 11, 12))
+    strel = rng.random((3, 2, 5)) > 0.5
+    expected = pg.flat.dilate(vol, strel)
+
+    # Fortran order is handled by permuting axes, so vol is not copied
+    fvol = np.asfortranarray(vol)
+    actual = pg.flat.dilate(fvol, strel, backend=impl)
+    np.testing.assert_equal(actual, expected)
+    assert np.shares_memory(impl.vol, fvol)
+
+    # Other views are copied
+    out = np.zeros((10, 11, 24))
+    pg.flat.dilate(vol[:, :, ::-1], strel[:, :, ::-1], backend=impl,
+                   out=out[:, :, ::2])
+    np.testing.assert_equal(out[:, :, ::2], expected[:, :, ::-1])
+
+
+def test_unbatched_backend():
+    class UnbatchedBackend(ContiguousBackend):
+        batched = False
+
+        def flat_morph(self, res, vol, strel, op, block_size):
+            assert vol.ndim == 3
+            super().flat_morph(res, vol, strel, op, block_size)
+
+    rng = np.random.default_rng(1)
+    vols = rng.random((4, 10, 11, 12))
+    strel = rng.random((3, 2, 5)) > 0.5
+    expected = np.stack([pg.flat.dilate(v, strel) for v in vols])
+    actual = pg.flat.morph_batch(vols, strel, pg.DILATE,
+                                 backend=UnbatchedBackend(), decompose=False)
+    np.testing.assert_equal(actual, expected)
+
+
+def test_half_keys():
+    vals = np.array([-np.inf, -300, -1.5, -2**-24, 0, 2**-24, 0.1, 7,
+                     6e4, np.inf], dtype=np.float16)
+    keys = pg.backend._half_keys(vals)
+    assert keys.dtype == np.int16
+    assert np.all(np.diff(keys) > 0)
+    np.testing.assert_equal(pg.backend._half_keys(keys).view(np.float16),
+                            vals)
+
+
+@pytest.mark.parametrize('op', [pg.DILATE, pg.ERODE, pg.OPEN, pg.CLOSE,
+                                pg.TOPHAT, pg.BOTHAT])
+def test_half_adapters(op):
+    # The CUDA backend computes float16 volumes as int16 keys for flat
+    # operations and as float32 slabs for general operations
+    rng = np.random.default_rng(op)
+    vol = (rng.standard_normal((12, 13, 14)) * 100).astype(np.float16)
+    strel = rng.random((3, 4, 5)) > 0.4
+    res = np.empty_like(vol)
+    pg.backend._on_half_keys(lambda r, v, o: pg._cpu.flat_morph_op(
+        r, v, strel, o, [8, 8, 8]), res, vol, op)
+    np.testing.assert_equal(res, pg.flat.morph(vol, strel, op,
+                                               decompose=False))
+
+    # Voxels without any offset inside the volume get an infinity
+    strel = np.zeros((3, 4, 5), dtype=bool)
+    strel[0, 0, 0] = strel[2, 3, 4] = True
+    pg.backend._on_half_keys(lambda r, v, o: pg._cpu.flat_morph_op(
+        r, v, strel, o, [8, 8, 8]), res, vol, op)
+    expected = pg.flat.morph(vol, strel, op, decompose=False)
+    assert np.isinf(expected).any()
+    np.testing.assert_equal(res, expected)
+
+    weights = (rng.random((3, 4, 5)) * 3).astype(np.float16)
+    wide = weights.astype(np.float32)
+
+    def dilate_erode(r, v, o):
+        pg.backend._on_float32_slabs(lambda rr, vv: pg._cpu.gen_morph_op(
+            rr, vv, wide, o, [8, 8, 8]), r, v,
+            pg._util.strel_halo(weights.shape, o), 5)
+
+    pg.backend._compose(dilate_erode, res, vol, op)
+    np.testing.assert_equal(res, pg.gen.morph(vol, weights, op))
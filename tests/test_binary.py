@@ -0,0 +1,74 @@
+import pytest
+
+import pygorpho as pg
+import numpy as np
+
+OPS = [pg.DILATE, pg.ERODE, pg.OPEN, pg.CLOSE, pg.TOPHAT, pg.BOTHAT]
+
+
+@pytest.mark.parametrize('shape', [(5, 6, 7), (3, 4, 64), (9, 8, 130),
+                                   (20, 30), (1, 1, 1)])
+def test_pack(shape):
+    rng = np.random.default_rng(0)
+    vol = rng.random(shape) < 0.5
+    packed = pg.binary.pack(vol)
+    assert packed.shape == shape
+    assert packed.words.shape[2] == -(-np.atleast_3d(vol).shape[2] // 64)
+    np.testing.assert_equal(pg.binary.unpack(packed), vol)
+    np.testing.assert_equal(packed.unpack(), vol)
+
+    # Bits past the end of the x axis are 0
+    full = pg.binary.pack(np.ones(shape))
+    assert np.unpackbits(full.words.view(np.uint8)).sum() == vol.size
+
+
+@pytest.mark.parametrize('op', OPS)
+def test_morph(op):
+    rng = np.random.default_rng(op)
+    for shape in [(7, 8, 9), (11, 5, 70), (4, 3, 129)]:
+        vol = rng.random(shape) < 0.5
+        for strel_shape in [(3, 3, 3), (1, 2, 5), (4, 3, 2)]:
+            strel = rng.random(strel_shape) < 0.6
+            expected = pg.flat.morph(vol, strel, op)
+            np.testing.assert_equal(pg.binary.morph(vol, strel, op),
+                                    expected)
+            res = pg.binary.morph(pg.binary.pack(vol), strel, op)
+            assert isinstance(res, pg.binary.PackedVolume)
+            np.testing.assert_equal(res.unpack(), expected)
+
+
+@pytest.mark.parametrize('op', OPS)
+def test_linear_morph(op):
+    rng = np.random.default_rng(op)
+    vol = rng.random((13, 14, 150)) < 0.7
+    line_steps = [[1, 0, 0], [0, 1, -1], [1, -1, 2], [0, 0, 1]]
+    line_lens = [4, 3, 5, 70]
+    np.testing.assert_equal(
+        pg.binary.linear_morph(vol, line_steps, line_lens, op),
+        pg.flat.linear_morph(vol, line_steps, line_lens, op))
+
+    line_steps, line_lens = pg.strel.flat_ball_approx(3)
+    np.testing.assert_equal(
+        pg.binary.linear_morph(vol, line_steps, line_lens, op),
+        pg.flat.linear_morph(vol, line_steps, line_lens, op))
+
+
+def test_shortcuts():
+    rng = np.random.default_rng(1)
+    vol = pg.binary.pack(rng.random((6, 7, 8)) < 0.5)
+    strel = np.ones((3, 1, 3))
+    for func, op in [(pg.binary.dilate, pg.DILATE),
+                     (pg.binary.erode, pg.ERODE),
+                     (pg.binary.open, pg.OPEN),
+                     (pg.binary.close, pg.CLOSE),
+                     (pg.binary.tophat, pg.TOPHAT),
+                     (pg.binary.bothat, pg.BOTHAT)]:
+        np.testing.assert_equal(func(vol, strel).words,
+                                pg.binary.morph(vol, strel, op).words)
+    for func, op in [(pg.binary.linear_dilate, pg.DILATE),
+                     (pg.binary.linear_erode, pg.ERODE),
+                     (pg.binary.linear_open, pg.OPEN),
+                     (pg.binary.linear_close, pg.CLOSE)]:
+        np.testing.assert_equal(
+            func(vol, [1, 1, 0], 3).words,
+            pg.binary.linear_morph(vol, [1, 1, 0], 3, op).words)
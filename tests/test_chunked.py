@@ -0,0 +1,36 @@
+import pytest
+
+import pygorpho as pg
+import numpy as np
+
+da = pytest.importorskip('dask.array')
+
+
+@pytest.mark.parametrize('op', [pg.DILATE, pg.OPEN, pg.TOPHAT])
+def test_morph(op):
+    rng = np.random.default_rng(0)
+    vol = rng.random((30, 31, 32))
+    strel = rng.random((5, 3, 7)) > 0.3
+    expected = pg.flat.morph(vol, strel, op)
+    actual = pg.chunked.morph(da.from_array(vol, chunks=10), strel, op)
+    np.testing.assert_equal(actual.compute(), expected)
+
+
+def test_linear_morph():
+    rng = np.random.default_rng(1)
+    vol = rng.random((30, 31, 32))
+    line_steps = [[1, 2, 0], [0, 1, -1]]
+    line_lens = [5, 7]
+    expected = pg.flat.linear_close(vol, line_steps, line_lens)
+    actual = pg.chunked.linear_morph(vol, line_steps, line_lens, pg.CLOSE,
+                                     chunks=12)
+    np.testing.assert_equal(actual.compute(), expected)
+
+
+def test_gen_morph():
+    rng = np.random.default_rng(2)
+    vol = rng.random((20, 21, 22))
+    strel = rng.random((3, 3, 3))
+    expected = pg.gen.erode(vol, strel)
+    actual = pg.chunked.gen_morph(vol, strel, pg.ERODE, chunks=8)
+    np.testing.assert_equal(actual.compute(), expected)
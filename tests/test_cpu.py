@@ -0,0 +1,176 @@
+import concurrent.futures
+import threading
+
+import pytest
+
+import pygorpho as pg
+import numpy as np
+from pygorpho import _cpu
+
+DTYPES = [np.bool_, np.int8, np.uint8, np.int16, np.uint16, np.int32,
+          np.uint32, np.int64, np.uint64, np.float16, np.float32, np.float64]
+
+
+def reference_morph(vol, strel, op, weights=None):
+    """Slow reference for dilation/erosion which loops over every voxel."""
+    res = np.empty_like(vol)
+    center = np.array(strel.shape) // 2
+    for pos in np.ndindex(*vol.shape):
+        vals = []
+        for idx in np.ndindex(*strel.shape):
+            if not strel[idx]:
+                continue
+            npos = np.array(pos) + np.array(idx) - center
+            if np.any(npos < 0) or np.any(npos >= vol.shape):
+                continue
+            val = vol[tuple(npos)]
+            if weights is not None:
+                val = val + weights[idx] if op == pg.DILATE \
+                    else val - weights[idx]
+            vals.append(val)
+        if vals:
+            res[pos] = max(vals) if op == pg.DILATE else min(vals)
+        else:
+            res[pos] = _cpu.identity(vol.dtype, op)
+    return res
+
+
+@pytest.mark.parametrize('dtype', DTYPES)
+@pytest.mark.parametrize('op', [pg.DILATE, pg.ERODE])
+def test_flat_dilate_erode(dtype, op):
+    rng = np.random.default_rng(0)
+    vol = rng.integers(0, 100, size=(5, 6, 7)).astype(dtype)
+    strel = rng.random((3, 2, 4)) > 0.3
+
+    expected = reference_morph(vol, strel, op)
+    actual = np.empty_like(vol)
+    _cpu.flat_morph_op(actual, vol, strel, op, [8, 8, 8])
+    np.testing.assert_equal(actual, expected)
+
+
+@pytest.mark.parametrize('dtype', [np.uint8, np.int32, np.float16,
+                                   np.float64])
+@pytest.mark.parametrize('op', [pg.DILATE, pg.ERODE])
+def test_gen_morph_op(dtype, op):
+    rng = np.random.default_rng(1)
+    vol = rng.integers(50, 100, size=(5, 6, 7)).astype(dtype)
+    strel = rng.integers(0, 10, size=(2, 3, 3)).astype(dtype)
+
+    expected = reference_morph(vol, np.ones(strel.shape, dtype=bool), op,
+                               weights=strel)
+    actual = np.empty_like(vol)
+    _cpu.gen_morph_op(actual, vol, strel, op, [8, 8, 8])
+    np.testing.assert_equal(actual, expected)
+
+
+@pytest.mark.parametrize('op', [pg.DILATE, pg.ERODE])
+def test_gen_morph_op_negative_weights(op):
+    # The identity outside the volume must not wrap around
+    rng = np.random.default_rng(2)
+    vol = rng.integers(-50, 50, size=(5, 6, 7)).astype(np.int16)
+    strel = rng.integers(-10, 10, size=(3, 3, 2)).astype(np.int16)
+
+    expected = reference_morph(vol, np.ones(strel.shape, dtype=bool), op,
+                               weights=strel)
+    actual = np.empty_like(vol)
+    _cpu.gen_morph_op(actual, vol, strel, op, [8, 8, 8])
+    np.testing.assert_equal(actual, expected)
+
+
+@pytest.mark.parametrize('op', [pg.DILATE, pg.ERODE])
+def test_gen_morph_op_signed_overflow(op):
+    # Sums inside the volume wrap around like in the C++ code
+    strel = np.array([[[-10, 0, -10]]], dtype=np.int8)
+    if op == pg.DILATE:
+        vol = np.array([[[-120, 0, 100]]], dtype=np.int8)
+        expected = [-10, 126, 100]
+    else:
+        vol = np.array([[[120, 0, -100]]], dtype=np.int8)
+        expected = [10, -126, -100]
+
+    actual = np.empty_like(vol)
+    _cpu.gen_morph_op(actual, vol, strel, op, [8, 8, 8])
+    np.testing.assert_equal(actual.ravel(), expected)
+
+
+@pytest.mark.parametrize('dtype', [np.uint8, np.uint16])
+@pytest.mark.parametrize('op', [pg.DILATE, pg.ERODE])
+def test_gen_morph_op_unsigned_border(dtype, op):
+    # Voxels outside the volume must not contribute, even where the identity
+    # plus a weight is a valid value of the type
+    rng = np.random.default_rng(3)
+    low = 0 if op == pg.DILATE else 55
+    vol = rng.integers(low, low + 201, size=(4, 5, 6)).astype(dtype)
+    strel = rng.integers(0, 56, size=(3, 2, 5)).astype(dtype)
+
+    expected = reference_morph(vol, np.ones(strel.shape, dtype=bool), op,
+                               weights=strel)
+    actual = np.empty_like(vol)
+    _cpu.gen_morph_op(actual, vol, strel, op, [2, 3, 8])
+    np.testing.assert_equal(actual, expected)
+
+    vol = np.full((1, 1, 3), 0 if op == pg.DILATE else 255, dtype=dtype)
+    actual = pg.gen.morph(vol, np.array([[[0, 0, 5]]], dtype=dtype), op,
+                          backend='cpu')
+    expected = [5, 5, 0] if op == pg.DILATE else [250, 250, 255]
+    np.testing.assert_equal(actual.ravel(), expected)
+
+
+def test_empty_strel():
+    vol = np.zeros((4, 4, 4), dtype=np.float32)
+    strel = np.zeros((3, 3, 3), dtype=bool)
+
+    actual = np.empty_like(vol)
+    _cpu.flat_morph_op(actual, vol, strel, pg.DILATE, [8, 8, 8])
+    assert np.all(actual == -np.inf)
+    _cpu.flat_morph_op(actual, vol, strel, pg.ERODE, [8, 8, 8])
+    assert np.all(actual == np.inf)
+
+
+def test_bool_tophat():
+    vol = np.zeros((7, 7, 7), dtype=bool)
+    vol[3:5, 3:5, 3:5] = True
+    strel = np.ones((3, 3, 3), dtype=bool)
+
+    actual = np.empty_like(vol)
+    _cpu.flat_morph_op(actual, vol, strel, pg.TOPHAT, [8, 8, 8])
+    np.testing.assert_equal(actual, vol)
+
+
+def test_shared_block_pool(monkeypatch):
+    monkeypatch.setenv('PYGORPHO_NUM_THREADS', '4')
+    names = set()
+
+    def add_one(buf, inner, center):
+        names.add(threading.current_thread().name)
+        return buf + 1
+
+    def nested(buf, inner, center):
+        # Calls from a block worker run serially instead of waiting for the
+        # pool they run on
+        out = np.empty_like(buf)
+        _cpu.process_blocks(out, buf, [0] * 3, [0] * 3, [2, 2, 2], 0,
+                            add_one)
+        return out
+
+    vol = np.zeros((8, 8, 8))
+
+    def run(_):
+        res = np.empty_like(vol)
+        _cpu.process_blocks(res, vol, [1] * 3, [1] * 3, [4, 4, 4], 0, nested)
+        return res
+
+    with concurrent.futures.ThreadPoolExecutor(3) as outer:
+        for res in outer.map(run, range(6)):
+            np.testing.assert_equal(res, 1)
+    # Concurrent calls all use the same pool
+    assert _cpu.block_pool() is _cpu.block_pool()
+    assert all(name.startswith('pygorpho-blocks') for name in names)
+
+
+def test_invalid_type():
+    vol = np.zeros((3, 3, 3), dtype=np.complex64)
+    strel = np.ones((1, 1, 1), dtype=bool)
+    with pytest.raises(ValueError):
+        _cpu.flat_morph_op(np.empty_like(vol), vol, strel, pg.DILATE,
+                           [8, 8, 8])
@@ -0,0 +1,83 @@
+import pytest
+
+import pygorpho as pg
+import numpy as np
+from pygorpho import _envelope
+
+
+def test_parabola_min():
+    rng = np.random.default_rng(0)
+    for c in [1.0, 0.25, 3.5]:
+        f = rng.random((17, 6)) * 20
+        f[rng.random(f.shape) < 0.5] = np.inf
+        f[:, 0] = np.inf
+        q = np.arange(17)
+        expected = np.min(f[None] + c * (q[:, None, None]
+                                         - q[None, :, None]) ** 2, axis=1)
+        np.testing.assert_allclose(_envelope.parabola_min(f, 0, c), expected)
+        np.testing.assert_allclose(_envelope.parabola_min(f.T, 1, c),
+                                   expected.T)
+
+
+def test_edt():
+    vol = np.ones((5, 6, 7), dtype=bool)
+    vol[2, 3, 1] = False
+    z, y, x = np.meshgrid(*[np.arange(n) for n in vol.shape],
+                          indexing='ij')
+    expected = np.sqrt((2.0 * (z - 2)) ** 2 + (y - 3) ** 2
+                       + (0.5 * (x - 1)) ** 2)
+    np.testing.assert_allclose(pg.distance.edt(vol, (2.0, 1.0, 0.5)),
+                               expected)
+    assert np.all(np.isinf(pg.distance.edt(np.ones((3, 4)))))
+    with pytest.raises(ValueError):
+        pg.distance.edt(vol, (1.0, 1.0))
+
+
+@pytest.mark.parametrize('op', [pg.DILATE, pg.ERODE, pg.OPEN, pg.CLOSE])
+@pytest.mark.parametrize('spacing', [None, (2.0, 1.0, 0.75)])
+def test_ball_morph(op, spacing):
+    rng = np.random.default_rng(op)
+    vol = rng.random((20, 21, 22)) < 0.3
+    for radius in [0, 1, 2.5, 4]:
+        expected = pg.flat.morph(vol, pg.distance.ball(radius, spacing), op)
+        res = pg.distance.ball_morph(vol, radius, op, spacing)
+        np.testing.assert_equal(res, expected)
+
+
+def test_ball_exact_radius():
+    # Offsets exactly at the radius are in the ball even if their squared
+    # distances are rounded up
+    ball = pg.distance.ball(0.3, 0.1, ndim=1)
+    np.testing.assert_equal(ball, np.ones(7, dtype=bool))
+
+    spacing = (0.1, 0.3, 0.7)
+    vol = np.zeros((21, 9, 5), dtype=bool)
+    vol[10, 4, 2] = True
+    for radius, reach in [(0.3, [3, 1, 0]), (0.6, [6, 2, 0]),
+                          (0.7, [7, 2, 1]), (0.9, [9, 3, 1])]:
+        ball = pg.distance.ball(radius, spacing)
+        assert ball.shape == tuple(2 * r + 1 for r in reach)
+        res = pg.distance.ball_dilate(vol, radius, spacing)
+        np.testing.assert_equal(res, pg.flat.dilate(vol, ball))
+        assert res[10 + reach[0], 4, 2] and res[10 - reach[0], 4, 2]
+        np.testing.assert_equal(
+            pg.distance.ball_erode(~vol, radius, spacing), ~res)
+
+
+def test_reuse_distance():
+    rng = np.random.default_rng(1)
+    vol = rng.random((15, 16)) < 0.05
+    res, dist = pg.distance.ball_dilate(vol, 2, return_distance=True)
+    disk = pg.distance.ball(2, ndim=2)
+    np.testing.assert_equal(res, pg.flat.dilate(vol, disk))
+    for radius in [1, 3, 5]:
+        np.testing.assert_equal(
+            pg.distance.ball_dilate(vol, radius, distance=dist),
+            pg.distance.ball_dilate(vol, radius))
+    _, dist = pg.distance.ball_erode(vol, 2, return_distance=True)
+    np.testing.assert_equal(dist, pg.distance.edt(vol))
+    np.testing.assert_equal(
+        pg.distance.ball_open(vol, 3, distance=dist),
+        pg.distance.ball_open(vol, 3))
+    with pytest.raises(ValueError):
+        pg.distance.ball_dilate(vol, 2, distance=dist[1:])
@@ -126,3 +126,165 @@ def test_non_numpy_input():
     expected = [0, 1, 1, 1, 0]
     actual = pg.flat.dilate(vol, strel)
     np.testing.assert_equal(actual, expected)
+
+
+@pytest.mark.parametrize('op', [pg.DILATE, pg.OPEN, pg.TOPHAT, pg.BOTHAT])
+def test_out(op):
+    rng = np.random.default_rng(0)
+    vol = rng.random((20, 21, 22))
+    strel = rng.random((3, 5, 4)) > 0.5
+    expected = pg.flat.morph(vol, strel, op)
+
+    out = np.empty_like(vol)
+    actual = pg.flat.morph(vol, strel, op, out=out)
+    assert actual is out
+    np.testing.assert_equal(actual, expected)
+
+    # In-place
+    actual = pg.flat.morph(vol, strel, op, block_size=[4, 8, 8], out=vol)
+    assert actual is vol
+    np.testing.assert_equal(vol, expected)
+
+
+def test_out_invalid():
+    vol = np.zeros((5, 5, 5))
+    strel = np.ones((3, 3, 3))
+    with pytest.raises(ValueError):
+        pg.flat.dilate(vol, strel, out=np.empty((5, 5, 4)))
+    with pytest.raises(ValueError):
+        pg.flat.dilate(vol, strel, out=np.empty((5, 5, 5), dtype=np.float32))
+
+
+def test_result_is_view():
+    vol = np.zeros((3, 3))
+    res = pg.flat.dilate(vol, np.ones(1))
+    assert res.base is not None
+
+
+def test_memory_layout():
+    rng = np.random.default_rng(1)
+    vol = rng.random((20, 21, 22))
+    strel = rng.random((3, 5, 4)) > 0.5
+    expected = pg.flat.dilate(vol, strel)
+
+    actual = pg.flat.dilate(np.asfortranarray(vol), strel)
+    np.testing.assert_equal(actual, expected)
+
+    big = rng.random((40, 42, 44))
+    big[::2, 1::2, ::-2] = vol
+    actual = pg.flat.dilate(big[::2, 1::2, ::-2], strel)
+    np.testing.assert_equal(actual, expected)
+
+    # In-place in a strided view
+    pg.flat.dilate(big[::2, 1::2, ::-2], strel, out=big[::2, 1::2, ::-2])
+    np.testing.assert_equal(big[::2, 1::2, ::-2], expected)
+
+
+@pytest.mark.parametrize('op', [pg.DILATE, pg.ERODE, pg.OPEN, pg.TOPHAT])
+def test_decomposed(op):
+    rng = np.random.default_rng(3)
+    vol = rng.integers(0, 100, size=(15, 16, 17)).astype(np.uint8)
+    box = np.ones((5, 4, 7), dtype=bool)
+    octahedron = np.abs(np.indices((5, 5, 5)) - 2).sum(axis=0) <= 2
+    for strel in [box, octahedron]:
+        expected = pg.flat.morph(vol, strel, op, decompose=False)
+        actual = pg.flat.morph(vol, strel, op, block_size=[8, 8, 8])
+        np.testing.assert_equal(actual, expected)
+
+
+def test_decomposed_padding():
+    # The default implementation for backends without a fused engine
+    class PaddingBackend(pg.backend.CpuBackend):
+        flat_sum_morph = pg.backend.Backend.flat_sum_morph
+
+    rng = np.random.default_rng(4)
+    vol = rng.random((15, 16, 17))
+    strel = np.ones((3, 5, 7), dtype=bool)
+    expected = pg.flat.morph(vol, strel, pg.BOTHAT, decompose=False)
+    actual = pg.flat.morph(vol, strel, pg.BOTHAT, backend=PaddingBackend())
+    np.testing.assert_equal(actual, expected)
+
+
+@pytest.mark.parametrize('op', [pg.DILATE, pg.CLOSE, pg.TOPHAT])
+def test_morph_batch(op):
+    rng = np.random.default_rng(5)
+    vols = rng.integers(0, 100, size=(6, 9, 10, 11)).astype(np.uint8)
+    for strel in [np.ones((3, 5, 3)), rng.random((3, 3, 5)) > 0.5]:
+        expected = np.stack([pg.flat.morph(v, strel, op) for v in vols])
+        actual = pg.flat.morph_batch(vols, strel, op, block_size=[8, 8, 8])
+        np.testing.assert_equal(actual, expected)
+        actual = pg.flat.morph_batch(list(vols), strel, op)
+        np.testing.assert_equal(actual, expected)
+
+
+def test_morph_batch_2d():
+    rng = np.random.default_rng(6)
+    vols = rng.random((4, 12, 13))
+    strel = np.ones((3, 5))
+    expected = np.stack([pg.flat.dilate(v, strel) for v in vols])
+    actual = pg.flat.morph_batch(vols, strel, pg.DILATE)
+    assert actual.shape == vols.shape
+    np.testing.assert_equal(actual, expected)
+
+
+def test_morph_batch_out():
+    rng = np.random.default_rng(7)
+    vols = np.asfortranarray(rng.random((5, 8, 9, 10)))
+    strel = rng.random((3, 3, 3)) > 0.5
+    expected = np.stack([pg.flat.erode(v, strel) for v in vols])
+    res = pg.flat.morph_batch(vols, strel, pg.ERODE, out=vols)
+    assert res is vols
+    np.testing.assert_equal(vols, expected)
+
+    with pytest.raises(ValueError):
+        pg.flat.morph_batch(vols, strel, pg.ERODE, out=vols[0])
+
+
+def naive_percentile(vol, strel, q):
+    res = np.empty_like(vol)
+    offsets = np.argwhere(strel) - np.array(strel.shape) // 2
+    for idx in np.ndindex(vol.shape):
+        pos = np.array(idx) + offsets
+        pos = pos[np.all((pos >= 0) & (pos < vol.shape), axis=1)]
+        window = np.sort(vol[tuple(pos.T)])
+        res[idx] = window[int(np.floor(q / 100 * (len(window) - 1) + 0.5))]
+    return res
+
+
+@pytest.mark.parametrize('dtype', [np.bool_, np.uint8, np.int16, np.int32,
+                                   np.float32])
+@pytest.mark.parametrize('q', [0, 30, 50, 100])
+def test_percentile(dtype, q):
+    rng = np.random.default_rng(q)
+    high = 10**6 if dtype == np.int32 else 20
+    vol = rng.integers(0, high, size=(6, 7, 9)).astype(dtype)
+    strel = rng.random((3, 4, 5)) < 0.6
+    strel[1, 2, 2] = True
+    np.testing.assert_equal(pg.flat.percentile(vol, strel, q),
+                            naive_percentile(vol, strel, q))
+
+
+def test_rank():
+    rng = np.random.default_rng(0)
+    vol = rng.integers(0, 256, size=(20, 21, 22)).astype(np.uint8)
+    strel = np.ones((3, 5, 3))
+    np.testing.assert_equal(pg.flat.rank(vol, strel, 0),
+                            pg.flat.erode(vol, strel))
+    np.testing.assert_equal(pg.flat.rank(vol, strel, -1),
+                            pg.flat.dilate(vol, strel))
+    np.testing.assert_equal(pg.flat.rank(vol, strel, 22),
+                            pg.flat.median(vol, strel))
+    with pytest.raises(ValueError):
+        pg.flat.rank(vol, strel, 45)
+
+
+def test_median_2d_and_out():
+    vol = np.array([[5, 1, 4, 2], [3, 9, 0, 7]], dtype=np.float64)
+    strel = np.ones((1, 3))
+    res = pg.flat.median(vol, strel)
+    assert res.shape == (2, 4)
+    np.testing.assert_equal(res, [[5, 4, 2, 4], [9, 3, 7, 7]])
+
+    out = pg.flat.median(vol, strel, out=vol)
+    assert out is vol
+    np.testing.assert_equal(vol, res)
@@ -2,6 +2,7 @@ import pytest
 
 import pygorpho as pg
 import numpy as np
+from pygorpho import _cpu
 
 def test_dilate():
     vol = np.zeros((7,7,7))
@@ -66,3 +67,171 @@ def test_valid_dims():
     line_lens = 1
     with pytest.raises(AssertionError):
         pg.flat.linear_dilate(vol, line_steps, line_lens)
+
+
+def reference_linear(vol, line_steps, line_lens, op):
+    """Applies each line segment with one pass per offset."""
+    reduce = np.maximum if op == pg.DILATE else np.minimum
+    for step, length in zip(line_steps, line_lens):
+        res = np.full_like(vol, -np.inf if op == pg.DILATE else np.inf)
+        for k in range(-(length // 2), length - length // 2):
+            offset = k * np.array(step)
+            if np.any(np.abs(offset) >= vol.shape):
+                continue
+            src = tuple(slice(max(0, o), n + min(0, o))
+                        for o, n in zip(offset, vol.shape))
+            dst = tuple(slice(max(0, -o), n - max(0, o))
+                        for o, n in zip(offset, vol.shape))
+            reduce(res[dst], vol[src], out=res[dst])
+        vol = res
+    return vol
+
+
+@pytest.mark.parametrize('op', [pg.DILATE, pg.ERODE])
+def test_diagonal_steps(op):
+    rng = np.random.default_rng(0)
+    vol = rng.random((20, 21, 22))
+    line_steps = [[1, 1, 1], [-1, 0, 1], [0, 2, -1], [0, 0, 3]]
+    line_lens = [9, 6, 5, 7]
+
+    expected = reference_linear(vol, line_steps, line_lens, op)
+    actual = pg.flat.linear_morph(vol, line_steps, line_lens, op)
+    np.testing.assert_equal(actual, expected)
+
+
+def test_lines_longer_than_volume():
+    rng = np.random.default_rng(4)
+    vol = rng.random((2, 3, 130))
+    line_steps = [[2, -2, 2], [1, 1, 1], [2, -1, -1], [0, 0, 1]]
+    line_lens = [134, 33, 5, 300]
+    expected = reference_linear(
+        reference_linear(vol, line_steps, line_lens, pg.DILATE),
+        line_steps, line_lens, pg.ERODE)
+
+    with pg.instrument.record() as rec:
+        actual = pg.flat.linear_close(vol, line_steps, line_lens,
+                                      backend='cpu')
+    np.testing.assert_equal(actual, expected)
+    # Buffers do not grow with the parts of the lines outside the volume
+    assert rec.calls[0].bytes_allocated < 100 * vol.nbytes
+
+
+def test_small_blocks():
+    rng = np.random.default_rng(1)
+    vol = rng.integers(0, 255, size=(20, 21, 22)).astype(np.uint8)
+    line_steps = [[1, 1, 0], [0, 1, -1]]
+    line_lens = [11, 8]
+
+    expected = pg.flat.linear_dilate(vol, line_steps, line_lens)
+    actual = pg.flat.linear_dilate(vol, line_steps, line_lens,
+                                   block_size=[5, 6, 7])
+    np.testing.assert_equal(actual, expected)
+
+
+def test_out():
+    rng = np.random.default_rng(2)
+    vol = rng.random((20, 21, 22))
+    line_steps = [[1, 1, 0], [0, 1, -1]]
+    line_lens = [7, 8]
+    expected = pg.flat.linear_tophat(vol, line_steps, line_lens)
+
+    out = np.empty_like(vol)
+    actual = pg.flat.linear_tophat(vol, line_steps, line_lens, out=out)
+    assert actual is out
+    np.testing.assert_equal(actual, expected)
+
+    actual = pg.flat.linear_tophat(vol, line_steps, line_lens, out=vol)
+    assert actual is vol
+    np.testing.assert_equal(vol, expected)
+
+
+def test_fortran_order():
+    rng = np.random.default_rng(3)
+    vol = rng.random((20, 21, 22))
+    line_steps = [[1, 2, 0], [0, 1, -1]]
+    line_lens = [5, 6]
+    expected = pg.flat.linear_dilate(vol, line_steps, line_lens)
+    actual = pg.flat.linear_dilate(np.asfortranarray(vol), line_steps,
+                                   line_lens)
+    np.testing.assert_equal(actual, expected)
+
+
+@pytest.mark.parametrize('dtype', [np.bool_, np.uint8, np.float16,
+                                   np.float32])
+@pytest.mark.parametrize('op', [pg.OPEN, pg.CLOSE, pg.TOPHAT, pg.BOTHAT])
+def test_fused(dtype, op):
+    rng = np.random.default_rng(4)
+    vol = (rng.random((20, 21, 22)) * 100).astype(dtype)
+    line_steps = [[1, 1, 0], [0, 2, -1], [0, 0, 1]]
+    line_lens = [5, 4, 7]
+    first, second = (pg.ERODE, pg.DILATE) if op in [pg.OPEN, pg.TOPHAT] \
+        else (pg.DILATE, pg.ERODE)
+    expected = pg.flat.linear_morph(vol, line_steps, line_lens, first)
+    expected = pg.flat.linear_morph(expected, line_steps, line_lens, second)
+    if op == pg.TOPHAT:
+        expected = _cpu.subtract(vol, expected, out=expected)
+    elif op == pg.BOTHAT:
+        expected = _cpu.subtract(expected, vol, out=expected)
+
+    actual = pg.flat.linear_morph(vol, line_steps, line_lens, op,
+                                  block_size=[8, 8, 8])
+    np.testing.assert_equal(actual, expected)
+
+
+def test_linear_morph_batch():
+    rng = np.random.default_rng(8)
+    vols = rng.random((5, 10, 11, 12)).astype(np.float32)
+    line_steps = [[1, 0, 0], [0, 1, 1], [1, -1, 0]]
+    line_lens = [3, 4, 5]
+    for op in [pg.DILATE, pg.OPEN, pg.BOTHAT]:
+        expected = np.stack([pg.flat.linear_morph(v, line_steps, line_lens, op)
+                             for v in vols])
+        actual = pg.flat.linear_morph_batch(vols, line_steps, line_lens, op,
+                                            block_size=[8, 8, 8])
+        np.testing.assert_equal(actual, expected)
+
+
+@pytest.mark.parametrize('dtype', [np.bool_, np.uint8, np.float32])
+def test_granulometry(dtype):
+    rng = np.random.default_rng(0)
+    radii = [1, 2, 4, 6]
+    line_steps, all_lens = pg.strel.nested_ball_approx(radii)
+    vol = np.zeros((36, 37, 38), dtype=dtype)
+    if dtype == np.bool_:
+        seeds = rng.random((16, 17, 18)) < 0.02
+        vol[10:26, 10:27, 10:28] = pg.flat.linear_dilate(
+            seeds, *pg.strel.flat_ball_approx(3))
+    else:
+        vol[10:26, 10:27, 10:28] = rng.integers(1, 100, size=(16, 17, 18))
+
+    spectrum, sizes = pg.flat.granulometry(vol, radii, radius_map=True)
+
+    # Openings from scratch. The volume has a border of its smallest value,
+    # so the incremental erosions give the same result.
+    expected_sizes = np.zeros(vol.shape, dtype=np.int32)
+    total = vol.sum(dtype=np.float64)
+    for radius, line_lens, removed in zip(radii, all_lens, spectrum):
+        opened = pg.flat.linear_open(vol, line_steps, line_lens)
+        assert removed == total - opened.sum(dtype=np.float64)
+        total = opened.sum(dtype=np.float64)
+        expected_sizes[opened == vol] = radius
+    expected_sizes[vol == 0] = 0
+    np.testing.assert_equal(sizes, expected_sizes)
+    assert np.all(spectrum >= 0)
+
+    np.testing.assert_equal(pg.flat.granulometry(vol, radii), spectrum)
+
+
+def test_granulometry_early_stop():
+    vol = np.zeros((20, 20, 20), dtype=np.uint8)
+    vol[5:8, 5:8, 5:8] = 3
+    spectrum, sizes = pg.flat.granulometry(vol, range(1, 20),
+                                           radius_map=True)
+    # The cube is removed at once, after which the erosions are empty
+    assert spectrum.sum() == vol.sum(dtype=np.float64)
+    assert np.count_nonzero(spectrum) == 1
+    removed = np.flatnonzero(spectrum)[0]
+    np.testing.assert_equal(sizes, np.where(vol > 0, removed, 0))
+
+    with pytest.raises(ValueError):
+        pg.flat.granulometry(vol, [2, 1])
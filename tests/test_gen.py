@@ -34,3 +34,222 @@ def test_erode():
 
     actual2 = pg.gen.erode(vol, strel)
     np.testing.assert_equal(actual2, expected)
+
+
+def test_out():
+    rng = np.random.default_rng(0)
+    vol = rng.random((10, 11, 12))
+    strel = rng.random((3, 3, 3))
+    expected = pg.gen.bothat(vol, strel)
+
+    actual = pg.gen.bothat(vol, strel, out=vol)
+    assert actual is vol
+    np.testing.assert_equal(vol, expected)
+
+
+@pytest.mark.parametrize('op', [pg.OPEN, pg.CLOSE, pg.TOPHAT, pg.BOTHAT])
+def test_fused(op):
+    rng = np.random.default_rng(1)
+    vol = rng.integers(0, 50, size=(10, 11, 12)).astype(np.int16)
+    strel = rng.integers(0, 5, size=(3, 2, 3)).astype(np.int16)
+    first, second = (pg.ERODE, pg.DILATE) if op in [pg.OPEN, pg.TOPHAT] \
+        else (pg.DILATE, pg.ERODE)
+    expected = pg.gen.morph(pg.gen.morph(vol, strel, first), strel, second)
+    if op == pg.TOPHAT:
+        expected = vol - expected
+    elif op == pg.BOTHAT:
+        expected = expected - vol
+
+    actual = pg.gen.morph(vol, strel, op, block_size=[4, 8, 8])
+    np.testing.assert_equal(actual, expected)
+
+
+def test_morph_batch():
+    rng = np.random.default_rng(9)
+    vols = rng.integers(0, 50, size=(5, 9, 10, 11)).astype(np.int16)
+    strel = rng.integers(-3, 3, size=(3, 3, 3)).astype(np.int16)
+    for op in [pg.DILATE, pg.OPEN]:
+        expected = np.stack([pg.gen.morph(v, strel, op) for v in vols])
+        actual = pg.gen.morph_batch(vols, strel, op)
+        np.testing.assert_equal(actual, expected)
+
+
+class DenseBackend(pg.backend.CpuBackend):
+    # Computes offsets with the default implementation, like the CUDA backend
+    name = 'dense'
+    gen_offsets_morph = pg.backend.Backend.gen_offsets_morph
+
+
+@pytest.mark.parametrize('op', [pg.DILATE, pg.ERODE, pg.OPEN, pg.TOPHAT])
+def test_holes(op):
+    rng = np.random.default_rng(op)
+    vol = rng.integers(0, 50, size=(10, 11, 12))
+    strel = rng.integers(-3, 4, size=(4, 3, 5))
+    mask = rng.random(strel.shape) > 0.6
+    mask[0, 0, 0] = True
+    holes = np.where(mask, strel, -np.inf)
+
+    # Float holes are the same as a mask
+    expected = pg.gen.morph(vol.astype(np.float32), holes, op)
+    actual = pg.gen.morph(vol.astype(np.float32), strel, op, mask=mask)
+    np.testing.assert_equal(actual, expected)
+    actual = pg.gen.morph(vol.astype(np.float32), holes, op,
+                          backend=DenseBackend())
+    np.testing.assert_equal(actual, expected)
+
+    for dtype in [np.int16, np.float64]:
+        actual = pg.gen.morph(vol.astype(dtype), strel, op, mask=mask,
+                              block_size=[4, 8, 8], backend=DenseBackend())
+        np.testing.assert_equal(actual, expected)
+
+    vols = np.stack([vol, vol[::-1]]).astype(np.int16)
+    actual = pg.gen.morph_batch(vols, strel, op, mask=mask)
+    np.testing.assert_equal(actual[0], expected)
+    np.testing.assert_equal(
+        actual[1], pg.gen.morph(vol[::-1].astype(np.int16), strel, op,
+                                mask=mask))
+
+
+def test_holes_cost():
+    ball = pg.distance.ball(7)
+    strel = np.where(ball, 1.0, -np.inf)
+    assert pg.gen.cost(strel) == {'entries': 15**3,
+                                  'offsets': int(ball.sum()),
+                                  'dense': 15**3, 'separable': None}
+    mask = np.zeros((3, 4, 5), dtype=bool)
+    mask[[0, 1, 2], [0, 1, 2], [0, 1, 2]] = True
+    assert pg.gen.cost(np.ones((3, 4, 5)), mask=mask) \
+        == {'entries': 60, 'offsets': 3, 'dense': 3 * 5 * 5,
+            'separable': None}
+    with pytest.raises(ValueError):
+        pg.gen.cost(np.ones((3, 3, 3)), mask=np.ones((3, 3)))
+
+    # No entries give the identity
+    vol = np.arange(24, dtype=np.uint8).reshape(2, 3, 4)
+    res = pg.gen.dilate(vol, np.full((3, 3, 3), -np.inf))
+    np.testing.assert_equal(res, np.zeros_like(vol))
+
+
+@pytest.mark.parametrize('op', [pg.DILATE, pg.ERODE, pg.OPEN, pg.CLOSE,
+                                pg.TOPHAT, pg.BOTHAT])
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+def test_parabolic(op, dtype):
+    rng = np.random.default_rng(op)
+    vol = (rng.random((6, 7, 8)) * 20).astype(dtype)
+    scale = [0.5, 2, 4]
+    strel = pg.strel.paraboloid(scale, [5, 6, 7])
+    expected = pg.gen.morph(vol, strel, op)
+    # The weights are added one axis at a time, which may round differently
+    np.testing.assert_allclose(pg.gen.parabolic_morph(vol, scale, op),
+                               expected, rtol=1e-6, atol=1e-6)
+
+
+def test_parabolic_types_and_out():
+    vol = np.array([0, 5, 0, 0, 1], dtype=np.int16)
+    np.testing.assert_equal(pg.gen.parabolic_dilate(vol, 1.0),
+                            [4, 5, 4, 1, 1])
+    np.testing.assert_equal(pg.gen.parabolic_dilate(vol, 1.5),
+                            [5, 5, 5, 3, 1])
+    vol = np.array([[0, 5], [3, 7]], dtype=np.float64)
+    out = pg.gen.parabolic_erode(vol, [1, 2], out=vol)
+    assert out is vol
+    np.testing.assert_equal(vol, [[0, 0.25], [1, 1.25]])
+    np.testing.assert_equal(pg.gen.parabolic_erode([1, -np.inf], 1.0),
+                            [-np.inf, -np.inf])
+    with pytest.raises(ValueError):
+        pg.gen.parabolic_erode(vol, [1, 2, 3])
+    with pytest.raises(ValueError):
+        pg.gen.parabolic_erode(vol, 0)
+
+
+class RecordingBackend(DenseBackend):
+    # Records the calls of the separable operation and uses the default
+    # implementation of it
+    name = 'recording'
+
+    def __init__(self):
+        self.profiles = []
+
+    def gen_separable_morph(self, res, vol, profiles, op, block_size):
+        self.profiles.append(profiles)
+        pg.backend.Backend.gen_separable_morph(self, res, vol, profiles, op,
+                                               block_size)
+
+
+@pytest.mark.parametrize('op', [pg.DILATE, pg.ERODE, pg.OPEN, pg.CLOSE,
+                                pg.TOPHAT, pg.BOTHAT])
+@pytest.mark.parametrize('dtype', [np.int16, np.float64])
+def test_separable(op, dtype):
+    rng = np.random.default_rng(op)
+    vol = rng.integers(-50, 50, size=(10, 11, 12)).astype(dtype)
+    profiles = [rng.integers(-5, 5, size=n).astype(dtype) for n in (3, 4, 5)]
+    strel = (profiles[0][:, None, None] + profiles[1][None, :, None]
+             + profiles[2][None, None, :])
+    expected = pg.gen.morph(vol, strel, op, decompose=False)
+
+    backend = RecordingBackend()
+    np.testing.assert_equal(pg.gen.morph(vol, strel, op, backend=backend,
+                                         decompose=True), expected)
+    assert [len(p) for p in backend.profiles[0]] == [3, 4, 5]
+    np.testing.assert_equal(pg.gen.morph(vol, strel, op,
+                                         block_size=[4, 8, 8]), expected)
+    np.testing.assert_equal(pg.gen.separable_morph(vol, profiles, op),
+                            expected)
+    # Fortran order permutes the profiles
+    actual = pg.gen.separable_morph(np.asfortranarray(vol), profiles, op,
+                                    backend=backend)
+    np.testing.assert_equal(actual, expected)
+    actual = pg.gen.morph_batch(np.stack([vol, vol]), strel, op)
+    np.testing.assert_equal(actual[1], expected)
+
+
+@pytest.mark.parametrize('op', [pg.DILATE, pg.OPEN])
+def test_separable_only_when_exact(op):
+    rng = np.random.default_rng(5)
+    profiles = [rng.random(n) for n in (3, 4, 5)]
+    strel = (profiles[0][:, None, None] + profiles[1][None, :, None]
+             + profiles[2][None, None, :])
+
+    # Floating point types are computed densely unless asked for
+    vol = rng.random((10, 11, 12))
+    backend = RecordingBackend()
+    actual = pg.gen.morph(vol, strel, op, backend=backend)
+    assert backend.profiles == []
+    np.testing.assert_equal(actual,
+                            pg.gen.morph(vol, strel, op, decompose=False))
+
+    # Integer types are separable if no sum can overflow
+    profiles = [rng.integers(0, 10, size=n) for n in (3, 4, 5)]
+    strel = (profiles[0][:, None, None] + profiles[1][None, :, None]
+             + profiles[2][None, None, :]).astype(np.uint8)
+    vol = rng.integers(0, 256, size=(10, 11, 12)).astype(np.uint8)
+    expected = pg.gen.morph(vol, strel, op, decompose=False)
+    actual = pg.gen.morph(vol, strel, op, backend=backend)
+    assert backend.profiles == []
+    np.testing.assert_equal(actual, expected)
+    np.testing.assert_equal(
+        pg.gen.morph(np.asfortranarray(vol), strel, op), expected)
+
+    vol = vol.astype(np.int16)
+    expected = pg.gen.morph(vol, strel, op, decompose=False)
+    actual = pg.gen.morph(vol, strel, op, backend=backend)
+    assert len(backend.profiles) == 1
+    np.testing.assert_equal(actual, expected)
+
+
+def test_separable_detection():
+    cost = pg.gen.cost
+    assert cost(np.ones((3, 4, 5)))['separable'] == 12
+    assert cost(pg.strel.paraboloid([1, 2, 4], [2, 3, 1]))['separable'] \
+        == 5 + 7 + 3
+    assert cost(np.arange(27).reshape(3, 3, 3))['separable'] == 9
+    assert cost(np.arange(27).reshape(3, 3, 3) ** 2)['separable'] is None
+    assert cost(np.ones((1, 1, 7)))['separable'] is None
+
+    vol = np.array([[1, 5, 2], [0, 3, 8]], dtype=np.uint8)
+    np.testing.assert_equal(pg.gen.separable_morph(vol, [[0, 1], [1, 0, 0]],
+                                                   pg.DILATE),
+                            pg.gen.morph(vol, [[1, 0, 0], [2, 1, 1]],
+                                         pg.DILATE, decompose=False))
+    with pytest.raises(ValueError):
+        pg.gen.separable_morph(vol, [[0, 1]], pg.DILATE)
@@ -0,0 +1,53 @@
+import json
+
+import pygorpho as pg
+import numpy as np
+
+
+def test_record():
+    vol = np.zeros((20, 21, 22), dtype=np.float32)
+    strel = np.ones((3, 3, 3))
+    with pg.instrument.record() as rec:
+        pg.flat.open(vol, strel, block_size=[8, 8, 8])
+        pg.flat.linear_erode(vol, [1, 0, 0], 5)
+        pg.gen.dilate(vol, np.zeros((3, 3, 3)), out=vol)
+    pg.flat.dilate(vol, strel)  # Not recorded
+
+    assert [c.function for c in rec.calls] == [
+        'flat.morph', 'flat.linear_morph', 'gen.morph']
+    assert [c.op for c in rec.calls] == [pg.OPEN, pg.ERODE, pg.DILATE]
+    for c in rec.calls:
+        assert c.backend == 'cpu'
+        assert c.dtype == 'float32'
+        assert c.shape == (20, 21, 22)
+        assert c.blocks > 0
+        assert c.bytes_copied >= vol.nbytes
+        assert set(c.phases) >= {'prepare', 'copy', 'compute', 'finish'}
+        assert sum(c.phases.values()) <= c.time
+    # The output is allocated unless out is given
+    assert rec.calls[0].bytes_allocated >= vol.nbytes
+    assert rec.calls[0].blocks >= 8
+    assert 'decompose' in rec.calls[0].phases
+
+    data = json.loads(rec.to_json())
+    assert data[1]['function'] == 'flat.linear_morph'
+    assert data[1]['shape'] == [20, 21, 22]
+    lines = rec.summary().splitlines()
+    assert len(lines) == 4
+    assert lines[1].split()[:4] == ['flat.morph', 'cpu', 'float32', '1']
+
+
+def test_hooks():
+    calls = []
+    pg.instrument.add_hook(calls.append)
+    try:
+        pg.flat.morph_batch(np.zeros((3, 5, 6, 7)), np.ones((3, 3, 3)),
+                            op=pg.DILATE)
+    finally:
+        pg.instrument.remove_hook(calls.append)
+    pg.flat.dilate(np.zeros((5, 6, 7)), np.ones((3, 3, 3)))
+
+    assert len(calls) == 1
+    assert calls[0].function == 'flat.morph_batch'
+    assert calls[0].op == pg.DILATE
+    assert calls[0].shape == (3, 5, 6, 7)
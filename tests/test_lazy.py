@@ -0,0 +1,71 @@
+import pytest
+
+import pygorpho as pg
+import numpy as np
+
+
+def test_pipeline():
+    rng = np.random.default_rng(0)
+    vol = rng.integers(0, 200, size=(14, 15, 16)).astype(np.uint8)
+    box = np.ones((3, 3, 3))
+    strel = np.ones((3, 1, 5))
+    line_steps, line_lens = pg.strel.flat_ball_approx(2)
+
+    x = pg.lazy.volume(vol)
+    y = (x.linear_dilate([1, 0, 0], 5).linear_dilate(line_steps, line_lens)
+         .erode(box).tophat(strel))
+    expected = pg.flat.linear_dilate(vol, [1, 0, 0], 5)
+    expected = pg.flat.linear_dilate(expected, line_steps, line_lens)
+    expected = pg.flat.tophat(pg.flat.erode(expected, box), strel)
+    np.testing.assert_equal(y.compute(), expected)
+
+    # Line segments are merged and the top-hat is fused
+    plan = y.explain().splitlines()
+    assert len(plan) == 4
+    assert 'flat.linear_morph(t0' in plan[1]
+    assert 'TOPHAT' in plan[3]
+
+
+def test_idempotent():
+    rng = np.random.default_rng(1)
+    vol = rng.random((10, 11, 12))
+    sym = np.ones((3, 3, 5))
+    asym = np.ones((2, 3, 3))
+    x = pg.lazy.volume(vol)
+
+    y = x.open(sym).open(sym).close(asym).close(asym)
+    expected = pg.flat.close(pg.flat.close(pg.flat.open(vol, sym), asym),
+                             asym)
+    np.testing.assert_equal(y.compute(), expected)
+    # Only the opening with the symmetric element is removed
+    assert y.explain().count('OPEN') == 1
+    assert y.explain().count('CLOSE') == 2
+
+
+def test_common_subexpressions():
+    rng = np.random.default_rng(2)
+    vol = rng.integers(0, 100, size=(10, 11, 12)).astype(np.int16)
+    strel = np.zeros((3, 3, 3))
+    x = pg.lazy.volume(vol)
+    grad = x.gen_dilate(strel) - x.gen_erode(strel)
+    diff = grad - (x.gen_dilate(strel) - x)
+    assert diff.explain().count('DILATE') == 1
+
+    closed, bothat = pg.lazy.compute(x.gen_close(strel),
+                                     x.gen_close(strel) - x)
+    np.testing.assert_equal(closed, pg.gen.close(vol, strel))
+    np.testing.assert_equal(bothat, pg.gen.bothat(vol, strel))
+    np.testing.assert_equal(diff.compute(),
+                            vol - pg.gen.erode(vol, strel))
+
+
+def test_out():
+    rng = np.random.default_rng(3)
+    vol = rng.random((8, 9, 10))
+    expected = pg.flat.open(vol, np.ones((3, 3, 3)))
+    res = pg.lazy.volume(vol).open(np.ones((3, 3, 3))).compute(out=vol)
+    assert res is vol
+    np.testing.assert_equal(vol, expected)
+
+    with pytest.raises(ValueError):
+        pg.lazy.volume(vol) - pg.lazy.volume(vol[1:])
@@ -0,0 +1,99 @@
+import pytest
+
+import pygorpho as pg
+import numpy as np
+
+
+@pytest.mark.parametrize('op', [pg.DILATE, pg.ERODE, pg.OPEN, pg.BOTHAT])
+def test_morph_npy(tmp_path, op):
+    rng = np.random.default_rng(0)
+    vol = rng.integers(0, 100, size=(30, 12, 13)).astype(np.uint8)
+    strel = rng.random((5, 3, 4)) > 0.3
+    np.save(tmp_path / 'vol.npy', vol)
+    expected = pg.flat.morph(vol, strel, op)
+
+    # Room for slabs of 4 planes
+    limit = 3 * (4 + 8) * vol[0].nbytes
+    actual = pg.outofcore.morph(tmp_path / 'vol.npy', strel, op,
+                                dst=tmp_path / 'res.npy', memory_limit=limit)
+    assert isinstance(actual, np.memmap)
+    np.testing.assert_equal(actual, expected)
+    np.testing.assert_equal(np.load(tmp_path / 'res.npy'), expected)
+
+
+def test_linear_morph_raw(tmp_path):
+    rng = np.random.default_rng(1)
+    vol = rng.random((20, 11, 12)).astype(np.float32)
+    vol.tofile(tmp_path / 'vol.raw')
+    line_steps = [[1, 1, 0], [2, 0, -1], [0, 0, 1]]
+    line_lens = [5, 3, 7]
+    expected = pg.flat.linear_morph(vol, line_steps, line_lens, pg.ERODE)
+
+    actual = pg.outofcore.linear_morph(
+        tmp_path / 'vol.raw', line_steps, line_lens, pg.ERODE,
+        dst=tmp_path / 'res.raw', memory_limit=3 * 12 * vol[0].nbytes,
+        shape=vol.shape, dtype=vol.dtype)
+    np.testing.assert_equal(actual, expected)
+
+
+def test_inplace_fortran():
+    rng = np.random.default_rng(2)
+    vol = np.asfortranarray(rng.random((10, 11, 25)))
+    strel = np.ones((3, 3, 3), dtype=bool)
+    expected = pg.flat.close(vol, strel)
+
+    actual = pg.outofcore.morph(vol, strel, pg.CLOSE, dst=vol,
+                                memory_limit=3 * 8 * 110 * 8)
+    assert actual is vol
+    np.testing.assert_equal(vol, expected)
+
+
+def test_memory_limit_too_small():
+    vol = np.zeros((10, 10, 10))
+    with pytest.raises(ValueError):
+        pg.outofcore.morph(vol, np.ones((5, 5, 5)), pg.DILATE,
+                           memory_limit=3 * 8 * 100)
+
+
+def test_inplace_npy(tmp_path):
+    rng = np.random.default_rng(3)
+    vol = rng.integers(0, 100, size=(20, 9, 10)).astype(np.uint16)
+    strel = np.ones((3, 3, 3), dtype=bool)
+    np.save(tmp_path / 'vol.npy', vol)
+    expected = pg.flat.dilate(vol, strel)
+
+    actual = pg.outofcore.morph(tmp_path / 'vol.npy', strel, pg.DILATE,
+                                dst=tmp_path / 'vol.npy',
+                                memory_limit=3 * 8 * vol[0].nbytes)
+    np.testing.assert_equal(actual, expected)
+    np.testing.assert_equal(np.load(tmp_path / 'vol.npy'), expected)
+
+
+def test_inplace_raw(tmp_path):
+    rng = np.random.default_rng(4)
+    vol = rng.random((20, 11, 12)).astype(np.float32)
+    header = b'header'
+    with open(tmp_path / 'vol.raw', 'wb') as f:
+        f.write(header)
+        vol.tofile(f)
+    line_steps = [[1, 0, 0], [0, 1, 1]]
+    line_lens = [5, 3]
+    expected = pg.flat.linear_morph(vol, line_steps, line_lens, pg.CLOSE)
+
+    actual = pg.outofcore.linear_morph(
+        tmp_path / 'vol.raw', line_steps, line_lens, pg.CLOSE,
+        dst=tmp_path / 'vol.raw', memory_limit=3 * 16 * vol[0].nbytes,
+        shape=vol.shape, dtype=vol.dtype, offset=len(header))
+    np.testing.assert_equal(actual, expected)
+    with open(tmp_path / 'vol.raw', 'rb') as f:
+        assert f.read(len(header)) == header
+        np.testing.assert_equal(
+            np.fromfile(f, dtype=vol.dtype).reshape(vol.shape), expected)
+
+
+def test_inplace_readonly_memmap(tmp_path):
+    np.save(tmp_path / 'vol.npy', np.zeros((5, 5, 5)))
+    vol = np.load(tmp_path / 'vol.npy', mmap_mode='r')
+    with pytest.raises(ValueError):
+        pg.outofcore.morph(vol, np.ones((3, 3, 3)), pg.DILATE,
+                           dst=tmp_path / 'vol.npy')
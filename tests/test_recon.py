@@ -0,0 +1,145 @@
+import pytest
+
+import pygorpho as pg
+import numpy as np
+import scipy.ndimage as ndi
+
+
+def naive_reconstruct(marker, mask, method, connectivity):
+    footprint = ndi.generate_binary_structure(
+        3, {6: 1, 18: 2, 26: 3}[connectivity])
+    if method == 'dilation':
+        res = np.minimum(marker, mask)
+    else:
+        res = np.maximum(marker, mask)
+    while True:
+        if method == 'dilation':
+            step = np.minimum(ndi.grey_dilation(res, footprint=footprint,
+                                                mode='nearest'), mask)
+        else:
+            step = np.maximum(ndi.grey_erosion(res, footprint=footprint,
+                                               mode='nearest'), mask)
+        if np.array_equal(step, res):
+            return res
+        res = step
+
+
+@pytest.mark.parametrize('method', ['dilation', 'erosion'])
+@pytest.mark.parametrize('connectivity', [6, 18, 26])
+@pytest.mark.parametrize('dtype', [np.bool_, np.uint8, np.int16,
+                                   np.float32])
+def test_reconstruct(method, connectivity, dtype):
+    rng = np.random.default_rng(connectivity)
+    for shape in [(9, 10, 11), (1, 12, 7), (20, 3, 1)]:
+        mask = rng.integers(0, 5, size=shape).astype(dtype)
+        marker = rng.integers(0, 5, size=shape).astype(dtype)
+        res = pg.recon.reconstruct(marker, mask, method, connectivity)
+        np.testing.assert_equal(
+            res, naive_reconstruct(marker, mask, method, connectivity))
+
+
+def test_reconstruct_long_paths():
+    # A winding path forces the queue phase to do most of the work
+    mask = np.zeros((3, 21, 21), dtype=np.uint8)
+    mask[1, ::4, :] = 200
+    mask[1, 1:4, -1] = 200
+    mask[1, 5:8, 0] = 200
+    mask[1, 9:12, -1] = 200
+    mask[1, 13:16, 0] = 200
+    mask[1, 17:20, -1] = 200
+    marker = np.zeros_like(mask)
+    marker[1, 0, 0] = 255
+    res = pg.recon.reconstruct(marker, mask, connectivity=6)
+    np.testing.assert_equal(res, naive_reconstruct(marker, mask,
+                                                   'dilation', 6))
+    assert res[1, 20, 0] == 200
+
+
+def test_reconstruct_2d_and_out():
+    mask = np.array([[1, 1, 0, 1], [0, 1, 0, 1]], dtype=np.uint8)
+    marker = np.array([[1, 0, 0, 0], [0, 0, 0, 0]], dtype=np.uint8)
+    res = pg.recon.reconstruct(marker, mask, connectivity=6)
+    assert res.shape == (2, 4)
+    np.testing.assert_equal(res, [[1, 1, 0, 0], [0, 1, 0, 0]])
+
+    out = pg.recon.reconstruct(marker, mask, connectivity=6, out=marker)
+    assert out is marker
+    np.testing.assert_equal(marker, res)
+
+
+def test_reconstruct_invalid():
+    vol = np.zeros((4, 4, 4), dtype=np.uint8)
+    with pytest.raises(ValueError):
+        pg.recon.reconstruct(vol, vol.astype(np.float32))
+    with pytest.raises(ValueError):
+        pg.recon.reconstruct(vol, vol[1:])
+    with pytest.raises(ValueError):
+        pg.recon.reconstruct(vol, vol, connectivity=8)
+    with pytest.raises(ValueError):
+        pg.recon.reconstruct(vol, vol, out=np.zeros((4, 4, 4)))
+
+
+def test_by_reconstruction():
+    rng = np.random.default_rng(0)
+    vol = rng.integers(0, 100, size=(12, 13, 14)).astype(np.int16)
+    strel = np.ones((3, 3, 3))
+
+    res = pg.recon.open_by_reconstruction(vol, strel)
+    expected = naive_reconstruct(pg.flat.erode(vol, strel), vol,
+                                 'dilation', 26)
+    np.testing.assert_equal(res, expected)
+
+    res = pg.recon.close_by_reconstruction(vol, strel, connectivity=6)
+    expected = naive_reconstruct(pg.flat.dilate(vol, strel), vol,
+                                 'erosion', 6)
+    np.testing.assert_equal(res, expected)
+
+
+def test_fill_holes():
+    rng = np.random.default_rng(0)
+    for _ in range(5):
+        vol = rng.random((15, 16, 17)) > 0.6
+        np.testing.assert_equal(pg.recon.fill_holes(vol),
+                                ndi.binary_fill_holes(vol))
+
+    # Gray values are raised to the lowest value around the hole
+    vol = np.full((5, 5, 5), 3, dtype=np.uint8)
+    vol[1:4, 1:4, 1:4] = 7
+    vol[2, 2, 2] = 1
+    vol[1, 2, 2] = 5
+    res = pg.recon.fill_holes(vol)
+    assert res[2, 2, 2] == 5
+    vol[2, 2, 2] = 5
+    np.testing.assert_equal(res, vol)
+
+    # Lower dimensional volumes only have a border along their own axes
+    vol = np.full((5, 5), 7, dtype=np.uint8)
+    vol[2, 2] = 1
+    res = pg.recon.fill_holes(vol)
+    assert res.shape == vol.shape
+    np.testing.assert_equal(res, np.full((5, 5), 7))
+    vol = rng.random((15, 16)) > 0.6
+    np.testing.assert_equal(pg.recon.fill_holes(vol),
+                            ndi.binary_fill_holes(vol))
+    np.testing.assert_equal(pg.recon.fill_holes([3, 1, 2, 0, 4]),
+                            [3, 3, 3, 3, 4])
+
+
+@pytest.mark.parametrize('dtype', [np.uint8, np.float32, np.float64])
+def test_h_maxima(dtype):
+    profile = np.array([0.0, 0.35, 0.1, 0.25, 0.1, 0.9, 0.8, 0.1, 0.0])
+    if dtype == np.uint8:
+        vol, h = (profile * 20).astype(dtype), 4
+    else:
+        vol, h = profile.astype(dtype), dtype(0.2)
+    vol = vol.reshape(1, 1, -1)
+    expected = np.array([0, 1, 0, 0, 0, 1, 0, 0, 0], dtype=bool)
+
+    np.testing.assert_equal(pg.recon.h_maxima(vol, h).ravel(), expected)
+    np.testing.assert_equal(pg.recon.h_minima(-vol.astype(np.float64),
+                                              h).ravel(), expected)
+    res = pg.recon.hmax(vol, h).ravel()
+    assert res[5] == vol[0, 0, 5] - h
+    assert res[3] == res[2]
+    np.testing.assert_allclose(pg.recon.hmin(vol.max() - vol, h),
+                               vol.max() - pg.recon.hmax(vol, h))
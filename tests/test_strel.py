@@ -0,0 +1,150 @@
+import pytest
+
+import pygorpho as pg
+import numpy as np
+from pygorpho import _ball
+from pygorpho import _decompose
+
+
+def minkowski_sum(line_steps, line_lens, strels, shape):
+    res = np.zeros(shape, dtype=bool)
+    res[tuple(np.array(shape) // 2)] = True
+    for step, length in zip(line_steps, line_lens):
+        res = _decompose.dilate(res, _decompose.line_offsets(step, length))
+    for strel in strels:
+        offsets = np.argwhere(strel) - np.array(strel.shape) // 2
+        res = _decompose.dilate(res, offsets)
+    return res
+
+
+@pytest.mark.parametrize('shape', [(5, 4, 7), (9, 9, 1), (1, 1, 1)])
+def test_decompose_box(shape):
+    line_steps, line_lens, strels = pg.strel.decompose(np.ones(shape))
+    assert sorted(line_lens) == sorted(n for n in shape if n > 1)
+    assert len(strels) == 0
+    np.testing.assert_equal(
+        minkowski_sum(line_steps, line_lens, strels, shape), np.ones(shape))
+
+
+def test_decompose_octahedron():
+    strel = np.abs(np.indices((7, 7, 7)) - 3).sum(axis=0) <= 3
+    parts = pg.strel.decompose(strel)
+    assert parts is not None
+    np.testing.assert_equal(minkowski_sum(*parts, strel.shape), strel)
+
+
+def test_decompose_ball():
+    strel = ((np.indices((11, 11, 11)) - 5)**2).sum(axis=0) <= 25
+    assert pg.strel.decompose(strel) is None
+
+    parts = pg.strel.decompose(strel, tolerance=0.2)
+    approx = minkowski_sum(*parts, (21, 21, 21))
+    expected = np.zeros((21, 21, 21), dtype=bool)
+    expected[5:16, 5:16, 5:16] = strel
+    assert np.count_nonzero(approx != expected) <= 0.2 * strel.sum()
+
+
+@pytest.mark.parametrize('type', [pg.INSIDE, pg.BEST, pg.OUTSIDE])
+def test_flat_ball_approx(type):
+    line_steps, line_lens = pg.strel.flat_ball_approx(10, type)
+    assert line_steps.shape == (13, 3)
+    assert line_lens.shape == (13,)
+
+    # Cached and read-only
+    assert pg.strel.flat_ball_approx(10, type)[1] is line_lens
+    with pytest.raises(ValueError):
+        line_lens[0] = 1
+
+
+def test_flat_ball_approx_radius():
+    for radius in [5, 20, 50]:
+        inside = _ball.ball_lengths(radius, pg.INSIDE) // 2
+        outside = _ball.ball_lengths(radius, pg.OUTSIDE) // 2
+        outer = _ball.outer_radius(inside)
+        inner = _ball.inner_radius(outside)
+        assert outer <= radius <= inner
+
+
+# Lengths along the axes, face and body diagonals for INSIDE, BEST and
+# OUTSIDE, as returned by the gorpho library
+GORPHO_BALL_LENGTHS = {
+    0: [[0, 0, 0], [0, 0, 0], [0, 0, 0]],
+    1: [[2, 0, 0], [2, 0, 0], [3, 0, 0]],
+    2: [[3, 0, 0], [4, 0, 0], [2, 0, 2]],
+    3: [[2, 2, 0], [3, 0, 2], [3, 2, 0]],
+    5: [[2, 2, 2], [3, 2, 2], [3, 3, 0]],
+    8: [[3, 3, 2], [4, 3, 2], [5, 3, 2]],
+    13: [[5, 3, 4], [6, 4, 3], [7, 4, 3]],
+    25: [[7, 7, 5], [9, 7, 5], [11, 7, 5]],
+    64: [[18, 17, 10], [23, 15, 12], [21, 18, 11]],
+    100: [[31, 24, 16], [32, 25, 17], [33, 27, 17]],
+    256: [[73, 62, 39], [78, 64, 41], [81, 68, 42]],
+    257: [[75, 61, 40], [77, 64, 42], [83, 67, 43]],
+    500: [[143, 120, 75], [152, 124, 79], [157, 131, 82]],
+    1000: [[283, 238, 151], [296, 249, 157], [313, 260, 164]],
+}
+
+
+@pytest.mark.parametrize('radius', sorted(GORPHO_BALL_LENGTHS))
+def test_flat_ball_approx_gorpho(radius):
+    gorpho_steps = [[1, 0, 0], [0, -1, 0], [0, 0, 1], [1, 1, 0], [-1, 1, 0],
+                    [-1, 0, -1], [1, 0, -1], [0, 1, 1], [0, -1, 1],
+                    [-1, -1, -1], [1, 1, -1], [1, -1, 1], [-1, 1, 1]]
+    for type in [pg.INSIDE, pg.BEST, pg.OUTSIDE]:
+        line_steps, line_lens = pg.strel.flat_ball_approx(radius, type)
+        np.testing.assert_equal(line_steps, gorpho_steps)
+        lens = GORPHO_BALL_LENGTHS[radius][type]
+        np.testing.assert_equal(line_lens, [lens[0]] * 3 + [lens[1]] * 6
+                                + [lens[2]] * 4)
+
+
+def test_flat_ball_approx_large_radius():
+    # Not supported by gorpho, so the lengths are computed
+    _, line_lens = pg.strel.flat_ball_approx(1001)
+    assert np.all(line_lens % 2 == 1)
+    np.testing.assert_equal(line_lens, line_lens[[0, 3, 9]][_ball.CLASSES])
+
+
+def test_flat_ball_approx_dilate():
+    vol = np.zeros((31, 31, 31), dtype=bool)
+    vol[15, 15, 15] = True
+    line_steps, line_lens = pg.strel.flat_ball_approx(8, pg.INSIDE)
+    res = pg.flat.linear_dilate(vol, line_steps, line_lens)
+    dist = np.sqrt(((np.argwhere(res) - 15)**2).sum(axis=1))
+    assert dist.max() <= 8
+
+
+@pytest.mark.parametrize('type', [pg.INSIDE, pg.BEST, pg.OUTSIDE])
+def test_nested_ball_approx(type):
+    radii = list(range(1, 31))
+    line_steps, line_lens = pg.strel.nested_ball_approx(radii, type)
+    assert line_steps.shape == (13, 3)
+    assert line_lens.shape == (30, 13)
+    assert np.all(line_lens % 2 == 1)
+    assert np.all(line_lens[1:] >= line_lens[:-1])
+    for radius, lens in zip(radii, line_lens):
+        a = lens[[0, 3, 9]] // 2
+        if type == pg.INSIDE:
+            assert _ball.outer_radius(a) <= radius + 1e-9
+        elif type == pg.OUTSIDE:
+            assert _ball.inner_radius(a) >= radius - 1e-9
+        best = _ball.ball_lengths(radius, type) // 2
+        excess = (_ball._errors(a, radius, type)
+                  - _ball._errors(best, radius, type))
+        assert excess <= 3
+
+    assert pg.strel.nested_ball_approx(radii, type)[1] is line_lens
+    with pytest.raises(ValueError):
+        pg.strel.nested_ball_approx([3, 3])
+
+
+def test_paraboloid():
+    strel = pg.strel.paraboloid([1, 2, 4], [1, 2, 0])
+    assert strel.shape == (3, 5, 1)
+    np.testing.assert_equal(strel[:, :, 0], [[-2, -1.25, -1, -1.25, -2],
+                                             [-1, -0.25, 0, -0.25, -1],
+                                             [-2, -1.25, -1, -1.25, -2]])
+    with pytest.raises(ValueError):
+        pg.strel.paraboloid(0, 2)
+    with pytest.raises(ValueError):
+        pg.strel.paraboloid([1, 2], 2)
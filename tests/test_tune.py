@@ -0,0 +1,83 @@
+import json
+import os
+
+import pytest
+
+import pygorpho as pg
+import numpy as np
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('PYGORPHO_CACHE_DIR', str(tmp_path))
+    pg.tune.clear_cache()
+    yield tmp_path
+    pg.tune.clear_cache()
+
+
+def test_auto(cache_dir):
+    rng = np.random.default_rng(0)
+    vol = rng.random((30, 31, 32))
+    strel = rng.random((3, 5, 3)) > 0.5
+    expected = pg.flat.open(vol, strel)
+    np.testing.assert_equal(pg.flat.open(vol, strel, block_size='auto'),
+                            expected)
+    np.testing.assert_equal(
+        pg.flat.linear_erode(vol, [[1, 1, 0]], [4], block_size='auto'),
+        pg.flat.linear_erode(vol, [[1, 1, 0]], [4]))
+    np.testing.assert_equal(
+        pg.gen.morph_batch(vol, np.zeros((3, 3)), pg.DILATE,
+                           block_size='auto'),
+        pg.gen.morph_batch(vol, np.zeros((3, 3)), pg.DILATE))
+    assert not os.path.exists(pg.tune.cache_path())
+
+    with pytest.raises(ValueError):
+        pg.flat.dilate(vol, strel, block_size='fast')
+
+
+def test_tune(cache_dir, monkeypatch):
+    # Keep the CPU backend from splitting blocks for more threads
+    monkeypatch.setenv('PYGORPHO_NUM_THREADS', '1')
+    rng = np.random.default_rng(1)
+    vol = rng.random((20, 21, 22)).astype(np.float32)
+    strel = np.ones((3, 3, 3))
+    best = pg.tune.tune(pg.flat.dilate, vol, strel,
+                        candidates=[[4, 4, 4], [8, 8, 8]], repeat=1)
+    assert best in [[4, 4, 4], [8, 8, 8]]
+
+    with open(pg.tune.cache_path()) as f:
+        cache = json.load(f)
+    assert list(cache.values()) == [best]
+    key = list(cache.keys())[0]
+    assert 'flat.morph' in key and '20x21x22' in key
+
+    # The tuned size is used for similar calls
+    calls = []
+    pg.instrument.add_hook(calls.append)
+    try:
+        res = pg.flat.dilate(vol + 1, strel, block_size='auto')
+    finally:
+        pg.instrument.remove_hook(calls.append)
+    np.testing.assert_equal(res, pg.flat.dilate(vol + 1, strel))
+    assert calls[0].blocks == np.prod([-(-n // best[0])
+                                       for n in vol.shape])
+
+
+def test_tune_defaults(cache_dir):
+    vol = np.zeros((40, 41, 42), dtype=np.uint8)
+    best = pg.tune.tune(pg.flat.linear_morph, vol, [1, 0, 0], 5, pg.OPEN,
+                        repeat=1, store=False)
+    assert len(best) == 3
+    assert not os.path.exists(pg.tune.cache_path())
+
+
+def test_heuristic():
+    from pygorpho import _tune
+    # Small volumes are processed in one block
+    assert _tune.heuristic([50, 60, 70], 4, [2, 2, 2], 2**22) == [50, 60, 70]
+    block = _tune.heuristic([512, 512, 512], 4, [6, 6, 6], 2**22)
+    assert np.prod(np.add(block, 6)) * 4 <= 2**22
+    assert block[2] == max(block)
+    # Blocks stay thicker than twice the halo
+    block = _tune.heuristic([512, 512, 512], 8, [40, 40, 40], 2**16)
+    assert min(block) >= 80